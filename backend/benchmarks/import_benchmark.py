@@ -0,0 +1,189 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+
+"""
+Measures the cold start cost of every lambda entry point under ml_space_lambda.
+
+Each handler module is imported in a fresh interpreter (with offline AWS settings so nothing can
+reach out to AWS during import) and the wall and CPU time of the import, the peak RSS of the
+process and the `-X importtime` breakdown are recorded. Results are compared against a stored baseline and the
+run fails if any module regressed beyond the allowed tolerance.
+
+    python benchmarks/import_benchmark.py                     # compare against the baseline
+    python benchmarks/import_benchmark.py --update-baseline   # record a new baseline
+    python benchmarks/import_benchmark.py ml_space_lambda.project.lambda_functions --top 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = BACKEND_DIR / "src"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "import_baseline.json"
+ENTRY_POINT_FILES = ("lambda_functions.py", "lambda_function.py")
+
+# Fake credentials and a disabled metadata endpoint make sure nothing at import time can talk to AWS
+OFFLINE_ENV = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+    "AWS_EC2_METADATA_DISABLED": "true",
+    "AWS_CONFIG_FILE": os.devnull,
+    "AWS_SHARED_CREDENTIALS_FILE": os.devnull,
+}
+
+# Runs inside the child interpreter, the timed section only covers the handler import
+IMPORT_SNIPPET = """
+import importlib, json, resource, sys, time
+start, cpu_start = time.perf_counter(), time.process_time()
+importlib.import_module(sys.argv[1])
+elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"import_ms": elapsed * 1000, "cpu_ms": cpu * 1000, "rss_kb": rss_kb}))
+"""
+
+
+def discover_entry_points() -> List[str]:
+    modules = []
+    for entry_point in sorted(SRC_DIR.glob("ml_space_lambda/**/*.py")):
+        if entry_point.name in ENTRY_POINT_FILES:
+            modules.append(".".join(entry_point.relative_to(SRC_DIR).with_suffix("").parts))
+    return modules
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, int]]:
+    """
+    Parses `-X importtime` output into {module: {"self_us": ..., "cumulative_us": ...}}
+    """
+    breakdown = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        breakdown[module.strip()] = {"self_us": int(self_us), "cumulative_us": int(cumulative_us)}
+    return breakdown
+
+
+def measure_module(module: str) -> Dict:
+    env = {**{key: value for key, value in os.environ.items() if not key.startswith("AWS_")}, **OFFLINE_ENV}
+    env["PYTHONPATH"] = str(SRC_DIR)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET, module],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=BACKEND_DIR,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    measurement = json.loads(result.stdout.strip().splitlines()[-1])
+    measurement["breakdown"] = parse_importtime(result.stderr)
+    return measurement
+
+
+def benchmark(modules: List[str], repeat: int) -> Dict[str, Dict]:
+    # Interleave the repeats so a burst of load on the machine doesn't skew every run of one module
+    module_runs: Dict[str, List[Dict]] = {module: [] for module in modules}
+    for _ in range(repeat):
+        for module in modules:
+            module_runs[module].append(measure_module(module))
+
+    results = {}
+    for module, runs in module_runs.items():
+        # The fastest run is the one least disturbed by whatever else the machine is doing
+        results[module] = {
+            "import_ms": round(min(run["import_ms"] for run in runs), 1),
+            "cpu_ms": round(min(run["cpu_ms"] for run in runs), 1),
+            "rss_kb": int(statistics.median(run["rss_kb"] for run in runs)),
+            "breakdown": runs[-1]["breakdown"],
+        }
+    return results
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float, slack_ms: float, slack_kb: int
+) -> List[str]:
+    regressions = []
+    for module, result in results.items():
+        expected = baseline.get(module)
+        if not expected:
+            continue
+        # CPU time is gated rather than wall time, it's far less sensitive to other load on the machine
+        if result["cpu_ms"] > expected["cpu_ms"] * (1 + tolerance) + slack_ms:
+            regressions.append(f"{module}: import cpu {expected['cpu_ms']}ms -> {result['cpu_ms']}ms")
+        if result["rss_kb"] > expected["rss_kb"] * (1 + tolerance) + slack_kb:
+            regressions.append(f"{module}: rss {expected['rss_kb']}KB -> {result['rss_kb']}KB")
+    return regressions
+
+
+def print_report(results: Dict[str, Dict], baseline: Dict[str, Dict], top: int) -> None:
+    columns = [("import_ms", "wall ms"), ("cpu_ms", "cpu ms"), ("rss_kb", "rss KB")]
+    print(f"{'module':<62}" + "".join(f" {label:>9} {'baseline':>9}" for _, label in columns))
+    for module, result in sorted(results.items(), key=lambda item: -item[1]["cpu_ms"]):
+        expected = baseline.get(module, {})
+        print(f"{module:<62}" + "".join(f" {result[key]:>9} {expected.get(key, '-'):>9}" for key, _ in columns))
+        if top:
+            heaviest = sorted(result["breakdown"].items(), key=lambda item: -item[1]["self_us"])[:top]
+            for name, timing in heaviest:
+                print(f"    {name:<58} {timing['self_us'] / 1000:>9.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", help="Entry point modules to measure (defaults to all handlers)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to start per module")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative regression")
+    parser.add_argument("--slack-ms", type=float, default=25, help="Allowed absolute import CPU time regression")
+    parser.add_argument("--slack-kb", type=int, default=2048, help="Allowed absolute RSS regression")
+    parser.add_argument("--top", type=int, default=0, help="Show the N slowest imports for each module")
+    parser.add_argument("--json", type=Path, help="Also write the full results (including breakdowns) here")
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.modules or discover_entry_points(), args.repeat)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    print_report(results, baseline, args.top)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        baseline.update(
+            {module: {key: result[key] for key in ("import_ms", "cpu_ms", "rss_kb")} for module, result in results.items()}
+        )
+        args.baseline.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance, args.slack_ms, args.slack_kb)
+    if regressions:
+        print("\nRegressions against baseline:")
+        print("\n".join(f"  {regression}" for regression in regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
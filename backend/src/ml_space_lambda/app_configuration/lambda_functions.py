@@ -18,13 +18,12 @@ import json
 import logging
 import time
 
-import boto3
-
 from ml_space_lambda.app_configuration.policy_helper.active_service_policy_manager import ActiveServicePolicyManager
 from ml_space_lambda.app_configuration.policy_helper.notebook import update_instance_constraint_policies
 from ml_space_lambda.data_access_objects.app_configuration import AppConfigurationDAO, AppConfigurationModel, SettingsModel
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
 from ml_space_lambda.enums import EnvVariable
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import (
     api_wrapper,
     event_wrapper,
@@ -39,7 +38,7 @@ from ml_space_lambda.utils.resource_utils import suspend_all_of_type
 log = logging.getLogger(__name__)
 app_configuration_dao = AppConfigurationDAO()
 env_variables = get_environment_variables()
-translate_client = boto3.client("translate", config=retry_config)
+translate_client = lazy_client("translate", config=retry_config)
 resource_metadata_dao = ResourceMetadataDAO()
 iam_manager = IAMManager()
 
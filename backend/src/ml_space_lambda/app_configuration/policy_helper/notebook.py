@@ -17,13 +17,12 @@
 import json
 import logging
 
-import boto3
-
 from ml_space_lambda.enums import EnvVariable
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.iam_manager import IAMManager
 from ml_space_lambda.utils.mlspace_config import get_environment_variables, retry_config
 
-iam = boto3.client("iam", config=retry_config)
+iam = lazy_client("iam", config=retry_config)
 log = logging.getLogger(__name__)
 
 
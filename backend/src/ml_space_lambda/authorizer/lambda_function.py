@@ -220,9 +220,14 @@ def lambda_handler(event, context):
                         logging.info("Access Denied. Encountered error while determining notebook access policy.")
                 elif "scope" in path_params:
                     if "datasetName" in path_params:
+                        # Generating a manifest writes objects into the dataset so it requires the
+                        # same access as updating the dataset
+                        dataset_method = (
+                            "PUT" if request_method == "POST" and requested_resource.endswith("/manifest") else request_method
+                        )
                         try:
                             if _handle_dataset_request(
-                                request_method,
+                                dataset_method,
                                 path_params,
                                 user,
                             ):
@@ -263,7 +268,7 @@ def lambda_handler(event, context):
                     # decisions can be found in the _allow_project_resources_read method.
                     job_type = ""
                     if (
-                        requested_resource.endswith("/logs")
+                        requested_resource.endswith(("/logs", "/logs/export"))
                         and "/notebook" not in requested_resource
                         and "/endpoint" not in requested_resource
                     ):
@@ -303,7 +308,9 @@ def lambda_handler(event, context):
             elif requested_resource == "/group" and request_method == "POST":
                 if IS_ADMIN:
                     policy_statement["Effect"] = "Allow"
-            elif requested_resource in ["/dataset/presigned-url", "/dataset/create"]:
+            elif requested_resource in ["/dataset/presigned-url", "/dataset/create"] or requested_resource.startswith(
+                "/dataset/presigned-url/"
+            ):
                 # If this is a request for a dataset related presigned url or for
                 # creating a new dataset, we need to determine the underlying dataset
                 # and whether the user should have access to it
@@ -339,7 +346,7 @@ def lambda_handler(event, context):
                                     is_valid_group_list = False
                             if is_valid_group_list:
                                 policy_statement["Effect"] = "Allow"
-                        elif requested_resource == "/dataset/presigned-url":
+                        elif requested_resource.startswith("/dataset/presigned-url"):
                             groups = group_dataset_dao.get_groups_for_dataset(target_scope)
                             for group in groups:
                                 # validate the user is a member of at least one group associated with this dataset
@@ -18,15 +18,14 @@ import json
 import logging
 import urllib.parse
 
-import boto3
-
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
 from ml_space_lambda.enums import EnvVariable, ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import api_wrapper, query_resource_metadata, retry_config
 from ml_space_lambda.utils.mlspace_config import get_environment_variables, pull_config_from_s3
 
-translate = boto3.client("translate", config=retry_config)
-s3 = boto3.client("s3", config=retry_config)
+translate = lazy_client("translate", config=retry_config)
+s3 = lazy_client("s3", config=retry_config)
 log = logging.getLogger(__name__)
 resource_metadata_dao = ResourceMetadataDAO()
 failed_job_statuses = ["FAILED", "COMPLETED_WITH_ERROR"]
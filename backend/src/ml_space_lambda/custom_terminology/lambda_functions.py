@@ -16,11 +16,10 @@
 
 import logging
 
-import boto3
-
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import api_wrapper, list_custom_terminologies_for_project, retry_config
 
-translate = boto3.client("translate", config=retry_config)
+translate = lazy_client("translate", config=retry_config)
 log = logging.getLogger(__name__)
 
 
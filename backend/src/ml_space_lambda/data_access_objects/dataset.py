@@ -22,7 +22,7 @@ from typing import List, Optional
 
 from dynamodb_json import json_util as dynamodb_json
 
-from ml_space_lambda.data_access_objects.dynamo_data_store import DynamoDBObjectStore
+from ml_space_lambda.data_access_objects.dynamo_data_store import DynamoDBObjectStore, PagedResults
 from ml_space_lambda.enums import DatasetType, EnvVariable
 from ml_space_lambda.utils.mlspace_config import get_environment_variables
 
@@ -39,6 +39,9 @@ class DatasetModel:
         created_at: Optional[float] = None,
         last_updated_at: Optional[float] = None,
         groups: List[str] = [],
+        object_count: Optional[int] = None,
+        total_bytes: Optional[int] = None,
+        last_modified: Optional[float] = None,
     ):
         now = int(time.time())
         self.scope = scope
@@ -50,6 +53,12 @@ class DatasetModel:
         self.created_at = created_at if created_at else now
         self.last_updated_at = last_updated_at if last_updated_at else now
         self.groups = groups
+        # Approximate aggregates maintained from S3 event notifications (overwrites are counted as
+        # new objects), these are only populated once objects have been written to the dataset and
+        # can be corrected with the recount-stats API
+        self.object_count = object_count
+        self.total_bytes = total_bytes
+        self.last_modified = last_modified
 
         env_variables = get_environment_variables()
         self.prefix = self.location.replace(f"s3://{env_variables[EnvVariable.DATA_BUCKET]}/", "")
@@ -57,7 +66,7 @@ class DatasetModel:
             self.prefix = self.prefix + "/"
 
     def to_dict(self) -> dict:
-        return {
+        dataset = {
             "name": self.name,
             "scope": self.scope,
             "type": self.type,
@@ -68,6 +77,14 @@ class DatasetModel:
             "lastUpdatedAt": self.last_updated_at,
             "groups": self.groups,
         }
+        # Omit unset aggregates so they can be atomically incremented in DynamoDB
+        if self.object_count is not None:
+            dataset["objectCount"] = self.object_count
+        if self.total_bytes is not None:
+            dataset["totalBytes"] = self.total_bytes
+        if self.last_modified is not None:
+            dataset["lastModified"] = self.last_modified
+        return dataset
 
     @staticmethod
     def from_dict(dict_object: dict) -> DatasetModel:
@@ -81,6 +98,9 @@ class DatasetModel:
             dict_object.get("createdAt", None),
             dict_object.get("lastUpdatedAt", None),
             dict_object.get("groups", []),
+            dict_object.get("objectCount", None),
+            dict_object.get("totalBytes", None),
+            dict_object.get("lastModified", None),
         )
 
 
@@ -93,6 +113,9 @@ class DatasetDAO(DynamoDBObjectStore):
     def create(self, dataset: DatasetModel) -> None:
         self._create(dataset.to_dict())
 
+    def create_many(self, datasets: List[DatasetModel]) -> None:
+        self._batch_create([dataset.to_dict() for dataset in datasets])
+
     def update(self, scope: str, name: str, dataset: DatasetModel) -> DatasetModel:
         json_key = {"scope": scope, "name": name}
         # Only a subset of fields can be modified
@@ -117,6 +140,44 @@ class DatasetDAO(DynamoDBObjectStore):
         )
         return self._retrieve(json_key)
 
+    def increment_object_stats(
+        self, scope: str, name: str, count_delta: int, bytes_delta: int, last_modified: Optional[float] = None
+    ) -> None:
+        json_key = {"scope": scope, "name": name}
+        update_exp = "ADD objectCount :countDelta, totalBytes :bytesDelta"
+        values = {":countDelta": count_delta, ":bytesDelta": bytes_delta}
+        if last_modified is not None:
+            update_exp += " SET lastModified = :lastModified"
+            values[":lastModified"] = last_modified
+        try:
+            self._update(
+                json_key=json_key,
+                update_expression=update_exp,
+                expression_names={"#name": "name"},
+                expression_values=json.loads(dynamodb_json.dumps(values)),
+                # Don't recreate a dataset record that has since been deleted
+                condition_expression="attribute_exists(#name)",
+            )
+        except self.client.exceptions.ConditionalCheckFailedException:
+            pass
+
+    def set_object_stats(
+        self, scope: str, name: str, object_count: int, total_bytes: int, last_modified: Optional[float]
+    ) -> None:
+        json_key = {"scope": scope, "name": name}
+        update_exp = "SET objectCount = :objectCount, totalBytes = :totalBytes"
+        values = {":objectCount": object_count, ":totalBytes": total_bytes}
+        if last_modified is not None:
+            update_exp += ", lastModified = :lastModified"
+            values[":lastModified"] = last_modified
+        self._update(
+            json_key=json_key,
+            update_expression=update_exp,
+            expression_names={"#name": "name"},
+            expression_values=json.loads(dynamodb_json.dumps(values)),
+            condition_expression="attribute_exists(#name)",
+        )
+
     def delete(self, scope: str, dataset_name: str) -> None:
         json_key = {"scope": scope, "name": dataset_name}
         self._delete(json_key)
@@ -130,6 +191,13 @@ class DatasetDAO(DynamoDBObjectStore):
             # If we get a KeyError then the item doesn't exist in dynamo
             return None
 
+    def get_many(self, scope: str, dataset_names: List[str]) -> List[DatasetModel]:
+        # Datasets are returned in the order requested, names that don't exist are skipped
+        unique_names = list(dict.fromkeys(dataset_names))
+        json_response = self._batch_retrieve([{"scope": scope, "name": name} for name in unique_names])
+        datasets = {entry["name"]: DatasetModel.from_dict(entry) for entry in json_response}
+        return [datasets[name] for name in unique_names if name in datasets]
+
     def get_all_for_scope(self, dataset_type: DatasetType, scope: str) -> List[DatasetModel]:
         json_response = self._query(
             key_condition_expression="#s = :scope",
@@ -141,5 +209,9 @@ class DatasetDAO(DynamoDBObjectStore):
         return [DatasetModel.from_dict(entry) for entry in json_response]
 
     def get_all(self) -> List[DatasetModel]:
-        json_response = self._scan(page_response=True).records
+        json_response = self._scan().records
         return [DatasetModel.from_dict(entry) for entry in json_response]
+
+    def get_page(self, limit: Optional[int] = None, next_token: Optional[str] = None) -> PagedResults:
+        ddb_response = self._scan(limit=limit, page_response=True, next_token=next_token)
+        return PagedResults([DatasetModel.from_dict(entry) for entry in ddb_response.records], ddb_response.next_token)
@@ -16,13 +16,24 @@
 
 # Core functionality for DynamoDB-based data access objects for accessing MLSpace data.
 import json
+import time
 from typing import Dict, List, Optional
 
-import boto3
+from botocore.client import BaseClient
 from dynamodb_json import json_util as dynamodb_json
 
 from ml_space_lambda.data_access_objects.pagination_helper import decode_pagination_token, encode_pagination_token
-from ml_space_lambda.utils.common_functions import retry_config
+from ml_space_lambda.utils.client_registry import get_client
+from ml_space_lambda.utils.metrics import instrument_client
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_MAX_KEYS = 100
+# Number of times to re-request unprocessed keys or items before giving up
+BATCH_MAX_RETRIES = 5
+# BatchWriteItem accepts at most 25 requests
+BATCH_WRITE_MAX_ITEMS = 25
+# The IN comparator accepts at most 100 operands
+MAX_FILTER_EXPRESSION_OPERANDS = 100
 
 
 class PagedResults:
@@ -35,7 +46,21 @@ class PagedResults:
 class DynamoDBObjectStore:
     def __init__(self, table_name="", client=None):
         self.table_name = table_name
-        self.client = client if client else boto3.client("dynamodb", config=retry_config)
+        self.client = client
+
+    @property
+    def client(self):
+        # DAOs are created at import time, defer creating the (shared) client until it's needed
+        if self._client is None:
+            self._client = get_client("dynamodb")
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        # Injected clients don't come from the registry, make sure their calls are still counted
+        if isinstance(client, BaseClient):
+            instrument_client(client)
+        self._client = client
 
     def _create(self, json_object: dict, condition_expression: Optional[str] = None):
         dynamodb_input = json.loads(dynamodb_json.dumps(json_object))
@@ -49,6 +74,32 @@ class DynamoDBObjectStore:
         # Add new item to the table
         self.client.put_item(**kwargs)
 
+    def _batch_create(self, json_objects: List[dict]) -> None:
+        """
+        Puts multiple items using BatchWriteItem. Unlike _create, existing items with the same key
+        are overwritten and condition expressions aren't supported.
+        """
+        self._batch_write([{"PutRequest": {"Item": json.loads(dynamodb_json.dumps(obj))}} for obj in json_objects])
+
+    def _batch_delete(self, json_keys: List[dict]) -> None:
+        """
+        Deletes multiple items by key using BatchWriteItem. Keys which don't exist are ignored.
+        """
+        self._batch_write([{"DeleteRequest": {"Key": json.loads(dynamodb_json.dumps(key))}} for key in json_keys])
+
+    def _batch_write(self, write_requests: List[dict]) -> None:
+        for start in range(0, len(write_requests), BATCH_WRITE_MAX_ITEMS):
+            request_items = {self.table_name: write_requests[start : start + BATCH_WRITE_MAX_ITEMS]}
+            for attempt in range(BATCH_MAX_RETRIES + 1):
+                if attempt:
+                    # Unprocessed items are the result of throttling so back off before retrying
+                    time.sleep(0.05 * 2**attempt)
+                request_items = self.client.batch_write_item(RequestItems=request_items).get("UnprocessedItems")
+                if not request_items:
+                    break
+            else:
+                raise RuntimeError(f"Failed to write all requested items to {self.table_name}.")
+
     def _retrieve(self, json_key: dict):
         dynamodb_key = json.loads(dynamodb_json.dumps(json_key))
         dynamo_response = self.client.get_item(
@@ -58,6 +109,28 @@ class DynamoDBObjectStore:
         json_response = dynamodb_json.loads(dynamo_response["Item"])
         return json_response
 
+    def _batch_retrieve(self, json_keys: List[dict]) -> List[dict]:
+        """
+        Retrieves multiple items by key using BatchGetItem. Items which don't exist are omitted
+        and the returned items are in no particular order.
+        """
+        results = []
+        dynamodb_keys = [json.loads(dynamodb_json.dumps(json_key)) for json_key in json_keys]
+        for start in range(0, len(dynamodb_keys), BATCH_GET_MAX_KEYS):
+            request_items = {self.table_name: {"Keys": dynamodb_keys[start : start + BATCH_GET_MAX_KEYS]}}
+            for attempt in range(BATCH_MAX_RETRIES + 1):
+                if attempt:
+                    # Unprocessed keys are the result of throttling so back off before retrying
+                    time.sleep(0.05 * 2**attempt)
+                dynamo_response = self.client.batch_get_item(RequestItems=request_items)
+                results.extend(dynamodb_json.loads(dynamo_response["Responses"].get(self.table_name, [])))
+                request_items = dynamo_response.get("UnprocessedKeys")
+                if not request_items:
+                    break
+            else:
+                raise RuntimeError(f"Failed to retrieve all requested items from {self.table_name}.")
+        return results
+
     def _query(
         self,
         key_condition_expression: str,
@@ -69,6 +142,7 @@ class DynamoDBObjectStore:
         page_response: bool = False,
         next_token: str = None,
         scan_index_forward: bool = True,
+        fill_page: bool = False,
     ) -> PagedResults:
         kwargs = {
             "TableName": self.table_name,
@@ -97,9 +171,23 @@ class DynamoDBObjectStore:
                 kwargs["ExclusiveStartKey"] = dynamo_response["LastEvaluatedKey"]
                 dynamo_response = self.client.query(**kwargs)
                 results.extend(dynamodb_json.loads(dynamo_response["Items"]))
-        elif "LastEvaluatedKey" in dynamo_response:
-            # Create encoded pagination token
-            new_next_token = encode_pagination_token(dynamo_response["LastEvaluatedKey"])
+        else:
+            if fill_page and limit:
+                # Limit is applied before any filter expression so keep reading until the page is full
+                while len(results) < limit and "LastEvaluatedKey" in dynamo_response:
+                    key_names = list(dynamo_response["LastEvaluatedKey"].keys())
+                    kwargs["ExclusiveStartKey"] = dynamo_response["LastEvaluatedKey"]
+                    dynamo_response = self.client.query(**kwargs)
+                    remaining = limit - len(results)
+                    if len(dynamo_response["Items"]) > remaining:
+                        # Resume after the last returned item, which has every attribute in the key
+                        last_item = dynamo_response["Items"][remaining - 1]
+                        results.extend(dynamodb_json.loads(dynamo_response["Items"][:remaining]))
+                        return PagedResults(results, encode_pagination_token({name: last_item[name] for name in key_names}))
+                    results.extend(dynamodb_json.loads(dynamo_response["Items"]))
+            if "LastEvaluatedKey" in dynamo_response:
+                # Create encoded pagination token
+                new_next_token = encode_pagination_token(dynamo_response["LastEvaluatedKey"])
 
         return PagedResults(results, new_next_token)
 
@@ -87,6 +87,10 @@ class GroupDatasetDAO(DynamoDBObjectStore):
         ).records
         return [GroupDatasetModel.from_dict(entry) for entry in json_response]
 
+    def get_all(self) -> List[GroupDatasetModel]:
+        json_response = self._scan().records
+        return [GroupDatasetModel.from_dict(entry) for entry in json_response]
+
     def delete(self, group_name: str, dataset_name: str) -> None:
         json_key = {
             "dataset": dataset_name,
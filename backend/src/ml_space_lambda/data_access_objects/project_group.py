@@ -95,6 +95,10 @@ class ProjectGroupDAO(DynamoDBObjectStore):
         ).records
         return [ProjectGroupModel.from_dict(entry) for entry in json_response]
 
+    def get_all(self) -> List[ProjectGroupModel]:
+        json_response = self._scan().records
+        return [ProjectGroupModel.from_dict(entry) for entry in json_response]
+
     def delete(self, project_name: str, group_name: str) -> None:
         json_key = {
             "group": group_name,
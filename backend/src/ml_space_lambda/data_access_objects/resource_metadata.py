@@ -17,7 +17,7 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from botocore.exceptions import ClientError
 from dynamodb_json import json_util as dynamodb_json
@@ -103,6 +103,11 @@ class ResourceMetadataDAO(DynamoDBObjectStore):
             # If we get a KeyError then the item doesn't exist in dynamo
             return None
 
+    def get_many(self, resources: List[Tuple[str, ResourceType]]) -> List[ResourceMetadataModel]:
+        # Records are returned in no particular order, resources that don't exist are skipped
+        json_keys = [{"resourceId": id, "resourceType": type} for id, type in dict.fromkeys(resources)]
+        return [ResourceMetadataModel.from_dict(entry) for entry in self._batch_retrieve(json_keys)]
+
     def get_all_for_project_by_type(
         self,
         project: str,
@@ -113,6 +118,7 @@ class ResourceMetadataDAO(DynamoDBObjectStore):
         filter_expression: Optional[str] = None,
         filter_values: Optional[Dict[str, Any]] = None,
         expression_names: Optional[Dict[str, Any]] = None,
+        fill_page: bool = False,
     ) -> PagedMetadataResults:
         expression_values: Dict[str, Any] = {":project": project, ":resourceType": type}
         if filter_expression and filter_values:
@@ -136,6 +142,7 @@ class ResourceMetadataDAO(DynamoDBObjectStore):
             page_response=not fetch_all,
             next_token=next_token,
             filter_expression=filter_expression,
+            fill_page=fill_page,
         )
         return PagedMetadataResults(
             [ResourceMetadataModel.from_dict(entry) for entry in ddb_response.records],
@@ -151,21 +158,31 @@ class ResourceMetadataDAO(DynamoDBObjectStore):
         fetch_all: Optional[bool] = False,
         filter_expression: Optional[str] = None,
         filter_values: Optional[Dict[str, Any]] = None,
+        expression_names: Optional[Dict[str, Any]] = None,
+        fill_page: bool = False,
     ) -> PagedMetadataResults:
         expression_values: Dict[str, Any] = {":user": user, ":resourceType": type}
         if filter_expression and filter_values:
             if ":user" in filter_values or ":resourceType" in filter_values:
                 raise ValueError("Reserved expression value contained specified in filter_values.")
             expression_values.update(filter_values)
+
+        if not expression_names:
+            expression_names = {"#u": "user"}
+        else:
+            if "#u" in expression_names:
+                raise ValueError("Reserved expression name, '#u', specified in expression_names.")
+            expression_names["#u"] = "user"
         ddb_response = self._query(
             index_name="UserResources",
             key_condition_expression="#u = :user and resourceType = :resourceType",
             expression_values=json.loads(dynamodb_json.dumps(expression_values)),
-            expression_names={"#u": "user"},
+            expression_names=expression_names,
             limit=limit if not fetch_all else None,
             page_response=not fetch_all,
             next_token=next_token,
             filter_expression=filter_expression,
+            fill_page=fill_page,
         )
         return PagedMetadataResults(
             [ResourceMetadataModel.from_dict(entry) for entry in ddb_response.records],
@@ -18,7 +18,7 @@
 from __future__ import annotations
 
 import json
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from dynamodb_json import json_util as dynamodb_json
 
@@ -80,6 +80,11 @@ class ResourceSchedulerDAO(DynamoDBObjectStore):
         json_key = {"resourceId": resource_id, "resourceType": resource_type}
         self._delete(json_key)
 
+    def delete_many(self, resources: List[Tuple[str, ResourceType]]) -> None:
+        self._batch_delete(
+            [{"resourceId": resource_id, "resourceType": resource_type} for resource_id, resource_type in resources]
+        )
+
     def update_termination_time(
         self, resource_id: str, resource_type: ResourceType, new_termination_time: int, project: str
     ) -> None:
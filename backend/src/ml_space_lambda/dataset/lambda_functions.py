@@ -14,25 +14,42 @@
 #   limitations under the License.
 #
 
+import fnmatch
 import json
 import re
-from urllib.parse import unquote
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlencode
 
-import boto3
 from botocore.config import Config
 
 from ml_space_lambda.data_access_objects.dataset import DatasetDAO, DatasetModel
 from ml_space_lambda.data_access_objects.group_dataset import GroupDatasetDAO, GroupDatasetModel
 from ml_space_lambda.data_access_objects.group_user import GroupUserDAO
+from ml_space_lambda.data_access_objects.pagination_helper import decode_pagination_token, encode_pagination_token
 from ml_space_lambda.data_access_objects.user import UserModel
-from ml_space_lambda.enums import DatasetType, EnvVariable, Permission
+from ml_space_lambda.enums import DatasetType, EnvVariable, ManifestFormat, Permission
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import api_wrapper, retry_config
+from ml_space_lambda.utils.dataset_reconciler import DatasetReconciler
 from ml_space_lambda.utils.dict_utils import filter_dict_by_keys, rename_dict_keys
 from ml_space_lambda.utils.exceptions import ResourceNotFound
 from ml_space_lambda.utils.iam_manager import IAMManager
+from ml_space_lambda.utils.manifest_utils import (
+    DEFAULT_ATTRIBUTE_NAME,
+    ManifestWriter,
+    manifest_entry,
+    manifest_footer,
+    manifest_header,
+)
 from ml_space_lambda.utils.mlspace_config import get_environment_variables
+from ml_space_lambda.utils.s3_utils import delete_prefix_or_raise, list_matching_objects
 
-s3 = boto3.client(
+s3 = lazy_client(
     "s3",
     config=Config(
         retries={
@@ -42,13 +59,39 @@ s3 = boto3.client(
         signature_version="s3v4",
     ),
 )
-s3_resource = boto3.resource("s3", config=retry_config)
 dataset_dao = DatasetDAO()
 group_user_dao = GroupUserDAO()
 group_dataset_dao = GroupDatasetDAO()
-iam = boto3.client("iam", config=retry_config)
+iam = lazy_client("iam", config=retry_config)
 iam_manager = IAMManager(iam)
 
+# S3 allows at most 10,000 parts per multipart upload
+MAX_MULTIPART_PARTS = 10000
+MAX_PRESIGNED_PARTS_PER_REQUEST = 100
+MAX_BATCH_PRESIGNED_URLS = 1000
+
+# Maximum number of datasets to recount concurrently
+RECOUNT_STATS_WORKERS = 8
+
+# Maximum number of concurrent group membership lookups
+GROUP_LOOKUP_WORKERS = 8
+
+# Stop deleting dataset files after this many seconds so the response is returned within the API
+# Gateway timeout, the delete request is repeated until every file is gone
+DELETE_TIME_BUDGET_SECONDS = 20
+
+# Manifests are written to this directory within the dataset and excluded from generated manifests
+MANIFEST_DIRECTORY = "_manifests/"
+# Stop generating after this many seconds so the response is returned within the API Gateway timeout
+MANIFEST_TIME_BUDGET_SECONDS = 20
+# Objects listed per ListObjectsV2 call, the deadline is checked after every page
+MANIFEST_LIST_PAGE_SIZE = 1000
+MANIFEST_FILTER_PARAMETERS = ["suffix", "pattern", "minSize", "maxSize", "modifiedAfter", "modifiedBefore"]
+
+# Recursive file listing limits
+MAX_LIST_FILES_PAGE_SIZE = 1000
+LIST_FILES_WORKERS = 8
+
 dataset_description_regex = re.compile(r"[^\w\-\s'.]")
 
 
@@ -65,10 +108,14 @@ def delete(event, context):
     dataset_name = event["pathParameters"]["datasetName"].replace('"', "")
 
     env_variables = get_environment_variables()
-    bucket = s3_resource.Bucket(env_variables[EnvVariable.DATA_BUCKET])
     # Grab the dataset info from dynamo and do the delete using the metadata
     s3_prefix = get_dataset_prefix(scope, dataset_name)
-    bucket.objects.filter(Prefix=s3_prefix).delete()
+    report = delete_prefix_or_raise(
+        s3, env_variables[EnvVariable.DATA_BUCKET], s3_prefix, deadline=time.monotonic() + DELETE_TIME_BUDGET_SECONDS
+    )
+    # The record is kept until every file is gone so the delete can be resumed
+    if not report["complete"]:
+        return {"status": "InProgress", "deleted": report["deleted"]}
     dataset_dao.delete(scope, dataset_name)
 
     # TODO: create dedicated delete query for performance?
@@ -171,11 +218,9 @@ def _is_scope_header_correct(type_from_key: str, scope_from_key: str, name_from_
     return True
 
 
-@api_wrapper
-def presigned_url(event, context):
-    response = ""
-    body = json.loads(event["body"])
-    key = body["key"]
+def _validate_dataset_key(event, key: str) -> Tuple[str, str]:
+    if len(key.split("/")) < 3:
+        raise ValueError("Key does not belong to a dataset.")
     type_from_key = key.split("/")[0]
     scope_from_key = key.split("/")[1]
     name_from_key = key.split("/")[2]
@@ -183,12 +228,23 @@ def presigned_url(event, context):
         # for group datasets, the scope is the dataset name
         scope_from_key = name_from_key
 
-    # Ensure the headers match the values derived from the request key
+    # Ensure the headers match the values derived from the request key, access to the dataset
+    # described by the headers has already been verified by the authorizer
     if type_from_key != event["headers"]["x-mlspace-dataset-type"] or not _is_scope_header_correct(
         type_from_key, scope_from_key, name_from_key, event["headers"]["x-mlspace-dataset-scope"]
     ):
         raise Exception("Dataset headers do not match expected type and scope.")
 
+    return type_from_key, name_from_key
+
+
+@api_wrapper
+def presigned_url(event, context):
+    response = ""
+    body = json.loads(event["body"])
+    key = body["key"]
+    type_from_key, name_from_key = _validate_dataset_key(event, key)
+
     is_upload = body.get("isUpload", False)
     env_variables = get_environment_variables()
 
@@ -239,6 +295,156 @@ def presigned_url(event, context):
     return response
 
 
+@api_wrapper
+def batch_presigned_urls(event, context):
+    """
+    Generates presigned download urls for multiple objects in a single dataset. Objects can be
+    selected by prefix, in which case the listing is paged using nextToken, or by an explicit
+    list of keys which is paged by position.
+    """
+    body = json.loads(event["body"])
+    page_size = min(int(body.get("pageSize", MAX_BATCH_PRESIGNED_URLS)), MAX_BATCH_PRESIGNED_URLS)
+    if page_size < 1:
+        raise ValueError("pageSize must be a positive integer.")
+    env_variables = get_environment_variables()
+    bucket = env_variables[EnvVariable.DATA_BUCKET]
+    response = {}
+
+    # Every requested key must belong to the dataset the authorizer verified access to
+    if "keys" in body:
+        start = int(body.get("nextToken") or 0)
+        keys = body["keys"][start : start + page_size]
+        for key in keys:
+            _validate_dataset_key(event, key)
+        if start + page_size < len(body["keys"]):
+            response["nextToken"] = str(start + page_size)
+    elif "prefix" in body:
+        prefix = body["prefix"]
+        _validate_dataset_key(event, prefix)
+        # The prefix has to include the dataset root (with its trailing slash) otherwise it would
+        # also match sibling datasets whose names start with the same characters
+        split_prefix = prefix.split("/")
+        if split_prefix[0] in [DatasetType.GLOBAL, DatasetType.GROUP]:
+            scope, name_index = split_prefix[0], 2
+        else:
+            scope, name_index = split_prefix[1], 3
+        if len(split_prefix) <= name_index + 1 or not prefix.startswith(get_dataset_prefix(scope, split_prefix[name_index])):
+            raise ValueError("prefix must start with the dataset prefix.")
+        list_params = {"Bucket": bucket, "Prefix": prefix, "MaxKeys": page_size}
+        if body.get("nextToken"):
+            list_params["ContinuationToken"] = body["nextToken"]
+        s3_response = s3.list_objects_v2(**list_params)
+        keys = [s3_object["Key"] for s3_object in s3_response.get("Contents", [])]
+        if s3_response.get("NextContinuationToken"):
+            response["nextToken"] = s3_response["NextContinuationToken"]
+    else:
+        raise ValueError("Either a prefix or a list of keys is required.")
+
+    # Signing is done locally so there's no need to parallelize this
+    response["urls"] = [
+        {
+            "key": key,
+            "url": s3.generate_presigned_url(
+                ClientMethod="get_object",
+                Params={"Bucket": bucket, "Key": key},
+                ExpiresIn=3600,
+            ),
+        }
+        for key in keys
+    ]
+    return response
+
+
+@api_wrapper
+def create_multipart_upload(event, context):
+    body = json.loads(event["body"])
+    key = body["key"]
+    type_from_key, name_from_key = _validate_dataset_key(event, key)
+    username = event["requestContext"]["authorizer"]["principalId"]
+    env_variables = get_environment_variables()
+
+    # Apply the same metadata and tags as single part uploads, S3 scope is an SMS legacy
+    # tag and actually corresponds to what is referred to as dataset type in MLS
+    metadata = {"user": username, "dataset-name": name_from_key, "dataset-scope": type_from_key}
+    response = s3.create_multipart_upload(
+        Bucket=env_variables[EnvVariable.DATA_BUCKET],
+        Key=key,
+        Metadata=metadata,
+        Tagging=urlencode(metadata),
+    )
+    return {"key": key, "uploadId": response["UploadId"]}
+
+
+@api_wrapper
+def presigned_part_urls(event, context):
+    body = json.loads(event["body"])
+    key = body["key"]
+    _validate_dataset_key(event, key)
+    part_numbers = body["partNumbers"]
+
+    if not part_numbers or len(part_numbers) > MAX_PRESIGNED_PARTS_PER_REQUEST:
+        raise ValueError(f"Between 1 and {MAX_PRESIGNED_PARTS_PER_REQUEST} part numbers must be requested at a time.")
+    for part_number in part_numbers:
+        if not isinstance(part_number, int) or not 1 <= part_number <= MAX_MULTIPART_PARTS:
+            raise ValueError(f"Part numbers must be integers between 1 and {MAX_MULTIPART_PARTS}.")
+
+    env_variables = get_environment_variables()
+    return {
+        "parts": [
+            {
+                "partNumber": part_number,
+                "url": s3.generate_presigned_url(
+                    ClientMethod="upload_part",
+                    Params={
+                        "Bucket": env_variables[EnvVariable.DATA_BUCKET],
+                        "Key": key,
+                        "UploadId": body["uploadId"],
+                        "PartNumber": part_number,
+                    },
+                    ExpiresIn=3600,
+                ),
+            }
+            for part_number in part_numbers
+        ]
+    }
+
+
+@api_wrapper
+def complete_multipart_upload(event, context):
+    body = json.loads(event["body"])
+    key = body["key"]
+    _validate_dataset_key(event, key)
+    env_variables = get_environment_variables()
+    bucket = env_variables[EnvVariable.DATA_BUCKET]
+
+    if body.get("parts"):
+        parts = [{"PartNumber": part["partNumber"], "ETag": part["eTag"]} for part in body["parts"]]
+    else:
+        # Clients resuming an upload may not have every ETag so fall back to what S3 has received
+        parts = []
+        for page in s3.get_paginator("list_parts").paginate(Bucket=bucket, Key=key, UploadId=body["uploadId"]):
+            parts.extend({"PartNumber": part["PartNumber"], "ETag": part["ETag"]} for part in page.get("Parts", []))
+
+    s3.complete_multipart_upload(
+        Bucket=bucket,
+        Key=key,
+        UploadId=body["uploadId"],
+        MultipartUpload={"Parts": sorted(parts, key=lambda part: part["PartNumber"])},
+    )
+    return {"key": key}
+
+
+@api_wrapper
+def abort_multipart_upload(event, context):
+    body = json.loads(event["body"])
+    key = body["key"]
+    _validate_dataset_key(event, key)
+    env_variables = get_environment_variables()
+
+    s3.abort_multipart_upload(Bucket=env_variables[EnvVariable.DATA_BUCKET], Key=key, UploadId=body["uploadId"])
+    return f"Successfully aborted upload of {key}"
+
+
 @api_wrapper
 def create_dataset(event, context):
     try:
@@ -305,6 +511,30 @@ def create_dataset(event, context):
         raise e
 
 
+def _populate_dataset_groups(datasets: List[DatasetModel], full_listing: bool) -> None:
+    group_datasets = [dataset for dataset in datasets if dataset.type == DatasetType.GROUP]
+    if not group_datasets:
+        return
+
+    dataset_groups = defaultdict(list)
+    if full_listing:
+        # Resolve the groups for every group dataset in a single pass over the mapping table
+        for group_dataset in group_dataset_dao.get_all():
+            dataset_groups[group_dataset.dataset].append(group_dataset.group)
+    else:
+        # A single page only needs the mappings for the datasets it contains
+        with ThreadPoolExecutor(max_workers=GROUP_LOOKUP_WORKERS) as executor:
+            for dataset, mappings in zip(
+                group_datasets,
+                executor.map(lambda dataset: group_dataset_dao.get_groups_for_dataset(dataset.name), group_datasets),
+            ):
+                dataset_groups[dataset.name] = [group_dataset.group for group_dataset in mappings]
+
+    for dataset in group_datasets:
+        # Replace the stored list to make sure it's up to date
+        dataset.groups = sorted(dataset_groups[dataset.name])
+
+
 @api_wrapper
 def list_resources(event, context):
     username = event["requestContext"]["authorizer"]["principalId"]
@@ -315,25 +545,34 @@ def list_resources(event, context):
 
     # if this is an admin request, retrieve ALL the datasets
     if is_admin and Permission.ADMIN in user.permissions:
+        query_string_parameters = event.get("queryStringParameters") or {}
+        if "pageSize" in query_string_parameters or "nextToken" in query_string_parameters:
+            page = dataset_dao.get_page(
+                limit=int(query_string_parameters.get("pageSize", 100)),
+                next_token=query_string_parameters.get("nextToken"),
+            )
+            _populate_dataset_groups(page.records, full_listing=False)
+            response = {"records": [dataset.to_dict() for dataset in page.records]}
+            if page.next_token:
+                response["nextToken"] = page.next_token
+            return response
+
         datasets = dataset_dao.get_all()
-        for dataset in datasets:
-            if dataset.type == DatasetType.GROUP:
-                # Clear list to make sure it's up to date
-                dataset.groups = []
-                for group_dataset in group_dataset_dao.get_groups_for_dataset(dataset.name):
-                    dataset.groups.append(group_dataset.group)
+        _populate_dataset_groups(datasets, full_listing=True)
     else:
         # Get global datasets
         datasets = dataset_dao.get_all_for_scope(DatasetType.GLOBAL, DatasetType.GLOBAL)
         # Get the user's private datasets
         datasets.extend(dataset_dao.get_all_for_scope(DatasetType.PRIVATE, username))
         # Get the group datasets for groups this user is a member of
-        group_datasets = set()
-        for group in group_user_dao.get_groups_for_user(username):
-            for group_dataset in group_dataset_dao.get_datasets_for_group(group.group):
-                if group_dataset.dataset not in group_datasets:
-                    group_datasets.add(group_dataset.dataset)
-                    datasets.append(dataset_dao.get(DatasetType.GROUP, group_dataset.dataset))
+        groups = group_user_dao.get_groups_for_user(username)
+        if groups:
+            with ThreadPoolExecutor(max_workers=GROUP_LOOKUP_WORKERS) as executor:
+                group_datasets = executor.map(lambda group: group_dataset_dao.get_datasets_for_group(group.group), groups)
+                dataset_names = [
+                    group_dataset.dataset for datasets_for_group in group_datasets for group_dataset in datasets_for_group
+                ]
+            datasets.extend(dataset_dao.get_many(DatasetType.GROUP, dataset_names))
 
         if event["pathParameters"] and "projectName" in event["pathParameters"]:
             project_name = event["pathParameters"]["projectName"].replace('"', "")
@@ -343,22 +582,311 @@ def list_resources(event, context):
     return [dataset.to_dict() for dataset in datasets]
 
 
+def _recount_dataset_stats(bucket: str, dataset: DatasetModel) -> dict:
+    object_count = 0
+    total_bytes = 0
+    last_modified = None
+    manifest_prefix = f"{dataset.prefix}{MANIFEST_DIRECTORY}"
+    for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=dataset.prefix):
+        for s3_object in page.get("Contents", []):
+            # Generated manifests aren't part of the dataset contents
+            if s3_object["Key"].startswith(manifest_prefix):
+                continue
+            object_count += 1
+            total_bytes += s3_object["Size"]
+            modified = s3_object["LastModified"].timestamp()
+            last_modified = max(last_modified or modified, modified)
+
+    dataset_dao.set_object_stats(dataset.scope, dataset.name, object_count, total_bytes, last_modified)
+    return {
+        "scope": dataset.scope,
+        "name": dataset.name,
+        "objectCount": object_count,
+        "totalBytes": total_bytes,
+        "lastModified": last_modified,
+    }
+
+
+@api_wrapper
+def recount_stats(event, context):
+    """
+    Recomputes the object count and size aggregates for a single dataset, if a scope and
+    datasetName are provided, or for every dataset. The aggregates are normally maintained from
+    S3 event notifications so this is only needed to repair drift.
+    """
+    body = json.loads(event["body"]) if event.get("body") else {}
+    if body.get("scope") and body.get("datasetName"):
+        dataset = dataset_dao.get(body["scope"], body["datasetName"])
+        if not dataset:
+            raise ResourceNotFound(f"Dataset '{body['datasetName']}' does not exist.")
+        datasets = [dataset]
+    else:
+        datasets = dataset_dao.get_all()
+
+    env_variables = get_environment_variables()
+    bucket = env_variables[EnvVariable.DATA_BUCKET]
+    with ThreadPoolExecutor(max_workers=RECOUNT_STATS_WORKERS) as executor:
+        results = list(executor.map(lambda dataset: _recount_dataset_stats(bucket, dataset), datasets))
+
+    return {"datasets": results}
+
+
+@api_wrapper
+def reconcile(event, context):
+    """
+    Creates dataset records for datasets which exist in S3 but not in the dataset table and
+    reports records with no objects. Send the returned nextToken back to continue a large bucket.
+    """
+    event_body = json.loads(event["body"]) if event.get("body") else {}
+    reconciler = DatasetReconciler(s3, get_environment_variables()[EnvVariable.DATA_BUCKET], dataset_dao)
+    return reconciler.reconcile(next_token=event_body.get("nextToken"), dry_run=event_body.get("dryRun", False))
+
+
+def _int_parameter(parameters: dict, name: str) -> Optional[int]:
+    if name not in parameters:
+        return None
+    try:
+        return int(parameters[name])
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer.")
+
+
+def _timestamp_parameter(parameters: dict, name: str) -> Optional[datetime]:
+    if name not in parameters:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(parameters[name]).replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO 8601 timestamp.")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _build_file_filter(dataset_prefix: str, query_string_parameters: dict) -> Callable[[Dict], bool]:
+    suffixes = tuple(suffix for suffix in query_string_parameters.get("suffix", "").split(",") if suffix)
+    pattern = query_string_parameters.get("pattern")
+    min_size = _int_parameter(query_string_parameters, "minSize")
+    max_size = _int_parameter(query_string_parameters, "maxSize")
+    modified_after = _timestamp_parameter(query_string_parameters, "modifiedAfter")
+    modified_before = _timestamp_parameter(query_string_parameters, "modifiedBefore")
+
+    def _matches(s3_object: Dict) -> bool:
+        key = s3_object["Key"]
+        if suffixes and not key.endswith(suffixes):
+            return False
+        # Patterns are matched against the key relative to the dataset root
+        if pattern and not fnmatch.fnmatchcase(key[len(dataset_prefix) :], pattern):
+            return False
+        if min_size is not None and s3_object["Size"] < min_size:
+            return False
+        if max_size is not None and s3_object["Size"] > max_size:
+            return False
+        if modified_after and s3_object["LastModified"] < modified_after:
+            return False
+        if modified_before and s3_object["LastModified"] >= modified_before:
+            return False
+        return True
+
+    return _matches
+
+
+def _list_files_recursive(bucket: str, dataset_prefix: str, computed_prefix: str, query_string_parameters: dict) -> dict:
+    """
+    Lists every object under the prefix regardless of depth, applying any filters server side and
+    filling each page up to the requested size. The nextToken is the last key returned so listing
+    can resume part way through an S3 page. When parallel is set, each top level prefix is listed
+    concurrently and the results are merged in key order.
+    """
+    page_size = _int_parameter(query_string_parameters, "pageSize")
+    if page_size is not None and page_size < 1:
+        raise ValueError("pageSize must be a positive integer.")
+    page_size = min(page_size or MAX_LIST_FILES_PAGE_SIZE, MAX_LIST_FILES_PAGE_SIZE)
+    start_after = query_string_parameters.get("nextToken")
+    if start_after and not start_after.startswith(computed_prefix):
+        raise ValueError("Invalid nextToken for the requested prefix.")
+    matches = _build_file_filter(dataset_prefix, query_string_parameters)
+
+    # Each listing is (matching objects, key up to which the listing is complete or None if exhausted)
+    listings = []
+    top_level = None
+    if str(query_string_parameters.get("parallel", "")).lower() == "true":
+        top_level = s3.list_objects_v2(Bucket=bucket, Prefix=computed_prefix, Delimiter="/")
+        # Fall back to a single listing if the top level of the prefix doesn't fit in one page
+        if top_level.get("IsTruncated") or not top_level.get("CommonPrefixes"):
+            top_level = None
+
+    if top_level:
+        listings.append(
+            (
+                [
+                    s3_object
+                    for s3_object in top_level.get("Contents", [])
+                    if (not start_after or s3_object["Key"] > start_after) and matches(s3_object)
+                ],
+                None,
+            )
+        )
+        with ThreadPoolExecutor(max_workers=LIST_FILES_WORKERS) as executor:
+            futures = [
+                executor.submit(list_matching_objects, s3, bucket, common_prefix["Prefix"], matches, page_size, start_after)
+                for common_prefix in top_level["CommonPrefixes"]
+                # Every key under a prefix sorts before the token if the token is past the prefix itself
+                if not start_after or start_after < common_prefix["Prefix"] or start_after.startswith(common_prefix["Prefix"])
+            ]
+            listings.extend(future.result() for future in futures)
+    else:
+        listings.append(list_matching_objects(s3, bucket, computed_prefix, matches, page_size, start_after))
+
+    # Only objects up to the earliest incomplete listing can be returned without skipping any
+    bounds = [bound for _, bound in listings if bound is not None]
+    cutoff = min(bounds) if bounds else None
+    objects = sorted(
+        (s3_object for listed, _ in listings for s3_object in listed if cutoff is None or s3_object["Key"] <= cutoff),
+        key=lambda s3_object: s3_object["Key"],
+    )
+
+    response = {"pageSize": page_size, "prefix": computed_prefix, "bucket": bucket}
+    if len(objects) > page_size:
+        objects = objects[:page_size]
+        response["nextToken"] = objects[-1]["Key"]
+    elif cutoff is not None:
+        response["nextToken"] = cutoff
+    response["contents"] = [{"key": s3_object["Key"], "size": s3_object["Size"], "type": "object"} for s3_object in objects]
+    return response
+
+
+def _checkpoint_manifest(state: Dict, writer: ManifestWriter, bucket: str, previous_pending_key: Optional[str]) -> Dict:
+    """
+    Stores any entries that haven't been uploaded as a part yet (parts must be at least 5 MiB)
+    alongside the manifest and returns a nextToken to continue from the last listed object.
+    """
+    buffered = writer.buffered()
+    if buffered:
+        state["pendingKey"] = f"{state['key']}.pending-{uuid.uuid4().hex[:8]}"
+        s3.put_object(Bucket=bucket, Key=state["pendingKey"], Body=buffered)
+    state["partNumber"] = writer.part_number
+    if previous_pending_key:
+        s3.delete_object(Bucket=bucket, Key=previous_pending_key)
+    return {"nextToken": encode_pagination_token(state), "objectCount": state["count"]}
+
+
+@api_wrapper
+def create_manifest(event, context):
+    """
+    Writes the (optionally filtered) listing of a dataset to a SageMaker ManifestFile or
+    AugmentedManifestFile within the dataset so it can be used as job input instead of a prefix.
+
+    Large datasets may not finish within a single request. In that case the response contains a
+    nextToken which should be sent back, on its own, to continue generating the same manifest.
+    """
+    dataset_prefix = get_dataset_prefix(event["pathParameters"]["scope"], event["pathParameters"]["datasetName"])
+    bucket = get_environment_variables()[EnvVariable.DATA_BUCKET]
+    manifest_prefix = f"{dataset_prefix}{MANIFEST_DIRECTORY}"
+    body = json.loads(event.get("body") or "{}")
+
+    if body.get("nextToken"):
+        state = decode_pagination_token(body["nextToken"])
+        if not state["key"].startswith(manifest_prefix):
+            raise ValueError("Invalid nextToken for the requested dataset.")
+    else:
+        manifest_format = ManifestFormat(body.get("format", ManifestFormat.MANIFEST))
+        filters = filter_dict_by_keys(body, MANIFEST_FILTER_PARAMETERS)
+        # Validate the filters before starting the upload so a bad request doesn't leave it behind
+        _build_file_filter(dataset_prefix, filters)
+        key = f"{manifest_prefix}{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.manifest"
+        state = {
+            "key": key,
+            "uploadId": s3.create_multipart_upload(Bucket=bucket, Key=key)["UploadId"],
+            "format": manifest_format.value,
+            "attributeName": body.get("attributeName", DEFAULT_ATTRIBUTE_NAME),
+            "filters": filters,
+            "startAfter": None,
+            "partNumber": 1,
+            "count": 0,
+        }
+
+    manifest_format = ManifestFormat(state["format"])
+    matches = _build_file_filter(dataset_prefix, state["filters"])
+    writer = ManifestWriter(s3, bucket, state["key"], state["uploadId"], state["partNumber"])
+    # Entries which didn't fill a part by the end of the previous request were stored separately
+    pending_key = state.pop("pendingKey", None)
+    if pending_key and not pending_key.startswith(f"{state['key']}.pending-"):
+        raise ValueError("Invalid nextToken for the requested dataset.")
+    if pending_key:
+        try:
+            writer.write(s3.get_object(Bucket=bucket, Key=pending_key)["Body"].read().decode("utf-8"))
+        except s3.exceptions.NoSuchKey:
+            raise ValueError("The nextToken has expired, start a new manifest.")
+    elif state["partNumber"] == 1:
+        writer.write(manifest_header(manifest_format, bucket, dataset_prefix))
+
+    deadline = time.monotonic() + MANIFEST_TIME_BUDGET_SECONDS
+    pending_count = 0
+    list_params = {"Bucket": bucket, "Prefix": dataset_prefix}
+    if state["startAfter"]:
+        list_params["StartAfter"] = state["startAfter"]
+    for page in s3.get_paginator("list_objects_v2").paginate(
+        **list_params, PaginationConfig={"PageSize": MANIFEST_LIST_PAGE_SIZE}
+    ):
+        contents = page.get("Contents", [])
+        for s3_object in contents:
+            if s3_object["Key"].startswith(manifest_prefix) or not matches(s3_object):
+                continue
+            pending_count += 1
+            if writer.write(manifest_entry(manifest_format, bucket, dataset_prefix, s3_object["Key"], state["attributeName"])):
+                # Everything up to and including this object is now stored in S3
+                state["count"] += pending_count
+                state["startAfter"] = s3_object["Key"]
+                state["partNumber"] = writer.part_number
+                pending_count = 0
+                if time.monotonic() > deadline:
+                    return _checkpoint_manifest(state, writer, bucket, pending_key)
+        # Sparse filters may list many pages without filling a part so check after every page too
+        if page.get("IsTruncated") and time.monotonic() > deadline:
+            state["count"] += pending_count
+            state["startAfter"] = contents[-1]["Key"]
+            return _checkpoint_manifest(state, writer, bucket, pending_key)
+
+    state["count"] += pending_count
+    if pending_key:
+        s3.delete_object(Bucket=bucket, Key=pending_key)
+    if manifest_format == ManifestFormat.AUGMENTED_MANIFEST and state["count"] == 0:
+        writer.abort()
+        raise ValueError("No objects in the dataset match the requested filters.")
+
+    writer.write(manifest_footer(manifest_format))
+    writer.complete()
+    return {
+        "manifestUri": f"s3://{bucket}/{state['key']}",
+        "format": manifest_format.value,
+        "objectCount": state["count"],
+    }
+
+
 @api_wrapper
 def list_files(event, context):
     env_variables = get_environment_variables()
     query_string_parameters = event.get("queryStringParameters") or {}
 
+    dataset_prefix = get_dataset_prefix(event["pathParameters"]["scope"], event["pathParameters"]["datasetName"])
+    # this joins dataset path with the user supplied prefix
+    # example: "private/aUsername/datasets/aDatasetName/" + "path/to/files/"
+    computed_prefix = "".join([dataset_prefix, query_string_parameters.get("prefix", "")])
+
+    if str(query_string_parameters.get("recursive", "")).lower() == "true":
+        return _list_files_recursive(
+            env_variables[EnvVariable.DATA_BUCKET], dataset_prefix, computed_prefix, query_string_parameters
+        )
+
+    page_size = _int_parameter(query_string_parameters, "pageSize")
+    if page_size is not None and page_size < 1:
+        raise ValueError("pageSize must be a positive integer.")
+
     # map query parameters keys to api parameter names
     query_string_parameters = rename_dict_keys(
         query_string_parameters,
         {"nextToken": "ContinuationToken", "pageSize": "MaxKeys", "prefix": "Prefix", "delimiter": "Delimiter"},
     )
 
-    dataset_prefix = get_dataset_prefix(event["pathParameters"]["scope"], event["pathParameters"]["datasetName"])
-    # this joins dataset path with the user supplied prefix
-    # example: "private/aUsername/datasets/aDatasetName/" + "path/to/files/"
-    computed_prefix = "".join([dataset_prefix, query_string_parameters.get("Prefix", "")])
-
     query_parameters = {
         "Bucket": env_variables[EnvVariable.DATA_BUCKET],
         "Prefix": computed_prefix,
@@ -370,10 +898,8 @@ def list_files(event, context):
     for key in filter_dict_by_keys(query_string_parameters, allowed_query_string_parameters):
         query_parameters[key] = query_string_parameters[key]
 
-    # convert MaxKeys to int if it exists
-    if "MaxKeys" in query_parameters:
-        # make sure MaxKeys is an int
-        query_parameters["MaxKeys"] = int(query_parameters["MaxKeys"])
+    if page_size is not None:
+        query_parameters["MaxKeys"] = page_size
 
     s3_response = s3.list_objects_v2(**query_parameters)
     response = {}
@@ -21,19 +21,24 @@ import random
 import time
 from typing import Any, Dict, Optional
 
-import boto3
-
 from ml_space_lambda.data_access_objects.project import ProjectDAO
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
 from ml_space_lambda.data_access_objects.resource_scheduler import ResourceSchedulerDAO, ResourceSchedulerModel
 from ml_space_lambda.enums import EnvVariable, ResourceType
 from ml_space_lambda.utils.app_config_utils import get_app_config, get_emr_application_list
-from ml_space_lambda.utils.common_functions import api_wrapper, generate_tags, query_resource_metadata, retry_config
+from ml_space_lambda.utils.client_registry import lazy_client
+from ml_space_lambda.utils.common_functions import (
+    api_wrapper,
+    generate_tags,
+    query_resource_metadata,
+    retry_config,
+    submit_with_context,
+)
 from ml_space_lambda.utils.mlspace_config import get_environment_variables, pull_config_from_s3
 
 logger = logging.getLogger(__name__)
 
-emr = boto3.client("emr", config=retry_config)
+emr = lazy_client("emr", config=retry_config)
 
 resource_metadata_dao = ResourceMetadataDAO()
 
@@ -246,10 +251,14 @@ def list_release_labels(event, context):
 @api_wrapper
 def get(event, context):
     cluster_id = event["pathParameters"]["clusterId"]
-    response = emr.describe_cluster(ClusterId=cluster_id)
+    describe_future = submit_with_context(emr.describe_cluster, ClusterId=cluster_id)
+    scheduler_future = submit_with_context(
+        resource_scheduler_dao.get, resource_id=cluster_id, resource_type=ResourceType.EMR_CLUSTER
+    )
+    response = describe_future.result()
 
     # Add termination time metadata to response
-    scheduler_model = resource_scheduler_dao.get(resource_id=cluster_id, resource_type=ResourceType.EMR_CLUSTER)
+    scheduler_model = scheduler_future.result()
     if scheduler_model and scheduler_model.termination_time:
         response["TerminationTime"] = scheduler_model.termination_time
 
@@ -19,24 +19,24 @@ import logging
 import time
 import urllib.parse
 
-import boto3
-
 from ml_space_lambda.data_access_objects.project import ProjectDAO
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
 from ml_space_lambda.data_access_objects.resource_scheduler import ResourceSchedulerDAO, ResourceSchedulerModel
 from ml_space_lambda.enums import EnvVariable, ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import (
     api_wrapper,
     generate_tags,
     get_tags_for_resource,
     query_resource_metadata,
     retry_config,
+    submit_with_context,
 )
 from ml_space_lambda.utils.mlspace_config import get_environment_variables
 
 logger = logging.getLogger(__name__)
 
-sagemaker = boto3.client("sagemaker", config=retry_config)
+sagemaker = lazy_client("sagemaker", config=retry_config)
 
 resource_metadata_dao = ResourceMetadataDAO()
 resource_scheduler_dao = ResourceSchedulerDAO()
@@ -99,17 +99,26 @@ def delete(event, context):
 def describe(event, context):
     endpoint_name = urllib.parse.unquote(event["pathParameters"]["endpointName"])
 
-    response = sagemaker.describe_endpoint(EndpointName=endpoint_name)
-    tags = get_tags_for_resource(sagemaker, response["EndpointArn"])
+    describe_future = submit_with_context(sagemaker.describe_endpoint, EndpointName=endpoint_name)
+    scheduler_future = submit_with_context(
+        resource_scheduler_dao.get, resource_id=endpoint_name, resource_type=ResourceType.ENDPOINT
+    )
+    metadata_future = submit_with_context(resource_metadata_dao.get, endpoint_name, ResourceType.ENDPOINT)
+    response = describe_future.result()
 
     # Add termination time metadata to response
-    scheduler_model = resource_scheduler_dao.get(resource_id=endpoint_name, resource_type=ResourceType.ENDPOINT)
+    scheduler_model = scheduler_future.result()
     if scheduler_model and scheduler_model.termination_time:
         response["TerminationTime"] = scheduler_model.termination_time
-    for tag in tags:
-        if tag["Key"] == "user":
-            response["Owner"] = tag["Value"]
-            break
+
+    metadata = metadata_future.result()
+    if metadata:
+        response["Owner"] = metadata.user
+    else:
+        for tag in get_tags_for_resource(sagemaker, response["EndpointArn"]):
+            if tag["Key"] == "user":
+                response["Owner"] = tag["Value"]
+                break
 
     return response
 
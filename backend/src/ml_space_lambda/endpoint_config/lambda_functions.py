@@ -18,16 +18,15 @@ import json
 import logging
 import urllib.parse
 
-import boto3
-
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
 from ml_space_lambda.enums import EnvVariable, ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import api_wrapper, generate_tags, query_resource_metadata, retry_config
 from ml_space_lambda.utils.mlspace_config import get_environment_variables, pull_config_from_s3
 
 logger = logging.getLogger(__name__)
 
-sagemaker = boto3.client("sagemaker", config=retry_config)
+sagemaker = lazy_client("sagemaker", config=retry_config)
 
 resource_metadata_dao = ResourceMetadataDAO()
 
@@ -27,6 +27,15 @@ class DatasetType(str, Enum):
     GROUP = "group"
 
 
+# Values match the SageMaker S3DataType used to consume the generated manifest
+class ManifestFormat(str, Enum):
+    def __str__(self):
+        return str(self.value)
+
+    MANIFEST = "ManifestFile"
+    AUGMENTED_MANIFEST = "AugmentedManifestFile"
+
+
 # Updating the ResourceType enumeration will likely require an update to the
 # corresponding enum in the FrontEnd code (src/shared/model/resource-metadata-model.ts)
 class ResourceType(str, Enum):
@@ -120,6 +129,12 @@ class EnvVariable(str, Enum):
     JOB_INSTANCE_CONSTRAINT_POLICY_ARN = "JOB_INSTANCE_CONSTRAINT_POLICY_ARN"
     KMS_INSTANCE_CONDITIONS_POLICY_ARN = "KMS_INSTANCE_CONDITIONS_POLICY_ARN"
     IAM_RESOURCE_PREFIX = "IAM_RESOURCE_PREFIX"
+    EVENT_LOG_MODE = "EVENT_LOG_MODE"
+    EVENT_LOG_SAMPLE_RATE = "EVENT_LOG_SAMPLE_RATE"
+    EVENT_LOG_MAX_BODY_LENGTH = "EVENT_LOG_MAX_BODY_LENGTH"
+    EMF_METRICS_ENABLED = "EMF_METRICS_ENABLED"
+    METRICS_NAMESPACE = "METRICS_NAMESPACE"
+    CONFIG_PREFETCH_ENABLED = "CONFIG_PREFETCH_ENABLED"
 
 
 class Permission(str, Enum):
@@ -122,8 +122,7 @@ def group_users(event, context):
 def group_datasets(event, context):
     group_name = event["pathParameters"]["groupName"]
     datasets = group_dataset_dao.get_datasets_for_group(group_name)
-    ret = []
-    [ret.append(dataset_dao.get("group", dataset.dataset)) for dataset in datasets]
+    ret = dataset_dao.get_many("group", [dataset.dataset for dataset in datasets])
     return [dataset.to_dict() for dataset in ret]
 
 
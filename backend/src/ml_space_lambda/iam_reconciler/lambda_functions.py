@@ -0,0 +1,42 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+import logging
+
+from ml_space_lambda.enums import EnvVariable
+from ml_space_lambda.utils.common_functions import api_wrapper
+from ml_space_lambda.utils.iam_reconciler import IAMReconciler
+from ml_space_lambda.utils.mlspace_config import get_environment_variables
+
+logger = logging.getLogger(__name__)
+
+iam_reconciler = IAMReconciler()
+
+
+@api_wrapper
+def reconcile(event, context):
+    event_body = json.loads(event["body"]) if event.get("body") else {}
+    env_variables = get_environment_variables()
+
+    if not env_variables[EnvVariable.MANAGE_IAM_ROLES]:
+        raise ValueError("IAM roles are not managed by MLSpace in this deployment.")
+
+    return iam_reconciler.reconcile(
+        project_name=event_body.get("projectName"),
+        username=event_body.get("username"),
+        dry_run=event_body.get("dryRun", False),
+    )
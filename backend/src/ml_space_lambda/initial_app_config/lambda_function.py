@@ -14,20 +14,19 @@
 
 import logging
 
-import boto3
-
 from ml_space_lambda.app_configuration.policy_helper.notebook import update_instance_constraint_policies
 from ml_space_lambda.data_access_objects.app_configuration import AppConfigurationDAO, SettingsModel
 from ml_space_lambda.enums import EnvVariable, ServiceType
 from ml_space_lambda.metadata.lambda_functions import get_compute_types
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import generate_html_response
 from ml_space_lambda.utils.iam_manager import DYNAMIC_USER_ROLE_TAG, IAMManager
 from ml_space_lambda.utils.mlspace_config import get_environment_variables, retry_config
 
 log = logging.getLogger(__name__)
-ddb = boto3.client("dynamodb", config=retry_config)
+ddb = lazy_client("dynamodb", config=retry_config)
 app_configuration_dao = AppConfigurationDAO()
-iam = boto3.client("iam", config=retry_config)
+iam = lazy_client("iam", config=retry_config)
 
 
 def lambda_handler(event, context):
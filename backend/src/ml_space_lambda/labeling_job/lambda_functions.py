@@ -18,11 +18,10 @@ import json
 import logging
 import os
 
-import boto3
-
 from ml_space_lambda.data_access_objects.project_user import ProjectUserDAO
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
 from ml_space_lambda.enums import EnvVariable, ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import api_wrapper, generate_tags, query_resource_metadata, retry_config
 from ml_space_lambda.utils.groundtruth_utils import (
     LambdaTypes,
@@ -36,7 +35,7 @@ from ml_space_lambda.utils.mlspace_config import get_environment_variables, pull
 
 logger = logging.getLogger(__name__)
 
-sagemaker = boto3.client("sagemaker", config=retry_config)
+sagemaker = lazy_client("sagemaker", config=retry_config)
 resource_metadata_dao = ResourceMetadataDAO()
 project_user_dao = ProjectUserDAO()
 
@@ -15,20 +15,33 @@
 #
 
 
+import heapq
+import json
 import logging
-from typing import Any, Dict
+import re
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
-from ml_space_lambda.utils.common_functions import api_wrapper, retry_config
+from ml_space_lambda.data_access_objects.dataset import DatasetDAO, DatasetModel
+from ml_space_lambda.data_access_objects.pagination_helper import decode_pagination_token, encode_pagination_token
+from ml_space_lambda.data_access_objects.project_user import ProjectUserDAO
+from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
+from ml_space_lambda.data_access_objects.user import UserModel
+from ml_space_lambda.enums import DatasetType, EnvVariable, Permission, ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
+from ml_space_lambda.utils.common_functions import api_wrapper, retry_config, submit_with_context
+from ml_space_lambda.utils.exceptions import ServiceException
 from ml_space_lambda.utils.mlspace_config import get_environment_variables
 
 logger = logging.getLogger(__name__)
 
-cloudwatch = boto3.client("logs", config=retry_config)
-s3 = boto3.client(
+cloudwatch = lazy_client("logs", config=retry_config)
+s3 = lazy_client(
     "s3",
     config=Config(
         retries={
@@ -39,51 +52,433 @@ s3 = boto3.client(
     ),
 )
 env_variables = get_environment_variables()
+dataset_dao = DatasetDAO()
+project_user_dao = ProjectUserDAO()
+resource_metadata_dao = ResourceMetadataDAO()
+
+DEFAULT_LOG_EVENT_LIMIT = 1000
+# FilterLogEvents won't return more than this many events in a single call
+MAX_LOG_EVENT_LIMIT = 10000
+# Stop filling a page before API Gateway times out the request
+LOGS_TIME_BUDGET_SECONDS = 10
+MAX_LOG_STREAM_PREFIXES = 10
+# Lambda responses are capped at 6MB, a single FilterLogEvents page can add up to 1MB on top of this
+LOGS_RESPONSE_BYTE_BUDGET = 4 * 1024 * 1024
+# Approximate serialized size of the event fields other than the message
+LOG_EVENT_OVERHEAD_BYTES = 128
+MERGE_STATE_KEYS = {"nextToken", "startTime", "seenEventIds"}
+# Exports stop reading new pages after this long and hand back a token to continue from
+LOG_EXPORT_TIME_BUDGET_SECONDS = 20
+# S3 requires every part but the last to be at least 5MiB
+LOG_EXPORT_PART_SIZE = 8 * 1024 * 1024
+LOG_EXPORT_JOB_RESOURCE_TYPES = {
+    "TrainingJobs": ResourceType.TRAINING_JOB,
+    "TransformJobs": ResourceType.TRANSFORM_JOB,
+    "LabelingJobs": ResourceType.LABELING_JOB,
+}
+
+# filter_log_events arguments an export (and its exportToken) may carry
+LOG_EXPORT_ARG_TYPES = {
+    "logGroupName": str,
+    "logStreamNamePrefix": str,
+    "startTime": int,
+    "endTime": int,
+    "filterPattern": str,
+}
+
+export_name_regex = re.compile(r"[^\w\-]")
+
+
+def _get_log_source(resource: str, path_params: Dict[str, str], params: Dict[str, Any]) -> Tuple[str, str]:
+    if resource.startswith("/endpoint"):
+        return f"/aws/sagemaker/Endpoints/{path_params['endpointName']}", params.get("variantName", "")
+    elif resource.startswith("/notebook"):
+        return "/aws/sagemaker/NotebookInstances", path_params["notebookName"]
+    elif resource.startswith("/job"):
+        return f"/aws/sagemaker/{path_params['jobType']}", path_params["jobName"]
+    raise ValueError("Unsupported resource.")
 
 
 @api_wrapper
 def get(event, context):
     path_params = event["pathParameters"]
     query_params = event["queryStringParameters"] or {}
-    log_group_name = ""
-    log_stream_name_prefix = ""
+    log_group_name, log_stream_name_prefix = _get_log_source(event["resource"], path_params, query_params)
+
+    try:
+        limit = int(query_params.get("limit", DEFAULT_LOG_EVENT_LIMIT))
+    except ValueError:
+        limit = 0
+    if not 0 < limit <= MAX_LOG_EVENT_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LOG_EVENT_LIMIT}.")
+
+    # Multiple endpoint variants can be requested as a comma separated list
+    log_stream_name_prefixes = list(dict.fromkeys(prefix for prefix in log_stream_name_prefix.split(",") if prefix))
+    if len(log_stream_name_prefixes) > MAX_LOG_STREAM_PREFIXES:
+        raise ValueError(f"Logs can be requested for at most {MAX_LOG_STREAM_PREFIXES} variants at a time.")
+
+    args: Dict[str, Any] = {
+        "logGroupName": log_group_name,
+    }
+    if "startTime" in query_params:
+        args["startTime"] = int(query_params["startTime"])
+    if "endTime" in query_params:
+        args["endTime"] = int(query_params["endTime"])
+    if "filterPattern" in query_params:
+        args["filterPattern"] = query_params["filterPattern"]
+
+    deadline = time.monotonic() + LOGS_TIME_BUDGET_SECONDS
+    try:
+        if len(log_stream_name_prefixes) <= 1:
+            if log_stream_name_prefixes:
+                args["logStreamNamePrefix"] = log_stream_name_prefixes[0]
+            events, next_token = _fill_log_events(args, query_params.get("nextToken"), limit, deadline)
+            return {"events": _sort_log_events(events), "nextToken": next_token}
+
+        return _merge_log_streams(args, log_stream_name_prefixes, query_params.get("nextToken"), limit, deadline)
+    except ClientError as e:
+        # if the log group doesn't exist, we should return an empty list of logs,
+        # otherwise raise the exception
+        if e.response["Error"]["Code"] == "ResourceNotFoundException":
+            return {}
+        else:
+            raise e
+
+
+def _sort_log_events(events: List[dict]) -> List[dict]:
+    # A single FilterLogEvents call spans every matching stream but only roughly in time order
+    return sorted(events, key=lambda log_event: log_event["timestamp"])
+
+
+def _log_event_size(log_event: dict) -> int:
+    return len(log_event.get("message", "")) + len(log_event.get("logStreamName", "")) + LOG_EVENT_OVERHEAD_BYTES
+
+
+def _fill_log_events(
+    args: Dict[str, Any], next_token: Optional[str], limit: int, deadline: float, max_bytes: int = LOGS_RESPONSE_BYTE_BUDGET
+) -> Tuple[List[dict], Optional[str]]:
+    # CloudWatch frequently returns empty or partial pages with a nextToken, so keep reading until
+    # the requested number of events is reached, the results are exhausted, the response is large
+    # enough or we run out of time
+    events: List[dict] = []
+    total_bytes = 0
+    while True:
+        page_args = {**args, "limit": limit - len(events)}
+        if next_token:
+            page_args["nextToken"] = next_token
+        response = cloudwatch.filter_log_events(**page_args)
+        events.extend(response["events"])
+        total_bytes += sum(_log_event_size(log_event) for log_event in response["events"])
+        next_token = response.get("nextToken")
+        if not next_token or len(events) >= limit or total_bytes >= max_bytes or time.monotonic() >= deadline:
+            return events, next_token
+
+
+def _fill_stream_events(
+    args: Dict[str, Any], prefix: str, state: Dict[str, Any], limit: int, deadline: float, max_bytes: int
+) -> Tuple[List[dict], Optional[str]]:
+    stream_args = {**args, "logStreamNamePrefix": prefix}
+    if "startTime" in state:
+        stream_args["startTime"] = state["startTime"]
+    events, next_token = _fill_log_events(stream_args, state.get("nextToken"), limit, deadline, max_bytes)
+    # Events at the resume timestamp may already have been returned by the previous page
+    seen_event_ids = set(state.get("seenEventIds", []))
+    return [log_event for log_event in events if log_event.get("eventId") not in seen_event_ids], next_token
+
+
+def _merge_log_streams(
+    args: Dict[str, Any], log_stream_name_prefixes: List[str], next_token: Optional[str], limit: int, deadline: float
+) -> Dict[str, Any]:
+    """
+    Merges the events of several log stream prefixes into one time ordered page. Each stream is read
+    independently so a page can only include events up to the point every unfinished stream has
+    reached. Streams with events beyond that point (or beyond the response size budget) resume from
+    the timestamp of their first event that wasn't returned.
+    """
+    # The next token tracks the read position of each prefix that still has events
+    stream_states: Dict[str, Dict[str, Any]] = {prefix: {} for prefix in log_stream_name_prefixes}
+    if next_token:
+        try:
+            stream_states = decode_pagination_token(next_token)
+        except Exception:
+            raise ValueError("Invalid nextToken.")
+        if (
+            not isinstance(stream_states, dict)
+            or not set(stream_states).issubset(log_stream_name_prefixes)
+            or not all(isinstance(state, dict) and set(state).issubset(MERGE_STATE_KEYS) for state in stream_states.values())
+        ):
+            raise ValueError("Invalid nextToken for the requested variants.")
+
+    # Split the limit and size budget between the streams
+    stream_limit = max(1, limit // len(stream_states))
+    stream_bytes = LOGS_RESPONSE_BYTE_BUDGET // len(stream_states)
+    futures = {
+        prefix: submit_with_context(_fill_stream_events, args, prefix, state, stream_limit, deadline, stream_bytes)
+        for prefix, state in stream_states.items()
+    }
+
+    stream_events: Dict[str, List[dict]] = {}
+    stream_tokens: Dict[str, Optional[str]] = {}
+    for prefix, future in futures.items():
+        events, stream_token = future.result()
+        stream_events[prefix] = _sort_log_events(events)
+        stream_tokens[prefix] = stream_token
+
+    # Streams that aren't finished may still have events up to the last timestamp they returned
+    unfinished_ends = [
+        stream_events[prefix][-1]["timestamp"] if stream_events[prefix] else None
+        for prefix, stream_token in stream_tokens.items()
+        if stream_token
+    ]
+    merged = heapq.merge(
+        *[[(prefix, log_event) for log_event in events] for prefix, events in stream_events.items()],
+        key=lambda item: item[1]["timestamp"],
+    )
+    emitted: List[Tuple[str, dict]] = []
+    total_bytes = 0
+    if None not in unfinished_ends:
+        cutoff = min(unfinished_ends) if unfinished_ends else None
+        for prefix, log_event in merged:
+            if cutoff is not None and log_event["timestamp"] > cutoff:
+                break
+            total_bytes += _log_event_size(log_event)
+            if total_bytes > LOGS_RESPONSE_BYTE_BUDGET and emitted:
+                break
+            emitted.append((prefix, log_event))
+
+    emitted_counts: Dict[str, int] = {prefix: 0 for prefix in stream_events}
+    for prefix, _ in emitted:
+        emitted_counts[prefix] += 1
+
+    remaining_states = {}
+    for prefix, events in stream_events.items():
+        state = stream_states[prefix]
+        if emitted_counts[prefix] < len(events):
+            # Re-read this stream from its first event that wasn't returned
+            resume_time = events[emitted_counts[prefix]]["timestamp"]
+            seen_event_ids = [
+                log_event["eventId"] for log_event in events[: emitted_counts[prefix]] if log_event["timestamp"] == resume_time
+            ]
+            if state.get("startTime") == resume_time:
+                seen_event_ids = state.get("seenEventIds", []) + seen_event_ids
+            remaining_states[prefix] = {"startTime": resume_time, "seenEventIds": seen_event_ids}
+        elif stream_tokens[prefix]:
+            remaining_states[prefix] = {
+                **{key: value for key, value in state.items() if key != "nextToken"},
+                "nextToken": stream_tokens[prefix],
+            }
+
+    return {
+        "events": [log_event for _, log_event in emitted],
+        "nextToken": encode_pagination_token(remaining_states) if remaining_states else None,
+    }
+
+
+def _get_resource_project(event) -> str:
+    project_name = event["requestContext"]["authorizer"].get("projectName")
+    if project_name:
+        return project_name
 
+    # The authorizer doesn't resolve the project for admins acting on jobs
+    path_params = event["pathParameters"]
     if event["resource"].startswith("/endpoint"):
-        log_group_name = f"/aws/sagemaker/Endpoints/{path_params['endpointName']}"
-        log_stream_name_prefix = query_params.get("variantName", "")
+        resource_metadata = resource_metadata_dao.get(path_params["endpointName"], ResourceType.ENDPOINT)
     elif event["resource"].startswith("/notebook"):
-        log_group_name = "/aws/sagemaker/NotebookInstances"
-        log_stream_name_prefix = path_params["notebookName"]
-    elif event["resource"].startswith("/job"):
-        log_group_name = f"/aws/sagemaker/{path_params['jobType']}"
-        log_stream_name_prefix = path_params["jobName"]
+        resource_metadata = resource_metadata_dao.get(path_params["notebookName"], ResourceType.NOTEBOOK)
+    elif path_params["jobType"] in LOG_EXPORT_JOB_RESOURCE_TYPES:
+        resource_metadata = resource_metadata_dao.get(
+            path_params["jobName"], LOG_EXPORT_JOB_RESOURCE_TYPES[path_params["jobType"]]
+        )
     else:
-        raise ValueError("Unsupported resource.")
+        resource_metadata = None
+
+    if not resource_metadata:
+        raise ValueError("Unable to determine the project associated with the requested resource.")
+    return resource_metadata.project
+
+
+def _get_export_dataset(project_name: str, dataset_name: str, user: UserModel) -> DatasetModel:
+    """
+    Returns the project dataset logs are exported to, creating it if it doesn't exist. Exports can
+    only be written to a dataset the user created unless they own the project or are an admin.
+    """
+    is_admin = Permission.ADMIN in user.permissions
+    project_user = project_user_dao.get(project_name, user.username)
+    if not project_user and not is_admin:
+        raise ServiceException(f"User is not a member of project {project_name}.", 403)
+
+    dataset = dataset_dao.get(project_name, dataset_name)
+    if dataset:
+        if dataset.type != DatasetType.PROJECT:
+            raise ValueError(f"Dataset {dataset_name} is not a project dataset.")
+        if dataset.created_by != user.username and not is_admin and Permission.PROJECT_OWNER not in project_user.permissions:
+            raise ServiceException(f"User does not have permission to write to dataset {dataset_name}.", 403)
+        return dataset
+
+    dataset = DatasetModel(
+        scope=project_name,
+        type=DatasetType.PROJECT,
+        name=dataset_name,
+        description="Exported CloudWatch logs",
+        location=f"s3://{env_variables[EnvVariable.DATA_BUCKET]}/project/{project_name}/datasets/{dataset_name}/",
+        created_by=user.username,
+    )
+    dataset_dao.create(dataset)
+    return dataset
+
+
+def _validate_export_names(dataset_name: Any, export_name: Any) -> None:
+    if not isinstance(dataset_name, str) or not dataset_name or export_name_regex.search(dataset_name):
+        raise ValueError("datasetName may only contain alphanumeric characters, hyphens and underscores.")
+    if not isinstance(export_name, str) or not export_name or export_name_regex.search(export_name):
+        raise ValueError("exportName may only contain alphanumeric characters, hyphens and underscores.")
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
 
+
+def _parse_export_token(export_token: str, log_group_name: str, log_stream_name_prefix: str) -> Dict[str, Any]:
     try:
-        args: Dict[str, Any] = {
-            "logGroupName": log_group_name,
-        }
+        export_state = decode_pagination_token(export_token)
+    except Exception:
+        raise ValueError("Invalid exportToken.")
 
-        if log_stream_name_prefix:
-            args["logStreamNamePrefix"] = log_stream_name_prefix
-        if "startTime" in query_params:
-            args["startTime"] = int(query_params["startTime"])
+    if (
+        not isinstance(export_state, dict)
+        or set(export_state) != {"args", "datasetName", "exportName", "part", "eventCount", "nextToken"}
+        or not isinstance(export_state["args"], dict)
+        or not _is_int(export_state["part"])
+        or not _is_int(export_state["eventCount"])
+        or export_state["part"] < 0
+        or not isinstance(export_state["nextToken"], str)
+    ):
+        raise ValueError("Invalid exportToken.")
+    # The args are passed straight to filter_log_events so only accept the ones an export sets
+    args = export_state["args"]
+    if not all(
+        key in LOG_EXPORT_ARG_TYPES
+        and isinstance(value, LOG_EXPORT_ARG_TYPES[key])
+        and (LOG_EXPORT_ARG_TYPES[key] is not int or _is_int(value))
+        for key, value in args.items()
+    ):
+        raise ValueError("Invalid exportToken.")
+    _validate_export_names(export_state["datasetName"], export_state["exportName"])
+    # The token carries the original request so make sure it still refers to the same logs
+    if args.get("logGroupName") != log_group_name or args.get("logStreamNamePrefix", "") != log_stream_name_prefix:
+        raise ValueError("exportToken does not match the requested resource.")
+    return export_state
+
+
+def _export_log_events(
+    args: Dict[str, Any], next_token: Optional[str], key: str, deadline: float
+) -> Tuple[int, Optional[str]]:
+    # Stream pages of log events into a single gzip compressed JSON Lines object using a multipart
+    # upload so the export never has to hold more than one part in memory
+    bucket = env_variables[EnvVariable.DATA_BUCKET]
+    upload_id = s3.create_multipart_upload(Bucket=bucket, Key=key, ContentType="application/gzip")["UploadId"]
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    buffer = bytearray()
+    parts: List[Dict[str, Any]] = []
+    event_count = 0
+
+    def _upload_part():
+        response = s3.upload_part(Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=len(parts) + 1, Body=bytes(buffer))
+        parts.append({"PartNumber": len(parts) + 1, "ETag": response["ETag"]})
+        buffer.clear()
+
+    try:
+        while True:
+            page_args = {**args, "limit": MAX_LOG_EVENT_LIMIT}
+            if next_token:
+                page_args["nextToken"] = next_token
+            response = cloudwatch.filter_log_events(**page_args)
+            for log_event in _sort_log_events(response["events"]):
+                buffer.extend(compressor.compress(json.dumps(log_event).encode() + b"\n"))
+            event_count += len(response["events"])
+            if len(buffer) >= LOG_EXPORT_PART_SIZE:
+                _upload_part()
+            next_token = response.get("nextToken")
+            if not next_token or time.monotonic() >= deadline:
+                break
 
-        if "endTime" in query_params:
-            args["endTime"] = int(query_params["endTime"])
+        if not event_count:
+            s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+            return event_count, next_token
 
-        if "nextToken" in query_params:
-            args["nextToken"] = query_params["nextToken"]
+        buffer.extend(compressor.flush())
+        _upload_part()
+        s3.complete_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts})
+    except Exception:
+        s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
 
-        response = cloudwatch.filter_log_events(**args)
+    return event_count, next_token
 
-        return {"events": response["events"], "nextToken": response.get("nextToken")}
 
+@api_wrapper
+def export(event, context):
+    path_params = event["pathParameters"]
+    body = json.loads(event["body"] or "{}")
+    log_group_name, log_stream_name_prefix = _get_log_source(event["resource"], path_params, body)
+    if "," in log_stream_name_prefix:
+        raise ValueError("Logs can be exported for a single variant at a time.")
+
+    if body.get("exportToken"):
+        export_state = _parse_export_token(body["exportToken"], log_group_name, log_stream_name_prefix)
+    else:
+        dataset_name = body.get("datasetName")
+        resource_name = log_stream_name_prefix or path_params["endpointName"]
+        export_name = body.get("exportName", f"{resource_name}-{datetime.now(tz=timezone.utc).strftime('%Y%m%d%H%M%S')}")
+        _validate_export_names(dataset_name, export_name)
+
+        args: Dict[str, Any] = {"logGroupName": log_group_name}
+        if log_stream_name_prefix:
+            args["logStreamNamePrefix"] = log_stream_name_prefix
+        for param in ("startTime", "endTime"):
+            if param in body:
+                args[param] = int(body[param])
+        if "filterPattern" in body:
+            args["filterPattern"] = body["filterPattern"]
+        export_state = {
+            "args": args,
+            "datasetName": dataset_name,
+            "exportName": export_name,
+            "part": 0,
+            "eventCount": 0,
+            "nextToken": None,
+        }
+
+    dataset = _get_export_dataset(
+        _get_resource_project(event),
+        export_state["datasetName"],
+        UserModel.from_dict(json.loads(event["requestContext"]["authorizer"]["user"])),
+    )
+    export_prefix = f"{dataset.prefix}{export_state['exportName']}/"
+    # Every invocation writes its own object so resuming never needs to carry partial parts over
+    key = f"{export_prefix}part-{export_state['part']:05d}.jsonl.gz"
+
+    try:
+        event_count, next_token = _export_log_events(
+            export_state["args"],
+            export_state["nextToken"],
+            key,
+            time.monotonic() + LOG_EXPORT_TIME_BUDGET_SECONDS,
+        )
     except ClientError as e:
-        # if the log group doesn't exist, we should return an empty list of logs,
-        # otherwise raise the exception
-        if e.response["Error"]["Code"] == "ResourceNotFoundException":
-            return {}
-        else:
+        if e.response["Error"]["Code"] != "ResourceNotFoundException":
             raise e
+        event_count, next_token = 0, None
+
+    export_state["eventCount"] += event_count
+    if event_count:
+        export_state["part"] += 1
+    export_state["nextToken"] = next_token
+
+    return {
+        "status": "InProgress" if next_token else "Completed",
+        "location": f"s3://{env_variables[EnvVariable.DATA_BUCKET]}/{export_prefix}",
+        "key": key if event_count else None,
+        "eventCount": export_state["eventCount"],
+        "exportToken": encode_pagination_token(export_state) if next_token else None,
+    }
@@ -17,23 +17,24 @@
 import logging
 import sys
 
-import boto3
-
-from ml_space_lambda.utils.common_functions import api_wrapper, retry_config
+from ml_space_lambda.utils.client_registry import lazy_client
+from ml_space_lambda.utils.common_functions import api_wrapper, event_wrapper, retry_config
+from ml_space_lambda.utils.metadata_cache import get_cached_metadata, write_cached_metadata
 from ml_space_lambda.utils.mlspace_config import pull_config_from_s3
 
 logger = logging.getLogger(__name__)
-sagemaker = boto3.client("sagemaker", config=retry_config)
+sagemaker = lazy_client("sagemaker", config=retry_config)
 
 
 this = sys.modules[__name__]
 
-this.ec2_client = boto3.client("ec2", config=retry_config)
-this.sagemaker_client = boto3.client("sagemaker", config=retry_config)
-this.translate_client = boto3.client("translate", config=retry_config)
-this.cached_response_compute_types = None
-this.cached_response_translate_languages = None
-this.cached_response_subnets = None
+this.ec2_client = lazy_client("ec2", config=retry_config)
+this.sagemaker_client = lazy_client("sagemaker", config=retry_config)
+this.translate_client = lazy_client("translate", config=retry_config)
+
+COMPUTE_TYPES_CACHE_NAME = "compute-types"
+TRANSLATE_LANGUAGES_CACHE_NAME = "translate-languages"
+SUBNETS_CACHE_NAME = "subnets"
 
 # List of ec2 instance types to just disallow across all of MLSpace
 this.ec2_instance_type_deny = []  # e.g. ["t2.xlarge"]
@@ -62,34 +63,31 @@ def compute_types(event, context):
 
 
 def get_compute_types():
-    response = {"InstanceTypes": {}, "AcceleratorTypes": {}}
+    return get_cached_metadata(COMPUTE_TYPES_CACHE_NAME, _describe_compute_types)
 
-    if this.cached_response_compute_types:
-        response = this.cached_response_compute_types
-    else:
-        paginator = this.ec2_client.get_paginator("describe_instance_type_offerings")
-        response_iterator = paginator.paginate()
-        ec2_instances = []
-        for page in response_iterator:
-            for offering in page["InstanceTypeOfferings"]:
-                if offering["InstanceType"] not in this.ec2_instance_type_deny:
-                    ec2_instances.append(offering["InstanceType"])
-
-        for sagemaker_shape in this.sagemaker_shapes:
-            all_instance_types = this.sagemaker_client._service_model.shape_for(sagemaker_shape).enum
-            deny_by_shape = this.sagemaker_instance_type_deny.get(sagemaker_shape, [])
-            intersection = [it for it in all_instance_types if it not in deny_by_shape and it[3:] in ec2_instances]
-            response["InstanceTypes"][sagemaker_shape] = intersection
-
-        for sagemaker_shape in this.sagemaker_eia_shapes:
-            all_instance_types = this.sagemaker_client._service_model.shape_for(sagemaker_shape).enum
-            deny_by_shape = this.sagemaker_instance_type_deny.get(sagemaker_shape, [])
-            # Note there is no EC2 or other api to filter eia on.
-            intersection = [it for it in all_instance_types if it not in deny_by_shape]
-            response["AcceleratorTypes"][sagemaker_shape] = intersection
-
-        # Done with all shapes so we'll set the cache now!
-        this.cached_response_compute_types = response
+
+def _describe_compute_types():
+    response = {"InstanceTypes": {}, "AcceleratorTypes": {}}
+    paginator = this.ec2_client.get_paginator("describe_instance_type_offerings")
+    response_iterator = paginator.paginate()
+    ec2_instances = []
+    for page in response_iterator:
+        for offering in page["InstanceTypeOfferings"]:
+            if offering["InstanceType"] not in this.ec2_instance_type_deny:
+                ec2_instances.append(offering["InstanceType"])
+
+    for sagemaker_shape in this.sagemaker_shapes:
+        all_instance_types = this.sagemaker_client.meta.service_model.shape_for(sagemaker_shape).enum
+        deny_by_shape = this.sagemaker_instance_type_deny.get(sagemaker_shape, [])
+        intersection = [it for it in all_instance_types if it not in deny_by_shape and it[3:] in ec2_instances]
+        response["InstanceTypes"][sagemaker_shape] = intersection
+
+    for sagemaker_shape in this.sagemaker_eia_shapes:
+        all_instance_types = this.sagemaker_client.meta.service_model.shape_for(sagemaker_shape).enum
+        deny_by_shape = this.sagemaker_instance_type_deny.get(sagemaker_shape, [])
+        # Note there is no EC2 or other api to filter eia on.
+        intersection = [it for it in all_instance_types if it not in deny_by_shape]
+        response["AcceleratorTypes"][sagemaker_shape] = intersection
 
     return response
 
@@ -110,30 +108,38 @@ def notebook_options(event, context):
 
 @api_wrapper
 def list_languages(event, context):
-    language_list = []
+    return get_cached_metadata(TRANSLATE_LANGUAGES_CACHE_NAME, _describe_translate_languages)
 
-    if this.cached_response_translate_languages:
-        language_list = this.cached_response_translate_languages
-    else:
-        response = this.translate_client.list_languages(DisplayLanguageCode="en", MaxResults=500)
-        language_list = response["Languages"]
-        this.cached_response_translate_languages = language_list
 
-    return language_list
+def _describe_translate_languages():
+    response = this.translate_client.list_languages(DisplayLanguageCode="en", MaxResults=500)
+    return response["Languages"]
 
 
 @api_wrapper
 def list_subnets(event, context):
-    subnets = []
+    return get_cached_metadata(SUBNETS_CACHE_NAME, _describe_subnets)
 
-    if this.cached_response_subnets:
-        subnets = this.cached_response_subnets
-    else:
-        param_file = pull_config_from_s3()
-        response = this.ec2_client.describe_subnets(SubnetIds=param_file["pSMSSubnetIds"].split(","))
-        if "Subnets" in response:
-            for subnet in response["Subnets"]:
-                subnets.append({"subnetId": subnet["SubnetId"], "availabilityZone": subnet["AvailabilityZone"]})
-        this.cached_response_subnets = subnets
 
+def _describe_subnets():
+    subnets = []
+    param_file = pull_config_from_s3()
+    response = this.ec2_client.describe_subnets(SubnetIds=param_file["pSMSSubnetIds"].split(","))
+    if "Subnets" in response:
+        for subnet in response["Subnets"]:
+            subnets.append({"subnetId": subnet["SubnetId"], "availabilityZone": subnet["AvailabilityZone"]})
     return subnets
+
+
+@event_wrapper
+def refresh_cache(event, context):
+    # Scheduled so handlers always find a current entry in the shared cache
+    for name, loader in [
+        (COMPUTE_TYPES_CACHE_NAME, _describe_compute_types),
+        (TRANSLATE_LANGUAGES_CACHE_NAME, _describe_translate_languages),
+        (SUBNETS_CACHE_NAME, _describe_subnets),
+    ]:
+        try:
+            write_cached_metadata(name, loader())
+        except Exception as e:
+            logger.exception(f"Failed to refresh cached metadata '{name}': {e}")
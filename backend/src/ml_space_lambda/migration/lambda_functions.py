@@ -17,17 +17,16 @@
 import json
 import logging
 
-import boto3
-
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
 from ml_space_lambda.enums import EnvVariable, ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import api_wrapper, get_tags_for_resource
 from ml_space_lambda.utils.mlspace_config import get_environment_variables, retry_config
 
 logger = logging.getLogger(__name__)
 
-sagemaker = boto3.client("sagemaker", config=retry_config)
-emr = boto3.client("emr", config=retry_config)
+sagemaker = lazy_client("sagemaker", config=retry_config)
+emr = lazy_client("emr", config=retry_config)
 resource_metadata_dao = ResourceMetadataDAO()
 
 
@@ -18,17 +18,17 @@ import json
 import logging
 import random
 
-import boto3
-
 from ml_space_lambda.data_access_objects.project_user import ProjectUserDAO
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
 from ml_space_lambda.enums import EnvVariable, ResourceType
+from ml_space_lambda.utils.client_registry import get_session, lazy_client
 from ml_space_lambda.utils.common_functions import (
     api_wrapper,
     generate_tags,
     get_tags_for_resource,
     query_resource_metadata,
     retry_config,
+    submit_with_context,
 )
 
 # The sagemaker SDK isn't directly compatible with Lambda
@@ -40,8 +40,7 @@ from ml_space_lambda.utils.mlspace_config import get_environment_variables, pull
 
 logger = logging.getLogger(__name__)
 
-sagemaker = boto3.client("sagemaker", config=retry_config)
-region = boto3.Session().region_name
+sagemaker = lazy_client("sagemaker", config=retry_config)
 project_user_dao = ProjectUserDAO()
 resource_metadata_dao = ResourceMetadataDAO()
 
@@ -123,14 +122,20 @@ def delete(event, context):
 @api_wrapper
 def describe(event, context):
     model_name = event["pathParameters"]["modelName"]
-    response = sagemaker.describe_model(ModelName=model_name)
+    describe_future = submit_with_context(sagemaker.describe_model, ModelName=model_name)
+    metadata_future = submit_with_context(resource_metadata_dao.get, model_name, ResourceType.MODEL)
+    response = describe_future.result()
     # Remove response metadata. Not needed by the front end UI.
     response.pop("ResponseMetadata", None)
-    tags = get_tags_for_resource(sagemaker, response["ModelArn"])
-    for tag in tags:
-        if tag["Key"] == "user":
-            response["Owner"] = tag["Value"]
-            break
+
+    metadata = metadata_future.result()
+    if metadata:
+        response["Owner"] = metadata.user
+    else:
+        for tag in get_tags_for_resource(sagemaker, response["ModelArn"]):
+            if tag["Key"] == "user":
+                response["Owner"] = tag["Value"]
+                break
 
     return response
 
@@ -159,6 +164,7 @@ def list_images(event, context):
     image_scope = None
     if "queryStringParameters" in event and event["queryStringParameters"] and "imageScope" in event["queryStringParameters"]:
         image_scope = event["queryStringParameters"]["imageScope"]
+    region = get_session().region_name
     for framework in frameworks:
         img_uri = retrieve(framework, region, version="latest", image_scope=image_scope)
         img_uris[framework] = img_uri
@@ -21,29 +21,31 @@ import random
 import re
 import urllib.parse
 
-import boto3
 from botocore.exceptions import ClientError
 
+from ml_space_lambda.data_access_objects.dynamo_data_store import MAX_FILTER_EXPRESSION_OPERANDS
 from ml_space_lambda.data_access_objects.project import ProjectDAO
 from ml_space_lambda.data_access_objects.project_user import ProjectUserDAO
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
 from ml_space_lambda.data_access_objects.resource_scheduler import ResourceSchedulerDAO, ResourceSchedulerModel
 from ml_space_lambda.data_access_objects.user import UserModel
 from ml_space_lambda.enums import EnvVariable, Permission, ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import (
     api_wrapper,
     generate_tags,
     get_notebook_stop_time,
     get_tags_for_resource,
     retry_config,
+    submit_with_context,
 )
 from ml_space_lambda.utils.mlspace_config import get_environment_variables, pull_config_from_s3
 
 logger = logging.getLogger(__name__)
 
-emr = boto3.client("emr", config=retry_config)
-sagemaker = boto3.client("sagemaker", config=retry_config)
-ec2 = boto3.client("ec2", config=retry_config)
+emr = lazy_client("emr", config=retry_config)
+sagemaker = lazy_client("sagemaker", config=retry_config)
+ec2 = lazy_client("ec2", config=retry_config)
 project_user_dao = ProjectUserDAO()
 project_dao = ProjectDAO()
 resource_scheduler_dao = ResourceSchedulerDAO()
@@ -157,19 +159,29 @@ def delete(event, context):
 @api_wrapper
 def describe(event, context):
     notebook_name = urllib.parse.unquote(event["pathParameters"]["notebookName"])
-    response = sagemaker.describe_notebook_instance(NotebookInstanceName=notebook_name)
-    tags = get_tags_for_resource(sagemaker, response["NotebookInstanceArn"])
+    describe_future = submit_with_context(sagemaker.describe_notebook_instance, NotebookInstanceName=notebook_name)
+    scheduler_future = submit_with_context(
+        resource_scheduler_dao.get, resource_id=notebook_name, resource_type=ResourceType.NOTEBOOK
+    )
+    metadata_future = submit_with_context(resource_metadata_dao.get, notebook_name, ResourceType.NOTEBOOK)
+    response = describe_future.result()
 
     # Add termination time metadata to response
-    scheduler_model = resource_scheduler_dao.get(resource_id=notebook_name, resource_type=ResourceType.NOTEBOOK)
+    scheduler_model = scheduler_future.result()
     if scheduler_model and scheduler_model.termination_time:
         response["NotebookDailyStopTime"] = scheduler_model.termination_time
 
-    for tag in tags:
-        if tag["Key"] == "user":
-            response["Owner"] = tag["Value"]
-        if tag["Key"] == "project":
-            response["Project"] = tag["Value"]
+    # Owner and project never change after creation so the metadata record is authoritative when present
+    metadata = metadata_future.result()
+    if metadata:
+        response["Owner"] = metadata.user
+        response["Project"] = metadata.project
+    else:
+        for tag in get_tags_for_resource(sagemaker, response["NotebookInstanceArn"]):
+            if tag["Key"] == "user":
+                response["Owner"] = tag["Value"]
+            if tag["Key"] == "project":
+                response["Project"] = tag["Value"]
 
     return response
 
@@ -237,34 +249,55 @@ def list_resources(event, context):
     response = {"records": []}
     if event["pathParameters"] and "projectName" in event["pathParameters"]:
         project_name = event["pathParameters"]["projectName"]
-        notebooks_metadata = resource_metadata_dao.get_all_for_project_by_type(
-            project_name, ResourceType.NOTEBOOK, limit=limit, next_token=next_token
-        )
-        if notebooks_metadata.next_token:
-            response["nextToken"] = notebooks_metadata.next_token
-        # Filter out notebooks that aren't owned by the requesting user unless they are
-        # an admin or project owner
         project_user = project_user_dao.get(project_name, user.username)
 
+        # Users who aren't an admin or project owner can only see their own notebooks
         if (
             Permission.ADMIN not in user.permissions
             and project_user
             and Permission.PROJECT_OWNER not in project_user.permissions
         ):
-            response["records"] = [record.to_dict() for record in notebooks_metadata.records if record.user == user.username]
+            notebooks_metadata = resource_metadata_dao.get_all_for_user_by_type(
+                user.username,
+                ResourceType.NOTEBOOK,
+                limit=limit,
+                next_token=next_token,
+                filter_expression="#p = :project",
+                filter_values={":project": project_name},
+                expression_names={"#p": "project"},
+                fill_page=True,
+            )
         else:
-            response["records"] = [record.to_dict() for record in notebooks_metadata.records]
-    else:
-        notebooks_metadata = resource_metadata_dao.get_all_for_user_by_type(
-            user.username, ResourceType.NOTEBOOK, limit=limit, next_token=next_token
-        )
+            notebooks_metadata = resource_metadata_dao.get_all_for_project_by_type(
+                project_name, ResourceType.NOTEBOOK, limit=limit, next_token=next_token
+            )
         if notebooks_metadata.next_token:
             response["nextToken"] = notebooks_metadata.next_token
-
+        response["records"] = [record.to_dict() for record in notebooks_metadata.records]
+    else:
         projects = project_user_dao.get_projects_for_user(user.username)
         project_names = [project_user.project for project_user in projects]
+        # A user without any projects can't have any visible notebooks
+        if not project_names:
+            return response
+
         # Need to filter out any notebook records that are associated with a project the user
         # no longer belongs to (even if the user was the creator/owner)
+        filter_kwargs = {}
+        if len(project_names) <= MAX_FILTER_EXPRESSION_OPERANDS:
+            filter_values = {f":p{i}": project for i, project in enumerate(project_names)}
+            filter_kwargs = {
+                "filter_expression": f"#p IN ({', '.join(filter_values.keys())})",
+                "filter_values": filter_values,
+                "expression_names": {"#p": "project"},
+                "fill_page": True,
+            }
+        notebooks_metadata = resource_metadata_dao.get_all_for_user_by_type(
+            user.username, ResourceType.NOTEBOOK, limit=limit, next_token=next_token, **filter_kwargs
+        )
+        if notebooks_metadata.next_token:
+            response["nextToken"] = notebooks_metadata.next_token
+
         response["records"] = [record.to_dict() for record in notebooks_metadata.records if record.project in project_names]
 
     return response
@@ -17,11 +17,11 @@
 import json
 import logging
 import re
+import time
 import urllib
 from collections import Counter
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-import boto3
 from cachetools.func import ttl_cache
 
 from ml_space_lambda.data_access_objects.dataset import DatasetDAO
@@ -31,12 +31,15 @@ from ml_space_lambda.data_access_objects.project import ProjectDAO, ProjectModel
 from ml_space_lambda.data_access_objects.project_group import ProjectGroupDAO, ProjectGroupModel
 from ml_space_lambda.data_access_objects.project_user import ProjectUserDAO, ProjectUserModel
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
+from ml_space_lambda.data_access_objects.resource_scheduler import ResourceSchedulerDAO
 from ml_space_lambda.data_access_objects.user import UserDAO, UserModel
 from ml_space_lambda.enums import DatasetType, EnvVariable, Permission, ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import (
     api_wrapper,
     retry_config,
     serialize_permissions,
+    submit_with_context,
     total_project_owners,
     validate_input,
 )
@@ -44,9 +47,12 @@ from ml_space_lambda.utils.exceptions import ResourceNotFound
 from ml_space_lambda.utils.iam_manager import IAMManager
 from ml_space_lambda.utils.mlspace_config import get_environment_variables
 from ml_space_lambda.utils.project_utils import is_member_of_project, is_owner_of_project
+from ml_space_lambda.utils.resource_utils import ResourceAction, resource_actions
+from ml_space_lambda.utils.s3_utils import delete_prefix_or_raise
 from ml_space_lambda.utils.user_utils import ensure_users_exist
 
 resource_metadata_dao = ResourceMetadataDAO()
+resource_scheduler_dao = ResourceSchedulerDAO()
 project_dao = ProjectDAO()
 project_user_dao = ProjectUserDAO()
 project_group_dao = ProjectGroupDAO()
@@ -58,15 +64,22 @@ group_user_dao = GroupUserDAO()
 
 logger = logging.getLogger(__name__)
 
-sagemaker = boto3.client("sagemaker", config=retry_config)
-emr = boto3.client("emr", config=retry_config)
-s3 = boto3.client("s3", config=retry_config)
-translate = boto3.client("translate", config=retry_config)
+sagemaker = lazy_client("sagemaker", config=retry_config)
+emr = lazy_client("emr", config=retry_config)
+s3 = lazy_client("s3", config=retry_config)
+translate = lazy_client("translate", config=retry_config)
 
 project_name_regex = re.compile(r"[^a-zA-Z0-9]")
 project_desc_regex = re.compile(r"[^ -~]")
 project_deny_list = ["global", "project", "private", "global-read-only", "logs", "create"]
 
+MAX_BULK_RESOURCE_ACTIONS = 100
+# Stop deleting dataset files after this many seconds so the response is returned within the API
+# Gateway timeout, the delete request is repeated until every file is gone
+DELETE_TIME_BUDGET_SECONDS = 20
+# Resource types with scheduler entries that should be removed once the resource is deleted
+SCHEDULED_RESOURCE_TYPES = [ResourceType.NOTEBOOK, ResourceType.ENDPOINT]
+
 
 def _add_project_user(project_name: str, username: str, permissions: Optional[List[Permission]] = None):
     env_variables = get_environment_variables()
@@ -464,6 +477,21 @@ def delete(event, context):
     if not existing_project.suspended:
         raise ValueError("Specified project is not suspended. Please suspend the project and try again.")
 
+    # Delete Datasets first since large projects can take several requests. Each dataset record is
+    # only removed once all of its files are gone so repeating the request resumes where it left off.
+    project_datasets = dataset_dao.get_all_for_scope(DatasetType.PROJECT, project_name)
+
+    env_variables = get_environment_variables()
+    deadline = time.monotonic() + DELETE_TIME_BUDGET_SECONDS
+    deleted_files = 0
+    for dataset in project_datasets:
+        report = delete_prefix_or_raise(s3, env_variables[EnvVariable.DATA_BUCKET], dataset.prefix, deadline=deadline)
+        deleted_files += report["deleted"]
+        if not report["complete"]:
+            return {"status": "InProgress", "deleted": deleted_files}
+
+        dataset_dao.delete(dataset.scope, dataset.name)
+
     # When deleting sagemaker resources we don't page responses because we need to delete everthing
     # Delete Models
     models = resource_metadata_dao.get_all_for_project_by_type(project_name, ResourceType.MODEL, fetch_all=True)
@@ -482,23 +510,6 @@ def delete(event, context):
     for endpoint_config in endpoint_configs.records:
         sagemaker.delete_endpoint_config(EndpointConfigName=endpoint_config.id)
 
-    # Delete Datesets
-    project_datasets = dataset_dao.get_all_for_scope(DatasetType.PROJECT, project_name)
-
-    env_variables = get_environment_variables()
-
-    for dataset in project_datasets:
-        # Get the files to be deleted
-        dataset_files = s3.list_objects_v2(Bucket=env_variables[EnvVariable.DATA_BUCKET], Prefix=dataset.prefix)
-
-        if "Contents" in dataset_files:
-            for file in dataset_files["Contents"]:
-                # Delete the s3 item
-                s3.delete_object(Bucket=env_variables[EnvVariable.DATA_BUCKET], Key=file["Key"])
-
-        # Delete the dataset
-        dataset_dao.delete(dataset.scope, dataset.name)
-
     # Delete Notebooks
     notebook_resources = resource_metadata_dao.get_all_for_project_by_type(project_name, ResourceType.NOTEBOOK, fetch_all=True)
     has_pending = False
@@ -590,3 +601,77 @@ def update_project_group(event, context):
         project_group_dao.update(project_name, group_name, project_group)
 
     return "Successfuly updated project group record."
+
+
+def _parse_bulk_resource_actions(event_body: dict) -> List[Tuple[ResourceType, str, ResourceAction]]:
+    items = event_body.get("items")
+    if not isinstance(items, list) or not 0 < len(items) <= MAX_BULK_RESOURCE_ACTIONS:
+        raise ValueError(f"Between 1 and {MAX_BULK_RESOURCE_ACTIONS} items must be provided.")
+
+    parsed_items = []
+    for item in items:
+        try:
+            resource_type = ResourceType(item["type"])
+            action = ResourceAction(item["action"])
+            resource_id = item["id"]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Each item must include a valid type, id and action.")
+        if not isinstance(resource_id, str) or not resource_id:
+            raise ValueError("Each item must include a valid type, id and action.")
+        if action not in resource_actions.get(resource_type, {}):
+            raise ValueError(f"The {action} action is not supported for {resource_type} resources.")
+        parsed_items.append((resource_type, resource_id, action))
+
+    return parsed_items
+
+
+@api_wrapper
+def bulk_resource_actions(event, context):
+    project_name = event["pathParameters"]["projectName"]
+    user = UserModel.from_dict(json.loads(event["requestContext"]["authorizer"]["user"]))
+    event_body = json.loads(event["body"])
+    items = _parse_bulk_resource_actions(event_body)
+
+    # Authorize every item in a single pass. Admins and project owners can act on any resource in
+    # the project, everyone else can only act on resources they own.
+    project_user = project_user_dao.get(project_name, user.username)
+    can_manage_all = Permission.ADMIN in user.permissions or (
+        project_user is not None and Permission.PROJECT_OWNER in project_user.permissions
+    )
+    records = {
+        (record.id, str(record.type)): record
+        for record in resource_metadata_dao.get_many([(resource_id, resource_type) for resource_type, resource_id, _ in items])
+    }
+
+    results = []
+    pending = []
+    for resource_type, resource_id, action in items:
+        result = {"type": str(resource_type), "id": resource_id, "action": str(action)}
+        results.append(result)
+        record = records.get((resource_id, str(resource_type)))
+        if not record or record.project != project_name:
+            result["status"] = "NotFound"
+            result["message"] = f"{resource_id} does not exist in {project_name}."
+        elif not can_manage_all and record.user != user.username:
+            result["status"] = "Denied"
+            result["message"] = f"Only the owner of {resource_id} or a project owner may {action} it."
+        else:
+            future = submit_with_context(resource_actions[resource_type][action], resource_id)
+            pending.append((result, resource_type, resource_id, action, future))
+
+    deleted_resources = []
+    for result, resource_type, resource_id, action, future in pending:
+        try:
+            future.result()
+            result["status"] = "Succeeded"
+            if action == ResourceAction.DELETE and resource_type in SCHEDULED_RESOURCE_TYPES:
+                deleted_resources.append((resource_id, resource_type))
+        except Exception as e:
+            logger.warning(f"Failed to {action} {resource_type} {resource_id}: {e}")
+            result["status"] = "Failed"
+            result["message"] = str(e)
+
+    if deleted_resources and event_body.get("cleanupSchedules", True):
+        resource_scheduler_dao.delete_many(deleted_resources)
+
+    return {"results": results}
@@ -20,7 +20,6 @@ import logging
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 
-import boto3
 from botocore.config import Config
 
 from ml_space_lambda.data_access_objects.project import ProjectDAO
@@ -28,6 +27,7 @@ from ml_space_lambda.data_access_objects.resource_metadata import PagedMetadataR
 from ml_space_lambda.data_access_objects.resource_scheduler import ResourceSchedulerDAO, ResourceSchedulerModel
 from ml_space_lambda.data_access_objects.user import UserDAO, UserModel
 from ml_space_lambda.enums import EnvVariable, Permission, ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import api_wrapper
 from ml_space_lambda.utils.mlspace_config import get_environment_variables
 
@@ -38,7 +38,7 @@ user_dao = UserDAO()
 
 logger = logging.getLogger(__name__)
 
-s3 = boto3.client(
+s3 = lazy_client(
     "s3",
     config=Config(
         retries={
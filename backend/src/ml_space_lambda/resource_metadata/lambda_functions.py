@@ -19,13 +19,13 @@ import logging
 import time
 from typing import Dict, List
 
-import boto3
 from botocore.exceptions import ClientError
 
 from ml_space_lambda.data_access_objects.project import ProjectDAO
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
 from ml_space_lambda.data_access_objects.resource_scheduler import ResourceSchedulerDAO, ResourceSchedulerModel
 from ml_space_lambda.enums import EnvVariable, ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import event_wrapper
 from ml_space_lambda.utils.mlspace_config import get_environment_variables, retry_config
 
@@ -36,13 +36,12 @@ resource_metadata_dao = ResourceMetadataDAO()
 resource_scheduler_dao = ResourceSchedulerDAO()
 project_dao = ProjectDAO()
 
-sagemaker = boto3.client("sagemaker", config=retry_config)
-emr = boto3.client("emr", config=retry_config)
-# Translate isn't available in all regions so we're going to lazy load this
-translate = {}
-# Iam is only needed if we're trying to attribute batch translate jobs to users
-# when created in a notebook so lazy loading this
-iam = {}
+sagemaker = lazy_client("sagemaker", config=retry_config)
+emr = lazy_client("emr", config=retry_config)
+# Translate isn't available in all regions and iam is only needed if we're trying to attribute batch
+# translate jobs to users when created in a notebook, lazy clients are only created on first use
+translate = lazy_client("translate", config=retry_config)
+iam = lazy_client("iam", config=retry_config)
 
 
 @event_wrapper
@@ -373,10 +372,6 @@ def _process_batch_translate_event(details):
         # a way to attribute jobs created in a notebook back to a specific user/project
         job_id = details["responseElements"]["jobId"]
 
-        global iam
-        if not iam:
-            iam = boto3.client("iam", config=retry_config)
-
         paginator = iam.get_paginator("list_role_tags")
         pages = paginator.paginate()
 
@@ -389,10 +384,6 @@ def _process_batch_translate_event(details):
                         username = tag["Value"]
 
     if job_id:
-        global translate
-        if not translate:
-            translate = boto3.client("translate", config=retry_config)
-
         job_details = translate.describe_text_translation_job(JobId=job_id)["TextTranslationJobProperties"]
         metadata = {
             "JobName": job_details["JobName"],
@@ -20,17 +20,17 @@ import logging
 import time
 import urllib
 
-import boto3
 from botocore.exceptions import ClientError
 
 from ml_space_lambda.data_access_objects.resource_scheduler import ResourceSchedulerDAO
 from ml_space_lambda.enums import ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import api_wrapper, event_wrapper, get_notebook_stop_time, retry_config
 
 resource_scheduler_dao = ResourceSchedulerDAO()
 
-emr = boto3.client("emr", config=retry_config)
-sagemaker = boto3.client("sagemaker", config=retry_config)
+emr = lazy_client("emr", config=retry_config)
+sagemaker = lazy_client("sagemaker", config=retry_config)
 
 
 @event_wrapper
@@ -14,28 +14,51 @@
 #   limitations under the License.
 #
 
-# This lambda gets invoked whenever there's an S3 upload event
+# This lambda gets invoked whenever there's an S3 upload or delete event
 import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
 from urllib.parse import unquote_plus
 
-import boto3
-
 from ml_space_lambda.data_access_objects.dataset import DatasetDAO, DatasetModel
 from ml_space_lambda.enums import DatasetType, EnvVariable
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import event_wrapper, retry_config
 from ml_space_lambda.utils.mlspace_config import get_environment_variables
 
 logger = logging.getLogger(__name__)
 
-s3 = boto3.client("s3", config=retry_config)
+s3 = lazy_client("s3", config=retry_config)
 dataset_dao = DatasetDAO()
 
+# Maximum number of concurrent S3 tagging requests per invocation
+MAX_TAGGING_WORKERS = 10
+# Maximum number of version listing pages used to size the objects removed in a single dataset
+MAX_REMOVED_SIZE_PAGES = 5
+# Directory, relative to the dataset prefix, that generated manifests are written to. Manifests
+# are derived from the dataset contents so they aren't counted in the dataset stats.
+MANIFEST_DIRECTORY = "_manifests/"
 
-def _create_dataset_record(metadata, key):
+# Dataset prefixes (bucket, prefix) known to have a dataset record mapped to when they were last
+# confirmed. Entries expire so that a dataset deleted elsewhere will eventually be recreated if
+# new objects are written under its prefix.
+KNOWN_DATASET_TTL_SECONDS = 300
+known_datasets: Dict[tuple, float] = {}
+
+
+def _is_known_dataset(dataset_prefix) -> bool:
+    confirmed_at = known_datasets.get(dataset_prefix)
+    return confirmed_at is not None and time.time() - confirmed_at < KNOWN_DATASET_TTL_SECONDS
+
+
+def _dataset_from_key(key) -> Tuple[str, str, str, str]:
     # Scope and name need to come from the key as opposed to metadata tags
     split_key = key.split("/")
     dataset_type = split_key[0].lower()
-    dataset_location = ""
 
     env_variables = get_environment_variables()
 
@@ -51,6 +74,12 @@ def _create_dataset_record(metadata, key):
         logger.error(f"Failed to determine dataset from key '{key}'")
         raise KeyError("Failed to determine corresponding dataset")
 
+    return dataset_type, scope, dataset_name, dataset_location
+
+
+def _create_dataset_record(metadata, key):
+    dataset_type, scope, dataset_name, dataset_location = _dataset_from_key(key)
+
     if not dataset_dao.get(scope, dataset_name):
         dataset = DatasetModel(
             scope=scope,
@@ -63,7 +92,7 @@ def _create_dataset_record(metadata, key):
         dataset_dao.create(dataset)
 
 
-def _handle_front_end_upload(bucket, key):
+def _verify_front_end_upload(bucket, key):
     s3_response = s3.head_object(Bucket=bucket, Key=key)
     metadata = s3_response["Metadata"]
     if metadata.get("user", "") == "":
@@ -79,17 +108,26 @@ def _handle_front_end_upload(bucket, key):
 
     # Do some basic verification. Check that there is at least metadata in the object and that
     # there are tags
-    tags_verified = False
     if metadata:
         for s3_tag in tag_set:
             if s3_tag["Key"] in tags and s3_tag["Value"]:
-                tags_verified = True
+                return metadata
 
-    if tags_verified is True:
-        _create_dataset_record(metadata, key)
+    return None
 
 
-def _handle_notebook_upload(bucket, key, username):
+def _handle_front_end_upload(bucket, keys):
+    # Every key belongs to the same dataset so we only need a single verified object to
+    # create the dataset record, any remaining objects don't need to be inspected
+    for key in keys:
+        metadata = _verify_front_end_upload(bucket, key)
+        if metadata is not None:
+            _create_dataset_record(metadata, key)
+            return True
+    return False
+
+
+def _tag_notebook_upload(bucket, key, username):
     # Split the S3 key and use it to determine the dataset type and scope
     split_key = key.split("/")
 
@@ -102,20 +140,68 @@ def _handle_notebook_upload(bucket, key, username):
         values = {"dataset-scope": split_key[1], "dataset-name": split_key[3]}
     else:
         logger.error(f"Unrecognized dataset type {type} (Bucket: {bucket}, Key: {key}")
+        return None
+
+    values["user"] = username
+    # Tag the s3 object
+    tag_set = {"TagSet": [{"Key": k, "Value": v} for k, v in values.items()]}
+    s3_response = s3.put_object_tagging(Bucket=bucket, Key=key, Tagging=tag_set)
+
+    if s3_response["ResponseMetadata"]["HTTPStatusCode"] == 200:
+        return values
+
+    logger.error(f"Failed to tag dataset (Bucket: {bucket}, Key: {key}")
+    return None
+
+
+def _event_time(record) -> float:
+    try:
+        return datetime.strptime(record["eventTime"], "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc).timestamp()
+    except (KeyError, ValueError):
+        return time.time()
+
+
+def _removed_object_sizes(bucket, keys: List[str]) -> int:
+    """
+    Returns the total size of the removed objects. Removal events don't include the object size but
+    in a versioned bucket the removed object is still available as the most recent noncurrent version.
+    The versions of every removed key are listed together, deleting a folder can remove 1000 keys in
+    a single request, and objects which can't be found within the page limit count as 0 bytes.
+    """
+    remaining = set(keys)
+    total_bytes = 0
+    paginator = s3.get_paginator("list_object_versions")
+    for page_number, page in enumerate(paginator.paginate(Bucket=bucket, Prefix=os.path.commonprefix(keys)), 1):
+        # Versions of a key are listed newest first
+        for version in page.get("Versions", []):
+            if version["Key"] in remaining:
+                remaining.discard(version["Key"])
+                total_bytes += version["Size"]
+        if not remaining or page_number >= MAX_REMOVED_SIZE_PAGES:
+            break
+    return total_bytes
+
 
-    if values:
-        values["user"] = username
-        # Tag the s3 object
-        tag_set = {"TagSet": [{"Key": k, "Value": v} for k, v in values.items()]}
-        s3_response = s3.put_object_tagging(Bucket=bucket, Key=key, Tagging=tag_set)
+def _is_visible_removal(record) -> bool:
+    # Permanently deleting a specific version doesn't change the visible contents of the dataset,
+    # it only does in an unversioned bucket (where there's no versionId) or when a delete marker is created
+    return record["eventName"] == "ObjectRemoved:DeleteMarkerCreated" or "versionId" not in record["s3"]["object"]
 
-        if s3_response["ResponseMetadata"]["HTTPStatusCode"] == 200:
-            _create_dataset_record(values, key)
-        else:
-            logger.error(f"Failed to tag dataset (Bucket: {bucket}, Key: {key}")
 
+def _update_dataset_stats(stats: Dict[Tuple[str, str], List]):
+    """
+    Applies the aggregated object count, size, and last modified deltas to each dataset record.
 
-def _check_key(key):
+    These aggregates are approximate. Overwriting an existing key counts as a new object, objects
+    removed from an unversioned bucket don't reduce the size, and permanently deleting object
+    versions isn't reflected. Use the recount_stats API to recompute them from the bucket contents.
+    """
+    for (scope, dataset_name), (count_delta, bytes_delta, last_modified) in stats.items():
+        if count_delta or bytes_delta or last_modified:
+            dataset_dao.increment_object_stats(scope, dataset_name, count_delta, bytes_delta, last_modified)
+
+
+def _dataset_prefix(key):
     """
     We only want to execute the tagging and insertion into Dynamo logic for files that are part of
     datasets. Datasets uploaded from MLSpace will be one level deep after the word 'datasets',
@@ -123,34 +209,101 @@ def _check_key(key):
     hierarchy. Files generated via notebook may not have all the tags that a file from the UI will
     have since the tags don't exist that means the dataset metadata won't either but none of those
     fields really matter.
+
+    Returns the key prefix of the dataset the key belongs to or None if the key isn't part of a dataset.
     """
-    try:
-        split_key = key.split("/")
-        index = split_key.index("datasets")
-        length = len(split_key) - 1
-        depth = length - index
-        if depth >= 2:
-            return True
-        else:
-            return False
-    except Exception:
-        return False
+    split_key = key.split("/")
+    if "datasets" not in split_key:
+        return None
+
+    index = split_key.index("datasets")
+    depth = len(split_key) - 1 - index
+    if depth >= 2:
+        return "/".join(split_key[: index + 2])
+    return None
 
 
 # s3-event-put-notification
 @event_wrapper
 def lambda_handler(event, context):
-    bucket = event["Records"][0]["s3"]["bucket"]["name"]
-    key = unquote_plus(event["Records"][0]["s3"]["object"]["key"])
-    requester_arn = event["Records"][0]["userIdentity"]["principalId"]
-
-    # Trigger the function logic only if there's an indication that this is a user uploaded dataset
-    result = _check_key(key)
-    if result:
-        # If the request came from the UI, run this code
-        if "mls-lambda" in requester_arn:
-            _handle_front_end_upload(bucket, key)
-        # Else, request is coming from a notebook and we have to create some reasonable tags
-        # derived from the S3 key
-        else:
-            _handle_notebook_upload(bucket, key, "default-user")
+    # S3 can deliver multiple records per invocation so group the uploads by dataset so that each
+    # dataset record only needs to be checked once per batch
+    front_end_uploads: Dict[tuple, List[str]] = defaultdict(list)
+    notebook_uploads: Dict[tuple, List[str]] = defaultdict(list)
+    # Dataset (scope, name) to [object count delta, bytes delta, last modified]
+    stats: Dict[Tuple[str, str], List] = defaultdict(lambda: [0, 0, None])
+    # Keys removed by delete markers grouped by (bucket, scope, name) so they can be sized together
+    removed_keys: Dict[Tuple[str, str, str], List[str]] = defaultdict(list)
+    for record in event["Records"]:
+        bucket = record["s3"]["bucket"]["name"]
+        key = unquote_plus(record["s3"]["object"]["key"])
+        requester_arn = record["userIdentity"]["principalId"]
+
+        # Trigger the function logic only if there's an indication that this is a user uploaded dataset
+        prefix = _dataset_prefix(key)
+        if prefix:
+            try:
+                _, scope, dataset_name, _ = _dataset_from_key(key)
+                dataset_stats = None if key.startswith(f"{prefix}/{MANIFEST_DIRECTORY}") else stats[(scope, dataset_name)]
+            except KeyError:
+                dataset_stats = None
+
+            if record.get("eventName", "").startswith("ObjectRemoved"):
+                if dataset_stats and _is_visible_removal(record):
+                    dataset_stats[0] -= 1
+                    if record["eventName"] == "ObjectRemoved:DeleteMarkerCreated":
+                        removed_keys[(bucket, scope, dataset_name)].append(key)
+                continue
+
+            if dataset_stats:
+                dataset_stats[0] += 1
+                dataset_stats[1] += record["s3"]["object"].get("size", 0)
+                dataset_stats[2] = max(dataset_stats[2] or 0, _event_time(record))
+
+            # If the request came from the UI it will already be tagged
+            if "mls-lambda" in requester_arn:
+                front_end_uploads[(bucket, prefix)].append(key)
+            # Else, request is coming from a notebook and we have to create some reasonable tags
+            # derived from the S3 key
+            else:
+                notebook_uploads[(bucket, prefix)].append(key)
+
+    for (bucket, scope, dataset_name), keys in removed_keys.items():
+        stats[(scope, dataset_name)][1] -= _removed_object_sizes(bucket, keys)
+
+    # Failures are collected per record rather than raised so one bad object doesn't prevent the
+    # rest of the batch, or the dataset stats, from being processed. Raising would also cause S3 to
+    # retry the whole event and count the successful records twice.
+    failed_keys: List[str] = []
+    for dataset_prefix, keys in front_end_uploads.items():
+        try:
+            if not _is_known_dataset(dataset_prefix) and _handle_front_end_upload(dataset_prefix[0], keys):
+                known_datasets[dataset_prefix] = time.time()
+        except Exception:
+            logger.exception(f"Failed to process uploads under s3://{dataset_prefix[0]}/{dataset_prefix[1]}")
+            failed_keys.extend(keys)
+
+    if notebook_uploads:
+        with ThreadPoolExecutor(max_workers=MAX_TAGGING_WORKERS) as executor:
+            tagging_results = {
+                dataset_prefix: [
+                    (key, executor.submit(_tag_notebook_upload, dataset_prefix[0], key, "default-user")) for key in keys
+                ]
+                for dataset_prefix, keys in notebook_uploads.items()
+            }
+            for dataset_prefix, results in tagging_results.items():
+                for key, future in results:
+                    try:
+                        # result() will re-raise any error encountered while tagging
+                        values = future.result()
+                        if values and not _is_known_dataset(dataset_prefix):
+                            _create_dataset_record(values, key)
+                            known_datasets[dataset_prefix] = time.time()
+                    except Exception:
+                        logger.exception(f"Failed to process upload s3://{dataset_prefix[0]}/{key}")
+                        failed_keys.append(key)
+
+    if failed_keys:
+        logger.error(f"Failed to process {len(failed_keys)} of {len(event['Records'])} records: {failed_keys}")
+
+    _update_dataset_stats(stats)
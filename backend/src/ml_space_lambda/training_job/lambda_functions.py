@@ -18,12 +18,12 @@ import json
 import logging
 import random
 
-import boto3
 import botocore
 
 from ml_space_lambda.data_access_objects.project_user import ProjectUserDAO
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
 from ml_space_lambda.enums import EnvVariable, ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import api_wrapper, generate_tags, query_resource_metadata, retry_config
 from ml_space_lambda.utils.image_uri_utils import delete_metric_definition_for_builtin_algorithms
 from ml_space_lambda.utils.instances import kms_unsupported_instances
@@ -31,7 +31,7 @@ from ml_space_lambda.utils.mlspace_config import get_environment_variables, pull
 
 logger = logging.getLogger(__name__)
 
-sagemaker = boto3.client("sagemaker", config=retry_config)
+sagemaker = lazy_client("sagemaker", config=retry_config)
 project_user_dao = ProjectUserDAO()
 resource_metadata_dao = ResourceMetadataDAO()
 
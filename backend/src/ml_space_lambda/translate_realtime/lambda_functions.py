@@ -17,13 +17,12 @@
 import json
 import logging
 
-import boto3
-
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import api_wrapper, retry_config
 
 logger = logging.getLogger(__name__)
 
-translate = boto3.client("translate", config=retry_config)
+translate = lazy_client("translate", config=retry_config)
 
 
 @api_wrapper
@@ -14,6 +14,34 @@
 #   limitations under the License.
 #
 
+from typing import Optional
+
+from ml_space_lambda.utils.client_registry import get_client, get_session
+
+# Resolved on first use and cached for the lifetime of the container
+aws_partition: Optional[str] = None
+aws_account: Optional[str] = None
+
+
+def get_partition() -> str:
+    global aws_partition
+    if aws_partition is None:
+        session = get_session()
+        aws_partition = session.get_partition_for_region(session.region_name)
+    return aws_partition
+
+
+def get_account_id(sts_client=None) -> str:
+    global aws_account
+    if aws_account is None:
+        sts_client = sts_client if sts_client else get_client("sts")
+        aws_account = sts_client.get_caller_identity()["Account"]
+    return aws_account
+
+
+def iam_arn(resource: str, sts_client=None) -> str:
+    return f"arn:{get_partition()}:iam::{get_account_id(sts_client)}:{resource}"
+
 
 # Structure of a context: https://docs.aws.amazon.com/lambda/latest/dg/python-context.html
 def account_arn_from_context(lambda_context, service, resource, omit_region=False):
@@ -0,0 +1,93 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+
+# Per-container registry of boto3 clients. Handler modules used to create every client they might
+# need at import time, now they declare lazy clients which are only created (from a single shared
+# session) the first time they're used.
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+from ml_space_lambda.utils.common_functions import retry_config
+from ml_space_lambda.utils.metrics import instrument_client
+
+_session: Optional[boto3.session.Session] = None
+_clients: Dict[Tuple[str, Optional[str], int], Any] = {}
+# Creating sessions and clients isn't thread safe
+_lock = threading.RLock()
+
+
+def get_session() -> boto3.session.Session:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = boto3.session.Session()
+    return _session
+
+
+def get_client(service_name: str, config: Config = retry_config, region_name: Optional[str] = None):
+    """
+    Returns the shared client for the given service, creating it on first use. Clients are keyed on
+    the config object so modules that need different settings (ie s3v4 signing) get their own client.
+    """
+    key = (service_name, region_name, id(config))
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = get_session().client(service_name, config=config, region_name=region_name)
+                instrument_client(client)
+                _clients[key] = client
+    return client
+
+
+def reset_clients() -> None:
+    global _session
+    with _lock:
+        _clients.clear()
+        _session = None
+
+
+class LazyClient:
+    """
+    Stand-in for a boto3 client which resolves the real (shared) client on first attribute access.
+    Tests can still replace the module level attribute with a mock.
+    """
+
+    def __init__(self, service_name: str, config: Config = retry_config):
+        self._service_name = service_name
+        self._config = config
+        # Keep resolving the region from the environment at import time like boto3.client did
+        self._region_name = os.getenv("AWS_DEFAULT_REGION")
+
+    def __getattr__(self, name: str):
+        # Don't create the client just because something (ie mock.patch) is inspecting this object
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(get_client(self._service_name, self._config, self._region_name), name)
+
+    def __repr__(self) -> str:
+        return f"LazyClient({self._service_name})"
+
+
+def lazy_client(service_name: str, config: Config = retry_config) -> LazyClient:
+    return LazyClient(service_name, config)
@@ -14,18 +14,35 @@
 #   limitations under the License.
 #
 
+import base64
+import binascii
 import copy
 import functools
+import gzip
 import json
 import logging
+import os
+import random
 import time
-from contextvars import ContextVar
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
 from re import Pattern
 from typing import Any, Dict, List, Optional
 
 from botocore.config import Config
 
-from ml_space_lambda.enums import Permission, ResourceType
+from ml_space_lambda.enums import EnvVariable, Permission, ResourceType
+from ml_space_lambda.utils.metrics import end_invocation, start_invocation
+
+# Optional faster encoders/compressors, these are used when present in the lambda layer
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 retry_config = Config(
     retries={
@@ -37,6 +54,20 @@ ctx_context = ContextVar("lamdbacontext")
 logger = logging.getLogger(__name__)
 logging_configured = False
 
+# Shared across invocations of a warm lambda; threads are only started when work is submitted
+SHARED_EXECUTOR_WORKERS = 8
+shared_executor = ThreadPoolExecutor(max_workers=SHARED_EXECUTOR_WORKERS)
+
+# Responses smaller than this aren't worth the cost of compressing and base64 encoding
+RESPONSE_COMPRESSION_MIN_BYTES = 4096
+
+# "full" logs every event (minus credentials), "compact" truncates large bodies and record batches
+# and "none" only logs the invocation. Compact mode still logs a sample of events in full.
+EVENT_LOG_MODE = os.getenv(EnvVariable.EVENT_LOG_MODE, "compact").lower()
+EVENT_LOG_SAMPLE_RATE = float(os.getenv(EnvVariable.EVENT_LOG_SAMPLE_RATE, "0.01"))
+EVENT_LOG_MAX_BODY_LENGTH = int(os.getenv(EnvVariable.EVENT_LOG_MAX_BODY_LENGTH, "2048"))
+EVENT_LOG_MAX_RECORDS = 5
+
 
 class LambdaContextFilter(logging.Filter):
     def filter(self, record):
@@ -110,30 +141,87 @@ def _sanitize_event(event: Dict[str, Dict[str, Any]]):
     return json.dumps(sanitized)
 
 
+def _redact_headers(headers: Optional[Dict[str, Any]], redacted_value: Any) -> Optional[Dict[str, Any]]:
+    if not headers:
+        return headers
+    return {key.lower(): redacted_value if key.lower() == "authorization" else value for key, value in headers.items()}
+
+
+def _summarize_event(event: Dict[str, Any]) -> str:
+    # Only the top level of the event is copied, nested values are shared with the original event
+    summary = dict(event)
+    if "headers" in summary:
+        summary["headers"] = _redact_headers(summary["headers"], "<REDACTED>")
+    if "multiValueHeaders" in summary:
+        summary["multiValueHeaders"] = _redact_headers(summary["multiValueHeaders"], ["<REDACTED>"])
+    body = summary.get("body")
+    if isinstance(body, str) and len(body) > EVENT_LOG_MAX_BODY_LENGTH:
+        summary["body"] = f"{body[:EVENT_LOG_MAX_BODY_LENGTH]}...<{len(body) - EVENT_LOG_MAX_BODY_LENGTH} characters omitted>"
+    records = summary.get("Records")
+    if isinstance(records, list) and len(records) > EVENT_LOG_MAX_RECORDS:
+        summary["Records"] = records[:EVENT_LOG_MAX_RECORDS] + [f"<{len(records) - EVENT_LOG_MAX_RECORDS} records omitted>"]
+    return json.dumps(summary, default=str)
+
+
+def _log_invocation(lambda_func_name: str, code_func_name: str, event: Dict[str, Any]) -> None:
+    if EVENT_LOG_MODE == "none":
+        logger.info(f"Lambda {lambda_func_name}({code_func_name}) invoked")
+    elif EVENT_LOG_MODE == "full" or random.random() < EVENT_LOG_SAMPLE_RATE:
+        logger.info(f"Lambda {lambda_func_name}({code_func_name}) invoked with {_sanitize_event(event)}")
+    else:
+        logger.info(f"Lambda {lambda_func_name}({code_func_name}) invoked with {_summarize_event(event)}")
+
+
 def api_wrapper(f):
     @functools.wraps(f)
     def wrapper(event, context):
         ctx_context.set(context)
-        code_func_name = f.__name__
-        lambda_func_name = context.function_name
-        logger.info(f"Lambda {lambda_func_name}({code_func_name}) invoked with {_sanitize_event(event)}")
+        try:
+            event = _decode_event_body(event)
+        except (binascii.Error, UnicodeDecodeError) as e:
+            # Log the raw event so malformed requests can still be diagnosed
+            _log_invocation(context.function_name, f.__name__, event)
+            return generate_exception_response(ValueError(f"Unable to decode request body: {e}"))
+        _log_invocation(context.function_name, f.__name__, event)
+        metrics_token = start_invocation()
         try:
             result = f(event, context)
-            return generate_html_response(200, result)
+            return compress_html_response(generate_html_response(200, result), _get_accept_encoding(event))
         except Exception as e:
             return generate_exception_response(e)
+        finally:
+            end_invocation(metrics_token, context.function_name)
 
     return wrapper
 
 
+def _decode_event_body(event):
+    # API Gateway base64 encodes JSON request bodies because application/json is registered as a
+    # binary media type (so that compressed responses can be returned)
+    if event.get("isBase64Encoded") and event.get("body"):
+        event = {**event, "body": base64.b64decode(event["body"]).decode("utf-8"), "isBase64Encoded": False}
+    return event
+
+
+def _get_accept_encoding(event) -> str:
+    for key, value in (event.get("headers") or {}).items():
+        if key.lower() == "accept-encoding":
+            return value or ""
+    return ""
+
+
 def event_wrapper(f):
     @functools.wraps(f)
     def wrapper(event, context):
         ctx_context.set(context)
-        code_func_name = f.__name__
-        lambda_func_name = context.function_name
-        logger.info(f"Lambda {lambda_func_name}({code_func_name}) invoked with {_sanitize_event(event)}")
-        return f(event, context)
+        _log_invocation(context.function_name, f.__name__, event)
+        metrics_token = start_invocation()
+        try:
+            # Some API Gateway routes (ie app config updates) use this wrapper so their bodies are
+            # base64 encoded as well, events from other sources don't set isBase64Encoded
+            return f(_decode_event_body(event), context)
+        finally:
+            end_invocation(metrics_token, context.function_name)
 
     return wrapper
 
@@ -147,15 +235,18 @@ def authorization_wrapper(f):
     return wrapper
 
 
+def submit_with_context(fn, *args, **kwargs) -> Future:
+    # Run in a copy of the caller's context so log lines keep the lambda request id
+    return shared_executor.submit(copy_context().run, fn, *args, **kwargs)
+
+
 def get_tags_for_resource(sagemaker, arn: str):
-    tags = []
     response = sagemaker.list_tags(ResourceArn=arn)
     tags = [tag for tag in response["Tags"]]
 
     while "NextToken" in response:
-        response = sagemaker.list_tags(ResourceArn=arn)
-        for tag in response["Tags"]:
-            tags.append(tag)
+        response = sagemaker.list_tags(ResourceArn=arn, NextToken=response["NextToken"])
+        tags.extend(response["Tags"])
     return tags
 
 
@@ -195,10 +286,25 @@ def list_custom_terminologies_for_project(
     return result
 
 
+def _dumps(response_body) -> str:
+    if orjson:
+        try:
+            # Hand datetimes and dataclasses to str() so the output matches json.dumps(default=str)
+            return orjson.dumps(
+                response_body,
+                default=str,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            ).decode("utf-8")
+        except (TypeError, orjson.JSONEncodeError):
+            # orjson doesn't support everything json does, ints over 64 bits for instance
+            pass
+    return json.dumps(response_body, default=str)
+
+
 def generate_html_response(status_code, response_body):
     return {
         "statusCode": status_code,
-        "body": json.dumps(response_body, default=str),
+        "body": _dumps(response_body),
         "headers": {
             "Access-Control-Allow-Origin": "*",
             "Content-Type": "application/json",
@@ -211,6 +317,33 @@ def generate_html_response(status_code, response_body):
     }
 
 
+def compress_html_response(response: Dict[str, Any], accept_encoding: str) -> Dict[str, Any]:
+    if len(response["body"]) < RESPONSE_COMPRESSION_MIN_BYTES:
+        return response
+
+    accepted = set()
+    for encoding in accept_encoding.lower().split(","):
+        name, _, params = encoding.strip().partition(";")
+        if params.strip().replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(name.strip())
+
+    if brotli and "br" in accepted:
+        content_encoding = "br"
+        body = brotli.compress(response["body"].encode("utf-8"), quality=4)
+    elif "gzip" in accepted:
+        content_encoding = "gzip"
+        body = gzip.compress(response["body"].encode("utf-8"), compresslevel=6)
+    else:
+        return response
+
+    return {
+        **response,
+        "body": base64.b64encode(body).decode("ascii"),
+        "isBase64Encoded": True,
+        "headers": {**response["headers"], "Content-Encoding": content_encoding, "Vary": "Accept-Encoding"},
+    }
+
+
 def generate_exception_response(e, status_code=400):
     error_msg = str(e)
     if hasattr(e, "response"):  # i.e. validate the exception was from an API call
@@ -364,6 +497,10 @@ def query_resource_metadata(resource_metadata_dao, event, resource_type: Resourc
                 kwargs["filter_expression"] = f"metadata.TrainingJobStatus IN ({', '.join(expressions)})"
                 kwargs["filter_values"] = filter_values
 
+            if "filter_expression" in kwargs:
+                # Keep reading so filtering doesn't result in short or empty pages
+                kwargs["fill_page"] = True
+
     response = {"records": []}
     job_metadata = resource_metadata_dao.get_all_for_project_by_type(project_name, resource_type, **kwargs)
     if job_metadata.next_token:
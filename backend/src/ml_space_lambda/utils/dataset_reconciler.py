@@ -0,0 +1,139 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ml_space_lambda.data_access_objects.dataset import DatasetDAO, DatasetModel
+from ml_space_lambda.data_access_objects.pagination_helper import decode_pagination_token, encode_pagination_token
+from ml_space_lambda.enums import DatasetType
+
+logger = logging.getLogger(__name__)
+
+# Stop after this many seconds so the response is returned within the API Gateway timeout
+DEFAULT_TIME_BUDGET_SECONDS = 20
+
+
+class DatasetReconciler:
+    """
+    Discovers dataset roots in the data bucket using delimiter listings and compares them, one
+    dataset scope at a time, against the dataset table. Datasets with objects in S3 but no record
+    (typically because the S3 event that would have created it was missed) are created and records
+    whose prefix has no objects are reported.
+
+    Scopes are processed in key order and a nextToken checkpoint is returned when the time budget
+    is exhausted so that large buckets can be reconciled across multiple requests.
+    """
+
+    def __init__(self, s3_client, bucket: str, dataset_dao: Optional[DatasetDAO] = None):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.dataset_dao = dataset_dao if dataset_dao else DatasetDAO()
+
+    def reconcile(
+        self,
+        next_token: Optional[str] = None,
+        dry_run: bool = False,
+        time_budget_seconds: float = DEFAULT_TIME_BUDGET_SECONDS,
+    ) -> dict:
+        start_after = decode_pagination_token(next_token)["startAfter"] if next_token else None
+        deadline = time.monotonic() + time_budget_seconds
+        report: Dict[str, Any] = {"created": [], "missingObjects": [], "scopesScanned": 0}
+
+        for dataset_type, scope, parent_prefix in self._dataset_parents(start_after):
+            created, missing = self._reconcile_scope(dataset_type, scope, parent_prefix, dry_run)
+            report["created"].extend(created)
+            report["missingObjects"].extend(missing)
+            report["scopesScanned"] += 1
+            if time.monotonic() > deadline:
+                report["nextToken"] = encode_pagination_token({"startAfter": parent_prefix})
+                break
+
+        return report
+
+    def _list_common_prefixes(self, prefix: str, start_after: Optional[str] = None) -> Iterator[str]:
+        list_params = {"Bucket": self.bucket, "Prefix": prefix, "Delimiter": "/"}
+        if start_after and start_after > prefix:
+            list_params["StartAfter"] = start_after
+        for page in self.s3_client.get_paginator("list_objects_v2").paginate(**list_params):
+            for common_prefix in page.get("CommonPrefixes", []):
+                yield common_prefix["Prefix"]
+
+    def _dataset_parents(self, start_after: Optional[str]) -> Iterator[Tuple[DatasetType, str, str]]:
+        """
+        Yields (type, scope, "<...>/datasets/") for every dataset scope in key order, skipping
+        any scope at or before start_after.
+        """
+        # Dataset types are listed in key order so a single checkpoint covers all of them
+        for dataset_type in [DatasetType.GLOBAL, DatasetType.GROUP, DatasetType.PRIVATE, DatasetType.PROJECT]:
+            if dataset_type in [DatasetType.GLOBAL, DatasetType.GROUP]:
+                parents = [(str(dataset_type), f"{dataset_type}/datasets/")]
+            else:
+                parents = (
+                    (scope_prefix.split("/")[1], f"{scope_prefix}datasets/")
+                    for scope_prefix in self._list_common_prefixes(f"{dataset_type}/", start_after)
+                )
+            for scope, parent_prefix in parents:
+                if not start_after or parent_prefix > start_after:
+                    yield dataset_type, scope, parent_prefix
+
+    def _reconcile_scope(
+        self, dataset_type: DatasetType, scope: str, parent_prefix: str, dry_run: bool
+    ) -> Tuple[List[Dict], List[Dict]]:
+        dataset_names = [
+            dataset_root[len(parent_prefix) :].rstrip("/") for dataset_root in self._list_common_prefixes(parent_prefix)
+        ]
+        existing = {dataset.name: dataset for dataset in self.dataset_dao.get_all_for_scope(dataset_type, scope)}
+
+        missing_records = [
+            self._build_dataset(dataset_type, scope, f"{parent_prefix}{name}/", name)
+            for name in dataset_names
+            if name not in existing
+        ]
+        if missing_records and not dry_run:
+            self.dataset_dao.create_many(missing_records)
+
+        discovered = set(dataset_names)
+        missing_objects = [dataset for name, dataset in existing.items() if name not in discovered]
+        for dataset in missing_objects:
+            logger.warning(f"Dataset '{dataset.name}' ({dataset.type}/{dataset.scope}) has no objects in S3.")
+
+        return (
+            [self._summary(dataset) for dataset in missing_records],
+            [self._summary(dataset) for dataset in missing_objects],
+        )
+
+    def _build_dataset(self, dataset_type: DatasetType, scope: str, dataset_root: str, name: str) -> DatasetModel:
+        # Recover what we can from the metadata written by front end uploads
+        metadata: Dict[str, str] = {}
+        listing = self.s3_client.list_objects_v2(Bucket=self.bucket, Prefix=dataset_root, MaxKeys=1)
+        if listing.get("Contents"):
+            metadata = self.s3_client.head_object(Bucket=self.bucket, Key=listing["Contents"][0]["Key"]).get("Metadata", {})
+
+        return DatasetModel(
+            scope=scope,
+            type=dataset_type,
+            name=name,
+            description=metadata.get("dataset-description", ""),
+            location=f"s3://{self.bucket}/{dataset_root}",
+            # Private datasets are owned by the user they're scoped to
+            created_by=scope if dataset_type == DatasetType.PRIVATE else metadata.get("user", "default-user"),
+        )
+
+    @staticmethod
+    def _summary(dataset: DatasetModel) -> Dict[str, str]:
+        return {"type": str(dataset.type), "scope": dataset.scope, "name": dataset.name}
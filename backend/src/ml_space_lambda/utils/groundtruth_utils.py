@@ -1,3 +1,11 @@
+import json
+import os
+from enum import Enum, auto
+
+from botocore.config import Config
+
+from ml_space_lambda.utils.client_registry import get_session, lazy_client
+
 #
 #   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 #
@@ -14,14 +22,8 @@
 #   limitations under the License.
 #
 
-import json
-import os
-from enum import Enum, auto
-
-import boto3
-from botocore.config import Config
 
-s3 = boto3.client(
+s3 = lazy_client(
     "s3",
     config=Config(
         retries={
@@ -85,7 +87,7 @@ _auto_labeling_task_arn_map = {
 
 
 def get_groundtruth_assets_domain():
-    session = boto3.session.Session()
+    session = get_session()
     region = session.region_name
 
     return _assets_domain_map.get(region, "assets.crowd.aws")
@@ -101,7 +103,7 @@ def get_groundtruth_lambda_arn(lambda_type: LambdaTypes, task_type: TaskTypes):
     :param boto_session: Boto3 session for retrieving region and partition information to construct an ARN
     :return: Lambda ARN for the specified Lambda and Task types in the current region
     """
-    session = boto3.session.Session()
+    session = get_session()
     region = session.region_name
     arn_partition = session.get_partition_for_region(region)
     account = _account_map[region]
@@ -110,7 +112,7 @@ def get_groundtruth_lambda_arn(lambda_type: LambdaTypes, task_type: TaskTypes):
 
 
 def get_auto_labeling_arn(task_type: TaskTypes):
-    session = boto3.session.Session()
+    session = get_session()
     region = session.region_name
     arn_partition = session.get_partition_for_region(region)
     account = _account_map[region]
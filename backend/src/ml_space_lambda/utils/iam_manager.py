@@ -17,15 +17,16 @@
 import hashlib
 import json
 import logging
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
-import boto3
 from botocore.exceptions import ClientError
 
 from ml_space_lambda.data_access_objects.dataset import DatasetDAO
 from ml_space_lambda.data_access_objects.group_dataset import GroupDatasetDAO
 from ml_space_lambda.data_access_objects.group_user import GroupUserDAO
 from ml_space_lambda.enums import DatasetType, EnvVariable, IAMResourceType
+from ml_space_lambda.utils import account_utils
+from ml_space_lambda.utils.client_registry import get_client
 from ml_space_lambda.utils.common_functions import generate_tags, has_tags, retry_config
 from ml_space_lambda.utils.mlspace_config import get_environment_variables
 
@@ -36,6 +37,7 @@ IAM_POLICY_NAME_MAX_LENGTH = 128
 USER_POLICY_VERSION = 1
 PROJECT_POLICY_VERSION = 1
 DYNAMIC_USER_ROLE_TAG = {"Key": "dynamic-user-role", "Value": "true"}
+POLICY_HASH_TAG_KEY = "policyHash"
 
 group_user_dao = GroupUserDAO()
 group_dataset_dao = GroupDatasetDAO()
@@ -44,9 +46,10 @@ dataset_dao = DatasetDAO()
 
 class IAMManager:
     def __init__(self, iam_client=None, sts_client=None):
-        self.sts_client = sts_client if sts_client else boto3.client("sts", config=retry_config)
-        self.aws_partition = boto3.Session().get_partition_for_region(boto3.Session().region_name)
-        self.iam_client = iam_client if iam_client else boto3.client("iam", config=retry_config)
+        # Clients, account and partition are resolved lazily so that handler modules
+        # can construct an IAMManager at import time without any AWS calls
+        self._iam_client = iam_client
+        self.sts_client = sts_client
 
         # If you update this you need to increment the PROJECT_POLICY_VERSION value
         self.project_policy = """{
@@ -155,6 +158,16 @@ class IAMManager:
         self.permissions_boundary_arn = env_variables[EnvVariable.PERMISSIONS_BOUNDARY_ARN]
         self.iam_resource_prefix = env_variables[EnvVariable.IAM_RESOURCE_PREFIX]
 
+    @property
+    def iam_client(self):
+        if self._iam_client is None:
+            self._iam_client = get_client("iam", config=retry_config)
+        return self._iam_client
+
+    @property
+    def aws_partition(self) -> str:
+        return account_utils.get_partition()
+
     def get_iam_role_arn(self, project_name: str, username: str) -> Optional[str]:
         """
         Get the ARN of an existing dynamic role for this (project_name, username) pair.
@@ -174,38 +187,46 @@ class IAMManager:
 
     def add_iam_role(self, project_name: str, username: str) -> str:
         iam_role_name = self._generate_iam_role_name(username, project_name)
+        self._check_name_length(IAMResourceType.ROLE, iam_role_name)
 
         # Check if the IAM role exists already
         existing_role_arn = self._fetch_iam_role(iam_role_name)
-        if not existing_role_arn:
-            iam_role_arn = self._create_iam_role(iam_role_name, project_name, username)
 
-        # Build additional resource name variables
-        project_policy_name = f"{self.iam_resource_prefix}-project-{project_name}"
+        project_policy_arn = self.update_project_policy(project_name)
+        user_policy_arn = self.update_user_policy(username)
 
-        aws_account = self.sts_client.get_caller_identity()["Account"]
-        project_policy_arn = f"arn:{self.aws_partition}:iam::{aws_account}:policy/{project_policy_name}"
+        # The notebook policy and pass role policies don't support/need dynamic
+        # policy updates between versions. The notebook policy is updated by CDK
+        # and not dynamic/managed via python like the user and project policies
+        if existing_role_arn:
+            return existing_role_arn
 
-        # Confirm policy name lengths are compliant
+        return self._create_project_user_role(project_name, username, project_policy_arn, user_policy_arn)
+
+    # Create the project policy if needed or update it if it is out of date
+    def update_project_policy(self, project_name: str, force: bool = False) -> str:
+        project_policy_name = f"{self.iam_resource_prefix}-project-{project_name}"
         self._check_name_length(IAMResourceType.POLICY, project_policy_name)
-        self._check_name_length(IAMResourceType.ROLE, iam_role_name)
+        project_policy_arn = self._generate_policy_arn(project_policy_name)
+        project_policy = self._generate_project_policy(project_name)
 
         # Check if the project policy exists
         existing_project_policy_version = self._get_policy_version(project_policy_arn)
         if existing_project_policy_version is None:
             project_policy_arn = self._create_iam_policy(
                 project_policy_name,
-                self._generate_project_policy(project_name),
+                project_policy,
                 "Project",
                 project_name,
                 PROJECT_POLICY_VERSION,
+                policy_hash=self.generate_policy_hash(project_policy),
             )
-        elif existing_project_policy_version < PROJECT_POLICY_VERSION:
+        elif force or existing_project_policy_version < PROJECT_POLICY_VERSION:
             # Remove unused versions of the policy making room for the new policy if needed
             self._delete_unused_policy_versions(project_policy_arn)
             self.iam_client.create_policy_version(
                 PolicyArn=project_policy_arn,
-                PolicyDocument=self._generate_project_policy(project_name),
+                PolicyDocument=project_policy,
                 SetAsDefault=True,
             )
 
@@ -216,6 +237,7 @@ class IAMManager:
                         {"Key": "project", "Value": project_name},
                         {"Key": "policyVersion", "Value": str(PROJECT_POLICY_VERSION)},
                         {"Key": "system", "Value": self.system_tag},
+                        {"Key": POLICY_HASH_TAG_KEY, "Value": self.generate_policy_hash(project_policy)},
                     ],
                 )
             except ClientError as error:
@@ -224,13 +246,14 @@ class IAMManager:
                     logger.info(f"Tagging policies is unsupported in this region.")
                 else:
                     raise error
-        user_policy_arn = self.update_user_policy(username)
+        return project_policy_arn
 
-        # The notebook policy and pass role policies don't support/need dynamic
-        # policy updates between versions. The notebook policy is updated by CDK
-        # and not dynamic/managed via python like the user and project policies
-        if existing_role_arn:
-            return existing_role_arn
+    # Creates the (user, project) role and attaches the notebook, project, user, and pass role policies
+    def _create_project_user_role(
+        self, project_name: str, username: str, project_policy_arn: str, user_policy_arn: str
+    ) -> str:
+        iam_role_name = self._generate_iam_role_name(username, project_name)
+        iam_role_arn = self._create_iam_role(iam_role_name, project_name, username)
 
         # Attach all policies from the MLSpace notebook role
         if not self.default_notebook_role_policy_arns:
@@ -277,31 +300,35 @@ class IAMManager:
 
         return iam_role_arn
 
-    # Create or update the user policy
+    # Create or update the user policy. If the caller has already rendered the desired policy
+    # document (ie the IAM reconciler) it can be passed in to avoid regenerating it.
     def update_user_policy(
         self,
         username: str,
+        user_policy: Optional[str] = None,
     ) -> str:
         user_policy_name = f"{self.iam_resource_prefix}-user-{username}"
-        aws_account = self.sts_client.get_caller_identity()["Account"]
-        user_policy_arn = f"arn:{self.aws_partition}:iam::{aws_account}:policy/{user_policy_name}"
+        user_policy_arn = self._generate_policy_arn(user_policy_name)
         self._check_name_length(IAMResourceType.POLICY, user_policy_name)
+        if user_policy is None:
+            user_policy = self._generate_user_policy(username)
         # Check if the user policy exists
         existing_user_policy_version = self._get_policy_version(user_policy_arn)
         if existing_user_policy_version is None:
             user_policy_arn = self._create_iam_policy(
                 user_policy_name,
-                self._generate_user_policy(username),
+                user_policy,
                 "User",
                 username,
                 USER_POLICY_VERSION,
+                policy_hash=self.generate_policy_hash(user_policy),
             )
         else:
             # Remove unused versions of the policy making room for the new policy if needed
             self._delete_unused_policy_versions(user_policy_arn)
             self.iam_client.create_policy_version(
                 PolicyArn=user_policy_arn,
-                PolicyDocument=self._generate_user_policy(username),
+                PolicyDocument=user_policy,
                 SetAsDefault=True,
             )
             try:
@@ -311,6 +338,7 @@ class IAMManager:
                         {"Key": "user", "Value": username},
                         {"Key": "policyVersion", "Value": str(USER_POLICY_VERSION)},
                         {"Key": "system", "Value": self.system_tag},
+                        {"Key": POLICY_HASH_TAG_KEY, "Value": self.generate_policy_hash(user_policy)},
                     ],
                 )
             except ClientError as error:
@@ -324,7 +352,6 @@ class IAMManager:
     # Removes the passed in roles and deletes any detached user specific policies. If a
     # project is passed in then the project policy is removed as well.
     def remove_project_user_roles(self, role_identifiers: List[str], project: str = None) -> None:
-        aws_account = self.sts_client.get_caller_identity()["Account"]
         for role_identifier in role_identifiers:
             # This may be a friendly role name alredy if we're doing user cleanup
             # spliting this way supports both arns and freindly role names
@@ -337,9 +364,7 @@ class IAMManager:
 
         if project:
             project_policy_name = f"{self.iam_resource_prefix}-project-{project}"
-            self.iam_client.delete_policy(
-                PolicyArn=f"arn:{self.aws_partition}:iam::{aws_account}:policy/{project_policy_name}"
-            )
+            self.iam_client.delete_policy(PolicyArn=self._generate_policy_arn(project_policy_name))
 
     # Removes all roles for the given user and deletes user specific policies
     def remove_all_user_roles(self, username: str, projects: List[str]) -> None:
@@ -350,10 +375,8 @@ class IAMManager:
 
         self.remove_project_user_roles(roles_to_delete)
         # Delete user policy
-        aws_account = self.sts_client.get_caller_identity()["Account"]
         user_policy_name = f"{self.iam_resource_prefix}-user-{username}"
-        user_policy_arn = f"arn:{self.aws_partition}:iam::{aws_account}:policy/{user_policy_name}"
-        self.iam_client.delete_policy(PolicyArn=user_policy_arn)
+        self.iam_client.delete_policy(PolicyArn=self._generate_policy_arn(user_policy_name))
 
     # Creates the IAM role for the MLSpace user/project context
     def _create_iam_role(self, iam_role_name: str, project_name: str, username: str) -> str:
@@ -385,16 +408,20 @@ class IAMManager:
         policy_type: str,
         policy_identifier: str,
         policy_version: int,
+        policy_hash: Optional[str] = None,
     ) -> str:
+        tags = [
+            {"Key": policy_type.lower(), "Value": policy_identifier},
+            {"Key": "policyVersion", "Value": str(policy_version)},
+            {"Key": "system", "Value": self.system_tag},
+        ]
+        if policy_hash:
+            tags.append({"Key": POLICY_HASH_TAG_KEY, "Value": policy_hash})
         iam_policy_creation_response = self.iam_client.create_policy(
             PolicyName=policy_name,
             PolicyDocument=policy_contents,
             Description=f"MLSpace::{policy_type}::{policy_identifier}",
-            Tags=[
-                {"Key": policy_type.lower(), "Value": policy_identifier},
-                {"Key": "policyVersion", "Value": str(policy_version)},
-                {"Key": "system", "Value": self.system_tag},
-            ],
+            Tags=tags,
         )
         return iam_policy_creation_response["Policy"]["Arn"]
 
@@ -446,26 +473,25 @@ class IAMManager:
             .replace("$PARTITION", self.aws_partition)
         )
 
-    def _generate_user_policy(self, user: str) -> str:
+    def _generate_user_policy(self, user: str, group_dataset_names: Optional[Iterable[str]] = None) -> str:
         resource_arns = [
             f"arn:{self.aws_partition}:s3:::{self.data_bucket}/private/{user}/*",
             f"arn:{self.aws_partition}:s3:::{self.data_bucket}/global/*",
         ]
         resource_prefixes = [f"private/{user}/*", "global/*", "index/*"]
 
-        dataset_arn_prefixes = set()
-        group_prefixes = set()
-        for group in group_user_dao.get_groups_for_user(user):
-            for group_dataset in group_dataset_dao.get_datasets_for_group(group.group):
-                dataset = dataset_dao.get(DatasetType.GROUP, group_dataset.dataset)
-                if dataset is not None:
-                    dataset_arn_prefixes.add(
-                        f"arn:{self.aws_partition}:s3:::{self.data_bucket}/group/datasets/{dataset.name}/*"
-                    )
-                    group_prefixes.add(f"group/datasets/{dataset.name}/*")
+        if group_dataset_names is None:
+            group_dataset_names = set()
+            for group in group_user_dao.get_groups_for_user(user):
+                for group_dataset in group_dataset_dao.get_datasets_for_group(group.group):
+                    dataset = dataset_dao.get(DatasetType.GROUP, group_dataset.dataset)
+                    if dataset is not None:
+                        group_dataset_names.add(dataset.name)
 
-        resource_arns.extend(list(dataset_arn_prefixes))
-        resource_prefixes.extend(list(group_prefixes))
+        # Sort the dataset names so the rendered policy (and its hash) is stable between invocations
+        for dataset_name in sorted(set(group_dataset_names)):
+            resource_arns.append(f"arn:{self.aws_partition}:s3:::{self.data_bucket}/group/datasets/{dataset_name}/*")
+            resource_prefixes.append(f"group/datasets/{dataset_name}/*")
 
         user_policy = {
             "Version": "2012-10-17",
@@ -556,6 +582,13 @@ class IAMManager:
     def _generate_user_hash(self, username: str) -> str:
         return hashlib.sha256(username.encode()).hexdigest()
 
+    def _generate_policy_arn(self, policy_name: str) -> str:
+        return account_utils.iam_arn(f"policy/{policy_name}", self.sts_client)
+
+    def generate_policy_hash(self, policy: str) -> str:
+        # Normalize the document so formatting differences don't register as drift
+        return hashlib.sha256(json.dumps(json.loads(policy), sort_keys=True).encode()).hexdigest()
+
     def generate_policy(self, statements: list):
         if len(statements) > 0:
             return {"Version": "2012-10-17", "Statement": statements}
@@ -578,10 +611,9 @@ class IAMManager:
         on_create_attach_to_existing_dynamic_roles: bool = False,
         expected_policy_version: int = None,
     ):
-        aws_account = self.sts_client.get_caller_identity()["Account"]
         prefixed_policy_name = f"{self.iam_resource_prefix}-{policy_name}"
         self._check_name_length(IAMResourceType.POLICY, prefixed_policy_name)
-        policy_arn = f"arn:{self.aws_partition}:iam::{aws_account}:policy/{prefixed_policy_name}"
+        policy_arn = self._generate_policy_arn(prefixed_policy_name)
         logger.info(f"Attempting to update {policy_name} with the provided policy {policy}")
         # Create the policy if it doesn't exist
         existing_policy_version = self._get_policy_version(policy_arn)
@@ -0,0 +1,385 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+import logging
+import urllib.parse
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ml_space_lambda.data_access_objects.dataset import DatasetDAO
+from ml_space_lambda.data_access_objects.group_dataset import GroupDatasetDAO
+from ml_space_lambda.data_access_objects.group_user import GroupUserDAO
+from ml_space_lambda.data_access_objects.project import ProjectDAO
+from ml_space_lambda.data_access_objects.project_group import ProjectGroupDAO
+from ml_space_lambda.data_access_objects.project_user import ProjectUserDAO
+from ml_space_lambda.enums import DatasetType
+from ml_space_lambda.utils.iam_manager import (
+    IAM_ROLE_NAME_MAX_LENGTH,
+    POLICY_HASH_TAG_KEY,
+    PROJECT_POLICY_VERSION,
+    USER_POLICY_VERSION,
+    IAMManager,
+)
+
+logger = logging.getLogger(__name__)
+
+project_dao = ProjectDAO()
+project_user_dao = ProjectUserDAO()
+project_group_dao = ProjectGroupDAO()
+group_user_dao = GroupUserDAO()
+group_dataset_dao = GroupDatasetDAO()
+dataset_dao = DatasetDAO()
+
+
+class IAMReconciler:
+    """
+    Computes the desired set of dynamic (user, project) roles and user/project policies from the
+    project user, project group, group user, and group dataset tables, diffs that against the
+    current IAM state in a single pass, and applies only the delta.
+
+    Reconciliation can be scoped to a single project, a single user, or run across the entire
+    system when neither is provided.
+    """
+
+    def __init__(self, iam_manager: Optional[IAMManager] = None):
+        self.iam_manager = iam_manager if iam_manager else IAMManager()
+        # ListPolicies doesn't include tags, cache them per policy version so that only policies
+        # which changed since the last run need a GetPolicy call
+        self._policy_tags: Dict[str, Tuple[str, Dict[str, str]]] = {}
+
+    def reconcile(self, project_name: Optional[str] = None, username: Optional[str] = None, dry_run: bool = False) -> dict:
+        if project_name and username:
+            raise ValueError("Reconciliation can be scoped to a project or a user but not both.")
+
+        known_projects = {project.name for project in project_dao.get_all(include_suspended=True)}
+        memberships, direct_members, group_users = self._desired_memberships(project_name, username)
+        # Memberships for projects that no longer exist are treated as stale
+        memberships = {project: users for project, users in memberships.items() if project in known_projects and users}
+
+        desired_roles: Dict[str, Tuple[str, str]] = {}
+        for project, users in memberships.items():
+            for user in users:
+                desired_roles[self.iam_manager._generate_iam_role_name(user, project)] = (project, user)
+
+        # Only users with a project or group membership need a user policy, any other user policies
+        # (ie for deleted users) are stale
+        users_in_scope = {user for users in memberships.values() for user in users} | group_users
+
+        existing_roles = self._list_managed_roles()
+        existing_policies = self._list_managed_policies()
+
+        actions: List[Dict[str, Any]] = []
+        user_policy_documents = self._render_user_policies(users_in_scope)
+        actions.extend(self._diff_user_policies(user_policy_documents, existing_policies))
+        actions.extend(self._diff_project_policies(memberships.keys(), existing_policies))
+
+        for role_name, (project, user) in sorted(desired_roles.items()):
+            if role_name not in existing_roles:
+                actions.append({"action": "createRole", "roleName": role_name, "project": project, "user": user})
+
+        for role_name in sorted(self._stale_roles(existing_roles, desired_roles, known_projects, project_name, username)):
+            actions.append({"action": "deleteRole", "roleName": role_name})
+
+        for project in sorted(self._stale_project_policies(existing_policies, known_projects, project_name, username)):
+            actions.append({"action": "deleteProjectPolicy", "project": project})
+
+        for user in sorted(self._stale_user_policies(existing_policies, users_in_scope, project_name, username)):
+            actions.append({"action": "deleteUserPolicy", "user": user})
+
+        errors = [] if dry_run else self._apply(actions, direct_members, user_policy_documents)
+
+        return {
+            "dryRun": dry_run,
+            "project": project_name,
+            "username": username,
+            "actions": actions,
+            "errors": errors,
+        }
+
+    def _desired_memberships(
+        self, project_name: Optional[str], username: Optional[str]
+    ) -> Tuple[Dict[str, Set[str]], Set[Tuple[str, str]], Set[str]]:
+        memberships: Dict[str, Set[str]] = defaultdict(set)
+        direct_members: Set[Tuple[str, str]] = set()
+        # Users in scope who belong to at least one group, they need a user policy even without projects
+        group_users: Set[str] = set()
+
+        if project_name:
+            for project_user in project_user_dao.get_users_for_project(project_name):
+                direct_members.add((project_name, project_user.user))
+            for project_group in project_group_dao.get_groups_for_project(project_name):
+                for group_user in group_user_dao.get_users_for_group(project_group.group_name):
+                    memberships[project_name].add(group_user.user)
+        elif username:
+            for project_user in project_user_dao.get_projects_for_user(username):
+                direct_members.add((project_user.project, username))
+            for group_user in group_user_dao.get_groups_for_user(username):
+                group_users.add(username)
+                for project_group in project_group_dao.get_projects_for_group(group_user.group):
+                    memberships[project_group.project].add(username)
+        else:
+            group_members: Dict[str, Set[str]] = defaultdict(set)
+            for group_user in group_user_dao.get_all():
+                group_members[group_user.group].add(group_user.user)
+                group_users.add(group_user.user)
+            for project_user in project_user_dao.get_all():
+                direct_members.add((project_user.project, project_user.user))
+            for project_group in project_group_dao.get_all():
+                memberships[project_group.project].update(group_members[project_group.group_name])
+
+        for project, user in direct_members:
+            memberships[project].add(user)
+
+        return memberships, direct_members, group_users
+
+    def _render_user_policies(self, usernames: Set[str]) -> Dict[str, str]:
+        # Group datasets are always stored with the "group" scope
+        existing_datasets = {dataset.name for dataset in dataset_dao.get_all_for_scope(DatasetType.GROUP, DatasetType.GROUP)}
+        datasets_for_group: Dict[str, Set[str]] = {}
+        datasets_for_user: Dict[str, Set[str]] = defaultdict(set)
+
+        for user in usernames:
+            for group_user in group_user_dao.get_groups_for_user(user):
+                if group_user.group not in datasets_for_group:
+                    datasets_for_group[group_user.group] = {
+                        group_dataset.dataset
+                        for group_dataset in group_dataset_dao.get_datasets_for_group(group_user.group)
+                        if group_dataset.dataset in existing_datasets
+                    }
+                datasets_for_user[user].update(datasets_for_group[group_user.group])
+
+        return {user: self.iam_manager._generate_user_policy(user, datasets_for_user[user]) for user in usernames}
+
+    def _diff_user_policies(
+        self, user_policy_documents: Dict[str, str], existing_policies: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        actions = []
+        for user, policy_document in sorted(user_policy_documents.items()):
+            policy_name = f"{self.iam_manager.iam_resource_prefix}-user-{user}"
+            policy_hash = self.iam_manager.generate_policy_hash(policy_document)
+            if policy_name not in existing_policies:
+                reason = "missing"
+            else:
+                reason = self._policy_drift(existing_policies[policy_name], USER_POLICY_VERSION, policy_hash)
+            if reason == "missingHash":
+                actions.append(self._tag_policy_action(existing_policies[policy_name], policy_hash))
+            elif reason:
+                actions.append({"action": "updateUserPolicy", "user": user, "reason": reason})
+        return actions
+
+    def _diff_project_policies(self, projects, existing_policies: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        actions = []
+        for project in sorted(projects):
+            policy_name = f"{self.iam_manager.iam_resource_prefix}-project-{project}"
+            policy_hash = self.iam_manager.generate_policy_hash(self.iam_manager._generate_project_policy(project))
+            if policy_name not in existing_policies:
+                reason = "missing"
+            else:
+                reason = self._policy_drift(existing_policies[policy_name], PROJECT_POLICY_VERSION, policy_hash)
+            if reason == "missingHash":
+                actions.append(self._tag_policy_action(existing_policies[policy_name], policy_hash))
+            elif reason:
+                actions.append({"action": "updateProjectPolicy", "project": project, "reason": reason})
+        return actions
+
+    def _tag_policy_action(self, policy: Dict[str, Any], policy_hash: str) -> Dict[str, Any]:
+        return {"action": "tagPolicy", "policyName": policy["PolicyName"], "policyHash": policy_hash}
+
+    def _policy_drift(self, policy: Dict[str, Any], expected_version: int, expected_hash: str) -> Optional[str]:
+        tags = self._get_policy_tags(policy)
+        if tags.get("policyVersion") != str(expected_version):
+            return "outdatedVersion"
+        if POLICY_HASH_TAG_KEY not in tags:
+            # Policies created before hashes were tracked aren't necessarily out of date, compare the
+            # current document once and tag it rather than rewriting every policy
+            if self._get_policy_document_hash(policy) == expected_hash:
+                return "missingHash"
+            return "contentDrift"
+        if tags[POLICY_HASH_TAG_KEY] != expected_hash:
+            return "contentDrift"
+        return None
+
+    def _get_policy_tags(self, policy: Dict[str, Any]) -> Dict[str, str]:
+        cached = self._policy_tags.get(policy["Arn"])
+        if cached and cached[0] == policy.get("DefaultVersionId"):
+            return cached[1]
+        response = self.iam_manager.iam_client.get_policy(PolicyArn=policy["Arn"])["Policy"]
+        tags = {tag["Key"]: tag["Value"] for tag in response.get("Tags", [])}
+        self._policy_tags[policy["Arn"]] = (response.get("DefaultVersionId"), tags)
+        return tags
+
+    def _get_policy_document_hash(self, policy: Dict[str, Any]) -> str:
+        document = self.iam_manager.iam_client.get_policy_version(
+            PolicyArn=policy["Arn"], VersionId=policy["DefaultVersionId"]
+        )["PolicyVersion"]["Document"]
+        # Boto decodes policy documents but handle the raw url encoded form as well
+        if isinstance(document, str):
+            document = urllib.parse.unquote(document)
+        else:
+            document = json.dumps(document)
+        return self.iam_manager.generate_policy_hash(document)
+
+    def _list_managed_roles(self) -> Set[str]:
+        role_prefix = f"{self.iam_manager.iam_resource_prefix}-"
+        role_names = set()
+        for page in self.iam_manager.iam_client.get_paginator("list_roles").paginate():
+            for role in page.get("Roles", []):
+                if role["RoleName"].startswith(role_prefix):
+                    role_names.add(role["RoleName"])
+        return role_names
+
+    def _list_managed_policies(self) -> Dict[str, Dict[str, Any]]:
+        policy_prefixes = (
+            f"{self.iam_manager.iam_resource_prefix}-user-",
+            f"{self.iam_manager.iam_resource_prefix}-project-",
+        )
+        policies = {}
+        for page in self.iam_manager.iam_client.get_paginator("list_policies").paginate(Scope="Local"):
+            for policy in page.get("Policies", []):
+                if policy["PolicyName"].startswith(policy_prefixes):
+                    policies[policy["PolicyName"]] = policy
+        return policies
+
+    def _project_for_role(self, role_name: str) -> Optional[str]:
+        """
+        Returns the project a role belongs to if the role name matches the dynamic user role naming
+        scheme ({prefix}-{project}-{truncated user hash}), otherwise None.
+        """
+        role_prefix = f"{self.iam_manager.iam_resource_prefix}-"
+        if not role_name.startswith(role_prefix) or "-" not in role_name[len(role_prefix) :]:
+            return None
+        project, user_hash = role_name[len(role_prefix) :].rsplit("-", 1)
+        expected_hash_length = IAM_ROLE_NAME_MAX_LENGTH - len(f"{role_prefix}{project}-") - 1
+        if not project or len(user_hash) != expected_hash_length or any(c not in "0123456789abcdef" for c in user_hash):
+            return None
+        return project
+
+    def _stale_roles(
+        self,
+        existing_roles: Set[str],
+        desired_roles: Dict[str, Tuple[str, str]],
+        known_projects: Set[str],
+        project_name: Optional[str],
+        username: Optional[str],
+    ) -> Set[str]:
+        if username:
+            # Role names can't be reversed to a user so check every role this user could have
+            candidates = {self.iam_manager._generate_iam_role_name(username, project) for project in known_projects}
+            return (existing_roles & candidates) - desired_roles.keys()
+
+        stale_roles = set()
+        for role_name in existing_roles - desired_roles.keys():
+            role_project = self._project_for_role(role_name)
+            if role_project and (not project_name or role_project == project_name):
+                stale_roles.add(role_name)
+        return stale_roles
+
+    def _stale_project_policies(
+        self,
+        existing_policies: Dict[str, Dict[str, Any]],
+        known_projects: Set[str],
+        project_name: Optional[str],
+        username: Optional[str],
+    ) -> Set[str]:
+        if username:
+            return set()
+        policy_prefix = f"{self.iam_manager.iam_resource_prefix}-project-"
+        stale_projects = set()
+        for policy_name in existing_policies:
+            if policy_name.startswith(policy_prefix):
+                policy_project = policy_name[len(policy_prefix) :]
+                if policy_project not in known_projects and (not project_name or policy_project == project_name):
+                    stale_projects.add(policy_project)
+        return stale_projects
+
+    def _stale_user_policies(
+        self,
+        existing_policies: Dict[str, Dict[str, Any]],
+        users_in_scope: Set[str],
+        project_name: Optional[str],
+        username: Optional[str],
+    ) -> Set[str]:
+        # A project only covers some of its members' memberships so it can't tell if a user policy is stale
+        if project_name:
+            return set()
+        policy_prefix = f"{self.iam_manager.iam_resource_prefix}-user-"
+        stale_users = set()
+        for policy_name in existing_policies:
+            if policy_name.startswith(policy_prefix):
+                policy_user = policy_name[len(policy_prefix) :]
+                if policy_user not in users_in_scope and (not username or policy_user == username):
+                    stale_users.add(policy_user)
+        return stale_users
+
+    def _apply(
+        self,
+        actions: List[Dict[str, Any]],
+        direct_members: Set[Tuple[str, str]],
+        user_policy_documents: Dict[str, str],
+    ) -> List[Dict[str, Any]]:
+        errors = []
+        user_policy_arns: Dict[str, str] = {}
+        project_policy_arns: Dict[str, str] = {}
+        prefix = self.iam_manager.iam_resource_prefix
+
+        # Actions are grouped by type and policies need to exist before roles can reference them
+        for action in actions:
+            try:
+                if action["action"] == "updateUserPolicy":
+                    user_policy_arns[action["user"]] = self.iam_manager.update_user_policy(
+                        action["user"], user_policy_documents[action["user"]]
+                    )
+                elif action["action"] == "updateProjectPolicy":
+                    project_policy_arns[action["project"]] = self.iam_manager.update_project_policy(
+                        action["project"], force=True
+                    )
+                elif action["action"] == "tagPolicy":
+                    policy_arn = self.iam_manager._generate_policy_arn(action["policyName"])
+                    self.iam_manager.iam_client.tag_policy(
+                        PolicyArn=policy_arn, Tags=[{"Key": POLICY_HASH_TAG_KEY, "Value": action["policyHash"]}]
+                    )
+                    self._policy_tags.pop(policy_arn, None)
+                elif action["action"] == "createRole":
+                    project, user = action["project"], action["user"]
+                    role_arn = self.iam_manager._create_project_user_role(
+                        project,
+                        user,
+                        project_policy_arns.get(project)
+                        or self.iam_manager._generate_policy_arn(f"{prefix}-project-{project}"),
+                        user_policy_arns.get(user) or self.iam_manager._generate_policy_arn(f"{prefix}-user-{user}"),
+                    )
+                    if (project, user) in direct_members:
+                        project_user = project_user_dao.get(project, user)
+                        if project_user and project_user.role != role_arn:
+                            project_user.role = role_arn
+                            project_user_dao.update(project, user, project_user)
+                elif action["action"] == "deleteRole":
+                    self.iam_manager.remove_project_user_roles([action["roleName"]])
+                elif action["action"] == "deleteProjectPolicy":
+                    self.iam_manager.iam_client.delete_policy(
+                        PolicyArn=self.iam_manager._generate_policy_arn(f"{prefix}-project-{action['project']}")
+                    )
+                elif action["action"] == "deleteUserPolicy":
+                    # Updated user policies have several versions which have to be removed first
+                    policy_arn = self.iam_manager._generate_policy_arn(f"{prefix}-user-{action['user']}")
+                    self.iam_manager._delete_unused_policy_versions(policy_arn)
+                    self.iam_manager.iam_client.delete_policy(PolicyArn=policy_arn)
+            except Exception as e:
+                logger.exception(e)
+                errors.append({**action, "error": str(e)})
+
+        return errors
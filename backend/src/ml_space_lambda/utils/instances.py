@@ -15,11 +15,10 @@
 #
 
 
-import boto3
-
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.mlspace_config import retry_config
 
-ec2 = boto3.client("ec2", config=retry_config)
+ec2 = lazy_client("ec2", config=retry_config)
 
 
 def abbreviated_instance_intersection(superset: list[str], subset: list[str]) -> list[str]:
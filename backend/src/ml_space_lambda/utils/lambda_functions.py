@@ -15,17 +15,16 @@
 import json
 import logging
 
-import boto3
-
 from ml_space_lambda.enums import EnvVariable
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.iam_manager import IAMManager
 from ml_space_lambda.utils.instances import abbreviated_instance_intersection, kms_unsupported_instances
 from ml_space_lambda.utils.mlspace_config import get_environment_variables, retry_config
 
 log = logging.getLogger(__name__)
-iam = boto3.client("iam", config=retry_config)
-ec2 = boto3.client("ec2", config=retry_config)
-sagemaker = boto3.client("sagemaker", config=retry_config)
+iam = lazy_client("iam", config=retry_config)
+ec2 = lazy_client("ec2", config=retry_config)
+sagemaker = lazy_client("sagemaker", config=retry_config)
 iam_manager = IAMManager(iam)
 
 sagemaker_shapes = [
@@ -52,7 +51,7 @@ def update_instance_kms_key_conditions(event, ctx):
     # build collection of instances used for sagemaker services
     sagemaker_instances = []
     for sagemaker_shape in sagemaker_shapes + sagemaker_eia_shapes:
-        for instance_type in sagemaker._service_model.shape_for(sagemaker_shape).enum:
+        for instance_type in sagemaker.meta.service_model.shape_for(sagemaker_shape).enum:
             sagemaker_instances.append(instance_type)
 
     # build collection of instances used for other services
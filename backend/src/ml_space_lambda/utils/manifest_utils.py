@@ -0,0 +1,107 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+from typing import List
+
+from ml_space_lambda.enums import ManifestFormat
+
+# Every part except the last must be at least 5 MiB
+MANIFEST_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_ATTRIBUTE_NAME = "source-ref"
+
+
+def manifest_header(manifest_format: ManifestFormat, bucket: str, prefix: str) -> str:
+    if manifest_format == ManifestFormat.MANIFEST:
+        # Entries in a ManifestFile are relative to the prefix in the first element
+        return "[" + json.dumps({"prefix": f"s3://{bucket}/{prefix}"})
+    return ""
+
+
+def manifest_entry(manifest_format: ManifestFormat, bucket: str, prefix: str, key: str, attribute_name: str) -> str:
+    if manifest_format == ManifestFormat.MANIFEST:
+        return ",\n" + json.dumps(key[len(prefix) :])
+    # Augmented manifests are JSON Lines with one object per record
+    return json.dumps({attribute_name: f"s3://{bucket}/{key}"}) + "\n"
+
+
+def manifest_footer(manifest_format: ManifestFormat) -> str:
+    if manifest_format == ManifestFormat.MANIFEST:
+        return "]\n"
+    return ""
+
+
+class ManifestWriter:
+    """
+    Buffers manifest content and uploads it as parts of an existing multipart upload whenever
+    the buffer reaches MANIFEST_PART_SIZE, so memory use doesn't depend on the manifest size.
+    """
+
+    def __init__(self, s3_client, bucket: str, key: str, upload_id: str, part_number: int = 1):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.upload_id = upload_id
+        self.part_number = part_number
+        self._buffer: List[bytes] = []
+        self._buffered_bytes = 0
+
+    def write(self, content: str) -> bool:
+        """
+        Adds content to the manifest and returns True if doing so caused a part to be uploaded.
+        """
+        data = content.encode("utf-8")
+        self._buffer.append(data)
+        self._buffered_bytes += len(data)
+        if self._buffered_bytes >= MANIFEST_PART_SIZE:
+            self._upload_part()
+            return True
+        return False
+
+    def buffered(self) -> bytes:
+        return b"".join(self._buffer)
+
+    def _upload_part(self):
+        self.s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=self.part_number,
+            Body=b"".join(self._buffer),
+        )
+        self.part_number += 1
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    def complete(self):
+        # The final part is allowed to be smaller than the minimum part size
+        if self._buffered_bytes or self.part_number == 1:
+            self._upload_part()
+        # Parts may have been uploaded by previous invocations so retrieve them from S3
+        parts = []
+        for page in self.s3_client.get_paginator("list_parts").paginate(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+        ):
+            parts.extend({"PartNumber": part["PartNumber"], "ETag": part["ETag"]} for part in page.get("Parts", []))
+        self.s3_client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": sorted(parts, key=lambda part: part["PartNumber"])},
+        )
+
+    def abort(self):
+        self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
@@ -0,0 +1,94 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from ml_space_lambda.enums import EnvVariable
+from ml_space_lambda.utils.client_registry import lazy_client
+from ml_space_lambda.utils.common_functions import retry_config
+from ml_space_lambda.utils.mlspace_config import get_environment_variables
+
+logger = logging.getLogger(__name__)
+
+s3 = lazy_client("s3", config=retry_config)
+
+# Cached metadata is stored in the config bucket. The objects are removed whenever the config
+# bucket is redeployed so cached values never outlive a change to the MLSpace configuration.
+METADATA_CACHE_PREFIX = "metadata-cache/"
+# Entries are refreshed by a scheduled job well before they expire
+METADATA_CACHE_TTL_SECONDS = 24 * 60 * 60
+# Values are also kept in memory for the life of the Lambda container. The in-memory copy expires
+# well before the bucket entry so that values refreshed by the scheduled job are picked up quickly.
+LOCAL_CACHE_TTL_SECONDS = 5 * 60
+# Cache name to (time.monotonic() expiry, value)
+_local_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+def _cache_key(name: str) -> str:
+    return f"{METADATA_CACHE_PREFIX}{name}.json"
+
+
+def read_cached_metadata(name: str) -> Optional[Any]:
+    """
+    Returns the cached value for the given name or None if it is missing or expired. Failures are
+    logged and treated as a cache miss so callers can always fall back to computing the value.
+    """
+    bucket = get_environment_variables()[EnvVariable.BUCKET]
+    try:
+        cache_entry = json.loads(s3.get_object(Bucket=bucket, Key=_cache_key(name))["Body"].read().decode())
+    except Exception as e:
+        if not (isinstance(e, ClientError) and e.response["Error"]["Code"] == "NoSuchKey"):
+            logger.warning(f"Unable to read cached metadata '{name}': {e}")
+        return None
+
+    if cache_entry.get("expiresAt", 0) <= time.time():
+        return None
+    return cache_entry.get("value")
+
+
+def write_cached_metadata(name: str, value: Any, ttl_seconds: int = METADATA_CACHE_TTL_SECONDS) -> None:
+    bucket = get_environment_variables()[EnvVariable.BUCKET]
+    s3.put_object(
+        Bucket=bucket,
+        Key=_cache_key(name),
+        Body=json.dumps({"expiresAt": int(time.time()) + ttl_seconds, "value": value}),
+        ContentType="application/json",
+    )
+
+
+def get_cached_metadata(name: str, loader: Callable[[], Any]) -> Any:
+    """
+    Returns the cached value for the given name, computing and storing it with the loader when
+    the cache is empty or expired.
+    """
+    local_entry = _local_cache.get(name)
+    if local_entry and local_entry[0] > time.monotonic():
+        return local_entry[1]
+
+    value = read_cached_metadata(name)
+    if value is None:
+        value = loader()
+        try:
+            write_cached_metadata(name, value)
+        except Exception as e:
+            logger.warning(f"Unable to cache metadata '{name}': {e}")
+    _local_cache[name] = (time.monotonic() + LOCAL_CACHE_TTL_SECONDS, value)
+    return value
@@ -0,0 +1,279 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+# Per invocation AWS call metrics. Botocore event hooks record the number of calls, the time spent
+# and (for DynamoDB) the consumed capacity of every request a handler makes. The totals are written
+# to stdout once per invocation in CloudWatch Embedded Metric Format so they become metrics without
+# any additional network calls.
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ml_space_lambda.enums import EnvVariable
+
+# Disabled unless turned on with the ENABLE_EMF_METRICS deployment setting
+METRICS_ENABLED = os.getenv(EnvVariable.EMF_METRICS_ENABLED, "False").lower() == "true"
+METRICS_NAMESPACE = os.getenv(EnvVariable.METRICS_NAMESPACE, "MLSpace")
+# Used as the table dimension for batch/transact calls which span several tables
+MULTIPLE_TABLES = "multiple"
+
+_HOOK_ID = "mlspace-call-metrics"
+_START_TIME_KEY = "mlspace_metrics_start"
+_TABLE_KEY = "mlspace_metrics_table"
+_MODEL_KEY = "mlspace_metrics_model"
+
+
+class CallMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = 0.0
+        self.consumed_capacity = 0.0
+
+
+class InvocationMetrics:
+    """
+    Call metrics for a single invocation keyed on (service, operation, table). Requests made from
+    worker threads (see submit_with_context) share the recorder so updates are locked.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: Dict[Tuple[str, str, Optional[str]], CallMetrics] = {}
+
+    def record(
+        self,
+        service: str,
+        operation: str,
+        latency: float,
+        table: Optional[str] = None,
+        consumed_capacity: float = 0.0,
+        error: bool = False,
+    ) -> None:
+        with self._lock:
+            metrics = self.calls.setdefault((service, operation, table), CallMetrics())
+            metrics.calls += 1
+            metrics.errors += int(error)
+            metrics.latency += latency
+            metrics.consumed_capacity += consumed_capacity
+
+    def count(self, service: Optional[str] = None, operation: Optional[str] = None, table: Optional[str] = None) -> int:
+        with self._lock:
+            return sum(
+                metrics.calls
+                for (call_service, call_operation, call_table), metrics in self.calls.items()
+                if service in (None, call_service) and operation in (None, call_operation) and table in (None, call_table)
+            )
+
+    def to_emf(self, function_name: str, timestamp: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Builds one EMF document per (service, operation, table) plus a summary for the function. EMF
+        documents can only carry one value per dimension so the breakdown can't share a document.
+        """
+        timestamp = timestamp if timestamp is not None else int(time.time() * 1000)
+        documents = []
+        total_calls = 0
+        total_latency = 0.0
+        total_capacity = 0.0
+        with self._lock:
+            calls = sorted(self.calls.items(), key=lambda item: (item[0][0], item[0][1], item[0][2] or ""))
+        for (service, operation, table), metrics in calls:
+            dimensions = ["Function", "Service", "Operation"]
+            values = {
+                "Function": function_name,
+                "Service": service,
+                "Operation": operation,
+                "Calls": metrics.calls,
+                "Errors": metrics.errors,
+                "Latency": round(metrics.latency, 3),
+            }
+            metric_definitions = [
+                {"Name": "Calls", "Unit": "Count"},
+                {"Name": "Errors", "Unit": "Count"},
+                {"Name": "Latency", "Unit": "Milliseconds"},
+            ]
+            if table:
+                dimensions.append("Table")
+                values["Table"] = table
+                values["ConsumedCapacity"] = metrics.consumed_capacity
+                metric_definitions.append({"Name": "ConsumedCapacity", "Unit": "Count"})
+            documents.append(_emf_document(timestamp, [dimensions], metric_definitions, values))
+            total_calls += metrics.calls
+            total_latency += metrics.latency
+            total_capacity += metrics.consumed_capacity
+
+        documents.append(
+            _emf_document(
+                timestamp,
+                [["Function"]],
+                [
+                    {"Name": "AwsCalls", "Unit": "Count"},
+                    {"Name": "AwsLatency", "Unit": "Milliseconds"},
+                    {"Name": "ConsumedCapacity", "Unit": "Count"},
+                ],
+                {
+                    "Function": function_name,
+                    "AwsCalls": total_calls,
+                    "AwsLatency": round(total_latency, 3),
+                    "ConsumedCapacity": total_capacity,
+                },
+            )
+        )
+        return documents
+
+
+_invocation_metrics: ContextVar[Optional[InvocationMetrics]] = ContextVar("invocation_metrics", default=None)
+# Additional recorders (ie the test suite's call budgets) which see every call independently of invocations
+_collectors: ContextVar[Tuple[InvocationMetrics, ...]] = ContextVar("metrics_collectors", default=())
+
+
+def _emf_document(
+    timestamp: int, dimensions: List[List[str]], metric_definitions: List[Dict[str, str]], values: Dict[str, Any]
+) -> Dict[str, Any]:
+    return {
+        "_aws": {
+            "Timestamp": timestamp,
+            "CloudWatchMetrics": [
+                {"Namespace": METRICS_NAMESPACE, "Dimensions": dimensions, "Metrics": metric_definitions},
+            ],
+        },
+        **values,
+    }
+
+
+def get_invocation_metrics() -> Optional[InvocationMetrics]:
+    return _invocation_metrics.get()
+
+
+def start_invocation() -> Optional[Token]:
+    """
+    Starts recording calls for the current invocation. Returns None (and keeps recording into the
+    existing metrics) when a wrapped handler is called from within another one.
+    """
+    if not METRICS_ENABLED or _invocation_metrics.get() is not None:
+        return None
+    return _invocation_metrics.set(InvocationMetrics())
+
+
+def end_invocation(token: Optional[Token], function_name: str) -> None:
+    if token is None:
+        return
+    metrics = _invocation_metrics.get()
+    _invocation_metrics.reset(token)
+    if metrics is not None and metrics.calls:
+        # EMF documents have to be the entire log line so they can't go through the logger
+        sys.stdout.write("".join(json.dumps(document, default=str) + "\n" for document in metrics.to_emf(function_name)))
+        sys.stdout.flush()
+
+
+@contextmanager
+def collect_calls() -> Iterator[InvocationMetrics]:
+    """
+    Records every instrumented call made inside the block, including those made by wrapped handlers
+    which also emit their own invocation metrics.
+    """
+    metrics = InvocationMetrics()
+    token = _collectors.set(_collectors.get() + (metrics,))
+    try:
+        yield metrics
+    finally:
+        _collectors.reset(token)
+
+
+def _active_metrics() -> List[InvocationMetrics]:
+    invocation_metrics = _invocation_metrics.get()
+    return ([invocation_metrics] if invocation_metrics is not None else []) + list(_collectors.get())
+
+
+def _get_table_name(params: Dict[str, Any]) -> Optional[str]:
+    if "TableName" in params:
+        return params["TableName"]
+    if "RequestItems" in params:
+        tables = list(params["RequestItems"])
+    elif "TransactItems" in params:
+        tables = list(
+            {operation.get("TableName") for item in params["TransactItems"] for operation in item.values() if operation}
+        )
+    else:
+        return None
+    return tables[0] if len(tables) == 1 else MULTIPLE_TABLES
+
+
+def _get_consumed_capacity(parsed: Dict[str, Any]) -> float:
+    consumed_capacity = parsed.get("ConsumedCapacity")
+    if isinstance(consumed_capacity, dict):
+        consumed_capacity = [consumed_capacity]
+    return float(sum(entry.get("CapacityUnits", 0) for entry in consumed_capacity or []))
+
+
+def _before_parameter_build(params, model, context, **kwargs):
+    if not _active_metrics():
+        return
+    if model.service_model.service_name == "dynamodb":
+        context[_TABLE_KEY] = _get_table_name(params)
+        if "ReturnConsumedCapacity" in model.input_shape.members and "ReturnConsumedCapacity" not in params:
+            params["ReturnConsumedCapacity"] = "TOTAL"
+    context[_START_TIME_KEY] = time.perf_counter()
+
+
+def _record(model, context: Dict[str, Any], parsed: Optional[Dict[str, Any]], error: bool) -> None:
+    start = context.pop(_START_TIME_KEY, None)
+    if start is None:
+        return
+    latency = (time.perf_counter() - start) * 1000
+    consumed_capacity = _get_consumed_capacity(parsed) if parsed else 0.0
+    for metrics in _active_metrics():
+        metrics.record(
+            model.service_model.service_name,
+            model.name,
+            latency,
+            table=context.get(_TABLE_KEY),
+            consumed_capacity=consumed_capacity,
+            error=error,
+        )
+
+
+def _after_call(http_response, parsed, model, context, **kwargs):
+    _record(model, context, parsed, http_response.status_code >= 300)
+
+
+def _after_call_error(context, **kwargs):
+    # Unlike after-call this doesn't include the operation model, it's stashed in the context
+    model = context.get(_MODEL_KEY)
+    if model is not None:
+        _record(model, context, None, True)
+
+
+def _before_call(model, context, **kwargs):
+    if _START_TIME_KEY in context:
+        context[_MODEL_KEY] = model
+
+
+def instrument_client(client) -> None:
+    """
+    Registers the metric hooks on a botocore client. Registering is idempotent so it's safe to call
+    for clients which have already been instrumented.
+    """
+    events = client.meta.events
+    events.register("before-parameter-build", _before_parameter_build, unique_id=f"{_HOOK_ID}-params")
+    events.register("before-call", _before_call, unique_id=f"{_HOOK_ID}-before")
+    events.register("after-call", _after_call, unique_id=f"{_HOOK_ID}-after")
+    events.register("after-call-error", _after_call_error, unique_id=f"{_HOOK_ID}-error")
@@ -16,14 +16,26 @@
 
 
 import json
+import logging
 import os
+import threading
+import time
 
-import boto3
+from botocore.exceptions import ClientError
 
 from ml_space_lambda.enums import EnvVariable
+from ml_space_lambda.utils.client_registry import get_client
 from ml_space_lambda.utils.common_functions import retry_config
 
+logger = logging.getLogger(__name__)
+
+# Seconds a cached copy of the notebook params file is used before it is revalidated against S3
+PARAM_FILE_TTL_SECONDS = 60
+
 param_file = {}
+param_file_etag = None
+param_file_refreshed_at = 0.0
+param_file_lock = threading.Lock()
 env_variables = {}
 
 ENV_DEFAULTS = {
@@ -64,22 +76,72 @@ ENV_DEFAULTS = {
 }
 
 
+def _param_file_is_fresh() -> bool:
+    return bool(param_file) and time.monotonic() - param_file_refreshed_at < PARAM_FILE_TTL_SECONDS
+
+
 def pull_config_from_s3() -> dict:
-    global param_file
-    if not param_file:
+    global param_file, param_file_etag, param_file_refreshed_at
+    if _param_file_is_fresh():
+        return param_file
+
+    with param_file_lock:
+        # Another thread (such as the init prefetch) may have refreshed the file while we waited
+        if _param_file_is_fresh():
+            return param_file
+
         bucket = os.environ["BUCKET"]
         key = os.environ["S3_KEY"]
-        s3 = boto3.client("s3", config=retry_config)
+        s3 = get_client("s3", config=retry_config)
 
-        s3_resp = s3.get_object(Bucket=bucket, Key=key)
-        param_file = json.loads(s3_resp["Body"].read().decode())
+        kwargs = {"Bucket": bucket, "Key": key}
+        if param_file and param_file_etag:
+            kwargs["IfNoneMatch"] = param_file_etag
+        try:
+            s3_resp = s3.get_object(**kwargs)
+            param_file = json.loads(s3_resp["Body"].read().decode())
+            param_file_etag = s3_resp.get("ETag")
+        except ClientError as e:
+            # A 304 means the cached copy is still current and no body was transferred
+            if not param_file or e.response["Error"]["Code"] not in ["304", "NotModified"]:
+                raise
+        param_file_refreshed_at = time.monotonic()
 
     return param_file
 
 
+def invalidate_config_cache() -> None:
+    global param_file, param_file_etag, param_file_refreshed_at
+    with param_file_lock:
+        param_file = {}
+        param_file_etag = None
+        param_file_refreshed_at = 0.0
+
+
+def prefetch_config_from_s3() -> None:
+    # Only lambdas which are configured with the params file location fetch it and only when
+    # running in lambda so the GET overlaps with the remainder of the init phase. The prefetch can
+    # be turned off by setting CONFIG_PREFETCH_ENABLED to False.
+    if os.getenv(EnvVariable.CONFIG_PREFETCH_ENABLED, "True").lower() != "true" or not (
+        os.getenv("AWS_LAMBDA_FUNCTION_NAME") and os.getenv("BUCKET") and os.getenv("S3_KEY")
+    ):
+        return
+
+    def _prefetch():
+        try:
+            pull_config_from_s3()
+        except Exception as e:
+            logger.warning(f"Unable to prefetch notebook params: {e}")
+
+    threading.Thread(target=_prefetch, daemon=True).start()
+
+
 def get_environment_variables() -> dict:
     global env_variables
     if not env_variables:
         env_variables = dict((env_var, os.getenv(env_var, ENV_DEFAULTS[env_var])) for env_var in ENV_DEFAULTS)
 
     return env_variables
+
+
+prefetch_config_from_s3()
@@ -17,17 +17,24 @@
 import logging
 from enum import Enum
 
-import boto3
-
 from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataDAO
 from ml_space_lambda.enums import ResourceType
+from ml_space_lambda.utils.client_registry import lazy_client
 from ml_space_lambda.utils.common_functions import retry_config
 
 log = logging.getLogger(__name__)
 resource_metadata_dao = ResourceMetadataDAO()
-sagemaker = boto3.client("sagemaker", config=retry_config)
-emr = boto3.client("emr", config=retry_config)
-translate = boto3.client("translate", config=retry_config)
+sagemaker = lazy_client("sagemaker", config=retry_config)
+emr = lazy_client("emr", config=retry_config)
+translate = lazy_client("translate", config=retry_config)
+
+
+class ResourceAction(str, Enum):
+    def __str__(self):
+        return str(self.value)
+
+    STOP = "stop"
+    DELETE = "delete"
 
 
 class ResourceHandlingProperty(str, Enum):
@@ -47,12 +54,36 @@ def stop_labeling_job(id=str):
     sagemaker.stop_labeling_job(LabelingJobName=id)
 
 
+def stop_notebook_instance(id=str):
+    sagemaker.stop_notebook_instance(NotebookInstanceName=id)
+
+
+def stop_training_job(id=str):
+    sagemaker.stop_training_job(TrainingJobName=id)
+
+
+def stop_transform_job(id=str):
+    sagemaker.stop_transform_job(TransformJobName=id)
+
+
+def stop_hpo_job(id=str):
+    sagemaker.stop_hyper_parameter_tuning_job(HyperParameterTuningJobName=id)
+
+
 # Delete Functions
 def delete_emr_cluster(id=str):
     emr.set_termination_protection(JobFlowIds=[id], TerminationProtected=False)
     emr.terminate_job_flows(JobFlowIds=[id])
 
 
+def delete_notebook_instance(id=str):
+    sagemaker.delete_notebook_instance(NotebookInstanceName=id)
+
+
+def delete_endpoint(id=str):
+    sagemaker.delete_endpoint(EndpointName=id)
+
+
 # A dictionary of values that support suspending or terminating resources
 resource_handling = {
     ResourceType.BATCH_TRANSLATE_JOB: {
@@ -76,6 +107,21 @@ resource_handling = {
 }
 
 
+# Actions that can be requested against individual resources through the bulk project resource API
+resource_actions = {
+    ResourceType.NOTEBOOK: {
+        ResourceAction.STOP: stop_notebook_instance,
+        ResourceAction.DELETE: delete_notebook_instance,
+    },
+    ResourceType.ENDPOINT: {ResourceAction.DELETE: delete_endpoint},
+    ResourceType.TRAINING_JOB: {ResourceAction.STOP: stop_training_job},
+    ResourceType.TRANSFORM_JOB: {ResourceAction.STOP: stop_transform_job},
+    ResourceType.HPO_JOB: {ResourceAction.STOP: stop_hpo_job},
+    ResourceType.LABELING_JOB: {ResourceAction.STOP: stop_labeling_job},
+    ResourceType.BATCH_TRANSLATE_JOB: {ResourceAction.STOP: stop_batch_translate_job},
+}
+
+
 def suspend_all_of_type(resource_type: ResourceType, project: str = None, user: str = None, fetch_all: bool = True):
     log.info(
         f"Attempting to suspend all resources of Type: {str(resource_type)} | Project: {str(project)} | User: {str(user)}"
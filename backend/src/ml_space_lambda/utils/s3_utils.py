@@ -0,0 +1,182 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from ml_space_lambda.utils.exceptions import ServiceException
+
+logger = logging.getLogger(__name__)
+
+# S3 DeleteObjects accepts at most 1000 keys per request
+DELETE_OBJECTS_BATCH_SIZE = 1000
+DEFAULT_DELETE_WORKERS = 8
+# Upper bound on the number of ListObjectsV2 pages scanned while filling a single page of results
+MAX_LIST_SCAN_PAGES = 10
+
+
+def _list_delete_batches(s3_client, bucket: str, prefix: str) -> Iterator[List[Dict]]:
+    batch: List[Dict] = []
+    for page in s3_client.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix):
+        for s3_object in page.get("Contents", []):
+            batch.append({"Key": s3_object["Key"]})
+            if len(batch) == DELETE_OBJECTS_BATCH_SIZE:
+                yield batch
+                batch = []
+
+    if batch:
+        yield batch
+
+
+def _delete_batch(s3_client, bucket: str, batch: List[Dict]) -> Dict:
+    response = s3_client.delete_objects(Bucket=bucket, Delete={"Objects": batch, "Quiet": True})
+    return {
+        # In quiet mode only failures are reported
+        "deleted": len(batch) - len(response.get("Errors", [])),
+        "errors": [
+            {key: error[key] for key in ("Key", "VersionId", "Code", "Message") if key in error}
+            for error in response.get("Errors", [])
+        ],
+    }
+
+
+def delete_prefix(
+    s3_client,
+    bucket: str,
+    prefix: str,
+    max_workers: int = DEFAULT_DELETE_WORKERS,
+    deadline: Optional[float] = None,
+) -> Dict:
+    """
+    Deletes every object under the given prefix.
+
+    The listing is paged and objects are removed with DeleteObjects in batches of up to 1000 keys
+    spread across a pool of workers. Deleted objects drop out of the listing so if any keys fail,
+    or the deadline passes before the prefix is empty, the operation can be resumed by calling
+    this again with the same prefix.
+
+    Args:
+        s3_client: The boto3 S3 client to use
+        bucket (str): The bucket containing the objects
+        prefix (str): The key prefix to delete, this should end with a "/"
+        max_workers (int): The maximum number of concurrent DeleteObjects requests
+        deadline (Optional[float]): time.monotonic() value after which no new batches are started
+
+    Return:
+        Dict: The number of deleted objects, a list of per key errors and whether the prefix was
+            fully listed
+    """
+    # Guard against accidentally deleting the entire bucket
+    if not prefix:
+        raise ValueError("A prefix is required to bulk delete objects.")
+
+    report: Dict = {"deleted": 0, "errors": [], "complete": True}
+
+    def _collect(future):
+        result = future.result()
+        report["deleted"] += result["deleted"]
+        report["errors"].extend(result["errors"])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Bound the number of in flight batches so very large prefixes don't have to be held in memory
+        in_flight: Deque = deque()
+        for batch in _list_delete_batches(s3_client, bucket, prefix):
+            if deadline is not None and time.monotonic() >= deadline:
+                report["complete"] = False
+                break
+            in_flight.append(executor.submit(_delete_batch, s3_client, bucket, batch))
+            if len(in_flight) >= max_workers * 2:
+                _collect(in_flight.popleft())
+        while in_flight:
+            _collect(in_flight.popleft())
+
+    if report["errors"]:
+        logger.error(f"Failed to delete {len(report['errors'])} objects under s3://{bucket}/{prefix}")
+
+    return report
+
+
+def delete_prefix_or_raise(s3_client, bucket: str, prefix: str, deadline: Optional[float] = None) -> Dict:
+    """
+    Deletes every object under the given prefix and raises a ServiceException if any object could
+    not be deleted. Callers should not remove the corresponding records until this succeeds with a
+    complete report so that the request can be retried.
+    """
+    report = delete_prefix(s3_client, bucket, prefix, deadline=deadline)
+    if report["errors"]:
+        first_error = report["errors"][0]
+        raise ServiceException(
+            f"Failed to delete {len(report['errors'])} objects under '{prefix}' "
+            f"({first_error.get('Code')}: {first_error.get('Message')}). Please try again.",
+            500,
+        )
+    return report
+
+
+def list_matching_objects(
+    s3_client,
+    bucket: str,
+    prefix: str,
+    matches: Callable[[Dict], bool],
+    limit: int,
+    start_after: Optional[str] = None,
+    max_pages: int = MAX_LIST_SCAN_PAGES,
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Recursively lists the objects under the given prefix which satisfy the matches predicate.
+
+    Listing continues across ListObjectsV2 pages until limit matching objects have been found,
+    the prefix is exhausted, or max_pages pages have been scanned, whichever comes first. This
+    keeps sparse filters from returning lots of near empty pages while still bounding the work
+    done per call.
+
+    Args:
+        s3_client: The boto3 S3 client to use
+        bucket (str): The bucket containing the objects
+        prefix (str): The key prefix to list
+        matches (Callable): Predicate applied to each ListObjectsV2 content entry
+        limit (int): The maximum number of matching objects to return
+        start_after (str): Only keys lexicographically after this key are considered
+        max_pages (int): The maximum number of ListObjectsV2 pages to scan
+
+    Return:
+        Tuple: The matching objects and the key to resume listing after, or None if every object
+        under the prefix has been considered
+    """
+    matching: List[Dict] = []
+    list_params = {"Bucket": bucket, "Prefix": prefix}
+    if start_after:
+        list_params["StartAfter"] = start_after
+
+    for _ in range(max_pages):
+        response = s3_client.list_objects_v2(**list_params)
+        contents = response.get("Contents", [])
+        for index, s3_object in enumerate(contents):
+            if matches(s3_object):
+                matching.append(s3_object)
+                if len(matching) == limit:
+                    exhausted = index == len(contents) - 1 and not response.get("IsTruncated")
+                    return matching, None if exhausted else s3_object["Key"]
+        if not response.get("IsTruncated"):
+            return matching, None
+        list_params["ContinuationToken"] = response["NextContinuationToken"]
+        last_scanned = contents[-1]["Key"] if contents else start_after
+
+    # Scan budget exhausted, everything up to the last scanned key has been considered
+    return matching, last_scanned
@@ -84,9 +84,9 @@ def test_create_sagemaker_resource_arn():
     assert arn == "arn:aws:sagemaker:us-east-1:123456789010:testing/*"
 
 
-@mock.patch("ml_space_lambda.utils.iam_manager.boto3")
+@mock.patch("ml_space_lambda.utils.iam_manager.get_client")
 @mock.patch("ml_space_lambda.app_configuration.policy_helper.notebook.iam")
-def test_create_instance_constraint_policy_version(iam, boto3):
+def test_create_instance_constraint_policy_version(iam, mock_get_client):
     policy_arn = "arn:aws:iam:::policy/some_policy"
     statements = []
 
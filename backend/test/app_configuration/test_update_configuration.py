@@ -13,6 +13,7 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 #
+import base64
 import json
 import time
 from unittest import mock
@@ -148,6 +149,27 @@ def test_update_config_success(
     assert lambda_handler(mock_event, mock_context) == expected_response
 
 
+@mock.patch("ml_space_lambda.app_configuration.lambda_functions.update_instance_constraint_policies")
+@mock.patch("ml_space_lambda.app_configuration.lambda_functions.app_configuration_dao")
+@mock.patch("ml_space_lambda.app_configuration.lambda_functions.iam_manager")
+@mock.patch("ml_space_lambda.app_configuration.lambda_functions.suspend_all_of_type")
+def test_update_config_base64_encoded_body(
+    mock_suspend_all_of_type,
+    mock_iam_manager,
+    mock_app_config_dao,
+    mock_update_instance_constraint_policies,
+):
+    # API Gateway base64 encodes JSON bodies since application/json is a binary media type
+    mock_event = generate_event("project_name", 1)
+    mock_event["body"] = base64.b64encode(mock_event["body"].encode()).decode()
+    mock_event["isBase64Encoded"] = True
+    mock_app_config_dao.create.return_value = None
+
+    expected_response = generate_html_response(200, "Successfully updated configuration for project_name, version 2.")
+    assert lambda_handler(mock_event, mock_context) == expected_response
+    assert mock_app_config_dao.create.call_args.kwargs["config"].change_reason == "Testing"
+
+
 @mock.patch("ml_space_lambda.app_configuration.lambda_functions.suspend_all_of_type")
 @mock.patch(
     "ml_space_lambda.app_configuration.policy_helper.active_service_policy_manager.ActiveServicePolicyManager.update_activated_services_policy"
@@ -553,6 +553,36 @@ def test_group_management(
         (MOCK_USER, None, f"project/{MOCK_PROJECT_NAME}/datasets/test-dataset/", "create", False),
         (MOCK_USER, None, f"private/{MOCK_USER.username}/datasets/test-dataset/", "create", True),
         (MOCK_USER, None, f"private/{MOCK_ADMIN_USER.username}/datasets/test-dataset/", "create", False),
+        (MOCK_USER, None, "group/datasets/test-dataset/example.txt", "presigned-url/multipart/parts", True),
+        (
+            MOCK_USER,
+            MOCK_REGULAR_PROJECT_USER,
+            f"project/{MOCK_PROJECT_NAME}/datasets/test-dataset/example.txt",
+            "presigned-url/multipart",
+            True,
+        ),
+        (
+            MOCK_USER,
+            None,
+            f"project/{MOCK_PROJECT_NAME}/datasets/test-dataset/example.txt",
+            "presigned-url/multipart/complete",
+            False,
+        ),
+        (
+            MOCK_USER,
+            None,
+            f"private/{MOCK_ADMIN_USER.username}/datasets/test-dataset/example.txt",
+            "presigned-url/multipart/abort",
+            False,
+        ),
+        (
+            MOCK_USER,
+            MOCK_REGULAR_PROJECT_USER,
+            f"project/{MOCK_PROJECT_NAME}/datasets/test-dataset/",
+            "presigned-url/batch",
+            True,
+        ),
+        (MOCK_USER, None, f"project/{MOCK_PROJECT_NAME}/datasets/test-dataset/", "presigned-url/batch", False),
     ],
     ids=[
         "global_dataset_presigned_url",
@@ -569,6 +599,12 @@ def test_group_management(
         "project_dataset_non_member_create_dataset",
         "private_same_user_create_dataset",
         "private_different_user_create_dataset",
+        "group_dataset_multipart_parts",
+        "project_dataset_member_multipart_create",
+        "project_dataset_non_member_multipart_complete",
+        "private_different_user_multipart_abort",
+        "project_dataset_member_batch_presigned_urls",
+        "project_dataset_non_member_batch_presigned_urls",
     ],
 )
 @mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
@@ -621,7 +657,7 @@ def test_generate_presigned_dataset_url(
         mock_project_user_dao.get.assert_not_called()
     if mock_type == DatasetType.GROUP:
         mock_group_user_dao.get_groups_for_user.assert_called_with(MOCK_USER.username)
-        if resource == "presigned-url":
+        if resource.startswith("presigned-url"):
             mock_group_dataset_dao.get_groups_for_dataset.assert_called_with(mock_scope)
         else:
             mock_group_dataset_dao.get_groups_for_dataset.assert_not_called()
@@ -1724,6 +1760,53 @@ def test_dataset_routes(
         mock_project_user_dao.get.assert_not_called()
 
 
+@pytest.mark.parametrize(
+    "user,scope,type,project_user,allow",
+    [
+        (MOCK_OWNER_USER, MOCK_PROJECT_NAME, DatasetType.PROJECT, None, True),
+        (MOCK_ADMIN_USER, DatasetType.GLOBAL, DatasetType.GLOBAL, None, True),
+        (MOCK_USER, DatasetType.GLOBAL, DatasetType.GLOBAL, None, False),
+        (MOCK_USER, MOCK_PROJECT_NAME, DatasetType.PROJECT, MOCK_REGULAR_PROJECT_USER, False),
+    ],
+    ids=["owner_project", "admin_global", "user_global", "project_member_project"],
+)
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+@mock.patch("ml_space_lambda.authorizer.lambda_function.project_user_dao")
+@mock.patch("ml_space_lambda.authorizer.lambda_function.user_dao")
+@mock.patch("ml_space_lambda.authorizer.lambda_function.dataset_dao")
+def test_dataset_create_manifest(
+    mock_dataset_dao,
+    mock_user_dao,
+    mock_project_user_dao,
+    user: UserModel,
+    scope: str,
+    type: str,
+    project_user: ProjectUserModel,
+    allow: bool,
+):
+    # Readers of a dataset can't write manifests into it
+    mock_dataset_dao.get.return_value = DatasetModel(
+        scope=scope,
+        type=type,
+        name="UnitTestDataset",
+        description="For unit tests",
+        location="s3://fake-location/",
+        created_by=MOCK_OWNER_USER.username,
+    )
+    mock_user_dao.get.return_value = user
+    mock_project_user_dao.get.return_value = project_user
+
+    assert lambda_handler(
+        mock_event(
+            user=user,
+            resource=f"/v2/dataset/{type}/{scope}/UnitTestDataset/manifest",
+            method="POST",
+            path_params={"type": type, "scope": scope, "datasetName": "UnitTestDataset"},
+        ),
+        {},
+    ) == policy_response(allow=allow, user=user)
+
+
 @mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
 @mock.patch("ml_space_lambda.authorizer.lambda_function.group_user_dao")
 @mock.patch("ml_space_lambda.authorizer.lambda_function.project_user_dao")
@@ -2152,6 +2235,34 @@ def test_logs_routes(
         mock_project_user_dao.get.assert_called_with(MOCK_PROJECT_NAME, user.username)
 
 
+@pytest.mark.parametrize(
+    "resource_owner,allow",
+    [(MOCK_USER.username, True), (MOCK_OWNER_USER.username, False)],
+    ids=["logs_export_resource_owner", "logs_export_project_user"],
+)
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+@mock.patch("ml_space_lambda.authorizer.lambda_function.resource_metadata_dao")
+@mock.patch("ml_space_lambda.authorizer.lambda_function.project_user_dao")
+@mock.patch("ml_space_lambda.authorizer.lambda_function.user_dao")
+def test_logs_export_route(mock_user_dao, mock_project_user_dao, mock_resource_metadata_dao, resource_owner, allow):
+    mock_user_dao.get.return_value = MOCK_USER
+    mock_project_user_dao.get.return_value = MOCK_REGULAR_PROJECT_USER
+    mock_resource_metadata_dao.get.return_value = ResourceMetadataModel(
+        MOCK_JOB_NAME, ResourceType.TRAINING_JOB, resource_owner, MOCK_PROJECT_NAME, {}
+    )
+
+    assert lambda_handler(
+        mock_event(
+            user=MOCK_USER,
+            resource=f"/job/TrainingJobs/{MOCK_JOB_NAME}/logs/export",
+            method="POST",
+            path_params={"jobType": "TrainingJobs", "jobName": MOCK_JOB_NAME},
+        ),
+        {},
+    ) == policy_response(allow=allow, user=MOCK_USER, project=MOCK_PROJECT)
+    mock_resource_metadata_dao.get.assert_called_with(MOCK_JOB_NAME, ResourceType.TRAINING_JOB)
+
+
 @pytest.mark.parametrize(
     "user,admin_only,allow",
     [
@@ -0,0 +1,126 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+
+# Pytest plugin which counts the AWS calls each test makes through instrumented clients (ie the
+# shared clients and DAOs running against moto). Tests can assert an upper bound on the calls a
+# handler makes with the call_budget fixture, which catches N+1 lookups before they reach
+# production, and a summary of the calls made by the whole suite is added to the terminal report.
+import json
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import pytest
+
+from ml_space_lambda.utils.metrics import InvocationMetrics, collect_calls
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("call-budget")
+    group.addoption(
+        "--call-report",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="Write the AWS calls made by each test to a JSON file.",
+    )
+    group.addoption(
+        "--call-report-top",
+        action="store",
+        type=int,
+        default=10,
+        help="Number of tests making the most AWS calls to list in the terminal summary.",
+    )
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(CallReport(config), "call-report")
+
+
+def _format_calls(calls: InvocationMetrics) -> str:
+    return "\n".join(
+        f"    {service} {operation}{f' ({table})' if table else ''}: {metrics.calls}"
+        for (service, operation, table), metrics in sorted(calls.calls.items(), key=lambda item: str(item[0]))
+    )
+
+
+class CallBudget:
+    @contextmanager
+    def __call__(
+        self, total: Optional[int] = None, operations: Optional[Dict[str, int]] = None, **services: int
+    ) -> Iterator[InvocationMetrics]:
+        """
+        Fails the test if the calls made inside the block exceed the given budget. Budgets can be set
+        for the total number of calls, per service (ie dynamodb=4) or per operation (ie
+        operations={"GetItem": 2}).
+        """
+        with collect_calls() as calls:
+            yield calls
+
+        exceeded = []
+        if total is not None and calls.count() > total:
+            exceeded.append(f"{calls.count()} AWS calls, budget is {total}")
+        for service, budget in services.items():
+            if calls.count(service=service) > budget:
+                exceeded.append(f"{calls.count(service=service)} {service} calls, budget is {budget}")
+        for operation, budget in (operations or {}).items():
+            if calls.count(operation=operation) > budget:
+                exceeded.append(f"{calls.count(operation=operation)} {operation} calls, budget is {budget}")
+        if exceeded:
+            pytest.fail(f"Call budget exceeded: {', '.join(exceeded)}\n{_format_calls(calls)}", pytrace=False)
+
+
+@pytest.fixture
+def call_budget() -> CallBudget:
+    return CallBudget()
+
+
+class CallReport:
+    def __init__(self, config):
+        self.config = config
+        self.calls: Dict[str, Counter] = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        with collect_calls() as calls:
+            yield
+        if calls.calls:
+            self.calls[item.nodeid] = Counter(
+                {
+                    " ".join(part for part in key if part): metrics.calls
+                    for key, metrics in sorted(calls.calls.items(), key=lambda item: str(item[0]))
+                }
+            )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        report_path = self.config.getoption("call_report")
+        if report_path:
+            with open(report_path, "w") as report_file:
+                json.dump({nodeid: dict(calls) for nodeid, calls in sorted(self.calls.items())}, report_file, indent=2)
+
+        if not self.calls:
+            return
+        totals = sum(self.calls.values(), Counter())
+        terminalreporter.section("AWS calls")
+        terminalreporter.write_line(f"{sum(totals.values())} AWS calls made by {len(self.calls)} tests")
+        for call, count in totals.most_common():
+            terminalreporter.write_line(f"    {call}: {count}")
+        top = self.config.getoption("call_report_top")
+        if top > 0:
+            terminalreporter.write_line("Tests making the most AWS calls:")
+            for nodeid, calls in sorted(self.calls.items(), key=lambda item: -sum(item[1].values()))[:top]:
+                terminalreporter.write_line(f"    {sum(calls.values()):>6} {nodeid}")
@@ -16,12 +16,19 @@
 
 import json
 import os
+from typing import Optional
 from unittest import mock
 
+import boto3
+import moto
 import pytest
 
 from ml_space_lambda.data_access_objects.dataset import DatasetModel
 from ml_space_lambda.enums import DatasetType
+from ml_space_lambda.utils.client_registry import reset_clients
+
+# Provides the call_budget fixture and the per test AWS call report
+pytest_plugins = ["call_budget"]
 
 
 # Adds global ENV variables unless they are overwritten by the test
@@ -30,6 +37,62 @@ def pytest_generate_tests(metafunc):
     os.environ["LAMBDA_TASK_ROOT"] = "./src/"
 
 
+# Clients are cached per container, start each test with a clean registry so that clients created
+# while a moto mock is active don't leak into other tests
+@pytest.fixture(autouse=True)
+def clean_client_registry():
+    reset_clients()
+    yield
+
+
+MOTO_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SECURITY_TOKEN": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+}
+
+
+def _create_table(ddb, table_name: str, hash_key: str, range_key: Optional[str] = None):
+    key_schema = [{"AttributeName": hash_key, "KeyType": "HASH"}]
+    attribute_definitions = [{"AttributeName": hash_key, "AttributeType": "S"}]
+    kwargs = {}
+    if range_key:
+        key_schema.append({"AttributeName": range_key, "KeyType": "RANGE"})
+        attribute_definitions.append({"AttributeName": range_key, "AttributeType": "S"})
+        kwargs["GlobalSecondaryIndexes"] = [
+            {
+                "IndexName": "ReverseLookup",
+                "KeySchema": [
+                    {"AttributeName": range_key, "KeyType": "HASH"},
+                    {"AttributeName": hash_key, "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ]
+    ddb.create_table(
+        TableName=table_name,
+        KeySchema=key_schema,
+        AttributeDefinitions=attribute_definitions,
+        BillingMode="PAY_PER_REQUEST",
+        **kwargs,
+    )
+
+
+# Moto backed project and group tables, used by the call budget tests so that every DAO call is counted
+@pytest.fixture
+def mock_project_group_tables():
+    with mock.patch.dict("os.environ", MOTO_ENV_CONFIG, clear=True), moto.mock_dynamodb():
+        ddb = boto3.client("dynamodb")
+        _create_table(ddb, "mlspace-projects", "name")
+        _create_table(ddb, "mlspace-project-users", "project", "user")
+        _create_table(ddb, "mlspace-project-groups", "project", "group")
+        _create_table(ddb, "mlspace-groups", "name")
+        _create_table(ddb, "mlspace-group-users", "group", "user")
+        yield
+
+
 @pytest.fixture
 def mock_global_dataset():
     return DatasetModel(
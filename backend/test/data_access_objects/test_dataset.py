@@ -187,6 +187,13 @@ class TestDatasetDAO(TestCase):
         assert from_ddb.type == DatasetType.PROJECT
         assert from_ddb.created_by == self.UPDATE_DS.created_by
 
+    def test_get_many_datasets(self):
+        from_ddb = self.dataset_dao.get_many(
+            self.UPDATE_DS.scope, ["nonexistent-dataset", self.UPDATE_DS.name, self.UPDATE_DS.name]
+        )
+        assert [dataset.to_dict() for dataset in from_ddb] == [self.UPDATE_DS.to_dict()]
+        assert self.dataset_dao.get_many(self.UPDATE_DS.scope, []) == []
+
     def test_get_nonexistent_dataset(self):
         from_ddb = self.dataset_dao.get("InvalidProject", self.UPDATE_DS.name)
         assert not from_ddb
@@ -273,3 +280,47 @@ class TestDatasetDAO(TestCase):
             if ds.type == DatasetType.PROJECT:
                 found_project = True
         assert found_global and found_group and found_private and found_project
+
+    def test_get_all_reads_every_page(self):
+        original_scan = self.ddb.scan
+        # Force multiple scan pages
+        with mock.patch.object(self.ddb, "scan", side_effect=lambda **kwargs: original_scan(Limit=2, **kwargs)) as mock_scan:
+            datasets = self.dataset_dao.get_all()
+        assert len(datasets) == 5
+        assert mock_scan.call_count == 3
+
+    def test_get_page(self):
+        names = []
+        next_token = None
+        for _ in range(3):
+            page = self.dataset_dao.get_page(limit=2, next_token=next_token)
+            assert len(page.records) <= 2
+            names.extend(f"{dataset.scope}/{dataset.name}" for dataset in page.records)
+            next_token = page.next_token
+            if not next_token:
+                break
+        assert sorted(names) == sorted(f"{dataset.scope}/{dataset.name}" for dataset in self.dataset_dao.get_all())
+
+    def test_increment_object_stats(self):
+        self.dataset_dao.increment_object_stats(self.UPDATE_DS.scope, self.UPDATE_DS.name, 2, 2048, 1000)
+        self.dataset_dao.increment_object_stats(self.UPDATE_DS.scope, self.UPDATE_DS.name, -1, -1024)
+
+        from_ddb = self.dataset_dao.get(self.UPDATE_DS.scope, self.UPDATE_DS.name)
+        assert from_ddb.object_count == 1
+        assert from_ddb.total_bytes == 1024
+        assert from_ddb.last_modified == 1000
+        assert from_ddb.to_dict()["objectCount"] == 1
+
+    def test_increment_object_stats_nonexistent_dataset(self):
+        self.dataset_dao.increment_object_stats("InvalidProject", self.UPDATE_DS.name, 1, 1024, 1000)
+        # The record should not have been created
+        assert not self.dataset_dao.get("InvalidProject", self.UPDATE_DS.name)
+
+    def test_set_object_stats(self):
+        self.dataset_dao.increment_object_stats(self.GLOBAL_DS.scope, self.GLOBAL_DS.name, 5, 5, 1000)
+        self.dataset_dao.set_object_stats(self.GLOBAL_DS.scope, self.GLOBAL_DS.name, 3, 3072, 2000)
+
+        from_ddb = self.dataset_dao.get(self.GLOBAL_DS.scope, self.GLOBAL_DS.name)
+        assert from_ddb.object_count == 3
+        assert from_ddb.total_bytes == 3072
+        assert from_ddb.last_modified == 2000
@@ -133,6 +133,65 @@ class TestDynamoDataStore(TestCase):
         with pytest.raises(KeyError):
             test_client._retrieve({"id": "12345", "type": "odd"})
 
+    def test_dynamodb_batch_create(self):
+        test_client = DynamoDBObjectStore(TEST_TABLE_NAME, self.ddb)
+        items = [{"id": f"batch-{i}", "type": "batch", "msg": default_message(f"batch-{i}")} for i in range(30)]
+        with mock.patch.object(self.ddb, "batch_write_item", wraps=self.ddb.batch_write_item) as mock_batch_write_item:
+            test_client._batch_create(items)
+
+        # 25 items per request
+        assert mock_batch_write_item.call_count == 2
+        created = test_client._batch_retrieve([{"id": item["id"], "type": "batch"} for item in items])
+        assert sorted(created, key=lambda item: item["id"]) == sorted(items, key=lambda item: item["id"])
+
+    def test_dynamodb_batch_retrieve(self):
+        test_client = DynamoDBObjectStore(TEST_TABLE_NAME, self.ddb)
+        # More keys than a single BatchGetItem request allows, including one that doesn't exist
+        keys = [{"id": f"{i}", "type": "even" if i % 2 == 0 else "odd"} for i in range(100)]
+        keys.append({"id": "12345", "type": "odd"})
+        with mock.patch.object(self.ddb, "batch_get_item", wraps=self.ddb.batch_get_item) as mock_batch_get_item:
+            dynamo_response = test_client._batch_retrieve(keys)
+
+        assert mock_batch_get_item.call_count == 2
+        assert sorted(int(item["id"]) for item in dynamo_response) == list(range(100))
+        assert all(item["msg"] == default_message(item["id"]) for item in dynamo_response)
+
+    def test_dynamodb_batch_retrieve_unprocessed_keys(self):
+        test_client = DynamoDBObjectStore(TEST_TABLE_NAME, self.ddb)
+        unprocessed_key = json.loads(dynamodb_json.dumps({"id": "13", "type": "odd"}))
+        batch_get_item = self.ddb.batch_get_item
+        responses = [
+            {"Responses": {TEST_TABLE_NAME: []}, "UnprocessedKeys": {TEST_TABLE_NAME: {"Keys": [unprocessed_key]}}},
+        ]
+        with mock.patch.object(
+            self.ddb, "batch_get_item", side_effect=lambda **kwargs: responses.pop() if responses else batch_get_item(**kwargs)
+        ) as mock_batch_get_item, mock.patch("ml_space_lambda.data_access_objects.dynamo_data_store.time.sleep"):
+            dynamo_response = test_client._batch_retrieve([{"id": "13", "type": "odd"}])
+
+        assert mock_batch_get_item.call_count == 2
+        mock_batch_get_item.assert_called_with(RequestItems={TEST_TABLE_NAME: {"Keys": [unprocessed_key]}})
+        assert [item["id"] for item in dynamo_response] == ["13"]
+
+    def test_dynamodb_query_fill_page(self):
+        test_client = DynamoDBObjectStore(TEST_TABLE_NAME, self.ddb)
+        query_kwargs = {
+            "key_condition_expression": "#t = :type",
+            "filter_expression": "begins_with(id, :prefix)",
+            "expression_names": {"#t": "type"},
+            "expression_values": json.loads(dynamodb_json.dumps({":type": "even", ":prefix": "1"})),
+            "limit": 3,
+            "page_response": True,
+            "fill_page": True,
+        }
+
+        first_page = test_client._query(**query_kwargs)
+        assert [record["id"] for record in first_page.records] == ["10", "12", "14"]
+        assert first_page.next_token
+
+        second_page = test_client._query(**query_kwargs, next_token=first_page.next_token)
+        assert [record["id"] for record in second_page.records] == ["16", "18"]
+        assert second_page.next_token is None
+
     def test_dynamodb_delete_success(self):
         to_delete_key = {"id": {"S": "99"}, "type": {"S": "odd"}}
         pre_delete = self.ddb.get_item(TableName=TEST_TABLE_NAME, Key=to_delete_key)
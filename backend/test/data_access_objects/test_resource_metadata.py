@@ -254,6 +254,22 @@ class TestResourceMetadataDAO(TestCase):
         from_ddb = self.resource_metadata_dao.get("fakeArn:0", ResourceType.NOTEBOOK)
         assert not from_ddb
 
+    def test_get_many_resource_metadata(self):
+        # "fakeArn:0" is a batch translate job, so the notebook key and the fake key don't exist
+        from_ddb = self.resource_metadata_dao.get_many(
+            [
+                ("fakeArn:0", ResourceType.BATCH_TRANSLATE_JOB),
+                ("fakeArn:0", ResourceType.NOTEBOOK),
+                ("fakeArn:1", ResourceType.NOTEBOOK),
+                ("fakeArn:1", ResourceType.NOTEBOOK),
+                ("fakeArn:not-real", ResourceType.NOTEBOOK),
+            ]
+        )
+        assert sorted((record.id, record.type) for record in from_ddb) == [
+            ("fakeArn:0", ResourceType.BATCH_TRANSLATE_JOB),
+            ("fakeArn:1", ResourceType.NOTEBOOK),
+        ]
+
     def test_get_resources_for_project(self):
         # 20 of the total 29 notebooks should be for TestProject and the other 9 should be for
         # DemoProject
@@ -235,6 +235,19 @@ class TestDatasetDAO(TestCase):
         to_delete = self.ddb.get_item(TableName=self.TEST_TABLE, Key=delete_item_key)
         assert "Item" not in to_delete
 
+    def test_resource_scheduler_delete_many(self):
+        self.resource_scheduler_dao.delete_many(
+            [
+                (self.DELETE_RECORD.resource_id, self.DELETE_RECORD.resource_type),
+                ("resource-id-1", ResourceType.NOTEBOOK),
+                ("not-a-resource", ResourceType.ENDPOINT),
+            ]
+        )
+
+        assert not self.resource_scheduler_dao.get(self.DELETE_RECORD.resource_id, self.DELETE_RECORD.resource_type)
+        assert not self.resource_scheduler_dao.get("resource-id-1", ResourceType.NOTEBOOK)
+        assert self.resource_scheduler_dao.get("resource-id-2", ResourceType.NOTEBOOK)
+
     def test_get_resources_past_termination_time(self):
         # retrieve the 10 seeded projects we added with single digit termination times
         expired_resources = self.resource_scheduler_dao.get_resources_past_termination_time(termination_time=10)
@@ -0,0 +1,150 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+from unittest import mock
+
+import pytest
+
+from ml_space_lambda.data_access_objects.dataset import DatasetModel
+from ml_space_lambda.utils.common_functions import generate_html_response
+
+TEST_ENV_CONFIG = {"AWS_DEFAULT_REGION": "us-east-1", "DATA_BUCKET": "mlspace-data-bucket"}
+
+mock_context = mock.Mock()
+
+# Need to mock the region in order to do the import......
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.dataset.lambda_functions import batch_presigned_urls
+
+MOCK_PROJECT = "project_name"
+MOCK_PREFIX = f"project/{MOCK_PROJECT}/datasets/example_dataset/"
+MOCK_DATASET = DatasetModel(
+    scope=MOCK_PROJECT,
+    type="project",
+    name="example_dataset",
+    description="",
+    location=f"s3://{TEST_ENV_CONFIG['DATA_BUCKET']}/{MOCK_PREFIX}",
+    created_by="jdoe",
+)
+
+
+def _mock_event(body: dict, dataset_type: str = "project", scope: str = MOCK_PROJECT):
+    return {
+        "body": json.dumps(body),
+        "headers": {"x-mlspace-dataset-type": dataset_type, "x-mlspace-dataset-scope": scope},
+        "requestContext": {"authorizer": {"principalId": "jdoe"}},
+    }
+
+
+def _mock_presign(ClientMethod, Params, ExpiresIn):
+    return f"https://signed/{Params['Key']}"
+
+
+def _expected_urls(keys):
+    return [{"key": key, "url": f"https://signed/{key}"} for key in keys]
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_batch_presigned_urls_prefix(mock_s3, mock_dataset_dao):
+    mock_dataset_dao.get.return_value = MOCK_DATASET
+    keys = [f"{MOCK_PREFIX}file{i}.csv" for i in range(2)]
+    mock_s3.list_objects_v2.return_value = {
+        "Contents": [{"Key": key} for key in keys],
+        "NextContinuationToken": "next-page",
+    }
+    mock_s3.generate_presigned_url.side_effect = _mock_presign
+    expected_response = generate_html_response(200, {"nextToken": "next-page", "urls": _expected_urls(keys)})
+
+    assert (
+        batch_presigned_urls(_mock_event({"prefix": MOCK_PREFIX, "pageSize": 2, "nextToken": "this-page"}), mock_context)
+        == expected_response
+    )
+    mock_s3.list_objects_v2.assert_called_with(
+        Bucket=TEST_ENV_CONFIG["DATA_BUCKET"], Prefix=MOCK_PREFIX, MaxKeys=2, ContinuationToken="this-page"
+    )
+    assert mock_s3.generate_presigned_url.call_count == 2
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_batch_presigned_urls_page_size_capped(mock_s3, mock_dataset_dao):
+    mock_dataset_dao.get.return_value = MOCK_DATASET
+    mock_s3.list_objects_v2.return_value = {}
+    expected_response = generate_html_response(200, {"urls": []})
+
+    assert batch_presigned_urls(_mock_event({"prefix": MOCK_PREFIX, "pageSize": 5000}), mock_context) == expected_response
+    mock_s3.list_objects_v2.assert_called_with(Bucket=TEST_ENV_CONFIG["DATA_BUCKET"], Prefix=MOCK_PREFIX, MaxKeys=1000)
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_batch_presigned_urls_keys(mock_s3):
+    keys = [f"{MOCK_PREFIX}file{i}.csv" for i in range(5)]
+    mock_s3.generate_presigned_url.side_effect = _mock_presign
+
+    first_page = batch_presigned_urls(_mock_event({"keys": keys, "pageSize": 3}), mock_context)
+    assert first_page == generate_html_response(200, {"nextToken": "3", "urls": _expected_urls(keys[:3])})
+
+    last_page = batch_presigned_urls(_mock_event({"keys": keys, "pageSize": 3, "nextToken": "3"}), mock_context)
+    assert last_page == generate_html_response(200, {"urls": _expected_urls(keys[3:])})
+    mock_s3.list_objects_v2.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_batch_presigned_urls_key_outside_dataset(mock_s3):
+    keys = [f"{MOCK_PREFIX}file.csv", "project/other_project/datasets/example_dataset/file.csv"]
+    expected_response = generate_html_response(400, "Bad Request: Dataset headers do not match expected type and scope.")
+
+    assert batch_presigned_urls(_mock_event({"keys": keys}), mock_context) == expected_response
+    mock_s3.generate_presigned_url.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_batch_presigned_urls_prefix_outside_dataset(mock_s3):
+    expected_response = generate_html_response(400, "Bad Request: Dataset headers do not match expected type and scope.")
+
+    assert batch_presigned_urls(_mock_event({"prefix": MOCK_PREFIX}, scope="other_project"), mock_context) == expected_response
+    mock_s3.list_objects_v2.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "prefix,message",
+    [
+        (f"project/{MOCK_PROJECT}/datasets/example", "prefix must start with the dataset prefix."),
+        (f"project/{MOCK_PROJECT}/datasets/example_dataset", "prefix must start with the dataset prefix."),
+        (f"project/{MOCK_PROJECT}", "Key does not belong to a dataset."),
+        ("project", "Key does not belong to a dataset."),
+    ],
+    ids=["sibling_dataset", "missing_trailing_slash", "no_dataset", "type_only"],
+)
+@mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_batch_presigned_urls_prefix_outside_dataset_root(mock_s3, mock_dataset_dao, prefix, message):
+    # Listing "example" would also include the objects of every dataset starting with "example"
+    mock_dataset_dao.get.return_value = MOCK_DATASET
+    expected_response = generate_html_response(400, f"Bad Request: {message}")
+
+    assert batch_presigned_urls(_mock_event({"prefix": prefix}), mock_context) == expected_response
+    mock_s3.list_objects_v2.assert_not_called()
+    mock_s3.generate_presigned_url.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_batch_presigned_urls_missing_selection(mock_s3):
+    expected_response = generate_html_response(400, "Bad Request: Either a prefix or a list of keys is required.")
+
+    assert batch_presigned_urls(_mock_event({}), mock_context) == expected_response
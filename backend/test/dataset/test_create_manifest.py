@@ -0,0 +1,185 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+from unittest import mock
+
+import boto3
+import moto
+import pytest
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "DATA_BUCKET": "mlspace-data-bucket",
+    # Fake cred info for MOTO
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SECURITY_TOKEN": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+}
+
+mock_context = mock.Mock()
+
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.dataset.lambda_functions import create_manifest as lambda_handler
+
+DATA_BUCKET = TEST_ENV_CONFIG["DATA_BUCKET"]
+DATASET_PREFIX = "global/datasets/example_dataset/"
+DATASET_KEYS = [f"{DATASET_PREFIX}images/img{i:03}.png" for i in range(40)] + [
+    f"{DATASET_PREFIX}labels/label{i:03}.json" for i in range(10)
+]
+
+
+@pytest.fixture
+def s3(mock_global_dataset):
+    with moto.mock_s3(), mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+        s3 = boto3.client("s3")
+        s3.create_bucket(Bucket=DATA_BUCKET)
+        for key in DATASET_KEYS:
+            s3.put_object(Bucket=DATA_BUCKET, Key=key, Body=b"data")
+        with mock.patch("ml_space_lambda.dataset.lambda_functions.s3", s3), mock.patch(
+            "ml_space_lambda.dataset.lambda_functions.dataset_dao"
+        ) as mock_dataset_dao:
+            mock_dataset_dao.get.return_value = mock_global_dataset
+            yield s3
+
+
+def _create_manifest(body: dict) -> dict:
+    event = {
+        "pathParameters": {"type": "global", "scope": "global", "datasetName": "example_dataset"},
+        "body": json.dumps(body),
+    }
+    response = lambda_handler(event, mock_context)
+    assert response["statusCode"] == 200, response["body"]
+    return json.loads(response["body"])
+
+
+def _read_manifest(s3, manifest_uri: str) -> str:
+    key = manifest_uri[len(f"s3://{DATA_BUCKET}/") :]
+    return s3.get_object(Bucket=DATA_BUCKET, Key=key)["Body"].read().decode("utf-8")
+
+
+def test_create_manifest(s3):
+    response = _create_manifest({})
+
+    assert response["format"] == "ManifestFile"
+    assert response["objectCount"] == len(DATASET_KEYS)
+    assert response["manifestUri"].startswith(f"s3://{DATA_BUCKET}/{DATASET_PREFIX}_manifests/")
+    manifest = json.loads(_read_manifest(s3, response["manifestUri"]))
+    assert manifest[0] == {"prefix": f"s3://{DATA_BUCKET}/{DATASET_PREFIX}"}
+    assert manifest[1:] == [key[len(DATASET_PREFIX) :] for key in DATASET_KEYS]
+
+    # Previously generated manifests are excluded from the listing
+    assert _create_manifest({})["objectCount"] == len(DATASET_KEYS)
+
+
+def test_create_augmented_manifest_with_filter(s3):
+    response = _create_manifest({"format": "AugmentedManifestFile", "attributeName": "label-ref", "suffix": ".json"})
+
+    assert response["objectCount"] == 10
+    lines = _read_manifest(s3, response["manifestUri"]).splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"label-ref": f"s3://{DATA_BUCKET}/{key}"} for key in DATASET_KEYS if key.endswith(".json")
+    ]
+
+
+def test_create_augmented_manifest_no_matches(s3):
+    event = {
+        "pathParameters": {"type": "global", "scope": "global", "datasetName": "example_dataset"},
+        "body": json.dumps({"format": "AugmentedManifestFile", "suffix": ".csv"}),
+    }
+    response = lambda_handler(event, mock_context)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"]) == "Bad Request: No objects in the dataset match the requested filters."
+    assert s3.list_multipart_uploads(Bucket=DATA_BUCKET).get("Uploads", []) == []
+
+
+def test_create_manifest_resumes_across_requests(s3):
+    # Upload a part for every few entries and stop after each one
+    with mock.patch("ml_space_lambda.utils.manifest_utils.MANIFEST_PART_SIZE", 200), mock.patch(
+        "ml_space_lambda.dataset.lambda_functions.MANIFEST_TIME_BUDGET_SECONDS", -1
+    ), mock.patch("moto.s3.models.S3_UPLOAD_PART_MIN_SIZE", 0):
+        requests = 1
+        response = _create_manifest({"format": "ManifestFile", "pattern": "images/*"})
+        while "nextToken" in response:
+            assert 0 < response["objectCount"] <= 40
+            requests += 1
+            response = _create_manifest({"nextToken": response["nextToken"]})
+
+    assert requests > 2
+    assert response["objectCount"] == 40
+    manifest = json.loads(_read_manifest(s3, response["manifestUri"]))
+    assert manifest[1:] == [key[len(DATASET_PREFIX) :] for key in DATASET_KEYS if "/images/" in key]
+
+
+def test_create_manifest_checks_deadline_after_every_page(s3):
+    # A sparse filter never fills a part, progress is carried in a pending object between requests
+    with mock.patch("ml_space_lambda.dataset.lambda_functions.MANIFEST_LIST_PAGE_SIZE", 10), mock.patch(
+        "ml_space_lambda.dataset.lambda_functions.MANIFEST_TIME_BUDGET_SECONDS", -1
+    ):
+        requests = 1
+        response = _create_manifest({"format": "AugmentedManifestFile", "suffix": "5.png"})
+        while "nextToken" in response:
+            requests += 1
+            response = _create_manifest({"nextToken": response["nextToken"]})
+
+    assert requests == 5
+    assert response["objectCount"] == 4
+    lines = _read_manifest(s3, response["manifestUri"]).splitlines()
+    assert [json.loads(line)["source-ref"] for line in lines] == [
+        f"s3://{DATA_BUCKET}/{key}" for key in DATASET_KEYS if key.endswith("5.png")
+    ]
+    # Only the manifest itself is left behind
+    manifest_objects = s3.list_objects_v2(Bucket=DATA_BUCKET, Prefix=f"{DATASET_PREFIX}_manifests/")["Contents"]
+    assert [s3_object["Key"] for s3_object in manifest_objects] == [response["manifestUri"][len(f"s3://{DATA_BUCKET}/") :]]
+
+
+def test_create_manifest_rejects_foreign_token(s3):
+    from ml_space_lambda.data_access_objects.pagination_helper import encode_pagination_token
+
+    token = encode_pagination_token({"key": "private/someone/datasets/other/_manifests/x.manifest", "uploadId": "id"})
+    event = {
+        "pathParameters": {"type": "global", "scope": "global", "datasetName": "example_dataset"},
+        "body": json.dumps({"nextToken": token}),
+    }
+    response = lambda_handler(event, mock_context)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"]) == "Bad Request: Invalid nextToken for the requested dataset."
+
+
+def test_create_manifest_invalid_format(s3):
+    event = {
+        "pathParameters": {"type": "global", "scope": "global", "datasetName": "example_dataset"},
+        "body": json.dumps({"format": "S3Prefix"}),
+    }
+    response = lambda_handler(event, mock_context)
+
+    assert response["statusCode"] == 400
+    assert s3.list_multipart_uploads(Bucket=DATA_BUCKET).get("Uploads", []) == []
+
+
+def test_create_manifest_invalid_filter(s3):
+    event = {
+        "pathParameters": {"type": "global", "scope": "global", "datasetName": "example_dataset"},
+        "body": json.dumps({"minSize": "large"}),
+    }
+    response = lambda_handler(event, mock_context)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"]) == "Bad Request: minSize must be an integer."
+    assert s3.list_multipart_uploads(Bucket=DATA_BUCKET).get("Uploads", []) == []
@@ -33,7 +33,7 @@ with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
 
 
 @mock.patch("ml_space_lambda.dataset.lambda_functions.group_dataset_dao")
-@mock.patch("ml_space_lambda.dataset.lambda_functions.s3_resource")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
 @mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
 def test_delete_dataset_success_without_groups(mock_dataset_dao, mock_s3, group_dataset_dao, mock_private_dataset):
     mock_event = {
@@ -43,24 +43,49 @@ def test_delete_dataset_success_without_groups(mock_dataset_dao, mock_s3, group_
         },
     }
 
-    mock_bucket = mock.MagicMock()
-    mock_s3.Bucket.return_value = mock_bucket
+    mock_s3.get_paginator.return_value.paginate.return_value = [{"Contents": [{"Key": "file.txt"}]}]
+    mock_s3.delete_objects.return_value = {}
     mock_dataset_dao.get.return_value = mock_private_dataset
     mock_dataset_dao.delete.return_value = None
     expected_response = generate_html_response(200, f"Successfully deleted {mock_private_dataset.name}")
 
     assert lambda_handler(mock_event, mock_context) == expected_response
 
-    mock_bucket.objects.filter.assert_called_with(
-        Prefix=f"private/{mock_private_dataset.scope}/datasets/{mock_private_dataset.name}/"
+    mock_s3.get_paginator.return_value.paginate.assert_called_with(
+        Bucket=mock.ANY, Prefix=f"private/{mock_private_dataset.scope}/datasets/{mock_private_dataset.name}/"
     )
+    mock_s3.delete_objects.assert_called_once()
     mock_dataset_dao.get.assert_called_with(mock_private_dataset.scope, mock_private_dataset.name)
     mock_dataset_dao.delete.assert_called_with(mock_private_dataset.scope, mock_private_dataset.name)
 
 
+@mock.patch("ml_space_lambda.dataset.lambda_functions.DELETE_TIME_BUDGET_SECONDS", 0)
+@mock.patch("ml_space_lambda.dataset.lambda_functions.group_dataset_dao")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
+def test_delete_dataset_in_progress(mock_dataset_dao, mock_s3, group_dataset_dao, mock_private_dataset):
+    mock_event = {
+        "pathParameters": {
+            "scope": mock_private_dataset.scope,
+            "datasetName": mock_private_dataset.name,
+        },
+    }
+
+    mock_s3.get_paginator.return_value.paginate.return_value = [{"Contents": [{"Key": "file.txt"}]}]
+    mock_dataset_dao.get.return_value = mock_private_dataset
+
+    # The time budget is exhausted before any files are deleted so the request needs to be repeated
+    expected_response = generate_html_response(200, {"status": "InProgress", "deleted": 0})
+    assert lambda_handler(mock_event, mock_context) == expected_response
+
+    mock_s3.delete_objects.assert_not_called()
+    mock_dataset_dao.delete.assert_not_called()
+    group_dataset_dao.get_groups_for_dataset.assert_not_called()
+
+
 @mock.patch("ml_space_lambda.dataset.lambda_functions.iam_manager")
 @mock.patch("ml_space_lambda.dataset.lambda_functions.group_dataset_dao")
-@mock.patch("ml_space_lambda.dataset.lambda_functions.s3_resource")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
 @mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
 def test_delete_dataset_success_with_groups(
     mock_dataset_dao, mock_s3, group_dataset_dao, mock_iam_manager, mock_private_dataset
@@ -75,8 +100,8 @@ def test_delete_dataset_success_with_groups(
     group_dataset_1 = GroupDatasetModel(group_name="TestGroup1", dataset_name="TestDataset1")
     group_dataset_2 = GroupDatasetModel(group_name="TestGroup2", dataset_name="TestDataset2")
 
-    mock_bucket = mock.MagicMock()
-    mock_s3.Bucket.return_value = mock_bucket
+    mock_s3.get_paginator.return_value.paginate.return_value = [{"Contents": [{"Key": "file.txt"}]}]
+    mock_s3.delete_objects.return_value = {}
     mock_dataset_dao.get.return_value = mock_private_dataset
     group_dataset_dao.get_groups_for_dataset.return_value = [group_dataset_1, group_dataset_2]
     mock_dataset_dao.delete.return_value = None
@@ -84,9 +109,10 @@ def test_delete_dataset_success_with_groups(
 
     assert lambda_handler(mock_event, mock_context) == expected_response
 
-    mock_bucket.objects.filter.assert_called_with(
-        Prefix=f"private/{mock_private_dataset.scope}/datasets/{mock_private_dataset.name}/"
+    mock_s3.get_paginator.return_value.paginate.assert_called_with(
+        Bucket=mock.ANY, Prefix=f"private/{mock_private_dataset.scope}/datasets/{mock_private_dataset.name}/"
     )
+    mock_s3.delete_objects.assert_called_once()
     mock_dataset_dao.get.assert_called_with(mock_private_dataset.scope, mock_private_dataset.name)
     mock_dataset_dao.delete.assert_called_with(mock_private_dataset.scope, mock_private_dataset.name)
     group_dataset_dao.get_groups_for_dataset.assert_called_with(mock_private_dataset.name)
@@ -99,7 +125,7 @@ def test_delete_dataset_success_with_groups(
     mock_iam_manager.update_groups.assert_called()
 
 
-@mock.patch("ml_space_lambda.dataset.lambda_functions.s3_resource")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
 @mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
 def test_delete_non_existent_dataset(mock_dataset_dao, mock_s3):
     dataset_name = "example_dataset"
@@ -109,8 +135,8 @@ def test_delete_non_existent_dataset(mock_dataset_dao, mock_s3):
         "pathParameters": {"scope": username, "datasetName": dataset_name},
     }
 
-    mock_bucket = mock.MagicMock()
-    mock_s3.Bucket.return_value = mock_bucket
+    mock_s3.get_paginator.return_value.paginate.return_value = [{"Contents": [{"Key": "file.txt"}]}]
+    mock_s3.delete_objects.return_value = {}
     mock_dataset_dao.get.return_value = None
     mock_dataset_dao.delete.return_value = None
 
@@ -118,11 +144,11 @@ def test_delete_non_existent_dataset(mock_dataset_dao, mock_s3):
 
     assert lambda_handler(mock_event, mock_context) == expected_response
 
-    mock_bucket.objects.filter.assert_not_called()
+    mock_s3.get_paginator.assert_not_called()
     mock_dataset_dao.delete.assert_not_called()
 
 
-@mock.patch("ml_space_lambda.dataset.lambda_functions.s3_resource")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
 @mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
 def test_delete_dataset_client_error(mock_dataset_dao, mock_s3, mock_global_dataset):
     error_msg = {
@@ -142,22 +168,49 @@ def test_delete_dataset_client_error(mock_dataset_dao, mock_s3, mock_global_data
         },
     }
 
-    mock_bucket = mock.MagicMock()
-    mock_s3.Bucket.return_value = mock_bucket
+    mock_s3.get_paginator.return_value.paginate.return_value = [{"Contents": [{"Key": "file.txt"}]}]
+    mock_s3.delete_objects.return_value = {}
     mock_dataset_dao.get.return_value = mock_global_dataset
-    mock_bucket.objects.filter(Prefix=f"global/datasets/{mock_global_dataset.name}/").delete.side_effect = ClientError(
-        error_msg, "Delete"
+    mock_s3.delete_objects.side_effect = ClientError(error_msg, "Delete")
+
+    assert lambda_handler(mock_event, mock_context) == expected_response
+
+    mock_s3.get_paginator.return_value.paginate.assert_called_with(
+        Bucket=mock.ANY, Prefix=f"global/datasets/{mock_global_dataset.name}/"
     )
+    mock_dataset_dao.delete.assert_not_called()
 
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.group_dataset_dao")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
+def test_delete_dataset_partial_failure(mock_dataset_dao, mock_s3, group_dataset_dao, mock_global_dataset):
+    mock_event = {
+        "pathParameters": {
+            "scope": mock_global_dataset.scope,
+            "datasetName": mock_global_dataset.name,
+        },
+    }
+    mock_dataset_dao.get.return_value = mock_global_dataset
+    mock_s3.get_paginator.return_value.paginate.return_value = [{"Contents": [{"Key": "a.txt"}, {"Key": "b.txt"}]}]
+    mock_s3.delete_objects.return_value = {"Errors": [{"Key": "b.txt", "Code": "AccessDenied", "Message": "Access Denied"}]}
+
+    expected_response = generate_html_response(
+        500,
+        f"Failed to delete 1 objects under 'global/datasets/{mock_global_dataset.name}/' "
+        "(AccessDenied: Access Denied). Please try again.",
+    )
     assert lambda_handler(mock_event, mock_context) == expected_response
 
-    mock_bucket.objects.filter.assert_called_with(Prefix=f"global/datasets/{mock_global_dataset.name}/")
+    # The record is kept so the delete can be retried
+    mock_dataset_dao.delete.assert_not_called()
+    group_dataset_dao.get_groups_for_dataset.assert_not_called()
 
 
-@mock.patch("ml_space_lambda.dataset.lambda_functions.s3_resource")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
 @mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
 def test_delete_dataset_missing_parameters(mock_dataset_dao, mock_s3):
     expected_response = generate_html_response(400, "Missing event parameter: 'pathParameters'")
     assert lambda_handler({}, mock_context) == expected_response
-    mock_s3.Bucket.assert_not_called()
+    mock_s3.get_paginator.assert_not_called()
     mock_dataset_dao.get.assert_not_called()
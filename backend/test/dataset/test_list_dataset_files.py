@@ -265,3 +265,13 @@ def test_list_dataset_files_missing_parameters(mock_s3, mock_dataset_dao):
     assert lambda_handler({}, mock_context) == expected_response
     mock_s3.list_objects_v2.assert_not_called()
     mock_dataset_dao.get.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_list_dataset_files_invalid_page_size(mock_s3, mock_dataset_dao, mock_global_dataset):
+    mock_dataset_dao.get.return_value = mock_global_dataset
+    expected_response = generate_html_response(400, "Bad Request: pageSize must be an integer.")
+
+    assert lambda_handler(build_mock_event(mock_global_dataset, {"pageSize": "all"}), mock_context) == expected_response
+    mock_s3.list_objects_v2.assert_not_called()
@@ -0,0 +1,162 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+from unittest import mock
+
+import boto3
+import moto
+import pytest
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "DATA_BUCKET": "mlspace-data-bucket",
+    # Fake cred info for MOTO
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SECURITY_TOKEN": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+}
+
+mock_context = mock.Mock()
+
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.dataset.lambda_functions import list_files as lambda_handler
+
+DATASET_PREFIX = "global/datasets/example_dataset/"
+DATASET_KEYS = (
+    [f"{DATASET_PREFIX}root{i}.csv" for i in range(3)]
+    + [f"{DATASET_PREFIX}a/deep/nested/file{i}.csv" for i in range(5)]
+    + [f"{DATASET_PREFIX}a/deep/nested/file{i}.json" for i in range(5)]
+    + [f"{DATASET_PREFIX}b/file{i}.csv" for i in range(4)]
+    + ["global/datasets/other_dataset/file.csv"]
+)
+
+
+@pytest.fixture
+def data_bucket(mock_global_dataset):
+    with moto.mock_s3(), mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+        s3 = boto3.client("s3")
+        s3.create_bucket(Bucket=TEST_ENV_CONFIG["DATA_BUCKET"])
+        for key in DATASET_KEYS:
+            s3.put_object(Bucket=TEST_ENV_CONFIG["DATA_BUCKET"], Key=key, Body=b"x" * (10 if key.endswith(".json") else 100))
+        with mock.patch("ml_space_lambda.dataset.lambda_functions.s3", s3), mock.patch(
+            "ml_space_lambda.dataset.lambda_functions.dataset_dao"
+        ) as mock_dataset_dao:
+            mock_dataset_dao.get.return_value = mock_global_dataset
+            yield s3
+
+
+def _list(query: dict) -> dict:
+    event = {
+        "pathParameters": {"scope": "global", "datasetName": "example_dataset"},
+        "queryStringParameters": {"recursive": "true", **query},
+    }
+    response = lambda_handler(event, mock_context)
+    assert response["statusCode"] == 200, response["body"]
+    return json.loads(response["body"])
+
+
+def _list_all(query: dict) -> list:
+    keys = []
+    next_token = None
+    while True:
+        page = _list({**query, **({"nextToken": next_token} if next_token else {})})
+        keys.extend(content["key"] for content in page["contents"])
+        next_token = page.get("nextToken")
+        if not next_token:
+            return keys
+
+
+def _expected(predicate=lambda key: True):
+    return sorted(key for key in DATASET_KEYS if key.startswith(DATASET_PREFIX) and predicate(key))
+
+
+@pytest.mark.parametrize("parallel", ["false", "true"], ids=["sequential", "parallel"])
+def test_list_files_recursive(data_bucket, parallel):
+    page = _list({"parallel": parallel})
+
+    assert [content["key"] for content in page["contents"]] == _expected()
+    assert all(content["type"] == "object" for content in page["contents"])
+    assert "nextToken" not in page
+
+
+@pytest.mark.parametrize("parallel", ["false", "true"], ids=["sequential", "parallel"])
+def test_list_files_recursive_fills_pages(data_bucket, parallel):
+    first_page = _list({"parallel": parallel, "pageSize": 4, "suffix": ".csv"})
+
+    assert len(first_page["contents"]) == 4
+    assert first_page["nextToken"] == first_page["contents"][-1]["key"]
+    assert _list_all({"parallel": parallel, "pageSize": 4, "suffix": ".csv"}) == _expected(lambda key: key.endswith(".csv"))
+
+
+def test_list_files_recursive_pattern_and_size(data_bucket):
+    assert _list_all({"pattern": "a/*.json"}) == _expected(lambda key: key.endswith(".json"))
+    assert _list_all({"minSize": "50"}) == _expected(lambda key: not key.endswith(".json"))
+    assert _list_all({"maxSize": "50", "pattern": "b/*"}) == []
+
+
+def test_list_files_recursive_modified_filters(data_bucket):
+    assert _list_all({"modifiedAfter": "2000-01-01T00:00:00Z"}) == _expected()
+    assert _list_all({"modifiedBefore": "2000-01-01T00:00:00"}) == []
+
+
+def test_list_files_recursive_with_prefix(data_bucket):
+    assert _list_all({"prefix": "a/", "parallel": "true"}) == _expected(lambda key: "/a/" in key)
+
+
+def test_list_files_recursive_scan_budget(data_bucket):
+    with mock.patch("ml_space_lambda.utils.s3_utils.MAX_LIST_SCAN_PAGES", 1):
+        data_bucket_list = data_bucket.list_objects_v2
+        # Force small S3 pages so a sparse filter needs more than one page per request
+        with mock.patch.object(data_bucket, "list_objects_v2", lambda **kwargs: data_bucket_list(MaxKeys=2, **kwargs)):
+            keys = _list_all({"suffix": "file4.json"})
+
+    assert keys == [f"{DATASET_PREFIX}a/deep/nested/file4.json"]
+
+
+def test_list_files_recursive_invalid_token(data_bucket):
+    event = {
+        "pathParameters": {"scope": "global", "datasetName": "example_dataset"},
+        "queryStringParameters": {"recursive": "true", "nextToken": "global/datasets/other_dataset/"},
+    }
+    response = lambda_handler(event, mock_context)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"]) == "Bad Request: Invalid nextToken for the requested prefix."
+
+
+@pytest.mark.parametrize(
+    "query,message",
+    [
+        ({"pageSize": "ten"}, "pageSize must be an integer."),
+        ({"pageSize": "0"}, "pageSize must be a positive integer."),
+        ({"minSize": "small"}, "minSize must be an integer."),
+        ({"maxSize": "1.5"}, "maxSize must be an integer."),
+        ({"modifiedAfter": "yesterday"}, "modifiedAfter must be an ISO 8601 timestamp."),
+        ({"modifiedBefore": "2024-13-01"}, "modifiedBefore must be an ISO 8601 timestamp."),
+    ],
+    ids=["non_numeric_page_size", "zero_page_size", "min_size", "max_size", "modified_after", "modified_before"],
+)
+def test_list_files_recursive_invalid_parameters(data_bucket, query, message):
+    event = {
+        "pathParameters": {"scope": "global", "datasetName": "example_dataset"},
+        "queryStringParameters": {"recursive": "true", **query},
+    }
+    response = lambda_handler(event, mock_context)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"]) == f"Bad Request: {message}"
@@ -23,6 +23,7 @@ from unittest import mock
 from botocore.exceptions import ClientError
 
 from ml_space_lambda.data_access_objects.dataset import DatasetModel
+from ml_space_lambda.data_access_objects.dynamo_data_store import PagedResults
 from ml_space_lambda.data_access_objects.group_dataset import GroupDatasetModel
 from ml_space_lambda.data_access_objects.group_user import GroupUserModel
 from ml_space_lambda.data_access_objects.user import UserModel
@@ -86,12 +87,6 @@ def mock_get_datasets_for_group(group: str):
     ]
 
 
-def mock_get_groups_for_dataset(dataset_name):
-    return [
-        _build_group_dataset(group_name, dataset_name),
-    ]
-
-
 def mock_get_all_for_scope(dataset_type: DatasetType, scope: str):
     if scope == DatasetType.GLOBAL:
         return [_build_dataset(scope=DatasetType.GLOBAL, name="example_global_dataset1", user_name="jdoe", type=dataset_type)]
@@ -137,7 +132,7 @@ def test_list_datasets(mock_dataset_dao, mock_group_user_dao, mock_group_dataset
     mock_dataset_dao.get_all_for_scope.side_effect = mock_get_all_for_scope
     mock_group_user_dao.get_groups_for_user.return_value = MOCK_GROUP_USERS
     mock_group_dataset_dao.get_datasets_for_group.side_effect = mock_get_datasets_for_group
-    mock_dataset_dao.get.return_value = _build_dataset("group", group_dataset_name, user_name, DatasetType.GROUP)
+    mock_dataset_dao.get_many.return_value = [_build_dataset("group", group_dataset_name, user_name, DatasetType.GROUP)]
 
     expected_datasets = mock_get_all_for_scope(DatasetType.GLOBAL, DatasetType.GLOBAL)
     expected_datasets.extend(mock_get_all_for_scope(DatasetType.PRIVATE, user_name))
@@ -150,12 +145,18 @@ def test_list_datasets(mock_dataset_dao, mock_group_user_dao, mock_group_dataset
     )
 
     assert lambda_handler(generate_mock_event(), mock_context) == expected_response
+    mock_dataset_dao.get_many.assert_called_once_with(DatasetType.GROUP, ["example_group_dataset1"])
+    mock_dataset_dao.get.assert_not_called()
 
 
 @mock.patch("ml_space_lambda.dataset.lambda_functions.group_dataset_dao")
 @mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
 def test_list_all(mock_dataset_dao, mock_group_dataset_dao):
-    mock_group_dataset_dao.get_groups_for_dataset.side_effect = mock_get_groups_for_dataset
+    mock_group_dataset_dao.get_all.return_value = [
+        _build_group_dataset("other_group", group_dataset_name),
+        _build_group_dataset(group_name, group_dataset_name),
+        _build_group_dataset(group_name, "unrelated_dataset"),
+    ]
 
     expected_datasets = mock_get_all_for_scope(DatasetType.GLOBAL, DatasetType.GLOBAL)
     expected_datasets.extend(mock_get_all_for_scope(DatasetType.PRIVATE, user_name))
@@ -166,20 +167,53 @@ def test_list_all(mock_dataset_dao, mock_group_dataset_dao):
                 name=group_dataset_name,
                 user_name=user_name,
                 type=DatasetType.GROUP,
-                groups=[group_name],
+                groups=["other_group", group_name],
             )
         ]
     )
     expected_datasets.extend(mock_get_all_for_scope(DatasetType.PROJECT, project_name))
 
-    mock_dataset_dao.get_all.return_value = expected_datasets
-
     expected_response = generate_html_response(
         200,
         [dataset.to_dict() for dataset in expected_datasets],
     )
 
+    # The stored group list is stale and should be replaced with the mapping table contents
+    expected_datasets[3].groups = [group_name]
+    mock_dataset_dao.get_all.return_value = expected_datasets
+
     assert lambda_handler(generate_mock_event(True), mock_context) == expected_response
+    mock_group_dataset_dao.get_all.assert_called_once()
+    mock_group_dataset_dao.get_groups_for_dataset.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.group_dataset_dao")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
+def test_list_all_paged(mock_dataset_dao, mock_group_dataset_dao):
+    global_dataset = _build_dataset(DatasetType.GLOBAL, "example_global_dataset1", "jdoe", DatasetType.GLOBAL)
+    group_dataset = _build_dataset(DatasetType.GROUP, group_dataset_name, user_name, DatasetType.GROUP)
+    mock_dataset_dao.get_page.return_value = PagedResults([global_dataset, group_dataset], "next-page")
+    mock_group_dataset_dao.get_groups_for_dataset.return_value = [
+        _build_group_dataset("other_group", group_dataset_name),
+        _build_group_dataset(group_name, group_dataset_name),
+    ]
+
+    expected_group_dataset = _build_dataset(
+        DatasetType.GROUP, group_dataset_name, user_name, DatasetType.GROUP, groups=["other_group", group_name]
+    )
+    expected_response = generate_html_response(
+        200,
+        {"records": [global_dataset.to_dict(), expected_group_dataset.to_dict()], "nextToken": "next-page"},
+    )
+
+    event = generate_mock_event(True)
+    event["queryStringParameters"] = {"pageSize": "2", "nextToken": "this-page"}
+    assert lambda_handler(event, mock_context) == expected_response
+
+    mock_dataset_dao.get_page.assert_called_with(limit=2, next_token="this-page")
+    mock_dataset_dao.get_all.assert_not_called()
+    mock_group_dataset_dao.get_groups_for_dataset.assert_called_once_with(group_dataset_name)
+    mock_group_dataset_dao.get_all.assert_not_called()
 
 
 @mock.patch("ml_space_lambda.dataset.lambda_functions.group_dataset_dao")
@@ -189,7 +223,7 @@ def test_list_user_datasets(mock_dataset_dao, mock_group_user_dao, mock_group_da
     mock_dataset_dao.get_all_for_scope.side_effect = mock_get_all_for_scope
     mock_group_user_dao.get_groups_for_user.side_effect = [MOCK_GROUP_USERS]
     mock_group_dataset_dao.get_datasets_for_group.side_effect = mock_get_datasets_for_group
-    mock_dataset_dao.get.return_value = _build_dataset("group", group_dataset_name, user_name, DatasetType.GROUP)
+    mock_dataset_dao.get_many.return_value = [_build_dataset("group", group_dataset_name, user_name, DatasetType.GROUP)]
 
     expected_datasets = mock_get_all_for_scope(DatasetType.GLOBAL, DatasetType.GLOBAL)
     expected_datasets.extend(mock_get_all_for_scope(DatasetType.PRIVATE, user_name))
@@ -220,7 +254,7 @@ def test_list_datasets_success_no_datasets(mock_dataset_dao, mock_group_user_dao
     mock_dataset_dao.get_all_for_scope.side_effect = lambda x, y: []
     mock_group_user_dao.get_groups_for_user.side_effect = [MOCK_GROUP_USERS]
     mock_group_dataset_dao.get_datasets_for_group.return_value = []
-    mock_dataset_dao.get.return_value = _build_dataset("group", group_dataset_name, user_name, DatasetType.GROUP)
+    mock_dataset_dao.get_many.return_value = []
     expected_response = generate_html_response(200, [])
 
     assert lambda_handler(generate_mock_event(), mock_context) == expected_response
@@ -0,0 +1,147 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+from unittest import mock
+
+from ml_space_lambda.utils.common_functions import generate_html_response
+
+TEST_ENV_CONFIG = {"AWS_DEFAULT_REGION": "us-east-1", "DATA_BUCKET": "mlspace-data-bucket"}
+
+mock_context = mock.Mock()
+
+# Need to mock the region in order to do the import......
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.dataset.lambda_functions import (
+        abort_multipart_upload,
+        complete_multipart_upload,
+        create_multipart_upload,
+        presigned_part_urls,
+    )
+
+MOCK_USERNAME = "jdoe"
+MOCK_PROJECT = "project_name"
+MOCK_KEY = f"project/{MOCK_PROJECT}/datasets/example_dataset/large-file.bin"
+MOCK_UPLOAD_ID = "mock-upload-id"
+
+
+def _mock_event(body: dict, dataset_type: str = "project", scope: str = MOCK_PROJECT):
+    return {
+        "body": json.dumps({"key": MOCK_KEY, **body}),
+        "headers": {"x-mlspace-dataset-type": dataset_type, "x-mlspace-dataset-scope": scope},
+        "requestContext": {"authorizer": {"principalId": MOCK_USERNAME}},
+    }
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_create_multipart_upload(mock_s3):
+    mock_s3.create_multipart_upload.return_value = {"UploadId": MOCK_UPLOAD_ID}
+    expected_response = generate_html_response(200, {"key": MOCK_KEY, "uploadId": MOCK_UPLOAD_ID})
+
+    assert create_multipart_upload(_mock_event({}), mock_context) == expected_response
+    mock_s3.create_multipart_upload.assert_called_with(
+        Bucket=TEST_ENV_CONFIG["DATA_BUCKET"],
+        Key=MOCK_KEY,
+        Metadata={"user": MOCK_USERNAME, "dataset-name": "datasets", "dataset-scope": "project"},
+        Tagging=f"user={MOCK_USERNAME}&dataset-name=datasets&dataset-scope=project",
+    )
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_create_multipart_upload_header_mismatch(mock_s3):
+    expected_response = generate_html_response(400, "Bad Request: Dataset headers do not match expected type and scope.")
+
+    assert create_multipart_upload(_mock_event({}, scope="other_project"), mock_context) == expected_response
+    mock_s3.create_multipart_upload.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_presigned_part_urls(mock_s3):
+    mock_s3.generate_presigned_url.side_effect = lambda ClientMethod, Params, ExpiresIn: f"https://part/{Params['PartNumber']}"
+    expected_response = generate_html_response(
+        200,
+        {"parts": [{"partNumber": 1, "url": "https://part/1"}, {"partNumber": 2, "url": "https://part/2"}]},
+    )
+
+    assert (
+        presigned_part_urls(_mock_event({"uploadId": MOCK_UPLOAD_ID, "partNumbers": [1, 2]}), mock_context)
+        == expected_response
+    )
+    mock_s3.generate_presigned_url.assert_called_with(
+        ClientMethod="upload_part",
+        Params={"Bucket": TEST_ENV_CONFIG["DATA_BUCKET"], "Key": MOCK_KEY, "UploadId": MOCK_UPLOAD_ID, "PartNumber": 2},
+        ExpiresIn=3600,
+    )
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_presigned_part_urls_invalid_parts(mock_s3):
+    expected_response = generate_html_response(400, "Bad Request: Part numbers must be integers between 1 and 10000.")
+    assert (
+        presigned_part_urls(_mock_event({"uploadId": MOCK_UPLOAD_ID, "partNumbers": [0]}), mock_context) == expected_response
+    )
+
+    expected_response = generate_html_response(400, "Bad Request: Between 1 and 100 part numbers must be requested at a time.")
+    assert (
+        presigned_part_urls(_mock_event({"uploadId": MOCK_UPLOAD_ID, "partNumbers": list(range(1, 102))}), mock_context)
+        == expected_response
+    )
+    mock_s3.generate_presigned_url.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_complete_multipart_upload(mock_s3):
+    parts = [{"partNumber": 2, "eTag": '"etag2"'}, {"partNumber": 1, "eTag": '"etag1"'}]
+    expected_response = generate_html_response(200, {"key": MOCK_KEY})
+
+    assert complete_multipart_upload(_mock_event({"uploadId": MOCK_UPLOAD_ID, "parts": parts}), mock_context) == (
+        expected_response
+    )
+    mock_s3.get_paginator.assert_not_called()
+    mock_s3.complete_multipart_upload.assert_called_with(
+        Bucket=TEST_ENV_CONFIG["DATA_BUCKET"],
+        Key=MOCK_KEY,
+        UploadId=MOCK_UPLOAD_ID,
+        MultipartUpload={"Parts": [{"PartNumber": 1, "ETag": '"etag1"'}, {"PartNumber": 2, "ETag": '"etag2"'}]},
+    )
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_complete_multipart_upload_from_uploaded_parts(mock_s3):
+    mock_s3.get_paginator.return_value.paginate.return_value = [
+        {"Parts": [{"PartNumber": 1, "ETag": '"etag1"', "Size": 5242880}]},
+        {"Parts": [{"PartNumber": 2, "ETag": '"etag2"', "Size": 1024}]},
+    ]
+
+    complete_multipart_upload(_mock_event({"uploadId": MOCK_UPLOAD_ID}), mock_context)
+
+    mock_s3.get_paginator.assert_called_with("list_parts")
+    mock_s3.complete_multipart_upload.assert_called_with(
+        Bucket=TEST_ENV_CONFIG["DATA_BUCKET"],
+        Key=MOCK_KEY,
+        UploadId=MOCK_UPLOAD_ID,
+        MultipartUpload={"Parts": [{"PartNumber": 1, "ETag": '"etag1"'}, {"PartNumber": 2, "ETag": '"etag2"'}]},
+    )
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+def test_abort_multipart_upload(mock_s3):
+    expected_response = generate_html_response(200, f"Successfully aborted upload of {MOCK_KEY}")
+
+    assert abort_multipart_upload(_mock_event({"uploadId": MOCK_UPLOAD_ID}), mock_context) == expected_response
+    mock_s3.abort_multipart_upload.assert_called_with(
+        Bucket=TEST_ENV_CONFIG["DATA_BUCKET"], Key=MOCK_KEY, UploadId=MOCK_UPLOAD_ID
+    )
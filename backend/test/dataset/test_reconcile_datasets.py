@@ -0,0 +1,55 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+from unittest import mock
+
+from ml_space_lambda.utils.common_functions import generate_html_response
+
+TEST_ENV_CONFIG = {"AWS_DEFAULT_REGION": "us-east-1", "DATA_BUCKET": "mlspace-data-bucket"}
+
+mock_context = mock.Mock()
+
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.dataset.lambda_functions import reconcile as lambda_handler
+
+mock_report = {
+    "created": [{"type": "global", "scope": "global", "name": "example"}],
+    "missingObjects": [],
+    "scopesScanned": 2,
+    "nextToken": "checkpoint",
+}
+
+
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+@mock.patch("ml_space_lambda.dataset.lambda_functions.DatasetReconciler")
+def test_reconcile_datasets(mock_reconciler):
+    mock_reconciler.return_value.reconcile.return_value = mock_report
+
+    response = lambda_handler({"body": json.dumps({"nextToken": "previous", "dryRun": True})}, mock_context)
+
+    assert response == generate_html_response(200, mock_report)
+    mock_reconciler.return_value.reconcile.assert_called_with(next_token="previous", dry_run=True)
+
+
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+@mock.patch("ml_space_lambda.dataset.lambda_functions.DatasetReconciler")
+def test_reconcile_datasets_defaults(mock_reconciler):
+    mock_reconciler.return_value.reconcile.return_value = mock_report
+
+    lambda_handler({"body": None}, mock_context)
+
+    mock_reconciler.return_value.reconcile.assert_called_with(next_token=None, dry_run=False)
@@ -0,0 +1,143 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+from datetime import datetime, timezone
+from unittest import mock
+
+import ml_space_lambda.utils.mlspace_config as mlspace_config
+from ml_space_lambda.utils.common_functions import generate_html_response
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+}
+
+mock_context = mock.Mock()
+
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.dataset.lambda_functions import recount_stats as lambda_handler
+
+MOCK_PAGES = [
+    {
+        "Contents": [
+            {"Key": "file1.txt", "Size": 100, "LastModified": datetime(2024, 1, 1, tzinfo=timezone.utc)},
+            {"Key": "file2.txt", "Size": 200, "LastModified": datetime(2024, 1, 3, tzinfo=timezone.utc)},
+        ]
+    },
+    {"Contents": [{"Key": "file3.txt", "Size": 300, "LastModified": datetime(2024, 1, 2, tzinfo=timezone.utc)}]},
+]
+MOCK_LAST_MODIFIED = datetime(2024, 1, 3, tzinfo=timezone.utc).timestamp()
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
+def test_recount_single_dataset(mock_dataset_dao, mock_s3, mock_private_dataset):
+    mlspace_config.env_variables = {}
+    mock_dataset_dao.get.return_value = mock_private_dataset
+    mock_s3.get_paginator.return_value.paginate.return_value = MOCK_PAGES
+
+    expected_response = generate_html_response(
+        200,
+        {
+            "datasets": [
+                {
+                    "scope": mock_private_dataset.scope,
+                    "name": mock_private_dataset.name,
+                    "objectCount": 3,
+                    "totalBytes": 600,
+                    "lastModified": MOCK_LAST_MODIFIED,
+                }
+            ]
+        },
+    )
+    event = {"body": json.dumps({"scope": mock_private_dataset.scope, "datasetName": mock_private_dataset.name})}
+    assert lambda_handler(event, mock_context) == expected_response
+
+    mock_dataset_dao.get.assert_called_with(mock_private_dataset.scope, mock_private_dataset.name)
+    mock_dataset_dao.get_all.assert_not_called()
+    mock_s3.get_paginator.return_value.paginate.assert_called_with(Bucket=mock.ANY, Prefix=mock_private_dataset.prefix)
+    mock_dataset_dao.set_object_stats.assert_called_with(
+        mock_private_dataset.scope, mock_private_dataset.name, 3, 600, MOCK_LAST_MODIFIED
+    )
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
+def test_recount_skips_manifests(mock_dataset_dao, mock_s3, mock_private_dataset):
+    mlspace_config.env_variables = {}
+    mock_dataset_dao.get.return_value = mock_private_dataset
+    mock_s3.get_paginator.return_value.paginate.return_value = [
+        {
+            "Contents": [
+                {
+                    "Key": f"{mock_private_dataset.prefix}file1.txt",
+                    "Size": 100,
+                    "LastModified": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                },
+                {
+                    "Key": f"{mock_private_dataset.prefix}_manifests/files.manifest",
+                    "Size": 200,
+                    "LastModified": datetime(2024, 1, 3, tzinfo=timezone.utc),
+                },
+            ]
+        }
+    ]
+
+    event = {"body": json.dumps({"scope": mock_private_dataset.scope, "datasetName": mock_private_dataset.name})}
+    assert lambda_handler(event, mock_context)["statusCode"] == 200
+
+    mock_dataset_dao.set_object_stats.assert_called_with(
+        mock_private_dataset.scope,
+        mock_private_dataset.name,
+        1,
+        100,
+        datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp(),
+    )
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
+def test_recount_all_datasets(mock_dataset_dao, mock_s3, mock_private_dataset, mock_global_dataset):
+    mlspace_config.env_variables = {}
+    mock_dataset_dao.get_all.return_value = [mock_private_dataset, mock_global_dataset]
+    mock_s3.get_paginator.return_value.paginate.return_value = [{}]
+
+    response = lambda_handler({"body": None}, mock_context)
+    assert response["statusCode"] == 200
+    assert [dataset["name"] for dataset in json.loads(response["body"])["datasets"]] == [
+        mock_private_dataset.name,
+        mock_global_dataset.name,
+    ]
+    mock_dataset_dao.set_object_stats.assert_has_calls(
+        [
+            mock.call(mock_private_dataset.scope, mock_private_dataset.name, 0, 0, None),
+            mock.call(mock_global_dataset.scope, mock_global_dataset.name, 0, 0, None),
+        ],
+        any_order=True,
+    )
+
+
+@mock.patch("ml_space_lambda.dataset.lambda_functions.s3")
+@mock.patch("ml_space_lambda.dataset.lambda_functions.dataset_dao")
+def test_recount_missing_dataset(mock_dataset_dao, mock_s3):
+    mlspace_config.env_variables = {}
+    mock_dataset_dao.get.return_value = None
+
+    expected_response = generate_html_response(404, "Dataset 'missing' does not exist.")
+    assert lambda_handler({"body": json.dumps({"scope": "global", "datasetName": "missing"})}, mock_context) == (
+        expected_response
+    )
+    mock_s3.get_paginator.assert_not_called()
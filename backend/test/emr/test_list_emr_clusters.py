@@ -118,6 +118,7 @@ def test_list_emr_clusters_filtered_success(mock_resource_metadata_dao):
         filter_expression="metadata.#s IN (:s0)",
         filter_values={":s0": "WAITING"},
         expression_names={"#s": "Status"},
+        fill_page=True,
     )
 
 
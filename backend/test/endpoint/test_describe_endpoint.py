@@ -18,6 +18,7 @@ from unittest import mock
 
 from botocore.exceptions import ClientError
 
+from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataModel
 from ml_space_lambda.data_access_objects.resource_scheduler import ResourceSchedulerModel
 from ml_space_lambda.enums import ResourceType
 from ml_space_lambda.utils.common_functions import generate_html_response
@@ -33,9 +34,11 @@ with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
     from ml_space_lambda.endpoint.lambda_functions import describe as lambda_handler
 
 
+@mock.patch("ml_space_lambda.endpoint.lambda_functions.resource_metadata_dao")
 @mock.patch("ml_space_lambda.endpoint.lambda_functions.resource_scheduler_dao")
 @mock.patch("ml_space_lambda.endpoint.lambda_functions.sagemaker")
-def test_describe_endpoint_success(mock_sagemaker, mock_resource_dao):
+def test_describe_endpoint_success(mock_sagemaker, mock_resource_dao, mock_resource_metadata_dao):
+    mock_resource_metadata_dao.get.return_value = None
     mock_event = {"pathParameters": {"endpointName": mock_endpoint_name}}
     mock_username = "jdoe@amazon.com"
     mock_response = {
@@ -80,10 +83,32 @@ def test_describe_endpoint_success(mock_sagemaker, mock_resource_dao):
 
     assert lambda_handler(mock_event, mock_context) == expected_response
     mock_sagemaker.describe_endpoint.assert_called_with(EndpointName=mock_endpoint_name)
+    mock_resource_metadata_dao.get.assert_called_with(mock_endpoint_name, ResourceType.ENDPOINT)
+    mock_sagemaker.list_tags.assert_called_with(ResourceArn="endpoint-arn", NextToken="mock_next_token")
 
 
+@mock.patch("ml_space_lambda.endpoint.lambda_functions.resource_metadata_dao")
+@mock.patch("ml_space_lambda.endpoint.lambda_functions.resource_scheduler_dao")
+@mock.patch("ml_space_lambda.endpoint.lambda_functions.sagemaker")
+def test_describe_endpoint_owner_from_metadata(mock_sagemaker, mock_resource_dao, mock_resource_metadata_dao):
+    mock_event = {"pathParameters": {"endpointName": mock_endpoint_name}}
+    mock_resource_dao.get.return_value = None
+    mock_resource_metadata_dao.get.return_value = ResourceMetadataModel(
+        mock_endpoint_name, ResourceType.ENDPOINT, "jdoe@amazon.com", "test-project", {}
+    )
+    mock_sagemaker.describe_endpoint.return_value = {"EndpointName": mock_endpoint_name, "EndpointArn": "endpoint-arn"}
+    expected_response = generate_html_response(
+        200, {"EndpointName": mock_endpoint_name, "EndpointArn": "endpoint-arn", "Owner": "jdoe@amazon.com"}
+    )
+
+    assert lambda_handler(mock_event, mock_context) == expected_response
+    mock_sagemaker.list_tags.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.endpoint.lambda_functions.resource_metadata_dao")
+@mock.patch("ml_space_lambda.endpoint.lambda_functions.resource_scheduler_dao")
 @mock.patch("ml_space_lambda.endpoint.lambda_functions.sagemaker")
-def test_describe_endpoint_client_error(mock_sagemaker):
+def test_describe_endpoint_client_error(mock_sagemaker, mock_resource_dao, mock_resource_metadata_dao):
     mock_event = {"pathParameters": {"endpointName": mock_endpoint_name}}
     error_msg = {
         "Error": {"Code": "MissingParameter", "Message": "Dummy error message."},
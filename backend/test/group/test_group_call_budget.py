@@ -0,0 +1,56 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+# Call budgets for group handlers on hot paths, run against moto so that every DAO call made by the
+# handler is counted.
+import json
+from unittest import mock
+
+import pytest
+
+from ml_space_lambda.data_access_objects.group import GroupModel
+from ml_space_lambda.data_access_objects.group_user import GroupUserModel
+from ml_space_lambda.data_access_objects.user import UserModel
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+}
+
+MOCK_USER = UserModel("jdoe", "jdoe@example.com", "John Doe", False)
+
+mock_context = mock.Mock()
+
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.group import lambda_functions as group_lambda
+
+
+@pytest.mark.xfail(
+    strict=True, raises=pytest.fail.Exception, reason="list_all looks up the member count of each group individually"
+)
+@pytest.mark.parametrize("group_count", [1, 5])
+def test_group_list_all(mock_project_group_tables, call_budget, group_count):
+    for i in range(group_count):
+        group_lambda.group_dao.create(GroupModel(f"group{i}", "Example group", MOCK_USER.username))
+        group_lambda.group_user_dao.create(GroupUserModel(MOCK_USER.username, f"group{i}"))
+    event = {
+        "requestContext": {"authorizer": {"principalId": MOCK_USER.username, "user": json.dumps(MOCK_USER.to_dict())}},
+    }
+
+    # One lookup for the user's groups and one scan for the groups, regardless of how many groups there are
+    with call_budget(dynamodb=2):
+        response = group_lambda.list_all(event, mock_context)
+
+    assert response["statusCode"] == 200
@@ -80,14 +80,12 @@ def test_list_datasets_for_group_success(mock_group_dataset_dao, mock_dataset_da
         [record.to_dict() for record in datasets],
     )
     mock_group_dataset_dao.get_datasets_for_group.return_value = group_datasets
-    mock_dataset_dao.get.side_effect = datasets
+    mock_dataset_dao.get_many.return_value = datasets
 
     assert lambda_handler(mock_event, mock_context) == expected_response
 
     mock_group_dataset_dao.get_datasets_for_group.assert_called_with(MOCK_GROUP_NAME)
-    mock_dataset_dao.get.assert_has_calls(
-        [mock.call("group", "Dataset1"), mock.call("group", "Dataset2"), mock.call("group", "Dataset3")]
-    )
+    mock_dataset_dao.get_many.assert_called_once_with("group", ["Dataset1", "Dataset2", "Dataset3"])
 
 
 @mock.patch("ml_space_lambda.group.lambda_functions.dataset_dao")
@@ -106,7 +104,7 @@ def test_list_datasets_for_group_client_error(mock_group_dataset_dao, mock_datas
     assert lambda_handler(mock_event, mock_context) == expected_response
 
     mock_group_dataset_dao.get_datasets_for_group.assert_called_with(MOCK_GROUP_NAME)
-    mock_dataset_dao.get.assert_not_called()
+    mock_dataset_dao.get_many.assert_not_called()
 
 
 @mock.patch("ml_space_lambda.group.lambda_functions.dataset_dao")
@@ -115,4 +113,4 @@ def test_list_datasets_for_group_missing_parameters(mock_group_dataset_dao, mock
     expected_response = generate_html_response(400, "Missing event parameter: 'pathParameters'")
     assert lambda_handler({}, mock_context) == expected_response
     mock_group_dataset_dao.get_datasets_for_group.assert_not_called()
-    mock_dataset_dao.get.assert_not_called()
+    mock_dataset_dao.get_many.assert_not_called()
@@ -0,0 +1,72 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+from unittest import mock
+
+from ml_space_lambda.utils import mlspace_config
+from ml_space_lambda.utils.common_functions import generate_exception_response, generate_html_response
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "MANAGE_IAM_ROLES": "True",
+}
+
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.iam_reconciler.lambda_functions import reconcile as lambda_handler
+
+mock_context = mock.Mock()
+
+mock_report = {
+    "dryRun": True,
+    "project": "project1",
+    "username": None,
+    "actions": [{"action": "deleteRole", "roleName": "MLSpace-project1-abc"}],
+    "errors": [],
+}
+
+
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+@mock.patch("ml_space_lambda.iam_reconciler.lambda_functions.iam_reconciler")
+def test_reconcile_project(mock_iam_reconciler):
+    mlspace_config.env_variables = {}
+    mock_iam_reconciler.reconcile.return_value = mock_report
+
+    response = lambda_handler({"body": json.dumps({"projectName": "project1", "dryRun": True})}, mock_context)
+
+    assert response == generate_html_response(200, mock_report)
+    mock_iam_reconciler.reconcile.assert_called_with(project_name="project1", username=None, dry_run=True)
+
+
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+@mock.patch("ml_space_lambda.iam_reconciler.lambda_functions.iam_reconciler")
+def test_reconcile_global(mock_iam_reconciler):
+    mlspace_config.env_variables = {}
+    mock_iam_reconciler.reconcile.return_value = mock_report
+
+    lambda_handler({"body": None}, mock_context)
+
+    mock_iam_reconciler.reconcile.assert_called_with(project_name=None, username=None, dry_run=False)
+
+
+@mock.patch.dict("os.environ", {"AWS_DEFAULT_REGION": "us-east-1"}, clear=True)
+@mock.patch("ml_space_lambda.iam_reconciler.lambda_functions.iam_reconciler")
+def test_reconcile_iam_not_managed(mock_iam_reconciler):
+    mlspace_config.env_variables = {}
+    expected_response = generate_exception_response(ValueError("IAM roles are not managed by MLSpace in this deployment."))
+
+    assert lambda_handler({"body": json.dumps({"username": "jdoe"})}, mock_context) == expected_response
+    mock_iam_reconciler.reconcile.assert_not_called()
@@ -0,0 +1,344 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+
+import gzip
+import json
+from unittest import mock
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_s3
+
+from ml_space_lambda.data_access_objects.dataset import DatasetModel
+from ml_space_lambda.data_access_objects.pagination_helper import decode_pagination_token, encode_pagination_token
+from ml_space_lambda.data_access_objects.project_user import ProjectUserModel
+from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataModel
+from ml_space_lambda.data_access_objects.user import UserModel
+from ml_space_lambda.enums import DatasetType, EnvVariable, Permission, ResourceType
+from ml_space_lambda.utils.common_functions import generate_html_response
+from ml_space_lambda.utils.mlspace_config import get_environment_variables
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+}
+mock_context = mock.Mock()
+
+# Need to mock the region in order to do the import...
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.logs.lambda_functions import export
+
+MOCK_JOB_NAME = "MockTestJobName"
+MOCK_PROJECT_NAME = "MockProject"
+MOCK_USERNAME = "jdoe"
+MOCK_USER = UserModel(MOCK_USERNAME, "jdoe@amazon.com", "John Doe", False, [])
+MOCK_DATASET_NAME = "job-logs"
+MOCK_EXPORT_NAME = "first-export"
+MOCK_LOG_GROUP = "/aws/sagemaker/TrainingJobs"
+MOCK_BUCKET = get_environment_variables()[EnvVariable.DATA_BUCKET]
+MOCK_PREFIX = f"project/{MOCK_PROJECT_NAME}/datasets/{MOCK_DATASET_NAME}/{MOCK_EXPORT_NAME}/"
+MOCK_DATASET = DatasetModel(
+    scope=MOCK_PROJECT_NAME,
+    type=DatasetType.PROJECT,
+    name=MOCK_DATASET_NAME,
+    description="",
+    location=f"s3://{MOCK_BUCKET}/project/{MOCK_PROJECT_NAME}/datasets/{MOCK_DATASET_NAME}/",
+    created_by=MOCK_USERNAME,
+)
+
+
+def _mock_event(body: dict, project_name: str = MOCK_PROJECT_NAME, user: UserModel = MOCK_USER):
+    return {
+        "resource": f"/job/TrainingJobs/{MOCK_JOB_NAME}/logs/export",
+        "pathParameters": {"jobType": "TrainingJobs", "jobName": MOCK_JOB_NAME},
+        "body": json.dumps(body),
+        "requestContext": {
+            "authorizer": {
+                "principalId": user.username,
+                "projectName": project_name,
+                "user": json.dumps(user.to_dict()),
+            }
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def mock_project_user_dao():
+    with mock.patch("ml_space_lambda.logs.lambda_functions.project_user_dao") as mock_project_user_dao:
+        mock_project_user_dao.get.side_effect = lambda project_name, username: ProjectUserModel(username, project_name)
+        yield mock_project_user_dao
+
+
+def _mock_export_token(**overrides):
+    export_state = {
+        "args": {"logGroupName": MOCK_LOG_GROUP, "logStreamNamePrefix": MOCK_JOB_NAME},
+        "datasetName": MOCK_DATASET_NAME,
+        "exportName": MOCK_EXPORT_NAME,
+        "part": 1,
+        "eventCount": 1,
+        "nextToken": "token1",
+    }
+    export_state.update(overrides)
+    return encode_pagination_token(export_state)
+
+
+def _mock_log_event(timestamp: int):
+    return {"logStreamName": f"{MOCK_JOB_NAME}/algo-1", "timestamp": timestamp, "message": f"Message {timestamp}"}
+
+
+@mock_s3
+@mock.patch("ml_space_lambda.logs.lambda_functions.dataset_dao")
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_export_logs(mock_cloudwatch, mock_dataset_dao):
+    s3 = boto3.client("s3", region_name="us-east-1")
+    s3.create_bucket(Bucket=MOCK_BUCKET)
+    mock_dataset_dao.get.return_value = None
+    mock_cloudwatch.filter_log_events.side_effect = [
+        {"events": [_mock_log_event(2), _mock_log_event(1)], "nextToken": "token1"},
+        {"events": [_mock_log_event(3)]},
+    ]
+
+    with mock.patch("ml_space_lambda.logs.lambda_functions.s3", s3):
+        response = export(
+            _mock_event({"datasetName": MOCK_DATASET_NAME, "exportName": MOCK_EXPORT_NAME, "filterPattern": "ERROR"}),
+            mock_context,
+        )
+
+    assert response == generate_html_response(
+        200,
+        {
+            "status": "Completed",
+            "location": f"s3://{MOCK_BUCKET}/{MOCK_PREFIX}",
+            "key": f"{MOCK_PREFIX}part-00000.jsonl.gz",
+            "eventCount": 3,
+            "exportToken": None,
+        },
+    )
+    exported = gzip.decompress(s3.get_object(Bucket=MOCK_BUCKET, Key=f"{MOCK_PREFIX}part-00000.jsonl.gz")["Body"].read())
+    assert [json.loads(line) for line in exported.splitlines()] == [_mock_log_event(1), _mock_log_event(2), _mock_log_event(3)]
+    mock_cloudwatch.filter_log_events.assert_called_with(
+        logGroupName=MOCK_LOG_GROUP,
+        logStreamNamePrefix=MOCK_JOB_NAME,
+        filterPattern="ERROR",
+        limit=10000,
+        nextToken="token1",
+    )
+    created_dataset = mock_dataset_dao.create.call_args.args[0]
+    assert created_dataset.to_dict()["location"] == MOCK_DATASET.location
+    assert created_dataset.type == DatasetType.PROJECT
+
+
+@mock.patch("ml_space_lambda.logs.lambda_functions.LOG_EXPORT_PART_SIZE", 1)
+@mock.patch("ml_space_lambda.logs.lambda_functions.LOG_EXPORT_TIME_BUDGET_SECONDS", 0)
+@mock.patch("ml_space_lambda.logs.lambda_functions.dataset_dao")
+@mock.patch("ml_space_lambda.logs.lambda_functions.s3")
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_export_logs_resume(mock_cloudwatch, mock_s3, mock_dataset_dao):
+    mock_dataset_dao.get.return_value = MOCK_DATASET
+    mock_s3.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    mock_s3.upload_part.side_effect = lambda **kwargs: {"ETag": f"etag{kwargs['PartNumber']}"}
+    mock_cloudwatch.filter_log_events.return_value = {"events": [_mock_log_event(1)], "nextToken": "token1"}
+
+    response = export(
+        _mock_event({"datasetName": MOCK_DATASET_NAME, "exportName": MOCK_EXPORT_NAME, "startTime": 0}), mock_context
+    )
+    body = json.loads(response["body"])
+    assert body["status"] == "InProgress"
+    assert body["key"] == f"{MOCK_PREFIX}part-00000.jsonl.gz"
+    # Each page crosses the (patched) part size so it gets its own part plus the final gzip trailer
+    mock_s3.complete_multipart_upload.assert_called_with(
+        Bucket=MOCK_BUCKET,
+        Key=f"{MOCK_PREFIX}part-00000.jsonl.gz",
+        UploadId="upload-1",
+        MultipartUpload={"Parts": [{"PartNumber": 1, "ETag": "etag1"}, {"PartNumber": 2, "ETag": "etag2"}]},
+    )
+    mock_dataset_dao.create.assert_not_called()
+    export_state = decode_pagination_token(body["exportToken"])
+    assert export_state["nextToken"] == "token1"
+    assert export_state["part"] == 1
+
+    mock_cloudwatch.filter_log_events.return_value = {"events": [_mock_log_event(2)]}
+    response = export(_mock_event({"exportToken": body["exportToken"]}), mock_context)
+    body = json.loads(response["body"])
+    assert body == {
+        "status": "Completed",
+        "location": f"s3://{MOCK_BUCKET}/{MOCK_PREFIX}",
+        "key": f"{MOCK_PREFIX}part-00001.jsonl.gz",
+        "eventCount": 2,
+        "exportToken": None,
+    }
+    mock_cloudwatch.filter_log_events.assert_called_with(
+        logGroupName=MOCK_LOG_GROUP, logStreamNamePrefix=MOCK_JOB_NAME, startTime=0, limit=10000, nextToken="token1"
+    )
+
+
+@mock.patch("ml_space_lambda.logs.lambda_functions.dataset_dao")
+@mock.patch("ml_space_lambda.logs.lambda_functions.s3")
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_export_logs_no_events(mock_cloudwatch, mock_s3, mock_dataset_dao):
+    mock_dataset_dao.get.return_value = MOCK_DATASET
+    mock_s3.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    mock_cloudwatch.filter_log_events.side_effect = ClientError(
+        {"Error": {"Code": "ResourceNotFoundException", "Message": "The specified log group does not exist."}},
+        "FilterLogEvents",
+    )
+
+    response = export(_mock_event({"datasetName": MOCK_DATASET_NAME, "exportName": MOCK_EXPORT_NAME}), mock_context)
+    assert json.loads(response["body"]) == {
+        "status": "Completed",
+        "location": f"s3://{MOCK_BUCKET}/{MOCK_PREFIX}",
+        "key": None,
+        "eventCount": 0,
+        "exportToken": None,
+    }
+    mock_s3.abort_multipart_upload.assert_called_with(
+        Bucket=MOCK_BUCKET, Key=f"{MOCK_PREFIX}part-00000.jsonl.gz", UploadId="upload-1"
+    )
+    mock_s3.complete_multipart_upload.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.logs.lambda_functions.resource_metadata_dao")
+@mock.patch("ml_space_lambda.logs.lambda_functions.dataset_dao")
+@mock.patch("ml_space_lambda.logs.lambda_functions.s3")
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_export_logs_project_from_metadata(mock_cloudwatch, mock_s3, mock_dataset_dao, mock_resource_metadata_dao):
+    mock_resource_metadata_dao.get.return_value = ResourceMetadataModel(
+        MOCK_JOB_NAME, ResourceType.TRAINING_JOB, MOCK_USERNAME, MOCK_PROJECT_NAME, {}
+    )
+    mock_dataset_dao.get.return_value = MOCK_DATASET
+    mock_cloudwatch.filter_log_events.return_value = {"events": []}
+
+    export(_mock_event({"datasetName": MOCK_DATASET_NAME}, project_name=None), mock_context)
+
+    mock_resource_metadata_dao.get.assert_called_with(MOCK_JOB_NAME, ResourceType.TRAINING_JOB)
+    mock_dataset_dao.get.assert_called_with(MOCK_PROJECT_NAME, MOCK_DATASET_NAME)
+
+
+@pytest.mark.parametrize(
+    "user,project_permissions,allowed",
+    [
+        (UserModel("mmoe", "mmoe@amazon.com", "Mary Moe", False, []), [], False),
+        (UserModel("mmoe", "mmoe@amazon.com", "Mary Moe", False, []), [Permission.PROJECT_OWNER], True),
+        (UserModel("admin", "admin@amazon.com", "Admin User", False, [Permission.ADMIN]), [], True),
+    ],
+    ids=["project_member", "project_owner", "admin"],
+)
+@mock.patch("ml_space_lambda.logs.lambda_functions.dataset_dao")
+@mock.patch("ml_space_lambda.logs.lambda_functions.s3")
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_export_logs_other_members_dataset(
+    mock_cloudwatch, mock_s3, mock_dataset_dao, mock_project_user_dao, user, project_permissions, allowed
+):
+    # MOCK_DATASET was created by MOCK_USER
+    mock_dataset_dao.get.return_value = MOCK_DATASET
+    mock_project_user_dao.get.side_effect = lambda project_name, username: ProjectUserModel(
+        username, project_name, permissions=project_permissions
+    )
+    mock_cloudwatch.filter_log_events.return_value = {"events": []}
+
+    response = export(_mock_event({"datasetName": MOCK_DATASET_NAME}, user=user), mock_context)
+
+    if allowed:
+        assert response["statusCode"] == 200
+    else:
+        assert response == generate_html_response(
+            403, f"User does not have permission to write to dataset {MOCK_DATASET_NAME}."
+        )
+        mock_cloudwatch.filter_log_events.assert_not_called()
+        mock_s3.create_multipart_upload.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.logs.lambda_functions.dataset_dao")
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_export_logs_not_project_member(mock_cloudwatch, mock_dataset_dao, mock_project_user_dao):
+    mock_project_user_dao.get.side_effect = None
+    mock_project_user_dao.get.return_value = None
+    mock_dataset_dao.get.return_value = None
+
+    assert export(_mock_event({"datasetName": MOCK_DATASET_NAME}), mock_context) == generate_html_response(
+        403, f"User is not a member of project {MOCK_PROJECT_NAME}."
+    )
+    mock_dataset_dao.create.assert_not_called()
+    mock_cloudwatch.filter_log_events.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "body,message",
+    [
+        ({}, "datasetName may only contain alphanumeric characters, hyphens and underscores."),
+        ({"datasetName": "../other"}, "datasetName may only contain alphanumeric characters, hyphens and underscores."),
+        (
+            {"datasetName": MOCK_DATASET_NAME, "exportName": "a/b"},
+            "exportName may only contain alphanumeric characters, hyphens and underscores.",
+        ),
+        ({"exportToken": "invalid"}, "Invalid exportToken."),
+        (
+            {
+                "exportToken": _mock_export_token(
+                    args={"logGroupName": "/aws/sagemaker/TransformJobs", "logStreamNamePrefix": MOCK_JOB_NAME}
+                )
+            },
+            "exportToken does not match the requested resource.",
+        ),
+        (
+            {"exportToken": _mock_export_token(datasetName="../other")},
+            "datasetName may only contain alphanumeric characters, hyphens and underscores.",
+        ),
+        (
+            {"exportToken": _mock_export_token(exportName="../../global/datasets/other")},
+            "exportName may only contain alphanumeric characters, hyphens and underscores.",
+        ),
+        (
+            {
+                "exportToken": _mock_export_token(
+                    args={"logGroupName": MOCK_LOG_GROUP, "logStreamNamePrefix": MOCK_JOB_NAME, "logStreamNames": ["other"]}
+                )
+            },
+            "Invalid exportToken.",
+        ),
+        (
+            {
+                "exportToken": _mock_export_token(
+                    args={"logGroupName": MOCK_LOG_GROUP, "logStreamNamePrefix": MOCK_JOB_NAME, "startTime": "0"}
+                )
+            },
+            "Invalid exportToken.",
+        ),
+        ({"exportToken": _mock_export_token(part="00001")}, "Invalid exportToken."),
+        ({"exportToken": _mock_export_token(part=True)}, "Invalid exportToken."),
+    ],
+    ids=[
+        "missing_dataset",
+        "invalid_dataset",
+        "invalid_export_name",
+        "invalid_token",
+        "mismatched_token",
+        "token_invalid_dataset",
+        "token_invalid_export_name",
+        "token_unexpected_arg",
+        "token_invalid_arg_type",
+        "token_string_part",
+        "token_bool_part",
+    ],
+)
+@mock.patch("ml_space_lambda.logs.lambda_functions.dataset_dao")
+@mock.patch("ml_space_lambda.logs.lambda_functions.s3")
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_export_logs_invalid_request(mock_cloudwatch, mock_s3, mock_dataset_dao, body, message):
+    assert export(_mock_event(body), mock_context) == generate_html_response(400, f"Bad Request: {message}")
+    mock_cloudwatch.filter_log_events.assert_not_called()
+    mock_s3.create_multipart_upload.assert_not_called()
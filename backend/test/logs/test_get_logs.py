@@ -14,11 +14,14 @@
 #   limitations under the License.
 #
 
+import json
+from typing import Optional
 from unittest import mock
 
 import pytest
 from botocore.exceptions import ClientError
 
+from ml_space_lambda.data_access_objects.pagination_helper import decode_pagination_token, encode_pagination_token
 from ml_space_lambda.utils.common_functions import generate_html_response
 
 TEST_ENV_CONFIG = {
@@ -97,6 +100,7 @@ def mock_job_event(job_type: str):
                 "startTime": 0,
                 "endTime": 1674060211048,
                 "nextToken": "mockTokenValue",
+                "limit": 1000,
             },
         ),
         (
@@ -107,6 +111,7 @@ def mock_job_event(job_type: str):
                 "startTime": 0,
                 "endTime": 1674060211048,
                 "nextToken": "mockTokenValue",
+                "limit": 1000,
             },
         ),
         (
@@ -114,6 +119,7 @@ def mock_job_event(job_type: str):
             {
                 "logGroupName": "/aws/sagemaker/NotebookInstances",
                 "logStreamNamePrefix": MOCK_NOTEBOOK_NAME,
+                "limit": 1000,
             },
         ),
         (
@@ -123,6 +129,7 @@ def mock_job_event(job_type: str):
                 "logStreamNamePrefix": "variant-name-1",
                 "startTime": 0,
                 "endTime": 1674060211048,
+                "limit": 1000,
             },
         ),
         (
@@ -131,6 +138,7 @@ def mock_job_event(job_type: str):
                 "logGroupName": f"/aws/sagemaker/Endpoints/{MOCK_ENDPOINT_NAME}",
                 "startTime": 0,
                 "endTime": 1674060211048,
+                "limit": 1000,
             },
         ),
     ],
@@ -144,11 +152,236 @@ def mock_job_event(job_type: str):
 )
 @mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
 def test_get_logs_success(mock_cloudwatch, mock_event, expected_params):
-    mock_cloudwatch.filter_log_events.return_value = mock_cloudwatch_response
-    expected_response = generate_html_response(200, mock_cloudwatch_response)
+    mock_cloudwatch.filter_log_events.return_value = {"events": mock_cloudwatch_response["events"]}
+    expected_response = generate_html_response(200, {"events": mock_cloudwatch_response["events"], "nextToken": None})
+
+    assert get(mock_event, mock_context) == expected_response
+    mock_cloudwatch.filter_log_events.assert_called_once_with(**expected_params)
+
+
+def _mock_log_event(timestamp: int, stream: str = "/aws/sagemaker", event_id: Optional[str] = None):
+    log_event = {"logStreamName": stream, "timestamp": timestamp, "message": f"Message {timestamp}"}
+    if event_id:
+        log_event["eventId"] = event_id
+    return log_event
+
+
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_get_logs_fills_page(mock_cloudwatch):
+    mock_cloudwatch.filter_log_events.side_effect = [
+        {"events": [], "nextToken": "token1"},
+        {"events": [_mock_log_event(3), _mock_log_event(1)], "nextToken": "token2"},
+        {"events": [_mock_log_event(2)], "nextToken": "token3"},
+    ]
+    mock_event = {
+        "resource": f"/notebook/{MOCK_NOTEBOOK_NAME}/logs",
+        "pathParameters": {"notebookName": MOCK_NOTEBOOK_NAME},
+        "queryStringParameters": {"limit": "3", "filterPattern": "ERROR"},
+    }
+    expected_response = generate_html_response(
+        200, {"events": [_mock_log_event(1), _mock_log_event(2), _mock_log_event(3)], "nextToken": "token3"}
+    )
 
     assert get(mock_event, mock_context) == expected_response
-    mock_cloudwatch.filter_log_events.assert_called_with(**expected_params)
+    mock_cloudwatch.filter_log_events.assert_has_calls(
+        [
+            mock.call(
+                logGroupName="/aws/sagemaker/NotebookInstances",
+                logStreamNamePrefix=MOCK_NOTEBOOK_NAME,
+                filterPattern="ERROR",
+                limit=3,
+            ),
+            mock.call(
+                logGroupName="/aws/sagemaker/NotebookInstances",
+                logStreamNamePrefix=MOCK_NOTEBOOK_NAME,
+                filterPattern="ERROR",
+                limit=3,
+                nextToken="token1",
+            ),
+            mock.call(
+                logGroupName="/aws/sagemaker/NotebookInstances",
+                logStreamNamePrefix=MOCK_NOTEBOOK_NAME,
+                filterPattern="ERROR",
+                limit=1,
+                nextToken="token2",
+            ),
+        ]
+    )
+
+
+@mock.patch("ml_space_lambda.logs.lambda_functions.LOGS_TIME_BUDGET_SECONDS", 0)
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_get_logs_time_budget(mock_cloudwatch):
+    mock_cloudwatch.filter_log_events.return_value = {"events": [], "nextToken": "token1"}
+
+    assert get(mock_notebook_event, mock_context) == generate_html_response(200, {"events": [], "nextToken": "token1"})
+    mock_cloudwatch.filter_log_events.assert_called_once()
+
+
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_get_logs_merges_variants(mock_cloudwatch):
+    def _filter_log_events(**kwargs):
+        prefix = kwargs["logStreamNamePrefix"]
+        if prefix == "variant-1":
+            assert "nextToken" not in kwargs
+            return {"events": [_mock_log_event(1, prefix), _mock_log_event(4, prefix)], "nextToken": "variant-1-token"}
+        return {"events": [_mock_log_event(2, prefix), _mock_log_event(3, prefix)]}
+
+    mock_cloudwatch.filter_log_events.side_effect = _filter_log_events
+    mock_event = {
+        "resource": f"/endpoint/{MOCK_ENDPOINT_NAME}/logs",
+        "pathParameters": {"endpointName": MOCK_ENDPOINT_NAME},
+        "queryStringParameters": {"variantName": "variant-1,variant-2", "limit": "4"},
+    }
+
+    response = get(mock_event, mock_context)
+    body = json.loads(response["body"])
+    assert [(log_event["logStreamName"], log_event["timestamp"]) for log_event in body["events"]] == [
+        ("variant-1", 1),
+        ("variant-2", 2),
+        ("variant-2", 3),
+        ("variant-1", 4),
+    ]
+    # Only streams with events remaining are included in the next token
+    assert decode_pagination_token(body["nextToken"]) == {"variant-1": {"nextToken": "variant-1-token"}}
+    for call in mock_cloudwatch.filter_log_events.call_args_list:
+        assert call.kwargs["limit"] == 2
+
+    mock_cloudwatch.filter_log_events.reset_mock()
+    mock_cloudwatch.filter_log_events.side_effect = None
+    mock_cloudwatch.filter_log_events.return_value = {"events": [_mock_log_event(5, "variant-1")]}
+    mock_event["queryStringParameters"]["nextToken"] = body["nextToken"]
+
+    response = get(mock_event, mock_context)
+    assert json.loads(response["body"]) == {"events": [_mock_log_event(5, "variant-1")], "nextToken": None}
+    mock_cloudwatch.filter_log_events.assert_called_once_with(
+        logGroupName=f"/aws/sagemaker/Endpoints/{MOCK_ENDPOINT_NAME}",
+        logStreamNamePrefix="variant-1",
+        limit=4,
+        nextToken="variant-1-token",
+    )
+
+
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_get_logs_merges_lagging_variant(mock_cloudwatch):
+    def _filter_log_events(**kwargs):
+        prefix = kwargs["logStreamNamePrefix"]
+        if prefix == "variant-1":
+            return {"events": [_mock_log_event(1, prefix), _mock_log_event(2, prefix)], "nextToken": "variant-1-token"}
+        return {"events": [_mock_log_event(2, prefix, "event-2"), _mock_log_event(5, prefix)], "nextToken": "variant-2-token"}
+
+    mock_cloudwatch.filter_log_events.side_effect = _filter_log_events
+    mock_event = {
+        "resource": f"/endpoint/{MOCK_ENDPOINT_NAME}/logs",
+        "pathParameters": {"endpointName": MOCK_ENDPOINT_NAME},
+        "queryStringParameters": {"variantName": "variant-1,variant-2", "limit": "4"},
+    }
+
+    response = get(mock_event, mock_context)
+    body = json.loads(response["body"])
+    # variant-1 may still have events between 2 and 5 so the page stops at 2
+    assert [(log_event["logStreamName"], log_event["timestamp"]) for log_event in body["events"]] == [
+        ("variant-1", 1),
+        ("variant-1", 2),
+        ("variant-2", 2),
+    ]
+    assert decode_pagination_token(body["nextToken"]) == {
+        "variant-1": {"nextToken": "variant-1-token"},
+        "variant-2": {"startTime": 5, "seenEventIds": []},
+    }
+
+    mock_cloudwatch.filter_log_events.reset_mock()
+    mock_cloudwatch.filter_log_events.side_effect = [
+        {"events": [_mock_log_event(3, "variant-1")]},
+        {"events": [_mock_log_event(5, "variant-2")]},
+    ]
+    mock_event["queryStringParameters"]["nextToken"] = body["nextToken"]
+
+    response = get(mock_event, mock_context)
+    assert json.loads(response["body"]) == {
+        "events": [_mock_log_event(3, "variant-1"), _mock_log_event(5, "variant-2")],
+        "nextToken": None,
+    }
+    mock_cloudwatch.filter_log_events.assert_has_calls(
+        [
+            mock.call(
+                logGroupName=f"/aws/sagemaker/Endpoints/{MOCK_ENDPOINT_NAME}",
+                logStreamNamePrefix="variant-1",
+                limit=2,
+                nextToken="variant-1-token",
+            ),
+            mock.call(
+                logGroupName=f"/aws/sagemaker/Endpoints/{MOCK_ENDPOINT_NAME}",
+                logStreamNamePrefix="variant-2",
+                startTime=5,
+                limit=2,
+            ),
+        ]
+    )
+
+
+@mock.patch("ml_space_lambda.logs.lambda_functions.LOGS_RESPONSE_BYTE_BUDGET", 300)
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_get_logs_merge_response_budget(mock_cloudwatch):
+    def _filter_log_events(**kwargs):
+        prefix = kwargs["logStreamNamePrefix"]
+        if prefix == "variant-1":
+            events = [_mock_log_event(1, prefix, "a"), _mock_log_event(2, prefix, "b"), _mock_log_event(2, prefix, "c")]
+        else:
+            events = [_mock_log_event(3, prefix, "d")]
+        return {"events": [log_event for log_event in events if log_event["timestamp"] >= kwargs.get("startTime", 0)]}
+
+    mock_cloudwatch.filter_log_events.side_effect = _filter_log_events
+    mock_event = {
+        "resource": f"/endpoint/{MOCK_ENDPOINT_NAME}/logs",
+        "pathParameters": {"endpointName": MOCK_ENDPOINT_NAME},
+        "queryStringParameters": {"variantName": "variant-1,variant-2", "limit": "10"},
+    }
+
+    response = get(mock_event, mock_context)
+    body = json.loads(response["body"])
+    assert [(log_event["logStreamName"], log_event["eventId"]) for log_event in body["events"]] == [
+        ("variant-1", "a"),
+        ("variant-1", "b"),
+    ]
+    # Events sharing the resume timestamp which were already returned are skipped on the next page
+    assert decode_pagination_token(body["nextToken"]) == {
+        "variant-1": {"startTime": 2, "seenEventIds": ["b"]},
+        "variant-2": {"startTime": 3, "seenEventIds": []},
+    }
+
+    mock_cloudwatch.filter_log_events.side_effect = _filter_log_events
+    mock_event["queryStringParameters"]["nextToken"] = body["nextToken"]
+    with mock.patch("ml_space_lambda.logs.lambda_functions.LOGS_RESPONSE_BYTE_BUDGET", 1000):
+        response = get(mock_event, mock_context)
+    body = json.loads(response["body"])
+    assert [log_event["eventId"] for log_event in body["events"]] == ["c", "d"]
+    assert body["nextToken"] is None
+
+
+@pytest.mark.parametrize(
+    "query_params,message",
+    [
+        ({"limit": "0"}, "limit must be between 1 and 10000."),
+        ({"limit": "abc"}, "limit must be between 1 and 10000."),
+        (
+            {"variantName": "a,b", "nextToken": encode_pagination_token({"c": "token"})},
+            "Invalid nextToken for the requested variants.",
+        ),
+        ({"variantName": ",".join(f"v{i}" for i in range(11))}, "Logs can be requested for at most 10 variants at a time."),
+    ],
+    ids=["zero_limit", "invalid_limit", "mismatched_token", "too_many_variants"],
+)
+@mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
+def test_get_logs_invalid_parameters(mock_cloudwatch, query_params, message):
+    mock_event = {
+        "resource": f"/endpoint/{MOCK_ENDPOINT_NAME}/logs",
+        "pathParameters": {"endpointName": MOCK_ENDPOINT_NAME},
+        "queryStringParameters": query_params,
+    }
+
+    assert get(mock_event, mock_context) == generate_html_response(400, f"Bad Request: {message}")
+    mock_cloudwatch.filter_log_events.assert_not_called()
 
 
 @mock.patch("ml_space_lambda.logs.lambda_functions.cloudwatch")
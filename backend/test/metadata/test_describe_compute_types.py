@@ -17,6 +17,7 @@
 # Testing for the list_endpoint Lambda function
 from unittest import mock
 
+import pytest
 from botocore.exceptions import ClientError
 
 from ml_space_lambda.utils.common_functions import generate_html_response
@@ -30,6 +31,16 @@ with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
 
 mock_context = mock.Mock()
 
+
+@pytest.fixture(autouse=True)
+def bypass_metadata_cache():
+    # The shared metadata cache is covered by the metadata cache tests
+    with mock.patch(
+        "ml_space_lambda.metadata.lambda_functions.get_cached_metadata", side_effect=lambda name, loader: loader()
+    ) as mock_get_cached_metadata:
+        yield mock_get_cached_metadata
+
+
 mock_ec2_response = [
     {
         "InstanceTypeOfferings": [
@@ -87,14 +98,14 @@ def test_describe_compute_types_success(mock_ec2):
 
 
 @mock.patch("ml_space_lambda.metadata.lambda_functions.ec2_client")
-def test_describe_compute_types_cached(mock_ec2):
+def test_describe_compute_types_cached(mock_ec2, bypass_metadata_cache):
+    bypass_metadata_cache.side_effect = lambda name, loader: expected_body
     expected_response = generate_html_response(200, expected_body)
     response = lambda_handler({}, mock_context)
     assert response == expected_response
     mock_ec2.get_paginator.assert_not_called()
 
 
-@mock.patch.dict("ml_space_lambda.metadata.lambda_functions.cached_response_compute_types", {}, clear=True)
 @mock.patch("ml_space_lambda.metadata.lambda_functions.ec2_client")
 def test_describe_compute_types_client_error(mock_ec2):
     error_msg = {
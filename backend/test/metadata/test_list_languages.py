@@ -18,6 +18,7 @@
 
 from unittest import mock
 
+import pytest
 from botocore.exceptions import ClientError
 
 from ml_space_lambda.utils.common_functions import generate_html_response
@@ -30,6 +31,17 @@ with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
     from ml_space_lambda.metadata.lambda_functions import list_languages as lambda_handler
 
 mock_context = mock.Mock()
+
+
+@pytest.fixture(autouse=True)
+def bypass_metadata_cache():
+    # The shared metadata cache is covered by the metadata cache tests
+    with mock.patch(
+        "ml_space_lambda.metadata.lambda_functions.get_cached_metadata", side_effect=lambda name, loader: loader()
+    ) as mock_get_cached_metadata:
+        yield mock_get_cached_metadata
+
+
 mock_response = {
     "Languages": [
         {"LanguageName": "English", "LanguageCode": "en"},
@@ -49,12 +61,9 @@ def test_list_languages_success(mock_translate):
     mock_translate.list_languages.assert_called()
 
 
-@mock.patch(
-    "ml_space_lambda.metadata.lambda_functions.cached_response_translate_languages",
-    mock_response["Languages"],
-)
 @mock.patch("ml_space_lambda.metadata.lambda_functions.translate_client")
-def test_list_languages_cached(mock_translate):
+def test_list_languages_cached(mock_translate, bypass_metadata_cache):
+    bypass_metadata_cache.side_effect = lambda name, loader: mock_response["Languages"]
     result = mock_response["Languages"]
     expected_response = generate_html_response(200, result)
     mock_translate.list_languages.return_value = mock_response
@@ -63,7 +72,6 @@ def test_list_languages_cached(mock_translate):
     mock_translate.list_languages.assert_not_called()
 
 
-@mock.patch("ml_space_lambda.metadata.lambda_functions.cached_response_translate_languages", [])
 @mock.patch("ml_space_lambda.metadata.lambda_functions.translate_client")
 def test_list_languages_client_error(mock_translate):
     error_msg = {
@@ -18,6 +18,7 @@
 
 from unittest import mock
 
+import pytest
 from botocore.exceptions import ClientError
 
 import ml_space_lambda.utils.mlspace_config as mlspace_config
@@ -31,6 +32,17 @@ with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
     from ml_space_lambda.metadata.lambda_functions import list_subnets as lambda_handler
 
 mock_context = mock.Mock()
+
+
+@pytest.fixture(autouse=True)
+def bypass_metadata_cache():
+    # The shared metadata cache is covered by the metadata cache tests
+    with mock.patch(
+        "ml_space_lambda.metadata.lambda_functions.get_cached_metadata", side_effect=lambda name, loader: loader()
+    ) as mock_get_cached_metadata:
+        yield mock_get_cached_metadata
+
+
 mock_ec2_response = {
     "Subnets": [
         {
@@ -84,13 +96,10 @@ def test_list_subnets(mock_ec2, mock_pull_config, mock_s3_param_json):
     mock_pull_config.assert_called_once()
 
 
-@mock.patch(
-    "ml_space_lambda.metadata.lambda_functions.cached_response_subnets",
-    expected_body,
-)
 @mock.patch("ml_space_lambda.metadata.lambda_functions.pull_config_from_s3")
 @mock.patch("ml_space_lambda.metadata.lambda_functions.ec2_client")
-def test_list_subnets_cached(mock_ec2, mock_pull_config):
+def test_list_subnets_cached(mock_ec2, mock_pull_config, bypass_metadata_cache):
+    bypass_metadata_cache.side_effect = lambda name, loader: expected_body
     expected_response = generate_html_response(200, expected_body)
     response = lambda_handler({}, mock_context)
     assert response == expected_response
@@ -98,7 +107,6 @@ def test_list_subnets_cached(mock_ec2, mock_pull_config):
     mock_pull_config.assert_not_called()
 
 
-@mock.patch("ml_space_lambda.metadata.lambda_functions.cached_response_subnets", [])
 @mock.patch("ml_space_lambda.metadata.lambda_functions.pull_config_from_s3")
 @mock.patch("ml_space_lambda.metadata.lambda_functions.ec2_client")
 def test_list_subnets_client_error(mock_ec2, mock_pull_config, mock_s3_param_json):
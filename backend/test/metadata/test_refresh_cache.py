@@ -0,0 +1,48 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-iso-east-1",
+}
+
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.metadata.lambda_functions import refresh_cache as lambda_handler
+
+mock_context = mock.Mock()
+
+
+@mock.patch("ml_space_lambda.metadata.lambda_functions.write_cached_metadata")
+@mock.patch("ml_space_lambda.metadata.lambda_functions.pull_config_from_s3")
+@mock.patch("ml_space_lambda.metadata.lambda_functions.translate_client")
+@mock.patch("ml_space_lambda.metadata.lambda_functions.ec2_client")
+def test_refresh_cache(mock_ec2, mock_translate, mock_pull_config, mock_write_cached_metadata, mock_s3_param_json):
+    mock_pull_config.return_value = mock_s3_param_json
+    mock_ec2.get_paginator.return_value.paginate.return_value = [{"InstanceTypeOfferings": [{"InstanceType": "t3.medium"}]}]
+    mock_ec2.describe_subnets.return_value = {"Subnets": [{"SubnetId": "subnet1", "AvailabilityZone": "us-east-1a"}]}
+    mock_translate.list_languages.side_effect = ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "Dummy error message."}}, "ListLanguages"
+    )
+
+    lambda_handler({}, mock_context)
+
+    # A failure refreshing one entry doesn't prevent refreshing the others
+    assert [call.args[0] for call in mock_write_cached_metadata.call_args_list] == ["compute-types", "subnets"]
+    assert "ml.t3.medium" in mock_write_cached_metadata.call_args_list[0].args[1]["InstanceTypes"]["InstanceType"]
+    mock_write_cached_metadata.assert_called_with("subnets", [{"subnetId": "subnet1", "availabilityZone": "us-east-1a"}])
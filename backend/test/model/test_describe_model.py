@@ -19,6 +19,8 @@ from unittest import mock
 
 from botocore.exceptions import ClientError
 
+from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataModel
+from ml_space_lambda.enums import ResourceType
 from ml_space_lambda.utils.common_functions import generate_html_response, generate_tags
 
 TEST_ENV_CONFIG = {
@@ -45,8 +47,10 @@ mock_event = {"pathParameters": {"modelName": "example_model"}}
 mock_context = mock.Mock()
 
 
+@mock.patch("ml_space_lambda.model.lambda_functions.resource_metadata_dao")
 @mock.patch("ml_space_lambda.model.lambda_functions.sagemaker")
-def test_describe_model_success(mock_sagemaker):
+def test_describe_model_success(mock_sagemaker, mock_resource_metadata_dao):
+    mock_resource_metadata_dao.get.return_value = None
     lambda_response = copy.deepcopy(describe_mock_response)
     lambda_response.pop("ResponseMetadata", None)
     lambda_response["Owner"] = username
@@ -61,8 +65,26 @@ def test_describe_model_success(mock_sagemaker):
     mock_sagemaker.list_tags.assert_called_with(ResourceArn="example_arn")
 
 
+@mock.patch("ml_space_lambda.model.lambda_functions.resource_metadata_dao")
 @mock.patch("ml_space_lambda.model.lambda_functions.sagemaker")
-def test_describe_model_describe_model_error(mock_sagemaker):
+def test_describe_model_owner_from_metadata(mock_sagemaker, mock_resource_metadata_dao):
+    lambda_response = copy.deepcopy(describe_mock_response)
+    lambda_response.pop("ResponseMetadata", None)
+    lambda_response["Owner"] = username
+
+    mock_sagemaker.describe_model.return_value = copy.deepcopy(describe_mock_response)
+    mock_resource_metadata_dao.get.return_value = ResourceMetadataModel(
+        "example_model", ResourceType.MODEL, username, "example_project", {}
+    )
+
+    assert lambda_handler(mock_event, mock_context) == generate_html_response(200, lambda_response)
+    mock_resource_metadata_dao.get.assert_called_with("example_model", ResourceType.MODEL)
+    mock_sagemaker.list_tags.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.model.lambda_functions.resource_metadata_dao")
+@mock.patch("ml_space_lambda.model.lambda_functions.sagemaker")
+def test_describe_model_describe_model_error(mock_sagemaker, mock_resource_metadata_dao):
     error_msg = {
         "Error": {"Code": "ThrottlingException", "Message": "Dummy error message."},
         "ResponseMetadata": {"HTTPStatusCode": 400},
@@ -78,8 +100,10 @@ def test_describe_model_describe_model_error(mock_sagemaker):
     mock_sagemaker.describe_model.assert_called_with(ModelName="example_model")
 
 
+@mock.patch("ml_space_lambda.model.lambda_functions.resource_metadata_dao")
 @mock.patch("ml_space_lambda.model.lambda_functions.sagemaker")
-def test_describe_model_list_tags_error(mock_sagemaker):
+def test_describe_model_list_tags_error(mock_sagemaker, mock_resource_metadata_dao):
+    mock_resource_metadata_dao.get.return_value = None
     error_msg = {
         "Error": {"Code": "ThrottlingException", "Message": "Dummy error message."},
         "ResponseMetadata": {"HTTPStatusCode": 400},
@@ -19,6 +19,7 @@ from unittest import mock
 
 from botocore.exceptions import ClientError
 
+from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataModel
 from ml_space_lambda.data_access_objects.resource_scheduler import ResourceSchedulerModel
 from ml_space_lambda.enums import ResourceType
 from ml_space_lambda.utils.common_functions import generate_html_response
@@ -33,9 +34,11 @@ with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
 mock_context = mock.Mock()
 
 
+@mock.patch("ml_space_lambda.notebook.lambda_functions.resource_metadata_dao")
 @mock.patch("ml_space_lambda.notebook.lambda_functions.resource_scheduler_dao")
 @mock.patch("ml_space_lambda.notebook.lambda_functions.sagemaker")
-def test_describe_notebook_instance_success(mock_sagemaker, mock_dao_scheduler):
+def test_describe_notebook_instance_success(mock_sagemaker, mock_dao_scheduler, mock_resource_metadata_dao):
+    mock_resource_metadata_dao.get.return_value = None
     mock_user = "jdoe@amazon.com"
     mock_arn = "fakeArn"
     mock_name = "example_notebook_instance"
@@ -90,11 +93,44 @@ def test_describe_notebook_instance_success(mock_sagemaker, mock_dao_scheduler):
 
     assert lambda_handler(mock_event, mock_context) == expected_response
     mock_sagemaker.describe_notebook_instance.assert_called_with(NotebookInstanceName=mock_name)
-    mock_sagemaker.list_tags.assert_called_with(ResourceArn=mock_arn)
+    mock_sagemaker.list_tags.assert_has_calls(
+        [mock.call(ResourceArn=mock_arn), mock.call(ResourceArn=mock_arn, NextToken="mock_next_token")]
+    )
+    mock_resource_metadata_dao.get.assert_called_with(mock_name, ResourceType.NOTEBOOK)
+
+
+@mock.patch("ml_space_lambda.notebook.lambda_functions.resource_metadata_dao")
+@mock.patch("ml_space_lambda.notebook.lambda_functions.resource_scheduler_dao")
+@mock.patch("ml_space_lambda.notebook.lambda_functions.sagemaker")
+def test_describe_notebook_instance_owner_from_metadata(mock_sagemaker, mock_dao_scheduler, mock_resource_metadata_dao):
+    mock_name = "example_notebook_instance"
+    mock_event = {"pathParameters": {"notebookName": mock_name}}
+    mock_dao_scheduler.get.return_value = None
+    mock_resource_metadata_dao.get.return_value = ResourceMetadataModel(
+        mock_name, ResourceType.NOTEBOOK, "jdoe@amazon.com", "test-project", {}
+    )
+    mock_sagemaker.describe_notebook_instance.return_value = {
+        "NotebookInstanceArn": "fakeArn",
+        "NotebookInstanceName": mock_name,
+    }
+    expected_response = generate_html_response(
+        200,
+        {
+            "NotebookInstanceArn": "fakeArn",
+            "NotebookInstanceName": mock_name,
+            "Owner": "jdoe@amazon.com",
+            "Project": "test-project",
+        },
+    )
 
+    assert lambda_handler(mock_event, mock_context) == expected_response
+    mock_sagemaker.list_tags.assert_not_called()
 
+
+@mock.patch("ml_space_lambda.notebook.lambda_functions.resource_metadata_dao")
+@mock.patch("ml_space_lambda.notebook.lambda_functions.resource_scheduler_dao")
 @mock.patch("ml_space_lambda.notebook.lambda_functions.sagemaker")
-def test_describe_notebook_instance_client_error(mock_sagemaker):
+def test_describe_notebook_instance_client_error(mock_sagemaker, mock_dao_scheduler, mock_resource_metadata_dao):
     mock_event = {"pathParameters": {"notebookName": "example_notebook_instance"}}
     error_msg = {
         "Error": {"Code": "MissingParameter", "Message": "Dummy error message."},
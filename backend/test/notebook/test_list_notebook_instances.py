@@ -110,7 +110,7 @@ def test_list_notebook_instances_success_user_single_project(mock_project_user_d
     }
     expected_response = generate_html_response(200, mock_return)
     mock_project_user_dao.get.return_value = MOCK_CO_USER
-    mock_resource_metadata_dao.get_all_for_project_by_type.return_value = PagedMetadataResults(
+    mock_resource_metadata_dao.get_all_for_user_by_type.return_value = PagedMetadataResults(
         [
             _mock_notebook_metadata(1),
             _mock_notebook_metadata(2),
@@ -119,9 +119,17 @@ def test_list_notebook_instances_success_user_single_project(mock_project_user_d
     )
 
     assert lambda_handler(_mock_event(False), mock_context) == expected_response
-    mock_resource_metadata_dao.get_all_for_project_by_type.assert_called_with(
-        MOCK_PROJECT_NAME, ResourceType.NOTEBOOK, limit=100, next_token=None
+    mock_resource_metadata_dao.get_all_for_user_by_type.assert_called_with(
+        MOCK_USERNAME,
+        ResourceType.NOTEBOOK,
+        limit=100,
+        next_token=None,
+        filter_expression="#p = :project",
+        filter_values={":project": MOCK_PROJECT_NAME},
+        expression_names={"#p": "project"},
+        fill_page=True,
     )
+    mock_resource_metadata_dao.get_all_for_project_by_type.assert_not_called()
 
 
 @mock.patch("ml_space_lambda.notebook.lambda_functions.resource_metadata_dao")
@@ -134,17 +142,24 @@ def test_list_notebook_instances_single_page(mock_project_user_dao, mock_resourc
     }
     expected_response = generate_html_response(200, mock_return)
     mock_project_user_dao.get.return_value = MOCK_CO_USER
-    mock_resource_metadata_dao.get_all_for_project_by_type.return_value = PagedMetadataResults(
+    # Filtering on the owner is done by the query
+    mock_resource_metadata_dao.get_all_for_user_by_type.return_value = PagedMetadataResults(
         [
-            _mock_notebook_metadata(1, user="otheruser"),
             _mock_notebook_metadata(3),
         ]
     )
 
     assert lambda_handler(_mock_event(False, True), mock_context) == expected_response
-    mock_resource_metadata_dao.get_all_for_project_by_type.assert_called_once()
-    mock_resource_metadata_dao.get_all_for_project_by_type.assert_called_with(
-        MOCK_PROJECT_NAME, ResourceType.NOTEBOOK, limit=10, next_token="mock_next_token1"
+    mock_resource_metadata_dao.get_all_for_user_by_type.assert_called_once()
+    mock_resource_metadata_dao.get_all_for_user_by_type.assert_called_with(
+        MOCK_USERNAME,
+        ResourceType.NOTEBOOK,
+        limit=10,
+        next_token="mock_next_token1",
+        filter_expression="#p = :project",
+        filter_values={":project": MOCK_PROJECT_NAME},
+        expression_names={"#p": "project"},
+        fill_page=True,
     )
 
 
@@ -257,12 +272,32 @@ def test_list_notebook_instances_success_user_multiple_projects(mock_project_use
     assert actual == expected_response
     mock_project_user_dao.get_projects_for_user.assert_called_with(MOCK_USERNAME)
     mock_resource_metadata_dao.get_all_for_user_by_type.assert_called_with(
-        MOCK_USERNAME, ResourceType.NOTEBOOK, limit=100, next_token=None
+        MOCK_USERNAME,
+        ResourceType.NOTEBOOK,
+        limit=100,
+        next_token=None,
+        filter_expression="#p IN (:p0, :p1)",
+        filter_values={":p0": MOCK_PROJECT_NAME, ":p1": SECONDARY_MOCK_PROJECT_NAME},
+        expression_names={"#p": "project"},
+        fill_page=True,
     )
 
 
 @mock.patch("ml_space_lambda.notebook.lambda_functions.resource_metadata_dao")
-def test_list_notebook_instances_client_error(mock_resource_metadata_dao):
+@mock.patch("ml_space_lambda.notebook.lambda_functions.project_user_dao")
+def test_list_notebook_instances_user_without_projects(mock_project_user_dao, mock_resource_metadata_dao):
+    mock_project_user_dao.get_projects_for_user.return_value = []
+    mock_event = _mock_event(False)
+    mock_event["pathParameters"].pop("projectName")
+
+    assert lambda_handler(mock_event, mock_context) == generate_html_response(200, {"records": []})
+    mock_resource_metadata_dao.get_all_for_user_by_type.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.notebook.lambda_functions.resource_metadata_dao")
+@mock.patch("ml_space_lambda.notebook.lambda_functions.project_user_dao")
+def test_list_notebook_instances_client_error(mock_project_user_dao, mock_resource_metadata_dao):
+    mock_project_user_dao.get.return_value = None
     error_msg = {
         "Error": {"Code": "ThrottlingException", "Message": "Dummy error message."},
         "ResponseMetadata": {"HTTPStatusCode": "400"},
@@ -0,0 +1,195 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+from typing import Any, Dict, List
+from unittest import mock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from ml_space_lambda.data_access_objects.project_user import ProjectUserModel
+from ml_space_lambda.data_access_objects.resource_metadata import ResourceMetadataModel
+from ml_space_lambda.data_access_objects.user import UserModel
+from ml_space_lambda.enums import Permission, ResourceType
+from ml_space_lambda.utils.common_functions import generate_html_response
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+}
+
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.project.lambda_functions import bulk_resource_actions as lambda_handler
+
+mock_context = mock.Mock()
+
+MOCK_PROJECT_NAME = "UnitTestProject"
+MOCK_USERNAME = "jdoe"
+
+
+def _mock_event(items: List[Dict[str, str]], is_admin: bool = False, **kwargs) -> Dict[str, Any]:
+    return {
+        "requestContext": {
+            "authorizer": {
+                "principalId": MOCK_USERNAME,
+                "user": json.dumps(
+                    UserModel(
+                        MOCK_USERNAME, "jdoe@amazon.com", "John Doe", False, [Permission.ADMIN] if is_admin else []
+                    ).to_dict()
+                ),
+            }
+        },
+        "pathParameters": {"projectName": MOCK_PROJECT_NAME},
+        "body": json.dumps({"items": items, **kwargs}),
+    }
+
+
+def _mock_record(resource_id: str, resource_type: ResourceType, user: str = MOCK_USERNAME, project: str = MOCK_PROJECT_NAME):
+    return ResourceMetadataModel(resource_id, resource_type, user, project, {})
+
+
+@mock.patch("ml_space_lambda.utils.resource_utils.sagemaker")
+@mock.patch("ml_space_lambda.project.lambda_functions.resource_scheduler_dao")
+@mock.patch("ml_space_lambda.project.lambda_functions.resource_metadata_dao")
+@mock.patch("ml_space_lambda.project.lambda_functions.project_user_dao")
+def test_bulk_resource_actions_owner(mock_project_user_dao, mock_resource_metadata_dao, mock_scheduler_dao, mock_sagemaker):
+    mock_project_user_dao.get.return_value = ProjectUserModel(
+        MOCK_USERNAME, MOCK_PROJECT_NAME, permissions=[Permission.PROJECT_OWNER]
+    )
+    mock_resource_metadata_dao.get_many.return_value = [
+        _mock_record("notebook1", ResourceType.NOTEBOOK, user="otheruser"),
+        _mock_record("endpoint1", ResourceType.ENDPOINT),
+        _mock_record("training1", ResourceType.TRAINING_JOB, user="otheruser"),
+        _mock_record("training2", ResourceType.TRAINING_JOB, project="OtherProject"),
+    ]
+    items = [
+        {"type": "notebook-instance", "id": "notebook1", "action": "stop"},
+        {"type": "endpoint", "id": "endpoint1", "action": "delete"},
+        {"type": "training-job", "id": "training1", "action": "stop"},
+        {"type": "training-job", "id": "training2", "action": "stop"},
+    ]
+    expected_response = generate_html_response(
+        200,
+        {
+            "results": [
+                {"type": "notebook-instance", "id": "notebook1", "action": "stop", "status": "Succeeded"},
+                {"type": "endpoint", "id": "endpoint1", "action": "delete", "status": "Succeeded"},
+                {"type": "training-job", "id": "training1", "action": "stop", "status": "Succeeded"},
+                {
+                    "type": "training-job",
+                    "id": "training2",
+                    "action": "stop",
+                    "status": "NotFound",
+                    "message": f"training2 does not exist in {MOCK_PROJECT_NAME}.",
+                },
+            ]
+        },
+    )
+
+    assert lambda_handler(_mock_event(items), mock_context) == expected_response
+    mock_resource_metadata_dao.get_many.assert_called_once_with(
+        [
+            ("notebook1", ResourceType.NOTEBOOK),
+            ("endpoint1", ResourceType.ENDPOINT),
+            ("training1", ResourceType.TRAINING_JOB),
+            ("training2", ResourceType.TRAINING_JOB),
+        ]
+    )
+    mock_sagemaker.stop_notebook_instance.assert_called_once_with(NotebookInstanceName="notebook1")
+    mock_sagemaker.delete_endpoint.assert_called_once_with(EndpointName="endpoint1")
+    mock_sagemaker.stop_training_job.assert_called_once_with(TrainingJobName="training1")
+    mock_scheduler_dao.delete_many.assert_called_once_with([("endpoint1", ResourceType.ENDPOINT)])
+
+
+@mock.patch("ml_space_lambda.utils.resource_utils.sagemaker")
+@mock.patch("ml_space_lambda.project.lambda_functions.resource_scheduler_dao")
+@mock.patch("ml_space_lambda.project.lambda_functions.resource_metadata_dao")
+@mock.patch("ml_space_lambda.project.lambda_functions.project_user_dao")
+def test_bulk_resource_actions_member(mock_project_user_dao, mock_resource_metadata_dao, mock_scheduler_dao, mock_sagemaker):
+    mock_project_user_dao.get.return_value = ProjectUserModel(MOCK_USERNAME, MOCK_PROJECT_NAME)
+    mock_resource_metadata_dao.get_many.return_value = [
+        _mock_record("notebook1", ResourceType.NOTEBOOK),
+        _mock_record("notebook2", ResourceType.NOTEBOOK, user="otheruser"),
+    ]
+    mock_sagemaker.delete_notebook_instance.side_effect = ClientError(
+        {"Error": {"Code": "ValidationException", "Message": "Dummy error message."}}, "DeleteNotebookInstance"
+    )
+    items = [
+        {"type": "notebook-instance", "id": "notebook1", "action": "delete"},
+        {"type": "notebook-instance", "id": "notebook2", "action": "delete"},
+    ]
+    expected_response = generate_html_response(
+        200,
+        {
+            "results": [
+                {
+                    "type": "notebook-instance",
+                    "id": "notebook1",
+                    "action": "delete",
+                    "status": "Failed",
+                    "message": "An error occurred (ValidationException) when calling the DeleteNotebookInstance operation: "
+                    "Dummy error message.",
+                },
+                {
+                    "type": "notebook-instance",
+                    "id": "notebook2",
+                    "action": "delete",
+                    "status": "Denied",
+                    "message": "Only the owner of notebook2 or a project owner may delete it.",
+                },
+            ]
+        },
+    )
+
+    assert lambda_handler(_mock_event(items), mock_context) == expected_response
+    mock_sagemaker.delete_notebook_instance.assert_called_once_with(NotebookInstanceName="notebook1")
+    mock_scheduler_dao.delete_many.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.utils.resource_utils.sagemaker")
+@mock.patch("ml_space_lambda.project.lambda_functions.resource_scheduler_dao")
+@mock.patch("ml_space_lambda.project.lambda_functions.resource_metadata_dao")
+@mock.patch("ml_space_lambda.project.lambda_functions.project_user_dao")
+def test_bulk_resource_actions_admin_skip_schedule_cleanup(
+    mock_project_user_dao, mock_resource_metadata_dao, mock_scheduler_dao, mock_sagemaker
+):
+    mock_project_user_dao.get.return_value = None
+    mock_resource_metadata_dao.get_many.return_value = [_mock_record("notebook1", ResourceType.NOTEBOOK, user="otheruser")]
+    items = [{"type": "notebook-instance", "id": "notebook1", "action": "delete"}]
+    expected_response = generate_html_response(
+        200, {"results": [{"type": "notebook-instance", "id": "notebook1", "action": "delete", "status": "Succeeded"}]}
+    )
+
+    assert lambda_handler(_mock_event(items, is_admin=True, cleanupSchedules=False), mock_context) == expected_response
+    mock_sagemaker.delete_notebook_instance.assert_called_once_with(NotebookInstanceName="notebook1")
+    mock_scheduler_dao.delete_many.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "items,message",
+    [
+        ([], "Between 1 and 100 items must be provided."),
+        ([{"type": "endpoint", "id": "e1", "action": "stop"}] * 101, "Between 1 and 100 items must be provided."),
+        ([{"type": "unknown", "id": "e1", "action": "stop"}], "Each item must include a valid type, id and action."),
+        ([{"type": "endpoint", "action": "delete"}], "Each item must include a valid type, id and action."),
+        ([{"type": "endpoint", "id": "e1", "action": "stop"}], "The stop action is not supported for endpoint resources."),
+    ],
+    ids=["empty", "too_many", "unknown_type", "missing_id", "unsupported_action"],
+)
+@mock.patch("ml_space_lambda.project.lambda_functions.resource_metadata_dao")
+def test_bulk_resource_actions_invalid_items(mock_resource_metadata_dao, items, message):
+    assert lambda_handler(_mock_event(items), mock_context) == generate_html_response(400, f"Bad Request: {message}")
+    mock_resource_metadata_dao.get_many.assert_not_called()
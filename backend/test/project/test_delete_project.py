@@ -179,8 +179,8 @@ def test_delete_project(
         )
     ]
     mock_dataset_dao.delete.return_value = None
-    mock_s3.list_objects_v2.return_value = {"Contents": [{"Key": "TestObjectKey"}]}
-    mock_s3.delete_object.return_value = None
+    mock_s3.get_paginator.return_value.paginate.return_value = [{"Contents": [{"Key": "TestObjectKey"}]}]
+    mock_s3.delete_objects.return_value = {}
     mock_project_user_dao.get_users_for_project.return_value = [
         ProjectUserModel(
             username="jdoe@example.com",
@@ -211,10 +211,13 @@ def test_delete_project(
     mock_dataset_dao.get_all_for_scope.assert_called_with(DatasetType.PROJECT, MOCK_PROJECT_NAME)
     mock_project_user_dao.get_users_for_project.assert_called_with(MOCK_PROJECT_NAME)
     mock_project_user_dao.delete.assert_called_with(MOCK_PROJECT_NAME, "jdoe@example.com")
-    mock_s3.list_objects_v2.assert_called_with(
+    mock_s3.get_paginator.assert_called_with("list_objects_v2")
+    mock_s3.get_paginator.return_value.paginate.assert_called_with(
         Bucket=env_vars[EnvVariable.DATA_BUCKET], Prefix=f"project/{MOCK_PROJECT_NAME}/datasets/TestDataset/"
     )
-    mock_s3.delete_object.assert_called_with(Bucket=env_vars[EnvVariable.DATA_BUCKET], Key="TestObjectKey")
+    mock_s3.delete_objects.assert_called_with(
+        Bucket=env_vars[EnvVariable.DATA_BUCKET], Delete={"Objects": [{"Key": "TestObjectKey"}], "Quiet": True}
+    )
     mock_dataset_dao.delete.assert_called_with(MOCK_PROJECT_NAME, "TestDataset")
     mock_sagemaker.delete_model.assert_called_with(ModelName="TestModel")
     mock_sagemaker.delete_endpoint.assert_called_with(EndpointName="TestEndpoint")
@@ -240,6 +243,39 @@ def test_delete_project_not_suspended(mock_project_dao, mock_resource_metadata_d
     mock_project_dao.delete.assert_not_called()
 
 
+@mock.patch("ml_space_lambda.project.lambda_functions.DELETE_TIME_BUDGET_SECONDS", 0)
+@mock.patch("ml_space_lambda.project.lambda_functions.sagemaker")
+@mock.patch("ml_space_lambda.project.lambda_functions.s3")
+@mock.patch("ml_space_lambda.project.lambda_functions.dataset_dao")
+@mock.patch("ml_space_lambda.project.lambda_functions.resource_metadata_dao")
+@mock.patch("ml_space_lambda.project.lambda_functions.project_dao")
+def test_delete_project_datasets_in_progress(
+    mock_project_dao, mock_resource_metadata_dao, mock_dataset_dao, mock_s3, mock_sagemaker
+):
+    mlspace_config.env_variables = {}
+    env_vars = get_environment_variables()
+    mock_project_dao.get.return_value = mock_project(True)
+    mock_dataset_dao.get_all_for_scope.return_value = [
+        DatasetModel(
+            scope=MOCK_PROJECT_NAME,
+            type=DatasetType.PROJECT,
+            name="TestDataset",
+            description="Test description",
+            location=f"s3://{env_vars['DATA_BUCKET']}/project/{MOCK_PROJECT_NAME}/datasets/TestDataset",
+            created_by="jdoe@example.com",
+        )
+    ]
+    mock_s3.get_paginator.return_value.paginate.return_value = [{"Contents": [{"Key": "TestObjectKey"}]}]
+
+    # The time budget is exhausted before any files are deleted so the request needs to be repeated
+    assert lambda_handler(mock_event, mock_context) == generate_html_response(200, {"status": "InProgress", "deleted": 0})
+    mock_s3.delete_objects.assert_not_called()
+    mock_dataset_dao.delete.assert_not_called()
+    mock_resource_metadata_dao.get_all_for_project_by_type.assert_not_called()
+    mock_sagemaker.delete_model.assert_not_called()
+    mock_project_dao.delete.assert_not_called()
+
+
 @mock.patch.dict("os.environ", {"MANAGE_IAM_ROLES": "True"})
 @mock.patch("ml_space_lambda.project.lambda_functions.group_user_dao")
 @mock.patch("ml_space_lambda.project.lambda_functions.project_group_dao")
@@ -291,7 +327,7 @@ def test_delete_project_external_iam(
         )
     ]
     mock_dataset_dao.delete.return_value = None
-    mock_s3.list_objects_v2.return_value = {}
+    mock_s3.get_paginator.return_value.paginate.return_value = [{}]
     mock_project_user_dao.get_users_for_project.return_value = [
         ProjectUserModel(
             username="jdoe@example.com",
@@ -353,10 +389,10 @@ def test_delete_project_external_iam(
     mock_dataset_dao.get_all_for_scope.assert_called_with(DatasetType.PROJECT, MOCK_PROJECT_NAME)
 
     # Mocking an s3 bucket that's now empty
-    mock_s3.list_objects_v2.assert_called_with(
+    mock_s3.get_paginator.return_value.paginate.assert_called_with(
         Bucket=env_vars[EnvVariable.DATA_BUCKET], Prefix=f"project/{MOCK_PROJECT_NAME}/datasets/TestDataset/"
     )
-    mock_s3.delete_object.assert_not_called()
+    mock_s3.delete_objects.assert_not_called()
     mock_dataset_dao.delete.assert_called_with(MOCK_PROJECT_NAME, "TestDataset")
     # Not mocking any models/endpoints/configs
     mock_sagemaker.delete_model.assert_not_called()
@@ -451,8 +487,8 @@ def test_delete_project_pending_notebook(
     mock_dataset_dao.get_all_for_scope.assert_called_with(DatasetType.PROJECT, MOCK_PROJECT_NAME)
 
     # Not mocking any datasets so no s3 calls
-    mock_s3.list_objects_v2.assert_not_called()
-    mock_s3.delete_object.assert_not_called()
+    mock_s3.get_paginator.assert_not_called()
+    mock_s3.delete_objects.assert_not_called()
     mock_dataset_dao.delete.assert_not_called()
     # Not mocking any models/endpoints/configs
     mock_sagemaker.delete_model.assert_not_called()
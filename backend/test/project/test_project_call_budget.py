@@ -0,0 +1,53 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+# Call budgets for project handlers on hot paths, run against moto so that every DAO call made by the
+# handler is counted.
+import json
+from unittest import mock
+
+from ml_space_lambda.data_access_objects.project import ProjectModel
+from ml_space_lambda.data_access_objects.project_user import ProjectUserModel
+from ml_space_lambda.data_access_objects.user import UserModel
+from ml_space_lambda.enums import Permission
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+}
+
+MOCK_USER = UserModel("jdoe", "jdoe@example.com", "John Doe", False)
+
+mock_context = mock.Mock()
+
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.project import lambda_functions as project_lambda
+
+
+def test_project_get(mock_project_group_tables, call_budget):
+    project_lambda.project_dao.create(ProjectModel("example", "Example project", False, MOCK_USER.username))
+    project_lambda.project_user_dao.create(
+        ProjectUserModel(MOCK_USER.username, "example", permissions=[Permission.PROJECT_OWNER])
+    )
+    event = {
+        "requestContext": {"authorizer": {"principalId": MOCK_USER.username, "user": json.dumps(MOCK_USER.to_dict())}},
+        "pathParameters": {"projectName": "example"},
+        "queryStringParameters": {"includeResourceCounts": "false"},
+    }
+
+    with call_budget(dynamodb=4, operations={"GetItem": 4}):
+        response = project_lambda.get(event, mock_context)
+
+    assert response["statusCode"] == 200
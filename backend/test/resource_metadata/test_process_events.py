@@ -1211,16 +1211,16 @@ def test_no_tag_resource_still_exists(mock_sagemaker, mock_resource_metadata_dao
     ],
 )
 @mock.patch("ml_space_lambda.resource_metadata.lambda_functions.resource_metadata_dao")
-@mock.patch("ml_space_lambda.resource_metadata.lambda_functions.boto3")
-def test_translate_event(mock_boto3, mock_resource_metadata_dao, mock_event, status, manage_iam_roles, expected_action):
+@mock.patch("ml_space_lambda.resource_metadata.lambda_functions.iam")
+@mock.patch("ml_space_lambda.resource_metadata.lambda_functions.translate")
+def test_translate_event(
+    mock_translate, mock_iam, mock_resource_metadata_dao, mock_event, status, manage_iam_roles, expected_action
+):
     # clear out global params if set to make lambda tests independent of each other
-    resource_metadata_lambda.translate = {}
     resource_metadata_lambda.env_variables = {"MANAGE_IAM_ROLES": manage_iam_roles}
 
     if expected_action:
-        mock_translate = mock.MagicMock()
         mock_translate.describe_text_translation_job.return_value = _mock_translate_job_describe(job_status=status)
-        mock_iam = mock.MagicMock()
         mock_paginator = mock.Mock()
         mock_paginator.paginate.return_value = [
             {
@@ -1241,9 +1241,6 @@ def test_translate_event(mock_boto3, mock_resource_metadata_dao, mock_event, sta
             },
         ]
         mock_iam.get_paginator.return_value = mock_paginator
-        mock_boto3.client.side_effect = lambda client_type, **kwargs: (
-            mock_translate if client_type == "translate" else mock_iam
-        )
 
     process_event(mock_event, mock_context)
 
@@ -1265,16 +1262,13 @@ def test_translate_event(mock_boto3, mock_resource_metadata_dao, mock_event, sta
                 _mock_translate_expected_metadata(job_status=status),
             )
     else:
-        mock_boto3.client.assert_not_called()
+        mock_translate.describe_text_translation_job.assert_not_called()
+        mock_iam.get_paginator.assert_not_called()
 
 
 @mock.patch("ml_space_lambda.resource_metadata.lambda_functions.resource_metadata_dao")
-@mock.patch("ml_space_lambda.resource_metadata.lambda_functions.boto3")
-def test_translate_update_event_no_existing_metadata_record(mock_boto3, mock_resource_metadata_dao):
-    # clear out global params if set to make lambda tests independent of each other
-    resource_metadata_lambda.translate = {}
-    mock_translate = mock.MagicMock()
-    mock_boto3.client.return_value = mock_translate
+@mock.patch("ml_space_lambda.resource_metadata.lambda_functions.translate")
+def test_translate_update_event_no_existing_metadata_record(mock_translate, mock_resource_metadata_dao):
     mock_translate.describe_text_translation_job.return_value = _mock_translate_job_describe("STOP_REQUESTED")
     mock_resource_metadata_dao.update.side_effect = ClientError(
         {
@@ -1299,12 +1293,8 @@ def test_translate_update_event_no_existing_metadata_record(mock_boto3, mock_res
 
 
 @mock.patch("ml_space_lambda.resource_metadata.lambda_functions.resource_metadata_dao")
-@mock.patch("ml_space_lambda.resource_metadata.lambda_functions.boto3")
-def test_translate_event_describe_error(mock_boto3, mock_resource_metadata_dao):
-    # clear out global params if set to make lambda tests independent of each other
-    resource_metadata_lambda.translate = {}
-    mock_translate = mock.MagicMock()
-    mock_boto3.client.return_value = mock_translate
+@mock.patch("ml_space_lambda.resource_metadata.lambda_functions.translate")
+def test_translate_event_describe_error(mock_translate, mock_resource_metadata_dao):
     mock_translate.describe_text_translation_job.side_effect = ClientError(
         {
             "Error": {
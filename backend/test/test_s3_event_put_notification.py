@@ -14,6 +14,7 @@
 #   limitations under the License.
 #
 
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from unittest import mock
 
@@ -59,28 +60,38 @@ def _validate_dataset_create_call(call_args: List[Any], dataset: DatasetModel):
     assert dataset_arg.location == dataset.location
 
 
-def mock_event(
+def mock_record(
     bucket: Optional[str] = DATA_BUCKET,
     key: Optional[str] = MOCK_KEY,
     principal: Optional[str] = MOCK_FRONT_END_PRINCIPAL,
 ) -> Dict:
     return {
-        "Records": [
-            {
-                "userIdentity": {"principalId": principal},
-                "s3": {
-                    "bucket": {"name": bucket},
-                    "object": {"key": key},
-                },
-            }
-        ]
+        "userIdentity": {"principalId": principal},
+        "s3": {
+            "bucket": {"name": bucket},
+            "object": {"key": key},
+        },
     }
 
 
+def mock_event(
+    bucket: Optional[str] = DATA_BUCKET,
+    key: Optional[str] = MOCK_KEY,
+    principal: Optional[str] = MOCK_FRONT_END_PRINCIPAL,
+) -> Dict:
+    return {"Records": [mock_record(bucket, key, principal)]}
+
+
 with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.s3_event_put_notification import lambda_function
     from ml_space_lambda.s3_event_put_notification.lambda_function import lambda_handler as s3_put_handler
 
 
+@pytest.fixture(autouse=True)
+def clear_known_datasets():
+    lambda_function.known_datasets.clear()
+
+
 @mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.s3")
 @mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.dataset_dao")
 def test_handle_front_end_upload(mock_dataset_dao, mock_s3):
@@ -144,8 +155,8 @@ def test_handle_front_end_upload_invalid_dataset_type(mock_dataset_dao, mock_s3)
     mock_s3.head_object.return_value = {"Metadata": mock_metadata}
     mock_s3.get_object_tagging.return_value = MOCK_DATASET_TAGS
 
-    with pytest.raises(KeyError):
-        s3_put_handler(mock_event(key=invalid_key), mock_context)
+    # The unrecognized dataset type is logged rather than raised
+    s3_put_handler(mock_event(key=invalid_key), mock_context)
 
     mock_s3.head_object.assert_called_with(Bucket=DATA_BUCKET, Key=invalid_key)
     mock_s3.get_object_tagging.assert_called_with(Bucket=DATA_BUCKET, Key=invalid_key)
@@ -201,8 +212,8 @@ def test_handle_front_end_upload_s3_error(mock_dataset_dao, mock_s3):
     }
     mock_s3.head_object.side_effect = ClientError(error_msg, "HeadObject")
 
-    with pytest.raises(ClientError):
-        s3_put_handler(mock_event(), mock_context)
+    # The failure is logged rather than raised
+    s3_put_handler(mock_event(), mock_context)
 
     mock_dataset_dao.create.assert_not_called()
     mock_s3.head_object.assert_called_with(Bucket=DATA_BUCKET, Key=MOCK_KEY)
@@ -295,8 +306,8 @@ def test_handle_notebook_upload_s3_error(mock_dataset_dao, mock_s3):
     }
     mock_s3.put_object_tagging.side_effect = ClientError(error_msg, "PutObjectTagging")
     expected_tags = MOCK_DATASET_TAGS
-    with pytest.raises(ClientError):
-        s3_put_handler(mock_event(principal=MOCK_NOTEBOOK_PRINCIPAL), mock_context)
+    # The failure is logged rather than raised
+    s3_put_handler(mock_event(principal=MOCK_NOTEBOOK_PRINCIPAL), mock_context)
 
     mock_dataset_dao.create.assert_not_called()
     mock_s3.put_object_tagging.assert_called_with(Bucket=DATA_BUCKET, Key=MOCK_KEY, Tagging=expected_tags)
@@ -354,3 +365,187 @@ def test_key_training_job_output(mock_dataset_dao, mock_s3):
     )
     mock_dataset_dao.create.assert_called_once()
     _validate_dataset_create_call(mock_dataset_dao.create.call_args, dataset)
+
+
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.s3")
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.dataset_dao")
+def test_handle_notebook_upload_multiple_records(mock_dataset_dao, mock_s3):
+    mock_s3.put_object_tagging.return_value = {"ResponseMetadata": {"HTTPStatusCode": 200}}
+    mock_dataset_dao.get.return_value = None
+    keys = [f"{MOCK_DATASET_BASE_KEY}file{i}.txt" for i in range(25)] + [
+        "project/fake-project/datasets/sensitive-data/list.csv",
+        "fake/unit/test/key.txt",
+    ]
+    s3_put_handler(
+        {"Records": [mock_record(key=key, principal=MOCK_NOTEBOOK_PRINCIPAL) for key in keys]},
+        mock_context,
+    )
+
+    # Every dataset object is tagged but each dataset is only checked and created once
+    assert mock_s3.put_object_tagging.call_count == 26
+    mock_dataset_dao.get.assert_has_calls(
+        [mock.call("global", "more-testing"), mock.call("fake-project", "sensitive-data")], any_order=True
+    )
+    assert mock_dataset_dao.get.call_count == 2
+    assert mock_dataset_dao.create.call_count == 2
+
+
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.s3")
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.dataset_dao")
+def test_handle_front_end_upload_multiple_records(mock_dataset_dao, mock_s3):
+    mock_s3.head_object.return_value = {"Metadata": {"user": MOCK_DATASET.created_by}}
+    mock_s3.get_object_tagging.return_value = MOCK_DATASET_TAGS
+    mock_dataset_dao.get.return_value = None
+    event = {"Records": [mock_record(key=f"{MOCK_DATASET_BASE_KEY}file{i}.txt") for i in range(10)]}
+    s3_put_handler(event, mock_context)
+
+    # Only a single object needs to be verified to create the dataset
+    mock_s3.head_object.assert_called_once_with(Bucket=DATA_BUCKET, Key=f"{MOCK_DATASET_BASE_KEY}file0.txt")
+    mock_dataset_dao.create.assert_called_once()
+
+    # The dataset is now known to exist so subsequent invocations skip all lookups
+    s3_put_handler(event, mock_context)
+    mock_s3.head_object.assert_called_once()
+    mock_dataset_dao.get.assert_called_once()
+
+
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.time")
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.s3")
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.dataset_dao")
+def test_known_dataset_expires(mock_dataset_dao, mock_s3, mock_time):
+    mock_s3.put_object_tagging.return_value = {"ResponseMetadata": {"HTTPStatusCode": 200}}
+    mock_dataset_dao.get.return_value = MOCK_DATASET
+    mock_time.time.return_value = 1000
+    s3_put_handler(mock_event(principal=MOCK_NOTEBOOK_PRINCIPAL), mock_context)
+    s3_put_handler(mock_event(principal=MOCK_NOTEBOOK_PRINCIPAL), mock_context)
+    mock_dataset_dao.get.assert_called_once()
+
+    mock_time.time.return_value = 1000 + lambda_function.KNOWN_DATASET_TTL_SECONDS
+    s3_put_handler(mock_event(principal=MOCK_NOTEBOOK_PRINCIPAL), mock_context)
+    assert mock_dataset_dao.get.call_count == 2
+    assert mock_s3.put_object_tagging.call_count == 3
+
+
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.s3")
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.dataset_dao")
+def test_dataset_stats_updated_once_per_batch(mock_dataset_dao, mock_s3):
+    mock_s3.put_object_tagging.return_value = {"ResponseMetadata": {"HTTPStatusCode": 200}}
+    mock_s3.get_paginator.return_value.paginate.return_value = [
+        {
+            "Versions": [
+                {"Key": f"{MOCK_DATASET_BASE_KEY}old.txt", "Size": 50, "IsLatest": False},
+                {"Key": f"{MOCK_DATASET_BASE_KEY}old.txt", "Size": 500, "IsLatest": False},
+                {"Key": f"{MOCK_DATASET_BASE_KEY}older.txt", "Size": 25, "IsLatest": False},
+            ]
+        }
+    ]
+    mock_dataset_dao.get.return_value = MOCK_DATASET
+    records = []
+    for i in range(3):
+        record = mock_record(key=f"{MOCK_DATASET_BASE_KEY}file{i}.txt", principal=MOCK_NOTEBOOK_PRINCIPAL)
+        record["eventName"] = "ObjectCreated:Put"
+        record["eventTime"] = f"2024-01-01T00:00:0{i}.000Z"
+        record["s3"]["object"]["size"] = 100
+        records.append(record)
+    for name in ["old.txt", "older.txt"]:
+        removed = mock_record(key=f"{MOCK_DATASET_BASE_KEY}{name}", principal=MOCK_NOTEBOOK_PRINCIPAL)
+        removed["eventName"] = "ObjectRemoved:DeleteMarkerCreated"
+        records.append(removed)
+    # Permanently deleting an older version doesn't change the dataset contents
+    removed_version = mock_record(key=f"{MOCK_DATASET_BASE_KEY}old.txt", principal=MOCK_NOTEBOOK_PRINCIPAL)
+    removed_version["eventName"] = "ObjectRemoved:Delete"
+    removed_version["s3"]["object"]["versionId"] = "abc123"
+    records.append(removed_version)
+
+    s3_put_handler({"Records": records}, mock_context)
+
+    # Removed objects aren't tagged
+    assert mock_s3.put_object_tagging.call_count == 3
+    # The removed objects are sized with a single listing of their common prefix
+    mock_s3.get_paginator.assert_called_once_with("list_object_versions")
+    mock_s3.get_paginator.return_value.paginate.assert_called_once_with(
+        Bucket=DATA_BUCKET, Prefix=f"{MOCK_DATASET_BASE_KEY}old"
+    )
+    mock_dataset_dao.increment_object_stats.assert_called_once_with(
+        "global", "more-testing", 1, 225, datetime(2024, 1, 1, 0, 0, 2, tzinfo=timezone.utc).timestamp()
+    )
+
+
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.s3")
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.dataset_dao")
+def test_dataset_stats_updated_when_tagging_fails(mock_dataset_dao, mock_s3):
+    error_msg = {
+        "Error": {"Code": "ThrottlingException", "Message": "Dummy error message."},
+        "ResponseMetadata": {"HTTPStatusCode": 400},
+    }
+    mock_s3.put_object_tagging.side_effect = [
+        ClientError(error_msg, "PutObjectTagging"),
+        {"ResponseMetadata": {"HTTPStatusCode": 200}},
+    ]
+    mock_dataset_dao.get.return_value = MOCK_DATASET
+    records = []
+    for i in range(2):
+        record = mock_record(key=f"{MOCK_DATASET_BASE_KEY}file{i}.txt", principal=MOCK_NOTEBOOK_PRINCIPAL)
+        record["eventName"] = "ObjectCreated:Put"
+        record["eventTime"] = "2024-01-01T00:00:00.000Z"
+        record["s3"]["object"]["size"] = 100
+        records.append(record)
+
+    s3_put_handler({"Records": records}, mock_context)
+
+    assert mock_s3.put_object_tagging.call_count == 2
+    mock_dataset_dao.increment_object_stats.assert_called_once_with(
+        "global", "more-testing", 2, 200, datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+    )
+
+
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.s3")
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.dataset_dao")
+def test_dataset_stats_skip_manifests(mock_dataset_dao, mock_s3):
+    mock_dataset_dao.get.return_value = MOCK_DATASET
+    records = []
+    for name in ["_manifests/files.manifest", "_manifests/.pending-files.manifest", "file.txt"]:
+        record = mock_record(key=f"{MOCK_DATASET_BASE_KEY}{name}")
+        record["eventName"] = "ObjectCreated:Put"
+        record["eventTime"] = "2024-01-01T00:00:00.000Z"
+        record["s3"]["object"]["size"] = 100
+        records.append(record)
+
+    s3_put_handler({"Records": records}, mock_context)
+
+    mock_dataset_dao.increment_object_stats.assert_called_once_with(
+        "global", "more-testing", 1, 100, datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+    )
+
+
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.s3")
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.dataset_dao")
+def test_dataset_stats_unversioned_delete(mock_dataset_dao, mock_s3):
+    record = mock_record(key=MOCK_KEY)
+    record["eventName"] = "ObjectRemoved:Delete"
+    s3_put_handler({"Records": [record]}, mock_context)
+
+    mock_s3.head_object.assert_not_called()
+    mock_s3.get_paginator.assert_not_called()
+    mock_dataset_dao.increment_object_stats.assert_called_once_with("global", "more-testing", -1, 0, None)
+
+
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.MAX_REMOVED_SIZE_PAGES", 2)
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.s3")
+@mock.patch("ml_space_lambda.s3_event_put_notification.lambda_function.dataset_dao")
+def test_dataset_stats_removed_size_page_limit(mock_dataset_dao, mock_s3):
+    mock_s3.get_paginator.return_value.paginate.return_value = [
+        {"Versions": [{"Key": f"{MOCK_DATASET_BASE_KEY}other.txt", "Size": 10, "IsLatest": True}]},
+        {"Versions": [{"Key": f"{MOCK_DATASET_BASE_KEY}old.txt", "Size": 50, "IsLatest": False}]},
+        {"Versions": [{"Key": f"{MOCK_DATASET_BASE_KEY}older.txt", "Size": 25, "IsLatest": False}]},
+    ]
+    records = []
+    for name in ["old.txt", "older.txt"]:
+        record = mock_record(key=f"{MOCK_DATASET_BASE_KEY}{name}")
+        record["eventName"] = "ObjectRemoved:DeleteMarkerCreated"
+        records.append(record)
+
+    s3_put_handler({"Records": records}, mock_context)
+
+    # Objects which weren't found within the page limit don't reduce the size
+    mock_dataset_dao.increment_object_stats.assert_called_once_with("global", "more-testing", -2, -50, None)
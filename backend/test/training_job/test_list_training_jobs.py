@@ -123,6 +123,7 @@ def test_list_training_jobs_success_completed_jobs(mock_resource_metadata_dao):
         next_token="abc123",
         filter_expression="metadata.TrainingJobStatus IN (:s0)",
         filter_values={":s0": "Completed"},
+        fill_page=True,
     )
 
 
@@ -0,0 +1,52 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+from unittest import mock
+
+import pytest
+from call_budget import CallBudget
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+}
+
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    from ml_space_lambda.data_access_objects.project import ProjectDAO
+    from ml_space_lambda.data_access_objects.project_user import ProjectUserDAO
+
+
+def test_call_budget_exceeded(mock_project_group_tables):
+    project_dao = ProjectDAO()
+    with pytest.raises(pytest.fail.Exception, match="3 dynamodb calls, budget is 2") as exc_info:
+        with CallBudget()(dynamodb=2):
+            for _ in range(3):
+                project_dao.get("example")
+
+    assert "dynamodb GetItem (mlspace-projects): 3" in str(exc_info.value)
+
+
+def test_call_budget_total_and_operations(mock_project_group_tables):
+    project_dao = ProjectDAO()
+    with CallBudget()(total=2, operations={"GetItem": 1}) as calls:
+        project_dao.get("example")
+        ProjectUserDAO().get_users_for_project("example")
+
+    assert calls.count() == 2
+
+    with pytest.raises(pytest.fail.Exception, match="2 GetItem calls, budget is 1"):
+        with CallBudget()(operations={"GetItem": 1}):
+            project_dao.get("example")
+            project_dao.get("example")
@@ -0,0 +1,73 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+
+from unittest import mock
+
+from botocore.config import Config
+
+from ml_space_lambda.data_access_objects.project import ProjectDAO
+from ml_space_lambda.utils.client_registry import get_client, lazy_client
+
+TEST_ENV_CONFIG = {"AWS_DEFAULT_REGION": "us-east-1"}
+
+
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+def test_get_client_shares_clients():
+    s3 = get_client("s3")
+
+    assert get_client("s3") is s3
+    assert get_client("s3", Config(signature_version="s3v4")) is not s3
+    assert get_client("sagemaker") is not s3
+    assert get_client("s3").meta.region_name == "us-east-1"
+
+
+@mock.patch("ml_space_lambda.utils.client_registry.get_session")
+def test_lazy_client_created_on_first_use(mock_get_session):
+    with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+        sagemaker = lazy_client("sagemaker")
+    mock_get_session.assert_not_called()
+
+    sagemaker.list_notebook_instances()
+    sagemaker.describe_notebook_instance(NotebookInstanceName="example")
+
+    mock_get_session.return_value.client.assert_called_once_with("sagemaker", config=mock.ANY, region_name="us-east-1")
+    mock_sagemaker = mock_get_session.return_value.client.return_value
+    mock_sagemaker.list_notebook_instances.assert_called_once()
+    mock_sagemaker.describe_notebook_instance.assert_called_with(NotebookInstanceName="example")
+
+
+@mock.patch("ml_space_lambda.utils.client_registry.get_session")
+def test_lazy_client_can_be_patched_without_creating_client(mock_get_session):
+    with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+        from ml_space_lambda.config import lambda_functions
+
+    with mock.patch("ml_space_lambda.config.lambda_functions.sagemaker") as mock_sagemaker:
+        assert lambda_functions.sagemaker is mock_sagemaker
+
+    mock_get_session.assert_not_called()
+
+
+@mock.patch("ml_space_lambda.data_access_objects.dynamo_data_store.get_client")
+def test_dao_client_resolved_lazily(mock_get_client):
+    project_dao = ProjectDAO()
+    mock_get_client.assert_not_called()
+
+    assert project_dao.client is mock_get_client.return_value
+    mock_get_client.assert_called_once_with("dynamodb")
+
+    mock_ddb = mock.Mock()
+    assert ProjectDAO(client=mock_ddb).client is mock_ddb
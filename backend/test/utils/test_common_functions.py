@@ -14,20 +14,30 @@
 #   limitations under the License.
 #
 
+import base64
+import gzip
 import json
+from datetime import datetime, timezone
+from decimal import Decimal
 from typing import Any, Dict
 from unittest import mock
 
 import pytest
 from botocore.exceptions import ClientError
 
+from ml_space_lambda.enums import ResourceType
 from ml_space_lambda.utils.common_functions import (
     api_wrapper,
+    compress_html_response,
+    ctx_context,
+    event_wrapper,
     generate_exception_response,
     generate_html_response,
     generate_tags,
+    get_tags_for_resource,
     has_tags,
     list_custom_terminologies_for_project,
+    submit_with_context,
 )
 
 TEST_ENV_CONFIG = {
@@ -51,7 +61,6 @@ mock_list_batch_translate_response = {
 def test_generate_html_response(status_code, body):
     expected_output = {
         "statusCode": status_code,
-        "body": json.dumps(body, default=str),
         "headers": {
             "Access-Control-Allow-Origin": "*",
             "Content-Type": "application/json",
@@ -63,6 +72,8 @@ def test_generate_html_response(status_code, body):
         },
     }
     return_value = generate_html_response(status_code, body)
+    # The body may come from a faster encoder with different whitespace so compare the decoded value
+    assert json.loads(return_value.pop("body")) == body
     assert return_value == expected_output
 
 
@@ -398,3 +409,180 @@ def test_list_custom_terminologies_for_project():
     }
 
     assert expected_result == result
+
+
+def test_get_tags_for_resource_pages():
+    mock_sagemaker = mock.Mock()
+    mock_sagemaker.list_tags.side_effect = [
+        {"Tags": [{"Key": "user", "Value": "jdoe"}], "NextToken": "page2"},
+        {"Tags": [{"Key": "project", "Value": "example"}]},
+    ]
+
+    assert get_tags_for_resource(mock_sagemaker, "example-arn") == [
+        {"Key": "user", "Value": "jdoe"},
+        {"Key": "project", "Value": "example"},
+    ]
+    mock_sagemaker.list_tags.assert_has_calls(
+        [mock.call(ResourceArn="example-arn"), mock.call(ResourceArn="example-arn", NextToken="page2")]
+    )
+
+
+def test_submit_with_context_keeps_lambda_context():
+    mock_context = mock.Mock()
+    mock_context.aws_request_id = "mock-request-id"
+    wrapped_func = api_wrapper(lambda event, context: submit_with_context(ctx_context.get).result().aws_request_id)
+    mock_context.function_name = "unit_test_wrap"
+
+    assert wrapped_func({}, mock_context) == generate_html_response(200, "mock-request-id")
+
+
+def test_generate_html_response_encoder_parity():
+    body = {
+        "created": datetime(2023, 1, 18, 16, 43, 31, tzinfo=timezone.utc),
+        "cost": Decimal("1.25"),
+        "large": 2**70,
+        ResourceType.NOTEBOOK: [1, 2.5, None, True],
+        1: "one",
+    }
+    expected = json.loads(json.dumps(body, default=str))
+
+    assert json.loads(generate_html_response(200, body)["body"]) == expected
+    with mock.patch("ml_space_lambda.utils.common_functions.orjson", None):
+        assert json.loads(generate_html_response(200, body)["body"]) == expected
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected_encoding",
+    [
+        ("gzip, deflate, br", "gzip"),
+        ("GZIP", "gzip"),
+        ("gzip;q=0, deflate", None),
+        ("deflate", None),
+        ("", None),
+    ],
+    ids=["gzip", "case_insensitive", "gzip_refused", "unsupported", "missing"],
+)
+def test_compress_html_response(accept_encoding, expected_encoding):
+    response = generate_html_response(200, {"records": ["notebook"] * 1000})
+
+    with mock.patch("ml_space_lambda.utils.common_functions.brotli", None):
+        compressed = compress_html_response(response, accept_encoding)
+
+    if expected_encoding:
+        assert compressed["isBase64Encoded"]
+        assert compressed["headers"]["Content-Encoding"] == expected_encoding
+        assert gzip.decompress(base64.b64decode(compressed["body"])).decode("utf-8") == response["body"]
+    else:
+        assert compressed == response
+
+
+def test_compress_html_response_brotli():
+    mock_brotli = mock.Mock()
+    mock_brotli.compress.return_value = b"compressed"
+    response = generate_html_response(200, {"records": ["notebook"] * 1000})
+
+    with mock.patch("ml_space_lambda.utils.common_functions.brotli", mock_brotli):
+        compressed = compress_html_response(response, "gzip, br")
+
+    assert compressed["headers"]["Content-Encoding"] == "br"
+    assert compressed["body"] == base64.b64encode(b"compressed").decode("ascii")
+    mock_brotli.compress.assert_called_with(response["body"].encode("utf-8"), quality=4)
+
+
+def test_compress_html_response_small_body():
+    response = generate_html_response(200, {"status": "success"})
+    assert compress_html_response(response, "gzip") == response
+
+
+def test_api_wrapper_compression_and_base64_body():
+    mock_context = mock.Mock()
+    mock_context.function_name = "unit_test_wrap"
+    mock_func = mock.Mock(return_value={"records": ["notebook"] * 1000})
+    mock_func.__name__ = "unit_test_wrap"
+    mock_event = {
+        "headers": {"Accept-Encoding": "gzip, deflate"},
+        "body": base64.b64encode(json.dumps({"name": "example"}).encode("utf-8")).decode("ascii"),
+        "isBase64Encoded": True,
+    }
+
+    response = api_wrapper(mock_func)(mock_event, mock_context)
+
+    assert json.loads(mock_func.call_args.args[0]["body"]) == {"name": "example"}
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(base64.b64decode(response["body"]))) == {"records": ["notebook"] * 1000}
+
+
+@pytest.mark.parametrize("body", ["not base64!", base64.b64encode(b"\xff\xfe").decode("ascii")])
+def test_api_wrapper_undecodable_body(body):
+    mock_context = mock.Mock()
+    mock_context.function_name = "unit_test_wrap"
+    mock_func = mock.Mock(return_value={})
+    mock_func.__name__ = "unit_test_wrap"
+
+    response = api_wrapper(mock_func)({"body": body, "isBase64Encoded": True}, mock_context)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"]).startswith("Bad Request: Unable to decode request body")
+    mock_func.assert_not_called()
+
+
+def _wrapped_event_logger():
+    mock_context = mock.Mock()
+    mock_context.function_name = "unit_test_wrap"
+    mock_func = mock.Mock(return_value={})
+    mock_func.__name__ = "unit_test_wrap"
+    return event_wrapper(mock_func), mock_context
+
+
+@mock.patch("ml_space_lambda.utils.common_functions.EVENT_LOG_SAMPLE_RATE", 0)
+@mock.patch("ml_space_lambda.utils.common_functions.EVENT_LOG_MAX_BODY_LENGTH", 10)
+@mock.patch("ml_space_lambda.utils.common_functions.logger")
+def test_event_logging_compact(mock_logger):
+    wrapped_func, mock_context = _wrapped_event_logger()
+    mock_event = {
+        "headers": {"Authorization": "Bearer secret"},
+        "multiValueHeaders": {"Authorization": ["Bearer secret"]},
+        "body": "a" * 25,
+        "Records": [{"id": i} for i in range(8)],
+    }
+
+    wrapped_func(mock_event, mock_context)
+
+    logged_event = json.loads(mock_logger.info.call_args.args[0].split(" invoked with ", 1)[1])
+    assert logged_event == {
+        "headers": {"authorization": "<REDACTED>"},
+        "multiValueHeaders": {"authorization": ["<REDACTED>"]},
+        "body": "aaaaaaaaaa...<15 characters omitted>",
+        "Records": [{"id": i} for i in range(5)] + ["<3 records omitted>"],
+    }
+    # The original event is left untouched for the handler
+    assert mock_event["headers"] == {"Authorization": "Bearer secret"}
+    assert len(mock_event["Records"]) == 8
+
+
+@pytest.mark.parametrize(
+    "mode,sample_rate,full_event_logged",
+    [("compact", 1, True), ("full", 0, True), ("compact", 0, False)],
+    ids=["compact_sampled", "full", "compact_not_sampled"],
+)
+@mock.patch("ml_space_lambda.utils.common_functions.EVENT_LOG_MAX_BODY_LENGTH", 10)
+@mock.patch("ml_space_lambda.utils.common_functions.logger")
+def test_event_logging_sampling(mock_logger, mode, sample_rate, full_event_logged):
+    wrapped_func, mock_context = _wrapped_event_logger()
+
+    with mock.patch("ml_space_lambda.utils.common_functions.EVENT_LOG_MODE", mode), mock.patch(
+        "ml_space_lambda.utils.common_functions.EVENT_LOG_SAMPLE_RATE", sample_rate
+    ):
+        wrapped_func({"body": "a" * 25}, mock_context)
+
+    assert ("a" * 25 in mock_logger.info.call_args.args[0]) == full_event_logged
+
+
+@mock.patch("ml_space_lambda.utils.common_functions.EVENT_LOG_MODE", "none")
+@mock.patch("ml_space_lambda.utils.common_functions.logger")
+def test_event_logging_none(mock_logger):
+    wrapped_func, mock_context = _wrapped_event_logger()
+
+    wrapped_func({"body": "secret"}, mock_context)
+
+    mock_logger.info.assert_called_once_with("Lambda unit_test_wrap(unit_test_wrap) invoked")
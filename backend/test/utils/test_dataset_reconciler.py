@@ -0,0 +1,152 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+from unittest import TestCase, mock
+
+import boto3
+import moto
+
+from ml_space_lambda.enums import DatasetType
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "DATA_BUCKET": "mlspace-data-bucket",
+    "DATASETS_TABLE": "mlspace-datasets",
+    # Fake cred info for MOTO
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SECURITY_TOKEN": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+}
+TEST_BUCKET = TEST_ENV_CONFIG["DATA_BUCKET"]
+TEST_TABLE = TEST_ENV_CONFIG["DATASETS_TABLE"]
+
+mock.patch.TEST_PREFIX = (
+    "test",
+    "setUp",
+    "tearDown",
+)
+
+
+def _summary(dataset_type: DatasetType, scope: str, name: str) -> dict:
+    return {"type": str(dataset_type), "scope": scope, "name": name}
+
+
+@moto.mock_s3
+@moto.mock_dynamodb
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+class TestDatasetReconciler(TestCase):
+    def setUp(self):
+        from ml_space_lambda.data_access_objects.dataset import DatasetDAO, DatasetModel
+        from ml_space_lambda.utils import mlspace_config
+        from ml_space_lambda.utils.dataset_reconciler import DatasetReconciler
+
+        mlspace_config.env_variables = {}
+        self.s3 = boto3.client("s3")
+        self.s3.create_bucket(Bucket=TEST_BUCKET)
+        self.ddb = boto3.client("dynamodb")
+        self.ddb.create_table(
+            TableName=TEST_TABLE,
+            KeySchema=[{"AttributeName": "scope", "KeyType": "HASH"}, {"AttributeName": "name", "KeyType": "RANGE"}],
+            AttributeDefinitions=[
+                {"AttributeName": "scope", "AttributeType": "S"},
+                {"AttributeName": "name", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        self.dataset_dao = DatasetDAO(TEST_TABLE, self.ddb)
+        self.reconciler = DatasetReconciler(self.s3, TEST_BUCKET, self.dataset_dao)
+
+        self.s3.put_object(
+            Bucket=TEST_BUCKET,
+            Key="global/datasets/known/file.csv",
+            Body=b"data",
+        )
+        self.s3.put_object(
+            Bucket=TEST_BUCKET,
+            Key="global/datasets/unknown/file.csv",
+            Body=b"data",
+            Metadata={"user": "jdoe", "dataset-description": "Recovered"},
+        )
+        self.s3.put_object(Bucket=TEST_BUCKET, Key="group/datasets/shared/file.csv", Body=b"data")
+        self.s3.put_object(Bucket=TEST_BUCKET, Key="private/alice/datasets/mine/deep/file.csv", Body=b"data")
+        self.s3.put_object(Bucket=TEST_BUCKET, Key="private/alice/notebooks/ignored.ipynb", Body=b"data")
+        self.s3.put_object(Bucket=TEST_BUCKET, Key="private/bob/datasets/theirs/file.csv", Body=b"data")
+        self.s3.put_object(Bucket=TEST_BUCKET, Key="project/p1/datasets/project-data/file.csv", Body=b"data")
+
+        self.dataset_dao.create(
+            DatasetModel("global", DatasetType.GLOBAL, "known", "", f"s3://{TEST_BUCKET}/global/datasets/known/", "jdoe")
+        )
+        self.dataset_dao.create(
+            DatasetModel("p1", DatasetType.PROJECT, "empty", "", f"s3://{TEST_BUCKET}/project/p1/datasets/empty/", "jdoe")
+        )
+
+    def tearDown(self):
+        self.ddb.delete_table(TableName=TEST_TABLE)
+
+    def test_reconcile(self):
+        report = self.reconciler.reconcile()
+
+        assert report == {
+            "created": [
+                _summary(DatasetType.GLOBAL, "global", "unknown"),
+                _summary(DatasetType.GROUP, "group", "shared"),
+                _summary(DatasetType.PRIVATE, "alice", "mine"),
+                _summary(DatasetType.PRIVATE, "bob", "theirs"),
+                _summary(DatasetType.PROJECT, "p1", "project-data"),
+            ],
+            "missingObjects": [_summary(DatasetType.PROJECT, "p1", "empty")],
+            "scopesScanned": 5,
+        }
+
+        recovered = self.dataset_dao.get("global", "unknown")
+        assert recovered.created_by == "jdoe"
+        assert recovered.description == "Recovered"
+        assert recovered.prefix == "global/datasets/unknown/"
+        assert self.dataset_dao.get("alice", "mine").created_by == "alice"
+        assert self.dataset_dao.get("group", "shared").created_by == "default-user"
+
+        # Nothing left to do on a second pass
+        assert self.reconciler.reconcile()["created"] == []
+
+    def test_reconcile_dry_run(self):
+        report = self.reconciler.reconcile(dry_run=True)
+
+        assert len(report["created"]) == 5
+        assert self.dataset_dao.get("global", "unknown") is None
+
+    def test_reconcile_resumes_from_checkpoint(self):
+        created = []
+        requests = 0
+        next_token = None
+        while True:
+            requests += 1
+            report = self.reconciler.reconcile(next_token=next_token, time_budget_seconds=-1)
+            created.extend(report["created"])
+            next_token = report.get("nextToken")
+            assert report["scopesScanned"] == (1 if next_token else 0)
+            if not next_token:
+                break
+
+        # The final scope is reported with a checkpoint and the next request finds nothing left
+        assert requests == 6
+        assert [(dataset["scope"], dataset["name"]) for dataset in created] == [
+            ("global", "unknown"),
+            ("group", "shared"),
+            ("alice", "mine"),
+            ("bob", "theirs"),
+            ("p1", "project-data"),
+        ]
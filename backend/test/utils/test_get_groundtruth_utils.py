@@ -32,9 +32,9 @@ from ml_space_lambda.utils.groundtruth_utils import (
 
 
 class GroundTruthUtilsTest(unittest.TestCase):
-    @mock.patch("ml_space_lambda.utils.groundtruth_utils.boto3")
-    def test_get_groundtruth_lambda_arn(self, mock_boto3):
-        mock_session = mock_boto3.session.Session()
+    @mock.patch("ml_space_lambda.utils.groundtruth_utils.get_session")
+    def test_get_groundtruth_lambda_arn(self, mock_get_session):
+        mock_session = mock_get_session.return_value
         mock_session.region_name = "us-east-1"
         assert mock_session.region_name == "us-east-1"
         mock_session.get_partition_for_region.return_value = "aws"
@@ -46,9 +46,9 @@ class GroundTruthUtilsTest(unittest.TestCase):
                     == f"arn:aws:lambda:us-east-1:432418664414:function:{lambda_type.name}-{task_type.name}"
                 )
 
-    @mock.patch("ml_space_lambda.utils.groundtruth_utils.boto3")
-    def test_get_auto_labeling_arn(self, mock_boto3):
-        mock_session = mock_boto3.session.Session()
+    @mock.patch("ml_space_lambda.utils.groundtruth_utils.get_session")
+    def test_get_auto_labeling_arn(self, mock_get_session):
+        mock_session = mock_get_session.return_value
         mock_session.region_name = "us-east-1"
         assert mock_session.region_name == "us-east-1"
         mock_session.get_partition_for_region.return_value = "aws"
@@ -89,9 +89,9 @@ class GroundTruthUtilsTest(unittest.TestCase):
             Body=json.dumps({"document-version": "2018-11-28", "labels": labels}),
         )
 
-    @mock.patch("ml_space_lambda.utils.groundtruth_utils.boto3")
-    def test_get_groundtruth_assets_domain(self, mock_boto3):
-        mock_session = mock_boto3.session.Session()
+    @mock.patch("ml_space_lambda.utils.groundtruth_utils.get_session")
+    def test_get_groundtruth_assets_domain(self, mock_get_session):
+        mock_session = mock_get_session.return_value
         mock_session.region_name = "us-east-1"
         get_groundtruth_assets_domain() == "assets.crowd.aws"
 
@@ -99,12 +99,12 @@ class GroundTruthUtilsTest(unittest.TestCase):
             mock_session.region_name = key
             get_groundtruth_assets_domain() == _assets_domain_map[key]
 
-    @mock.patch("ml_space_lambda.utils.groundtruth_utils.boto3")
+    @mock.patch("ml_space_lambda.utils.groundtruth_utils.get_session")
     @mock.patch("ml_space_lambda.utils.groundtruth_utils.s3")
     @mock.patch("ml_space_lambda.utils.groundtruth_utils.os.path.isfile")
     @mock.patch("ml_space_lambda.utils.groundtruth_utils.os.path.abspath")
-    def test_generate_ui_template(self, mock_abspath, mock_isfile, mock_s3, mock_boto3):
-        mock_session = mock_boto3.session.Session()
+    def test_generate_ui_template(self, mock_abspath, mock_isfile, mock_s3, mock_get_session):
+        mock_session = mock_get_session.return_value
         mock_session.region_name = "us-east-1"
         mock_abspath.return_value = "."
         mock_isfile.return_value = True
@@ -373,8 +373,8 @@ class TestIAMSupport(TestCase):
             policy_tags = self.iam_client.list_policy_tags(
                 PolicyArn=arn,
             )
-            # Should have system, policyVersion, and user or project
-            assert len(policy_tags["Tags"]) == 3
+            # Should have system, policyVersion, policyHash, and user or project
+            assert len(policy_tags["Tags"]) == 4
 
             policy_type = None
             mls_policy_version = None
@@ -652,3 +652,22 @@ class TestIAMSupport(TestCase):
         ]
         self.iam_manager.update_groups(["group1", "group2"])
         mock_update_user_policy.assert_has_calls([mock.call("user1"), mock.call("user2")], any_order=True)
+
+    @mock.patch("ml_space_lambda.utils.iam_manager.get_client")
+    def test_construction_is_lazy(self, mock_get_client):
+        iam_manager = IAMManager()
+        mock_get_client.assert_not_called()
+
+        # The shared client is only resolved on first use
+        assert iam_manager.iam_client == mock_get_client.return_value
+        mock_get_client.assert_called_once_with("iam", config=mock.ANY)
+
+    def test_account_is_memoized(self):
+        account_utils.aws_account = None
+        mock_sts_client = mock.Mock()
+        mock_sts_client.get_caller_identity.return_value = {"Account": "123456789012"}
+        iam_manager = IAMManager(self.iam_client, mock_sts_client)
+
+        assert iam_manager._generate_policy_arn("policy1") == "arn:aws:iam::123456789012:policy/policy1"
+        assert iam_manager._generate_policy_arn("policy2") == "arn:aws:iam::123456789012:policy/policy2"
+        mock_sts_client.get_caller_identity.assert_called_once()
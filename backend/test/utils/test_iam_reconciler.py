@@ -0,0 +1,285 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+from unittest import TestCase, mock
+
+import boto3
+import moto
+import pytest
+
+from ml_space_lambda.data_access_objects.dataset import DatasetModel
+from ml_space_lambda.data_access_objects.group_dataset import GroupDatasetModel
+from ml_space_lambda.data_access_objects.group_user import GroupUserModel
+from ml_space_lambda.data_access_objects.project import ProjectModel
+from ml_space_lambda.data_access_objects.project_group import ProjectGroupModel
+from ml_space_lambda.data_access_objects.project_user import ProjectUserModel
+from ml_space_lambda.enums import DatasetType
+
+NOTEBOOK_ROLE_NAME = "MLSpace-notebook-role"
+
+TEST_ENV_CONFIG = {
+    # Moto doesn't work with iso regions...
+    "AWS_DEFAULT_REGION": "us-east-1",
+    # Fake cred info for MOTO
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SECURITY_TOKEN": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+    "NOTEBOOK_ROLE_NAME": NOTEBOOK_ROLE_NAME,
+    "PERMISSIONS_BOUNDARY_ARN": "arn:aws:iam::123456789012:policy/mlspace-project-user-permission-boundary",
+}
+
+with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+    import ml_space_lambda.utils.mlspace_config as mlspace_config
+
+MOCK_PROJECT_NAME = "project1"
+MOCK_DIRECT_USER = "jdoe@example.com"
+MOCK_GROUP_USER = "asmith@example.com"
+MOCK_GROUP_NAME = "group1"
+
+mock.patch.TEST_PREFIX = (
+    "test",
+    "setUp",
+    "tearDown",
+)
+
+
+def _actions_of_type(report, action_type):
+    return [action for action in report["actions"] if action["action"] == action_type]
+
+
+@moto.mock_sts
+@moto.mock_iam
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+class TestIAMReconciler(TestCase):
+    def setUp(self):
+        from ml_space_lambda.utils.common_functions import retry_config
+        from ml_space_lambda.utils.iam_manager import IAMManager
+        from ml_space_lambda.utils.iam_reconciler import IAMReconciler
+
+        mlspace_config.env_variables = {}
+        self.mock_project_dao = mock.patch("ml_space_lambda.utils.iam_reconciler.project_dao").start()
+        self.mock_project_user_dao = mock.patch("ml_space_lambda.utils.iam_reconciler.project_user_dao").start()
+        self.mock_project_group_dao = mock.patch("ml_space_lambda.utils.iam_reconciler.project_group_dao").start()
+        self.mock_group_user_dao = mock.patch("ml_space_lambda.utils.iam_reconciler.group_user_dao").start()
+        self.mock_group_dataset_dao = mock.patch("ml_space_lambda.utils.iam_reconciler.group_dataset_dao").start()
+        self.mock_dataset_dao = mock.patch("ml_space_lambda.utils.iam_reconciler.dataset_dao").start()
+        self.mock_iam_group_user_dao = mock.patch("ml_space_lambda.utils.iam_manager.group_user_dao").start()
+        self.mock_iam_group_dataset_dao = mock.patch("ml_space_lambda.utils.iam_manager.group_dataset_dao").start()
+        self.mock_iam_dataset_dao = mock.patch("ml_space_lambda.utils.iam_manager.dataset_dao").start()
+        self.iam_client = boto3.client("iam", config=retry_config)
+        self.iam_client.create_role(
+            RoleName=NOTEBOOK_ROLE_NAME,
+            AssumeRolePolicyDocument=json.dumps(
+                {
+                    "Version": "2012-10-17",
+                    "Statement": [
+                        {
+                            "Effect": "Allow",
+                            "Principal": {"Service": "sagemaker.amazonaws.com"},
+                            "Action": "sts:AssumeRole",
+                        }
+                    ],
+                }
+            ),
+            Description="MLSpace SageMaker Notebook role",
+        )
+        self.iam_manager = IAMManager(self.iam_client)
+        self.reconciler = IAMReconciler(self.iam_manager)
+
+    def tearDown(self):
+        mock.patch.stopall()
+        self.iam_client = None
+        self.iam_manager = None
+        self.reconciler = None
+
+    def _setup_membership(self):
+        self.mock_project_dao.get_all.return_value = [ProjectModel(MOCK_PROJECT_NAME, "", False, MOCK_DIRECT_USER)]
+        project_users = [ProjectUserModel(MOCK_DIRECT_USER, MOCK_PROJECT_NAME)]
+        self.mock_project_user_dao.get_all.return_value = project_users
+        self.mock_project_user_dao.get_users_for_project.return_value = project_users
+        self.mock_project_user_dao.get_projects_for_user.side_effect = lambda user: (
+            [ProjectUserModel(MOCK_DIRECT_USER, MOCK_PROJECT_NAME)] if user == MOCK_DIRECT_USER else []
+        )
+        self.mock_project_user_dao.get.return_value = ProjectUserModel(MOCK_DIRECT_USER, MOCK_PROJECT_NAME)
+        self.mock_project_group_dao.get_all.return_value = [ProjectGroupModel(MOCK_GROUP_NAME, MOCK_PROJECT_NAME)]
+        self.mock_project_group_dao.get_groups_for_project.return_value = [
+            ProjectGroupModel(MOCK_GROUP_NAME, MOCK_PROJECT_NAME)
+        ]
+        self.mock_project_group_dao.get_projects_for_group.return_value = [
+            ProjectGroupModel(MOCK_GROUP_NAME, MOCK_PROJECT_NAME)
+        ]
+        self.mock_group_user_dao.get_all.return_value = [GroupUserModel(MOCK_GROUP_USER, MOCK_GROUP_NAME)]
+        self.mock_group_user_dao.get_users_for_group.return_value = [GroupUserModel(MOCK_GROUP_USER, MOCK_GROUP_NAME)]
+        self.mock_group_user_dao.get_groups_for_user.side_effect = lambda user: (
+            [GroupUserModel(MOCK_GROUP_USER, MOCK_GROUP_NAME)] if user == MOCK_GROUP_USER else []
+        )
+        self.mock_iam_group_user_dao.get_groups_for_user.side_effect = self.mock_group_user_dao.get_groups_for_user.side_effect
+        self.mock_group_dataset_dao.get_datasets_for_group.return_value = []
+        self.mock_dataset_dao.get_all_for_scope.return_value = []
+
+    def test_reconcile_dry_run(self):
+        self._setup_membership()
+        initial_role_count = len(self.iam_client.list_roles()["Roles"])
+
+        report = self.reconciler.reconcile(dry_run=True)
+
+        assert report["dryRun"]
+        assert report["errors"] == []
+        assert {action["user"] for action in _actions_of_type(report, "updateUserPolicy")} == {
+            MOCK_DIRECT_USER,
+            MOCK_GROUP_USER,
+        }
+        assert [action["project"] for action in _actions_of_type(report, "updateProjectPolicy")] == [MOCK_PROJECT_NAME]
+        assert {action["user"] for action in _actions_of_type(report, "createRole")} == {MOCK_DIRECT_USER, MOCK_GROUP_USER}
+        # Nothing should have been changed
+        assert len(self.iam_client.list_roles()["Roles"]) == initial_role_count
+        assert self.iam_client.list_policies(Scope="Local")["Policies"] == []
+
+    def test_reconcile_apply_is_idempotent(self):
+        self._setup_membership()
+
+        report = self.reconciler.reconcile()
+        assert report["errors"] == []
+        assert len(_actions_of_type(report, "createRole")) == 2
+
+        for user in [MOCK_DIRECT_USER, MOCK_GROUP_USER]:
+            role_name = self.iam_manager._generate_iam_role_name(user, MOCK_PROJECT_NAME)
+            attached = self.iam_client.list_attached_role_policies(RoleName=role_name)["AttachedPolicies"]
+            assert {policy["PolicyName"] for policy in attached} == {
+                f"MLSpace-project-{MOCK_PROJECT_NAME}",
+                f"MLSpace-user-{user}",
+            }
+
+        # The direct project member's record should point at the new role
+        self.mock_project_user_dao.update.assert_called_once()
+
+        # A second pass should be a no-op
+        assert self.reconciler.reconcile()["actions"] == []
+
+    def test_reconcile_detects_policy_drift(self):
+        self._setup_membership()
+        self.reconciler.reconcile()
+
+        # Share a dataset with the group, the group user's policy is now out of date
+        self.mock_group_dataset_dao.get_datasets_for_group.return_value = [GroupDatasetModel("dataset1", MOCK_GROUP_NAME)]
+        self.mock_dataset_dao.get_all_for_scope.return_value = [
+            DatasetModel(
+                DatasetType.GROUP,
+                DatasetType.GROUP,
+                "dataset1",
+                "",
+                "s3://mlspace-data-bucket/group/datasets/dataset1",
+                MOCK_GROUP_USER,
+            )
+        ]
+        report = self.reconciler.reconcile(project_name=MOCK_PROJECT_NAME)
+        assert report["actions"] == [{"action": "updateUserPolicy", "user": MOCK_GROUP_USER, "reason": "contentDrift"}]
+
+        policy_arn = self.iam_manager._generate_policy_arn(f"MLSpace-user-{MOCK_GROUP_USER}")
+        default_version = self.iam_client.get_policy(PolicyArn=policy_arn)["Policy"]["DefaultVersionId"]
+        policy_document = self.iam_client.get_policy_version(PolicyArn=policy_arn, VersionId=default_version)
+        assert "group/datasets/dataset1/*" in json.dumps(policy_document["PolicyVersion"]["Document"])
+
+    def test_reconcile_tags_policies_without_hash(self):
+        self._setup_membership()
+        # Policies created before hashes were tracked only carry the version tag
+        project_policy = self.iam_manager._generate_project_policy(MOCK_PROJECT_NAME)
+        self.iam_manager._create_iam_policy(
+            f"MLSpace-project-{MOCK_PROJECT_NAME}", project_policy, "Project", MOCK_PROJECT_NAME, 1
+        )
+
+        report = self.reconciler.reconcile(project_name=MOCK_PROJECT_NAME, dry_run=True)
+        assert _actions_of_type(report, "updateProjectPolicy") == []
+        assert _actions_of_type(report, "tagPolicy") == [
+            {
+                "action": "tagPolicy",
+                "policyName": f"MLSpace-project-{MOCK_PROJECT_NAME}",
+                "policyHash": self.iam_manager.generate_policy_hash(project_policy),
+            }
+        ]
+
+        assert self.reconciler.reconcile(project_name=MOCK_PROJECT_NAME)["errors"] == []
+        policy_arn = self.iam_manager._generate_policy_arn(f"MLSpace-project-{MOCK_PROJECT_NAME}")
+        assert self.iam_client.list_policy_versions(PolicyArn=policy_arn)["Versions"][0]["VersionId"] == "v1"
+        assert self.reconciler.reconcile(project_name=MOCK_PROJECT_NAME)["actions"] == []
+
+    def test_reconcile_caches_policy_tags(self):
+        self._setup_membership()
+        self.reconciler.reconcile()
+        self.reconciler.reconcile()
+
+        # Unchanged policies are diffed from the cached tags without any GetPolicy calls
+        with mock.patch.object(self.iam_client, "get_policy", wraps=self.iam_client.get_policy) as get_policy:
+            assert self.reconciler.reconcile()["actions"] == []
+        get_policy.assert_not_called()
+
+    def test_reconcile_removes_stale_roles_and_policies(self):
+        self._setup_membership()
+        self.mock_iam_group_dataset_dao.get_datasets_for_group.return_value = []
+        self.reconciler.reconcile()
+        # A former member of the project and a role/policy for a project that was deleted
+        stale_member_role = self.iam_manager.add_iam_role(MOCK_PROJECT_NAME, "former@example.com").split("/")[-1]
+        deleted_project_role = self.iam_manager.add_iam_role("deletedProject", MOCK_DIRECT_USER).split("/")[-1]
+
+        report = self.reconciler.reconcile(username=MOCK_DIRECT_USER, dry_run=True)
+        assert _actions_of_type(report, "deleteRole") == []
+
+        report = self.reconciler.reconcile(project_name=MOCK_PROJECT_NAME, dry_run=True)
+        assert _actions_of_type(report, "deleteRole") == [{"action": "deleteRole", "roleName": stale_member_role}]
+
+        report = self.reconciler.reconcile()
+        assert report["errors"] == []
+        assert {action["roleName"] for action in _actions_of_type(report, "deleteRole")} == {
+            stale_member_role,
+            deleted_project_role,
+        }
+        assert _actions_of_type(report, "deleteProjectPolicy") == [
+            {"action": "deleteProjectPolicy", "project": "deletedProject"}
+        ]
+        assert _actions_of_type(report, "deleteUserPolicy") == [{"action": "deleteUserPolicy", "user": "former@example.com"}]
+        with pytest.raises(self.iam_client.exceptions.NoSuchEntityException):
+            self.iam_client.get_role(RoleName=stale_member_role)
+        with pytest.raises(self.iam_client.exceptions.NoSuchEntityException):
+            self.iam_client.get_policy(PolicyArn=self.iam_manager._generate_policy_arn("MLSpace-project-deletedProject"))
+
+    def test_reconcile_user_without_memberships(self):
+        self._setup_membership()
+        self.reconciler.reconcile()
+        # The user was removed from every project and group (or deleted) after their role was created
+        former_member_role = self.iam_manager.add_iam_role(MOCK_PROJECT_NAME, "former@example.com").split("/")[-1]
+        former_member_policy_arn = self.iam_manager._generate_policy_arn("MLSpace-user-former@example.com")
+        self.iam_manager.update_user_policy("former@example.com")
+
+        report = self.reconciler.reconcile(username="former@example.com")
+        assert report["errors"] == []
+        # The user policy isn't recreated, it's deleted along with the role
+        assert report["actions"] == [
+            {"action": "deleteRole", "roleName": former_member_role},
+            {"action": "deleteUserPolicy", "user": "former@example.com"},
+        ]
+        with pytest.raises(self.iam_client.exceptions.NoSuchEntityException):
+            self.iam_client.get_policy(PolicyArn=former_member_policy_arn)
+
+        # Policies of other users are left alone when scoped to a user
+        assert self.reconciler.reconcile(username="other@example.com")["actions"] == []
+        assert self.reconciler.reconcile()["actions"] == []
+
+    def test_reconcile_project_and_user_scope(self):
+        with pytest.raises(ValueError):
+            self.reconciler.reconcile(project_name=MOCK_PROJECT_NAME, username=MOCK_DIRECT_USER)
+        self.mock_project_dao.get_all.assert_not_called()
@@ -0,0 +1,120 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+import json
+from unittest import mock
+
+import boto3
+import moto
+import pytest
+
+from ml_space_lambda.enums import EnvVariable
+from ml_space_lambda.utils import metadata_cache
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    # Fake cred info for MOTO
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SECURITY_TOKEN": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+}
+TEST_BUCKET = "mlspace-config-bucket"
+
+mock.patch.TEST_PREFIX = (
+    "test",
+    "setUp",
+    "tearDown",
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    metadata_cache._local_cache.clear()
+    yield
+    metadata_cache._local_cache.clear()
+
+
+def _setup_bucket():
+    s3 = boto3.client("s3")
+    s3.create_bucket(Bucket=TEST_BUCKET)
+    return s3
+
+
+@moto.mock_s3
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+@mock.patch("ml_space_lambda.utils.metadata_cache.get_environment_variables", return_value={EnvVariable.BUCKET: TEST_BUCKET})
+def test_get_cached_metadata_populates_cache(mock_env):
+    s3 = _setup_bucket()
+    loader = mock.Mock(return_value={"InstanceTypes": ["ml.t3.medium"]})
+
+    with mock.patch("ml_space_lambda.utils.metadata_cache.s3", s3):
+        assert metadata_cache.get_cached_metadata("compute-types", loader) == {"InstanceTypes": ["ml.t3.medium"]}
+        # The second lookup is served from the in-memory copy
+        assert metadata_cache.get_cached_metadata("compute-types", loader) == {"InstanceTypes": ["ml.t3.medium"]}
+
+    loader.assert_called_once()
+    cache_entry = json.loads(s3.get_object(Bucket=TEST_BUCKET, Key="metadata-cache/compute-types.json")["Body"].read())
+    assert cache_entry["value"] == {"InstanceTypes": ["ml.t3.medium"]}
+
+
+@moto.mock_s3
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+@mock.patch("ml_space_lambda.utils.metadata_cache.get_environment_variables", return_value={EnvVariable.BUCKET: TEST_BUCKET})
+def test_get_cached_metadata_expired(mock_env):
+    s3 = _setup_bucket()
+    s3.put_object(
+        Bucket=TEST_BUCKET,
+        Key="metadata-cache/subnets.json",
+        Body=json.dumps({"expiresAt": 0, "value": ["stale"]}),
+    )
+    loader = mock.Mock(return_value=["fresh"])
+
+    with mock.patch("ml_space_lambda.utils.metadata_cache.s3", s3):
+        assert metadata_cache.get_cached_metadata("subnets", loader) == ["fresh"]
+        assert metadata_cache.read_cached_metadata("subnets") == ["fresh"]
+
+    loader.assert_called_once()
+
+
+@mock.patch("ml_space_lambda.utils.metadata_cache.get_environment_variables", return_value={EnvVariable.BUCKET: TEST_BUCKET})
+@mock.patch("ml_space_lambda.utils.metadata_cache.s3")
+def test_get_cached_metadata_cache_unavailable(mock_s3, mock_env):
+    mock_s3.get_object.side_effect = Exception("Access Denied")
+    mock_s3.put_object.side_effect = Exception("Access Denied")
+
+    # Cache failures fall back to the loader
+    assert metadata_cache.get_cached_metadata("subnets", lambda: ["subnet1"]) == ["subnet1"]
+
+
+@mock.patch("ml_space_lambda.utils.metadata_cache.time")
+@mock.patch("ml_space_lambda.utils.metadata_cache.read_cached_metadata")
+def test_get_cached_metadata_local_copy_expires(mock_read_cached_metadata, mock_time):
+    mock_time.monotonic.return_value = 0
+    mock_read_cached_metadata.return_value = ["subnet1"]
+    loader = mock.Mock()
+
+    assert metadata_cache.get_cached_metadata("subnets", loader) == ["subnet1"]
+    mock_time.monotonic.return_value = metadata_cache.LOCAL_CACHE_TTL_SECONDS - 1
+    assert metadata_cache.get_cached_metadata("subnets", loader) == ["subnet1"]
+    mock_read_cached_metadata.assert_called_once()
+
+    # Once the in-memory copy expires the value refreshed in the bucket is picked up
+    mock_read_cached_metadata.return_value = ["subnet2"]
+    mock_time.monotonic.return_value = metadata_cache.LOCAL_CACHE_TTL_SECONDS
+    assert metadata_cache.get_cached_metadata("subnets", loader) == ["subnet2"]
+    assert mock_read_cached_metadata.call_count == 2
+    loader.assert_not_called()
@@ -0,0 +1,172 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+
+import json
+from unittest import mock
+
+import boto3
+import moto
+import pytest
+from botocore.exceptions import ClientError
+
+from ml_space_lambda.data_access_objects.project import ProjectDAO, ProjectModel
+from ml_space_lambda.utils.common_functions import api_wrapper, event_wrapper
+from ml_space_lambda.utils.metrics import (
+    MULTIPLE_TABLES,
+    InvocationMetrics,
+    end_invocation,
+    get_invocation_metrics,
+    start_invocation,
+)
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SECURITY_TOKEN": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+}
+TEST_TABLE = "mlspace-projects"
+
+mock_context = mock.Mock()
+mock_context.function_name = "mls-lambda-project-get"
+
+
+@pytest.fixture(autouse=True)
+def metrics_enabled():
+    # Metrics are disabled unless enabled for the deployment
+    with mock.patch("ml_space_lambda.utils.metrics.METRICS_ENABLED", True):
+        yield
+
+
+@pytest.fixture
+def project_dao():
+    with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True), moto.mock_dynamodb():
+        ddb = boto3.client("dynamodb")
+        ddb.create_table(
+            TableName=TEST_TABLE,
+            KeySchema=[{"AttributeName": "name", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "name", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield ProjectDAO(TEST_TABLE, ddb)
+
+
+def _emf_documents(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith('{"_aws"')]
+
+
+def test_api_wrapper_emits_dynamodb_metrics(project_dao, capsys):
+    @api_wrapper
+    def handler(event, context):
+        project_dao.create(ProjectModel("example", "Example project", False, "jdoe"))
+        project_dao.get("example")
+        project_dao.get("missing")
+        return "ok"
+
+    handler({}, mock_context)
+
+    documents = _emf_documents(capsys)
+    assert len(documents) == 3
+    get_item, put_item, summary = documents
+    assert get_item["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Function", "Service", "Operation", "Table"]]
+    assert get_item["Function"] == "mls-lambda-project-get"
+    assert (get_item["Service"], get_item["Operation"], get_item["Table"]) == ("dynamodb", "GetItem", TEST_TABLE)
+    assert get_item["Calls"] == 2
+    assert get_item["Errors"] == 0
+    assert get_item["ConsumedCapacity"] > 0
+    assert (put_item["Operation"], put_item["Calls"]) == ("PutItem", 1)
+    assert summary["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Function"]]
+    assert summary["AwsCalls"] == 3
+    assert summary["ConsumedCapacity"] == get_item["ConsumedCapacity"] + put_item["ConsumedCapacity"]
+    assert summary["AwsLatency"] >= get_item["Latency"]
+    assert get_invocation_metrics() is None
+
+
+def test_event_wrapper_counts_errors(project_dao, capsys):
+    @event_wrapper
+    def handler(event, context):
+        project = ProjectModel("example", "Example project", False, "jdoe")
+        project_dao.create(project)
+        with pytest.raises(ClientError):
+            project_dao._create(project.to_dict(), condition_expression="attribute_not_exists(createdBy)")
+
+    handler({}, mock_context)
+
+    put_item, summary = _emf_documents(capsys)
+    assert (put_item["Operation"], put_item["Calls"], put_item["Errors"]) == ("PutItem", 2, 1)
+    assert summary["AwsCalls"] == 2
+
+
+def test_no_metrics_outside_invocation(project_dao, capsys):
+    project_dao.get("example")
+
+    assert _emf_documents(capsys) == []
+
+
+def test_no_metrics_without_calls(capsys):
+    @api_wrapper
+    def handler(event, context):
+        return "ok"
+
+    handler({}, mock_context)
+
+    assert _emf_documents(capsys) == []
+
+
+def test_nested_handlers_share_metrics(project_dao, capsys):
+    @event_wrapper
+    def inner(event, context):
+        project_dao.get("example")
+
+    @api_wrapper
+    def outer(event, context):
+        project_dao.get("example")
+        inner(event, context)
+
+    outer({}, mock_context)
+
+    get_item, summary = _emf_documents(capsys)
+    assert get_item["Calls"] == 2
+    assert summary["AwsCalls"] == 2
+
+
+@mock.patch("ml_space_lambda.utils.metrics.METRICS_ENABLED", False)
+def test_metrics_disabled(project_dao, capsys):
+    token = start_invocation()
+    project_dao.get("example")
+    end_invocation(token, mock_context.function_name)
+
+    assert token is None
+    assert _emf_documents(capsys) == []
+
+
+def test_batch_calls_across_tables():
+    metrics = InvocationMetrics()
+    metrics.record("dynamodb", "BatchGetItem", 5.0, table=MULTIPLE_TABLES, consumed_capacity=1.5)
+    metrics.record("s3", "GetObject", 10.0)
+
+    dynamodb, s3, summary = metrics.to_emf("example", timestamp=1)
+
+    assert dynamodb["Table"] == MULTIPLE_TABLES
+    assert dynamodb["_aws"]["Timestamp"] == 1
+    assert "Table" not in s3
+    assert "ConsumedCapacity" not in s3
+    assert s3["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Function", "Service", "Operation"]]
+    assert summary["AwsCalls"] == 2
+    assert summary["AwsLatency"] == 15.0
+    assert summary["ConsumedCapacity"] == 1.5
@@ -18,6 +18,8 @@ import json
 from io import BytesIO
 from unittest import mock
 
+from botocore.exceptions import ClientError
+
 import ml_space_lambda.utils.mlspace_config as mlspace_config
 from ml_space_lambda.enums import EnvVariable
 from ml_space_lambda.utils.mlspace_config import get_environment_variables
@@ -29,7 +31,7 @@ TEST_ENV_CONFIG = {
 }
 
 
-@mock.patch("ml_space_lambda.utils.mlspace_config.boto3.client")
+@mock.patch("ml_space_lambda.utils.mlspace_config.get_client")
 def test_pull_config_from_s3(mock_s3, mock_s3_param_json):
     # clear out global config if set to make lambda tests independent of each other
     mlspace_config.param_file = {}
@@ -44,6 +46,80 @@ def test_pull_config_from_s3(mock_s3, mock_s3_param_json):
     mock_s3.return_value.get_object.assert_called_with(Bucket="testS3Bucket", Key="testS3Key")
 
 
+@mock.patch("ml_space_lambda.utils.mlspace_config.time")
+@mock.patch("ml_space_lambda.utils.mlspace_config.get_client")
+def test_pull_config_from_s3_revalidates_with_etag(mock_s3, mock_time, mock_s3_param_json):
+    mlspace_config.invalidate_config_cache()
+    updated_params = {**mock_s3_param_json, "pSMSKMSKeyId": "updated-key"}
+    mock_s3.return_value.get_object.side_effect = [
+        {"Body": BytesIO(bytes(json.dumps(mock_s3_param_json), "utf-8")), "ETag": '"etag1"'},
+        ClientError({"Error": {"Code": "304", "Message": "Not Modified"}}, "GetObject"),
+        {"Body": BytesIO(bytes(json.dumps(updated_params), "utf-8")), "ETag": '"etag2"'},
+    ]
+
+    with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+        mock_time.monotonic.return_value = 1000
+        assert mlspace_config.pull_config_from_s3() == mock_s3_param_json
+        # Within the TTL the cached copy is returned without calling S3
+        mock_time.monotonic.return_value = 1000 + mlspace_config.PARAM_FILE_TTL_SECONDS - 1
+        assert mlspace_config.pull_config_from_s3() == mock_s3_param_json
+        assert mock_s3.return_value.get_object.call_count == 1
+
+        # Once expired the cached copy is revalidated, a 304 keeps the cached copy
+        mock_time.monotonic.return_value = 2000
+        assert mlspace_config.pull_config_from_s3() == mock_s3_param_json
+        mock_s3.return_value.get_object.assert_called_with(Bucket="testS3Bucket", Key="testS3Key", IfNoneMatch='"etag1"')
+
+        # The 304 restarted the TTL, once that expires again the changed file is loaded
+        mock_time.monotonic.return_value = 2000 + mlspace_config.PARAM_FILE_TTL_SECONDS
+        assert mlspace_config.pull_config_from_s3() == updated_params
+        assert mlspace_config.param_file_etag == '"etag2"'
+
+    mlspace_config.invalidate_config_cache()
+
+
+@mock.patch("ml_space_lambda.utils.mlspace_config.get_client")
+def test_invalidate_config_cache(mock_s3, mock_s3_param_json):
+    mlspace_config.invalidate_config_cache()
+    mock_s3.return_value.get_object.side_effect = lambda **kwargs: {
+        "Body": BytesIO(bytes(json.dumps(mock_s3_param_json), "utf-8")),
+        "ETag": '"etag1"',
+    }
+
+    with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+        mlspace_config.pull_config_from_s3()
+        mlspace_config.invalidate_config_cache()
+        mlspace_config.pull_config_from_s3()
+
+    # An invalidated cache does a full GET rather than a conditional one
+    mock_s3.return_value.get_object.assert_called_with(Bucket="testS3Bucket", Key="testS3Key")
+    assert mock_s3.return_value.get_object.call_count == 2
+    mlspace_config.invalidate_config_cache()
+
+
+@mock.patch("ml_space_lambda.utils.mlspace_config.threading")
+def test_prefetch_config_from_s3(mock_threading):
+    with mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True):
+        # Not running in lambda
+        mlspace_config.prefetch_config_from_s3()
+        mock_threading.Thread.assert_not_called()
+
+    with mock.patch.dict("os.environ", {**TEST_ENV_CONFIG, "AWS_LAMBDA_FUNCTION_NAME": "mls-lambda-test"}, clear=True):
+        mlspace_config.prefetch_config_from_s3()
+        mock_threading.Thread.assert_called_once()
+        mock_threading.Thread.return_value.start.assert_called_once()
+
+    mock_threading.reset_mock()
+    with mock.patch.dict(
+        "os.environ",
+        {**TEST_ENV_CONFIG, "AWS_LAMBDA_FUNCTION_NAME": "mls-lambda-test", EnvVariable.CONFIG_PREFETCH_ENABLED: "False"},
+        clear=True,
+    ):
+        # Disabled by configuration
+        mlspace_config.prefetch_config_from_s3()
+        mock_threading.Thread.assert_not_called()
+
+
 def test_environment_variables():
     # clear out global config if set to make lambda tests independent of each other
     mlspace_config.env_variables = {}
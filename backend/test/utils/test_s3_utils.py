@@ -0,0 +1,137 @@
+#
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License").
+#   You may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+
+from unittest import mock
+
+import boto3
+import moto
+import pytest
+
+from ml_space_lambda.utils.exceptions import ServiceException
+from ml_space_lambda.utils.s3_utils import delete_prefix, delete_prefix_or_raise, list_matching_objects
+
+TEST_ENV_CONFIG = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    # Fake cred info for MOTO
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SECURITY_TOKEN": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+}
+TEST_BUCKET = "mlspace-data-bucket"
+
+
+def _create_objects(s3, keys):
+    for key in keys:
+        s3.put_object(Bucket=TEST_BUCKET, Key=key, Body=b"data")
+
+
+@moto.mock_s3
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+def test_delete_prefix_pages_all_objects():
+    s3 = boto3.client("s3")
+    s3.create_bucket(Bucket=TEST_BUCKET)
+    _create_objects(s3, [f"project/p1/datasets/ds1/file{i}.txt" for i in range(2100)])
+    _create_objects(s3, ["project/p1/datasets/ds2/keep.txt"])
+
+    with mock.patch.object(s3, "delete_objects", wraps=s3.delete_objects) as mock_delete_objects:
+        report = delete_prefix(s3, TEST_BUCKET, "project/p1/datasets/ds1/", max_workers=2)
+
+    assert report == {"deleted": 2100, "errors": [], "complete": True}
+    # 1000 key batches
+    assert mock_delete_objects.call_count == 3
+    remaining = s3.list_objects_v2(Bucket=TEST_BUCKET)["Contents"]
+    assert [s3_object["Key"] for s3_object in remaining] == ["project/p1/datasets/ds2/keep.txt"]
+
+
+@moto.mock_s3
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+@mock.patch("ml_space_lambda.utils.s3_utils.time")
+def test_delete_prefix_resumes_after_deadline(mock_time):
+    s3 = boto3.client("s3")
+    s3.create_bucket(Bucket=TEST_BUCKET)
+    _create_objects(s3, [f"project/p1/datasets/ds1/file{i}.txt" for i in range(2100)])
+
+    # The deadline passes before the third batch is started
+    mock_time.monotonic.side_effect = [0, 1, 10]
+    assert delete_prefix(s3, TEST_BUCKET, "project/p1/datasets/ds1/", max_workers=2, deadline=5) == {
+        "deleted": 2000,
+        "errors": [],
+        "complete": False,
+    }
+    assert s3.list_objects_v2(Bucket=TEST_BUCKET)["KeyCount"] == 100
+
+    # Calling again picks up the remaining objects
+    mock_time.monotonic.side_effect = None
+    mock_time.monotonic.return_value = 0
+    assert delete_prefix_or_raise(s3, TEST_BUCKET, "project/p1/datasets/ds1/", deadline=5) == {
+        "deleted": 100,
+        "errors": [],
+        "complete": True,
+    }
+    assert s3.list_objects_v2(Bucket=TEST_BUCKET)["KeyCount"] == 0
+
+
+def test_delete_prefix_reports_errors():
+    mock_s3 = mock.Mock()
+    mock_s3.get_paginator.return_value.paginate.return_value = [
+        {"Contents": [{"Key": "private/jdoe/datasets/ds1/a.txt"}, {"Key": "private/jdoe/datasets/ds1/b.txt"}]}
+    ]
+    mock_s3.delete_objects.return_value = {
+        "Errors": [{"Key": "private/jdoe/datasets/ds1/b.txt", "Code": "AccessDenied", "Message": "Access Denied"}]
+    }
+
+    report = delete_prefix(mock_s3, TEST_BUCKET, "private/jdoe/datasets/ds1/")
+    assert report == {
+        "deleted": 1,
+        "errors": [{"Key": "private/jdoe/datasets/ds1/b.txt", "Code": "AccessDenied", "Message": "Access Denied"}],
+        "complete": True,
+    }
+
+    with pytest.raises(ServiceException) as exception:
+        delete_prefix_or_raise(mock_s3, TEST_BUCKET, "private/jdoe/datasets/ds1/")
+    assert exception.value.http_status_code == 500
+
+
+def test_delete_prefix_requires_prefix():
+    mock_s3 = mock.Mock()
+    with pytest.raises(ValueError):
+        delete_prefix(mock_s3, TEST_BUCKET, "")
+    mock_s3.get_paginator.assert_not_called()
+
+
+@moto.mock_s3
+@mock.patch.dict("os.environ", TEST_ENV_CONFIG, clear=True)
+def test_list_matching_objects_fills_limit_across_pages():
+    s3 = boto3.client("s3")
+    s3.create_bucket(Bucket=TEST_BUCKET)
+    _create_objects(s3, [f"project/p1/datasets/ds1/file{i:04}.{'csv' if i % 500 == 0 else 'txt'}" for i in range(2500)])
+
+    def _is_csv(s3_object):
+        return s3_object["Key"].endswith(".csv")
+
+    matching, resume_after = list_matching_objects(s3, TEST_BUCKET, "project/p1/datasets/ds1/", _is_csv, 3)
+    assert [s3_object["Key"] for s3_object in matching] == [f"project/p1/datasets/ds1/file{i:04}.csv" for i in (0, 500, 1000)]
+    assert resume_after == "project/p1/datasets/ds1/file1000.csv"
+
+    matching, resume_after = list_matching_objects(s3, TEST_BUCKET, "project/p1/datasets/ds1/", _is_csv, 3, resume_after)
+    assert [s3_object["Key"] for s3_object in matching] == [f"project/p1/datasets/ds1/file{i:04}.csv" for i in (1500, 2000)]
+    assert resume_after is None
+
+    # With a single page budget the listing stops at the end of the first page
+    matching, resume_after = list_matching_objects(s3, TEST_BUCKET, "project/p1/datasets/ds1/", _is_csv, 10, max_pages=1)
+    assert len(matching) == 2
+    assert resume_after == "project/p1/datasets/ds1/file0999.txt"
@@ -64,7 +64,12 @@ export const deleteDatasetFromProject = createAsyncThunk(
     'dataset/remove_dataset_from_project',
     async (dataset: IDataset) => {
         const requestUrl = `/v2/dataset/${dataset.type}/${dataset.scope}/${dataset.name}`;
-        return axios.delete<IDataset>(requestUrl);
+        // Large datasets are deleted over several requests, repeat until every file is gone
+        let response = await axios.delete(requestUrl);
+        while (response.data?.status === 'InProgress') {
+            response = await axios.delete(requestUrl);
+        }
+        return response;
     }
 );
 
@@ -70,7 +70,11 @@ export const deleteProject = createAsyncThunk(
     'project/delete',
     async (projectName: string, thunkApi) => {
         try {
-            const response = await axios.delete(`/project/${projectName}`);
+            // Project datasets are deleted over several requests, repeat until the project is gone
+            let response = await axios.delete(`/project/${projectName}`);
+            while (response.data?.status === 'InProgress') {
+                response = await axios.delete(`/project/${projectName}`);
+            }
             return response.data;
         } catch (err: any) {
             return thunkApi.rejectWithValue(err?.response?.data || err);
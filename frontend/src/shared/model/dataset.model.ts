@@ -30,6 +30,10 @@ export type IDataset = {
     location?: string;
     format?: string;
     groups?: string[];
+    // Approximate, maintained from S3 events and repaired with the recount-stats API
+    objectCount?: number;
+    totalBytes?: number;
+    lastModified?: number;
 };
 
 export const defaultDataset: IDataset = {
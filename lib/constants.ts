@@ -95,6 +95,9 @@ export const EMR_EC2_SSH_KEY = '';
 
 // Set this to false to disable access logging on all MLSpace S3 buckets and the APIGW
 export const ENABLE_ACCESS_LOGGING = true;
+// Set this to true to have the MLSpace lambdas emit per invocation AWS call metrics (call counts,
+// latency and DynamoDB consumed capacity) to CloudWatch using the Embedded Metric Format
+export const ENABLE_EMF_METRICS = false;
 // If access logs are enabled API Gateway will use the Cloudwatch role for your account
 // if you have an existing role set that ARN here otherwise MLSpace will attempt to create
 // the role for you
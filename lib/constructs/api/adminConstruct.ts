@@ -92,6 +92,26 @@ export class AdminApiConstruct extends Construct {
                 path: 'admin/datasets',
                 method: 'GET',
             },
+            {
+                name: 'recount_stats',
+                resource: 'dataset',
+                description: 'Recomputes dataset object count and size aggregates from the data bucket',
+                path: 'admin/datasets/recount-stats',
+                method: 'POST',
+                environment: {
+                    DATA_BUCKET: props.dataBucketName,
+                },
+            },
+            {
+                name: 'reconcile',
+                resource: 'dataset',
+                description: 'Creates missing dataset records from the contents of the data bucket',
+                path: 'admin/datasets/reconcile',
+                method: 'POST',
+                environment: {
+                    DATA_BUCKET: props.dataBucketName,
+                },
+            },
             {
                 name: 'update',
                 resource: 'user',
@@ -172,6 +192,13 @@ export class AdminApiConstruct extends Construct {
                 path: 'admin/sync-metadata',
                 method: 'POST',
             },
+            {
+                name: 'reconcile',
+                resource: 'iam_reconciler',
+                description: 'Reconciles dynamic user roles and policies with MLSpace membership data',
+                path: 'admin/reconcile-iam',
+                method: 'POST',
+            },
             {
                 name: 'list_subnets',
                 resource: 'metadata',
@@ -189,6 +216,9 @@ export class AdminApiConstruct extends Construct {
                 description: 'Describe available instance types for a sagemaker notebook',
                 path: 'metadata/compute-types',
                 method: 'GET',
+                environment: {
+                    BUCKET: props.configBucketName,
+                },
             },
             {
                 name: 'notebook_options',
@@ -49,6 +49,56 @@ export class DatasetsApiConstruct extends Construct {
                     DATA_BUCKET: props.dataBucketName,
                 },
             },
+            {
+                name: 'batch_presigned_urls',
+                resource: 'dataset',
+                description: 'Generates presigned download urls for multiple files in an MLSpace Dataset',
+                path: 'dataset/presigned-url/batch',
+                method: 'POST',
+                environment: {
+                    DATA_BUCKET: props.dataBucketName,
+                },
+            },
+            {
+                name: 'create_multipart_upload',
+                resource: 'dataset',
+                description: 'Starts a multipart upload for a large MLSpace Dataset file',
+                path: 'dataset/presigned-url/multipart',
+                method: 'POST',
+                environment: {
+                    DATA_BUCKET: props.dataBucketName,
+                },
+            },
+            {
+                name: 'presigned_part_urls',
+                resource: 'dataset',
+                description: 'Generates presigned urls for a batch of multipart upload parts',
+                path: 'dataset/presigned-url/multipart/parts',
+                method: 'POST',
+                environment: {
+                    DATA_BUCKET: props.dataBucketName,
+                },
+            },
+            {
+                name: 'complete_multipart_upload',
+                resource: 'dataset',
+                description: 'Completes a multipart upload for an MLSpace Dataset file',
+                path: 'dataset/presigned-url/multipart/complete',
+                method: 'POST',
+                environment: {
+                    DATA_BUCKET: props.dataBucketName,
+                },
+            },
+            {
+                name: 'abort_multipart_upload',
+                resource: 'dataset',
+                description: 'Aborts a multipart upload for an MLSpace Dataset file',
+                path: 'dataset/presigned-url/multipart/abort',
+                method: 'POST',
+                environment: {
+                    DATA_BUCKET: props.dataBucketName,
+                },
+            },
             {
                 name: 'create_dataset',
                 resource: 'dataset',
@@ -102,6 +152,16 @@ export class DatasetsApiConstruct extends Construct {
                     DATA_BUCKET: props.dataBucketName,
                 },
             },
+            {
+                name: 'create_manifest',
+                resource: 'dataset',
+                description: 'Generates a SageMaker manifest file listing the contents of an MLSpace Dataset',
+                path: 'v2/dataset/{type}/{scope}/{datasetName}/manifest',
+                method: 'POST',
+                environment: {
+                    DATA_BUCKET: props.dataBucketName,
+                },
+            },
             {
                 name: 'list_files',
                 resource: 'dataset',
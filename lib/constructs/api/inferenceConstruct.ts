@@ -107,6 +107,17 @@ export class InferenceApiConstruct extends Construct {
                 path: 'endpoint/{endpointName}/logs',
                 method: 'GET',
             },
+            {
+                id: 'endpoint-export-logs',
+                name: 'export',
+                resource: 'logs',
+                description: 'Exports the log events for the specified endpoint to a project dataset',
+                path: 'endpoint/{endpointName}/logs/export',
+                method: 'POST',
+                environment: {
+                    DATA_BUCKET: props.dataBucketName,
+                },
+            },
             {
                 name: 'create',
                 resource: 'endpoint_config',
@@ -127,6 +127,17 @@ export class JobsApiConstruct extends Construct {
                 path: 'job/{jobType}/{jobName}/logs',
                 method: 'GET',
             },
+            {
+                id: 'job-export-logs',
+                name: 'export',
+                resource: 'logs',
+                description: 'Exports the log events for the specified job to a project dataset',
+                path: 'job/{jobType}/{jobName}/logs/export',
+                method: 'POST',
+                environment: {
+                    DATA_BUCKET: props.dataBucketName,
+                },
+            },
             {
                 name: 'describe',
                 resource: 'labeling_job',
@@ -115,6 +115,17 @@ export class NotebooksApiConstruct extends Construct {
                 path: 'notebook/{notebookName}/logs',
                 method: 'GET',
             },
+            {
+                id: 'notebooks-export-logs',
+                name: 'export',
+                resource: 'logs',
+                description: 'Exports the log events for the specified notebook to a project dataset',
+                path: 'notebook/{notebookName}/logs/export',
+                method: 'POST',
+                environment: {
+                    DATA_BUCKET: props.dataBucketName,
+                },
+            },
             {
                 name: 'set_resource_termination',
                 resource: 'resource_scheduler',
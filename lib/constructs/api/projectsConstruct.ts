@@ -144,6 +144,13 @@ export class ProjectsApiConstruct extends Construct {
                 path: 'project/{projectName}',
                 method: 'PUT',
             },
+            {
+                name: 'bulk_resource_actions',
+                resource: 'project',
+                description: 'Stops or deletes multiple resources within a project',
+                path: 'project/{projectName}/resources/bulk',
+                method: 'POST',
+            },
             {
                 name: 'list_resources',
                 resource: 'training_job',
@@ -154,8 +154,10 @@ export class RestApiConstruct extends Construct {
                     'x-mlspace-project',
                 ],
             },
-            // Support binary media types used for documentation images and fonts
-            binaryMediaTypes: ['font/*', 'image/*'],
+            // Support binary media types used for documentation images and fonts. JSON is included
+            // so that API lambdas can return gzip/br compressed (base64 encoded) responses, request
+            // bodies are decoded again by the api_wrapper.
+            binaryMediaTypes: ['font/*', 'image/*', 'application/json'],
         });
         // Configure static site resources
         const proxyMethodResponse = [
@@ -265,6 +267,7 @@ export class RestApiConstruct extends Construct {
                 OIDC_CLIENT_NAME: props.mlspaceConfig.OIDC_CLIENT_NAME,
                 OIDC_VERIFY_SSL: props.mlspaceConfig.OIDC_VERIFY_SSL ? 'True' : 'False',
                 OIDC_VERIFY_SIGNATURE: props.verifyOIDCTokenSignature ? 'True' : 'False',
+                EMF_METRICS_ENABLED: props.mlspaceConfig.ENABLE_EMF_METRICS ? 'True' : 'False',
                 ...props.mlspaceConfig.ADDITIONAL_LAMBDA_ENVIRONMENT_VARS,
             },
             vpc: props.mlSpaceVPC,
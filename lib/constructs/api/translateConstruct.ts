@@ -88,6 +88,9 @@ export class TranslateApiConstruct extends Construct {
                 description: 'List the supported languages for AWS Translate',
                 path: 'translate/list-languages',
                 method: 'GET',
+                environment: {
+                    BUCKET: props.configBucketName,
+                },
             },
             {
                 name: 'list',
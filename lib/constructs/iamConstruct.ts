@@ -758,6 +758,8 @@ export class IAMConstruct extends Construct {
                 new PolicyStatement({
                     effect: Effect.ALLOW,
                     actions: [
+                        'dynamodb:BatchGetItem',
+                        'dynamodb:BatchWriteItem',
                         'dynamodb:GetItem',
                         'dynamodb:PutItem',
                         'dynamodb:Scan',
@@ -819,6 +821,7 @@ export class IAMConstruct extends Construct {
                 new PolicyStatement({
                     effect: Effect.ALLOW,
                     actions: [
+                        's3:AbortMultipartUpload',
                         's3:List*',
                         's3:Get*',
                         's3:PutObject',
@@ -1015,6 +1018,8 @@ export class IAMConstruct extends Construct {
                             'iam:ListAttachedRolePolicies',
                             'iam:GetRole',
                             'iam:GetPolicy',
+                            'iam:GetPolicyVersion',
+                            'iam:ListPolicies',
                             'iam:ListRoleTags',
                         ],
                         resources: ['*'],
@@ -187,10 +187,12 @@ export class CoreConstruct extends Construct {
             enforceSSL: true,
             cors: [
                 {
-                    allowedMethods: [HttpMethods.GET, HttpMethods.POST],
+                    // PUT is required for presigned multipart part uploads and the ETag must be exposed
+                    // so clients can complete the upload
+                    allowedMethods: [HttpMethods.GET, HttpMethods.POST, HttpMethods.PUT],
                     allowedHeaders: ['*'],
                     allowedOrigins: ['*'],
-                    exposedHeaders: ['Access-Control-Allow-Origin'],
+                    exposedHeaders: ['Access-Control-Allow-Origin', 'ETag'],
                 },
             ],
             serverAccessLogsBucket: accessLogBucket,
@@ -338,6 +340,33 @@ export class CoreConstruct extends Construct {
         });
         updateInstanceKmsConditionsLambdaScheduleRule.addTarget(new LambdaFunction(updateInstanceKmsConditionsLambda));
 
+        // Keeps the shared metadata cache (compute types, subnets, languages) in the config bucket current.
+        // Cached entries are pruned when the config bucket is redeployed and repopulated on first use.
+        const refreshMetadataCacheLambda = new Function(scope, 'refreshMetadataCacheLambda', {
+            functionName: 'mls-lambda-refresh-metadata-cache',
+            description: 'Refreshes the cached metadata used to populate MLSpace create forms',
+            runtime: props.mlspaceConfig.LAMBDA_RUNTIME,
+            architecture: props.mlspaceConfig.LAMBDA_ARCHITECTURE,
+            handler: 'ml_space_lambda.metadata.lambda_functions.refresh_cache',
+            code: Code.fromAsset(props.lambdaSourcePath),
+            timeout: Duration.minutes(2),
+            role: props.mlSpaceAppRole,
+            environment: {
+                BUCKET: props.configBucketName,
+                S3_KEY: props.mlspaceConfig.NOTEBOOK_PARAMETERS_FILE_NAME,
+                EMF_METRICS_ENABLED: props.mlspaceConfig.ENABLE_EMF_METRICS ? 'True' : 'False',
+                ...props.mlspaceConfig.ADDITIONAL_LAMBDA_ENVIRONMENT_VARS,
+            },
+            layers: [commonLambdaLayer.layerVersion],
+            vpc: props.mlSpaceVPC,
+            securityGroups: props.lambdaSecurityGroups,
+        });
+
+        new Rule(scope, 'mlspace-refresh-metadata-cache-rule', {
+            schedule: Schedule.rate(Duration.hours(6)),
+            targets: [new LambdaFunction(refreshMetadataCacheLambda)],
+        });
+
         const notifierLambdaLayer = createLambdaLayer(scope, 'common', 'notifier', props.mlspaceConfig.COMMON_LAYER_PATH);
 
         const s3NotificationLambda = new Function(scope, 's3Notifier', {
@@ -348,7 +377,8 @@ export class CoreConstruct extends Construct {
             architecture: props.mlspaceConfig.LAMBDA_ARCHITECTURE,
             handler: 'ml_space_lambda.s3_event_put_notification.lambda_function.lambda_handler',
             code: Code.fromAsset(props.lambdaSourcePath),
-            timeout: Duration.seconds(5),
+            // A single event can batch many records, each of which is tagged and counted
+            timeout: Duration.seconds(60),
             role: props.mlSpaceAppRole,
             environment: {
                 DATA_BUCKET: props.dataBucketName,
@@ -356,6 +386,7 @@ export class CoreConstruct extends Construct {
                 PROJECTS_TABLE: props.mlspaceConfig.PROJECTS_TABLE_NAME,
                 PROJECT_USERS_TABLE: props.mlspaceConfig.PROJECT_USERS_TABLE_NAME,
                 USERS_TABLE: props.mlspaceConfig.USERS_TABLE_NAME,
+                EMF_METRICS_ENABLED: props.mlspaceConfig.ENABLE_EMF_METRICS ? 'True' : 'False',
                 ...props.mlspaceConfig.ADDITIONAL_LAMBDA_ENVIRONMENT_VARS,
             },
             layers: [notifierLambdaLayer.layerVersion],
@@ -374,6 +405,11 @@ export class CoreConstruct extends Construct {
             EventType.OBJECT_CREATED,
             new LambdaDestination(s3NotificationLambda)
         );
+        // Removal events keep the dataset object count and size aggregates up to date
+        dataBucket.addEventNotification(
+            EventType.OBJECT_REMOVED,
+            new LambdaDestination(s3NotificationLambda)
+        );
 
         const terminateResourcesLambda = new Function(scope, 'resourceTerminator', {
             functionName: 'mls-lambda-resource-terminator',
@@ -387,6 +423,7 @@ export class CoreConstruct extends Construct {
             role: props.mlSpaceAppRole,
             environment: {
                 RESOURCE_SCHEDULE_TABLE: props.mlspaceConfig.RESOURCE_SCHEDULE_TABLE_NAME,
+                EMF_METRICS_ENABLED: props.mlspaceConfig.ENABLE_EMF_METRICS ? 'True' : 'False',
                 ...props.mlspaceConfig.ADDITIONAL_LAMBDA_ENVIRONMENT_VARS,
             },
             layers: [commonLambdaLayer.layerVersion],
@@ -669,6 +706,7 @@ export class CoreConstruct extends Construct {
             environment: {
                 RESOURCE_METADATA_TABLE: props.mlspaceConfig.RESOURCE_METADATA_TABLE_NAME,
                 SYSTEM_TAG: props.mlspaceConfig.SYSTEM_TAG,
+                EMF_METRICS_ENABLED: props.mlspaceConfig.ENABLE_EMF_METRICS ? 'True' : 'False',
                 ...props.mlspaceConfig.ADDITIONAL_LAMBDA_ENVIRONMENT_VARS,
             },
             layers: [commonLambdaLayer.layerVersion],
@@ -83,6 +83,7 @@ export function registerAPIEndpoint (
             APP_ROLE_NAME: appRoleName,
             PERMISSIONS_BOUNDARY_ARN: permissionsBoundaryArn || '',
             IAM_RESOURCE_PREFIX: mlspaceConfig.IAM_RESOURCE_PREFIX,
+            EMF_METRICS_ENABLED: mlspaceConfig.ENABLE_EMF_METRICS ? 'True' : 'False',
             ...funcDef.environment,
             ...mlspaceConfig.ADDITIONAL_LAMBDA_ENVIRONMENT_VARS,
         },
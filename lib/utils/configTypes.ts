@@ -35,6 +35,7 @@ import {
     EMR_EC2_SSH_KEY,
     ENABLE_ACCESS_LOGGING,
     ENABLE_DDB_KMS_CMK_ENCRYPTION,
+    ENABLE_EMF_METRICS,
     EXISTING_KMS_MASTER_KEY_ARN,
     EXISTING_VPC_DEFAULT_SECURITY_GROUP,
     EXISTING_VPC_ID,
@@ -128,6 +129,7 @@ export type MLSpaceConfig = {
     MANAGE_IAM_ROLES: boolean,
     ENABLE_ACCESS_LOGGING: boolean,
     ENABLE_DDB_KMS_CMK_ENCRYPTION: boolean,
+    ENABLE_EMF_METRICS: boolean,
     CREATE_MLSPACE_CLOUDTRAIL_TRAIL: boolean,
     RESOURCE_TERMINATION_INTERVAL: number,
     NEW_USERS_SUSPENDED: boolean,
@@ -220,6 +222,7 @@ export function generateConfig (accountId?: string) {
         MANAGE_IAM_ROLES: MANAGE_IAM_ROLES,
         ENABLE_ACCESS_LOGGING: ENABLE_ACCESS_LOGGING,
         ENABLE_DDB_KMS_CMK_ENCRYPTION: ENABLE_DDB_KMS_CMK_ENCRYPTION,
+        ENABLE_EMF_METRICS: ENABLE_EMF_METRICS,
         CREATE_MLSPACE_CLOUDTRAIL_TRAIL: CREATE_MLSPACE_CLOUDTRAIL_TRAIL,
         RESOURCE_TERMINATION_INTERVAL: RESOURCE_TERMINATION_INTERVAL,
         LAMBDA_ARCHITECTURE: LAMBDA_ARCHITECTURE,